@@ -13,7 +13,7 @@ import { selectedSamples, SampleData } from "../recoil/atoms";
 import * as schemaAtoms from "../recoil/schema";
 import { datasetName } from "../recoil/selectors";
 import { State } from "../recoil/types";
-import { getSampleSrc } from "../recoil/utils";
+import { getSampleSrc, THUMBNAIL_MAX_SIZE } from "../recoil/utils";
 import * as viewAtoms from "../recoil/view";
 
 export default <T extends FrameLooker | ImageLooker | VideoLooker>(
@@ -70,7 +70,10 @@ export default <T extends FrameLooker | ImageLooker | VideoLooker>(
         frameNumber: constructor === FrameLooker ? frameNumber : undefined,
         frameRate,
         sampleId: sample._id,
-        src: getSampleSrc(urls[mediaField]),
+        src: getSampleSrc(
+          urls[mediaField],
+          thumbnail && !video ? THUMBNAIL_MAX_SIZE : undefined
+        ),
         support: isClip ? sample.support : undefined,
         thumbnail,
         dataset,
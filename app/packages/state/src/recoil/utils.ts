@@ -1,6 +1,10 @@
 import { getFetchOrigin, getFetchPathPrefix } from "@fiftyone/utilities";
 
-export const getSampleSrc = (url: string) => {
+// The maximum dimension of images requested for grid thumbnails. Chosen to be
+// sharp on high-DPI displays at the largest grid tile size
+export const THUMBNAIL_MAX_SIZE = 512;
+
+export const getSampleSrc = (url: string, maxSize?: number) => {
   try {
     const { protocol } = new URL(url);
     if (["http:", "https:"].includes(protocol)) {
@@ -8,7 +12,9 @@ export const getSampleSrc = (url: string) => {
     }
   } catch {}
 
-  return `${getFetchOrigin()}${getFetchPathPrefix()}/media?filepath=${encodeURIComponent(
+  const src = `${getFetchOrigin()}${getFetchPathPrefix()}/media?filepath=${encodeURIComponent(
     url
   )}`;
+
+  return maxSize ? `${src}&max_size=${maxSize}` : src;
 };
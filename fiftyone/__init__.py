@@ -7,6 +7,7 @@ See https://voxel51.com/fiftyone for more information.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from importlib import import_module as _import_module
 from pkgutil import extend_path as _extend_path
 import os as _os
 
@@ -23,13 +24,39 @@ import fiftyone.constants as _foc
 __version__ = _foc.VERSION
 
 from fiftyone.__public__ import *
+from fiftyone.__public__ import __all__ as _public_all, _PUBLIC_ATTRS
 
 import fiftyone.core.uid as _fou
 import fiftyone.core.logging as _fol
-import fiftyone.migrations as _fom
+
+__all__ = _public_all + list(_PUBLIC_ATTRS)
 
 _fol.init_logging()
 
 if _os.environ.get("FIFTYONE_DISABLE_SERVICES", "0") != "1":
-    _fom.migrate_database_if_necessary()
     _fou.log_import_if_allowed()
+
+
+def __getattr__(name):
+    # Public attributes and subpackages like `fiftyone.types` are imported on
+    # first access
+    module_name = _PUBLIC_ATTRS.get(name, None)
+    if module_name is None:
+        submodule_name = __name__ + "." + name
+        try:
+            return _import_module(submodule_name)
+        except ModuleNotFoundError as e:
+            if e.name != submodule_name:
+                raise
+
+        raise AttributeError(
+            "module '%s' has no attribute '%s'" % (__name__, name)
+        )
+
+    value = getattr(_import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_PUBLIC_ATTRS))
@@ -1,209 +1,221 @@
 """
 FiftyOne's public interface.
 
+The public interface is loaded lazily: each attribute below is imported from
+its module the first time that it is accessed, so ``import fiftyone`` does not
+pay the import cost of functionality that is never used, such as plotting and
+App sessions.
+
 | Copyright 2017-2022, Voxel51, Inc.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
 import fiftyone.core.config as _foc
-import fiftyone.core.odm as _foo
 
 config = _foc.load_config()
 annotation_config = _foc.load_annotation_config()
 app_config = _foc.load_app_config()
 
-_foo.establish_db_conn(config)
+__all__ = ["config", "annotation_config", "app_config"]
+
+_PUBLIC_MODULES = {
+    "fiftyone.core.aggregations": (
+        "Aggregation",
+        "Bounds",
+        "Count",
+        "CountValues",
+        "Distinct",
+        "HistogramValues",
+        "Mean",
+        "Quantiles",
+        "Std",
+        "Sum",
+        "Values",
+    ),
+    "fiftyone.core.collections": ("SaveContext",),
+    "fiftyone.core.config": ("AppConfig",),
+    "fiftyone.core.dataset": (
+        "Dataset",
+        "list_datasets",
+        "dataset_exists",
+        "load_dataset",
+        "delete_dataset",
+        "delete_datasets",
+        "delete_non_persistent_datasets",
+        "get_default_dataset_name",
+        "make_unique_dataset_name",
+        "get_default_dataset_dir",
+    ),
+    "fiftyone.core.expressions": (
+        "ViewField",
+        "ViewExpression",
+        "VALUE",
+    ),
+    "fiftyone.core.fields": (
+        "ArrayField",
+        "BooleanField",
+        "ClassesField",
+        "DateField",
+        "DateTimeField",
+        "DictField",
+        "EmbeddedDocumentField",
+        "EmbeddedDocumentListField",
+        "Field",
+        "FrameNumberField",
+        "FrameSupportField",
+        "FloatField",
+        "GeoPointField",
+        "GeoLineStringField",
+        "GeoPolygonField",
+        "GeoMultiPointField",
+        "GeoMultiLineStringField",
+        "GeoMultiPolygonField",
+        "IntField",
+        "IntDictField",
+        "KeypointsField",
+        "ListField",
+        "ObjectIdField",
+        "PolylinePointsField",
+        "StringField",
+        "TargetsField",
+        "VectorField",
+    ),
+    "fiftyone.core.frame": ("Frame",),
+    "fiftyone.core.groups": ("Group",),
+    "fiftyone.core.labels": (
+        "Label",
+        "Attribute",
+        "BooleanAttribute",
+        "CategoricalAttribute",
+        "NumericAttribute",
+        "ListAttribute",
+        "Regression",
+        "Classification",
+        "Classifications",
+        "Detection",
+        "Detections",
+        "Polyline",
+        "Polylines",
+        "Keypoint",
+        "Keypoints",
+        "Segmentation",
+        "Heatmap",
+        "TemporalDetection",
+        "TemporalDetections",
+        "GeoLocation",
+        "GeoLocations",
+    ),
+    "fiftyone.core.logging": (
+        "get_logging_level",
+        "set_logging_level",
+    ),
+    "fiftyone.core.metadata": (
+        "Metadata",
+        "ImageMetadata",
+        "VideoMetadata",
+    ),
+    "fiftyone.core.models": (
+        "apply_model",
+        "compute_embeddings",
+        "compute_patch_embeddings",
+        "load_model",
+        "Model",
+        "ModelConfig",
+        "EmbeddingsMixin",
+        "TorchModelMixin",
+        "ModelManagerConfig",
+        "ModelManager",
+    ),
+    "fiftyone.core.odm": (
+        "DatasetAppConfig",
+        "KeypointSkeleton",
+    ),
+    "fiftyone.core.plots": (
+        "plot_confusion_matrix",
+        "plot_pr_curve",
+        "plot_pr_curves",
+        "plot_roc_curve",
+        "lines",
+        "scatterplot",
+        "location_scatterplot",
+        "Plot",
+        "ResponsivePlot",
+        "InteractivePlot",
+        "ViewPlot",
+        "ViewGrid",
+        "CategoricalHistogram",
+        "NumericalHistogram",
+    ),
+    "fiftyone.core.sample": ("Sample",),
+    "fiftyone.core.stages": (
+        "Concat",
+        "Exclude",
+        "ExcludeBy",
+        "ExcludeFields",
+        "ExcludeFrames",
+        "ExcludeLabels",
+        "Exists",
+        "FilterField",
+        "FilterLabels",
+        "FilterKeypoints",
+        "Limit",
+        "LimitLabels",
+        "GeoNear",
+        "GeoWithin",
+        "GroupBy",
+        "MapLabels",
+        "Match",
+        "MatchFrames",
+        "MatchLabels",
+        "MatchTags",
+        "Mongo",
+        "Shuffle",
+        "Select",
+        "SelectBy",
+        "SelectFields",
+        "SelectFrames",
+        "SelectGroups",
+        "SelectGroupSlices",
+        "SelectLabels",
+        "SelectSet",
+        "SetField",
+        "Skip",
+        "SortBy",
+        "SortBySimilarity",
+        "Take",
+        "ToPatches",
+        "ToEvaluationPatches",
+        "ToClips",
+        "ToFrames",
+    ),
+    "fiftyone.core.session": (
+        "close_app",
+        "launch_app",
+        "Session",
+    ),
+    "fiftyone.core.utils": (
+        "pprint",
+        "pformat",
+        "ProgressBar",
+    ),
+    "fiftyone.core.view": ("DatasetView",),
+    "fiftyone.utils.eval.classification": (
+        "evaluate_classifications",
+        "ClassificationResults",
+        "BinaryClassificationResults",
+    ),
+    "fiftyone.utils.eval.detection": (
+        "evaluate_detections",
+        "DetectionResults",
+    ),
+    "fiftyone.utils.eval.segmentation": (
+        "evaluate_segmentations",
+        "SegmentationResults",
+    ),
+    "fiftyone.utils.quickstart": ("quickstart",),
+}
 
-from .core.aggregations import (
-    Aggregation,
-    Bounds,
-    Count,
-    CountValues,
-    Distinct,
-    HistogramValues,
-    Mean,
-    Quantiles,
-    Std,
-    Sum,
-    Values,
-)
-from .core.collections import SaveContext
-from .core.config import AppConfig
-from .core.dataset import (
-    Dataset,
-    list_datasets,
-    dataset_exists,
-    load_dataset,
-    delete_dataset,
-    delete_datasets,
-    delete_non_persistent_datasets,
-    get_default_dataset_name,
-    make_unique_dataset_name,
-    get_default_dataset_dir,
-)
-from .core.expressions import (
-    ViewField,
-    ViewExpression,
-    VALUE,
-)
-from .core.fields import (
-    ArrayField,
-    BooleanField,
-    ClassesField,
-    DateField,
-    DateTimeField,
-    DictField,
-    EmbeddedDocumentField,
-    EmbeddedDocumentListField,
-    Field,
-    FrameNumberField,
-    FrameSupportField,
-    FloatField,
-    GeoPointField,
-    GeoLineStringField,
-    GeoPolygonField,
-    GeoMultiPointField,
-    GeoMultiLineStringField,
-    GeoMultiPolygonField,
-    IntField,
-    IntDictField,
-    KeypointsField,
-    ListField,
-    ObjectIdField,
-    PolylinePointsField,
-    StringField,
-    TargetsField,
-    VectorField,
-)
-from .core.frame import Frame
-from .core.groups import Group
-from .core.labels import (
-    Label,
-    Attribute,
-    BooleanAttribute,
-    CategoricalAttribute,
-    NumericAttribute,
-    ListAttribute,
-    Regression,
-    Classification,
-    Classifications,
-    Detection,
-    Detections,
-    Polyline,
-    Polylines,
-    Keypoint,
-    Keypoints,
-    Segmentation,
-    Heatmap,
-    TemporalDetection,
-    TemporalDetections,
-    GeoLocation,
-    GeoLocations,
-)
-from .core.logging import (
-    get_logging_level,
-    set_logging_level,
-)
-from .core.metadata import (
-    Metadata,
-    ImageMetadata,
-    VideoMetadata,
-)
-from .core.models import (
-    apply_model,
-    compute_embeddings,
-    compute_patch_embeddings,
-    load_model,
-    Model,
-    ModelConfig,
-    EmbeddingsMixin,
-    TorchModelMixin,
-    ModelManagerConfig,
-    ModelManager,
-)
-from .core.odm import (
-    DatasetAppConfig,
-    KeypointSkeleton,
-)
-from .core.plots import (
-    plot_confusion_matrix,
-    plot_pr_curve,
-    plot_pr_curves,
-    plot_roc_curve,
-    lines,
-    scatterplot,
-    location_scatterplot,
-    Plot,
-    ResponsivePlot,
-    InteractivePlot,
-    ViewPlot,
-    ViewGrid,
-    CategoricalHistogram,
-    NumericalHistogram,
-)
-from .core.sample import Sample
-from .core.stages import (
-    Concat,
-    Exclude,
-    ExcludeBy,
-    ExcludeFields,
-    ExcludeFrames,
-    ExcludeLabels,
-    Exists,
-    FilterField,
-    FilterLabels,
-    FilterKeypoints,
-    Limit,
-    LimitLabels,
-    GeoNear,
-    GeoWithin,
-    GroupBy,
-    MapLabels,
-    Match,
-    MatchFrames,
-    MatchLabels,
-    MatchTags,
-    Mongo,
-    Shuffle,
-    Select,
-    SelectBy,
-    SelectFields,
-    SelectFrames,
-    SelectGroups,
-    SelectGroupSlices,
-    SelectLabels,
-    SetField,
-    Skip,
-    SortBy,
-    SortBySimilarity,
-    Take,
-    ToPatches,
-    ToEvaluationPatches,
-    ToClips,
-    ToFrames,
-)
-from .core.session import (
-    close_app,
-    launch_app,
-    Session,
-)
-from .core.utils import (
-    pprint,
-    pformat,
-    ProgressBar,
-)
-from .core.view import DatasetView
-from .utils.eval.classification import (
-    evaluate_classifications,
-    ClassificationResults,
-    BinaryClassificationResults,
-)
-from .utils.eval.detection import (
-    evaluate_detections,
-    DetectionResults,
-)
-from .utils.eval.segmentation import (
-    evaluate_segmentations,
-    SegmentationResults,
-)
-from .utils.quickstart import quickstart
+# Maps public attribute names to the modules that define them
+_PUBLIC_ATTRS = {
+    name: module for module, names in _PUBLIC_MODULES.items() for name in names
+}
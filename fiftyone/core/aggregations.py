@@ -8,6 +8,8 @@ Aggregations.
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import date, datetime
+import itertools
+import numbers
 import reprlib
 import uuid
 
@@ -21,8 +23,11 @@ from fiftyone.core.expressions import ViewExpression as E
 from fiftyone.core.expressions import ViewField as F
 import fiftyone.core.fields as fof
 import fiftyone.core.media as fom
+import fiftyone.core.sketches as fosk
 import fiftyone.core.utils as fou
 
+pa = fou.lazy_import("pyarrow", callback=lambda: fou.ensure_import("pyarrow"))
+
 
 class Aggregation(object):
     """Abstract base class for all aggregations.
@@ -640,6 +645,16 @@ class CountValues(Aggregation):
         counts = dataset.aggregate(aggregation)
         print(counts)  # dict mapping values to counts
 
+        #
+        # Estimate the counts of the most common predicted labels
+        #
+
+        aggregation = fo.CountValues(
+            "predictions.detections.label", approx=True
+        )
+        counts = dataset.aggregate(aggregation)
+        print(counts)  # dict mapping values to estimated counts
+
     Args:
         field_or_expr: a field name, ``embedded.field.name``,
             :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -651,6 +666,11 @@ class CountValues(Aggregation):
             aggregating
         safe (False): whether to treat nan/inf values as None when dealing with
             floating point values
+        approx (False): whether to estimate the counts of the most common
+            values from a uniform random sample of at most 100,000 values
+            rather than counting all values. Only values that appear in the
+            sample are returned, so rare values may be omitted. The results
+            are exact when there are fewer values than the sample size
     """
 
     def __init__(
@@ -658,6 +678,7 @@ class CountValues(Aggregation):
         field_or_expr,
         expr=None,
         safe=False,
+        approx=False,
         _first=None,
         _sort_by="count",
         _asc=True,
@@ -666,6 +687,7 @@ class CountValues(Aggregation):
         _selected=[],
     ):
         super().__init__(field_or_expr, expr=expr, safe=safe)
+        self._approx = approx
         self._first = _first
         self._sort_by = _sort_by
         self._asc = _asc
@@ -675,8 +697,14 @@ class CountValues(Aggregation):
 
         self._field_type = None
 
+    @property
+    def approx(self):
+        """Whether the counts are estimated from a sample of the values."""
+        return self._approx
+
     def _kwargs(self):
         return super()._kwargs() + [
+            ["approx", self._approx],
             ["_first", self._first],
             ["_sort_by", self._sort_by],
             ["_asc", self._asc],
@@ -710,6 +738,9 @@ class CountValues(Aggregation):
         else:
             p = lambda x: x
 
+        if self._approx:
+            return self._parse_result_approx(d, p)
+
         if self._first is not None:
             count = d["count"]
             if not count:
@@ -741,6 +772,9 @@ class CountValues(Aggregation):
         else:
             value = "$" + path
 
+        if self._approx:
+            return pipeline + self._make_approx_pipeline(value)
+
         pipeline += [
             {"$group": {"_id": value, "count": {"$sum": 1}}},
         ]
@@ -756,24 +790,7 @@ class CountValues(Aggregation):
             ]
 
         if self._search or self._selected:
-            pipeline += [
-                {
-                    "$match": {
-                        "$expr": {
-                            "$and": [
-                                {"$not": {"$in": ["$_id", self._selected]}},
-                                {
-                                    "$regexMatch": {
-                                        "input": "$_id",
-                                        "regex": self._search,
-                                        "options": None,
-                                    }
-                                },
-                            ]
-                        }
-                    }
-                }
-            ]
+            pipeline.append(self._make_search_stage("$_id"))
 
         sort = OrderedDict()
         limit = self._first
@@ -804,6 +821,92 @@ class CountValues(Aggregation):
             {"$facet": {"count": [{"$count": "count"}], "result": result}}
         ]
 
+    def _make_search_stage(self, value):
+        return {
+            "$match": {
+                "$expr": {
+                    "$and": [
+                        {"$not": {"$in": [value, self._selected]}},
+                        {
+                            "$regexMatch": {
+                                "input": value,
+                                "regex": self._search,
+                                "options": None,
+                            }
+                        },
+                    ]
+                }
+            }
+        }
+
+    def _make_approx_pipeline(self, value):
+        pipeline = []
+
+        if self._first is not None and (self._search or self._selected):
+            pipeline.append(self._make_search_stage(value))
+
+        facets = {
+            "count": [{"$count": "count"}],
+            "sample": [
+                {"$sample": {"size": _APPROX_SAMPLE_SIZE}},
+                {"$group": {"_id": value, "count": {"$sum": 1}}},
+                {
+                    "$group": {
+                        "_id": None,
+                        "result": {"$push": {"k": "$_id", "count": "$count"}},
+                    }
+                },
+            ],
+        }
+
+        if self._first is not None:
+            # The number of distinct values is estimated separately, since
+            # the sample may not contain all of them
+            sketch = fosk.CardinalitySketch()
+            facets["distinct"] = _make_cardinality_pipeline(value, sketch)
+
+        pipeline.append({"$facet": facets})
+
+        return pipeline
+
+    def _parse_result_approx(self, d, p):
+        count = d["count"][0]["count"] if d["count"] else 0
+        sample = d["sample"][0]["result"] if d["sample"] else []
+
+        num_sampled = sum(i["count"] for i in sample)
+        scale = count / num_sampled if num_sampled else 0
+        counts = [(i["k"], int(round(scale * i["count"]))) for i in sample]
+
+        if self._first is None:
+            return {p(k): c for k, c in counts}
+
+        if d["distinct"]:
+            sketch = fosk.CardinalitySketch()
+            num_distinct = _parse_cardinality_result(d["distinct"][0], sketch)
+        else:
+            num_distinct = 0
+
+        include = set(self._include or [])
+        counts = [(k, c) for k, c in counts if k is not None]
+
+        # Mirror the sort order of the exact aggregation
+        reverse = not self._asc
+        if self._sort_by == "count":
+            counts.sort(key=lambda kc: (kc[1], kc[0]), reverse=reverse)
+        else:
+            counts.sort(key=lambda kc: (kc[0], kc[1]), reverse=reverse)
+
+        counts.sort(key=lambda kc: kc[0] in include, reverse=True)
+
+        limit = self._first
+        if self._include is not None:
+            limit = max(limit, len(self._include))
+
+        return (
+            max(num_distinct, len(counts)),
+            [[p(k), c] for k, c in counts[:limit]],
+        )
+
 
 class Distinct(Aggregation):
     """Computes the distinct values of a field in a collection.
@@ -882,6 +985,14 @@ class Distinct(Aggregation):
         values = dataset.aggregate(aggregation)
         print(values)  # list of distinct values
 
+        #
+        # Estimate the number of distinct predicted labels in a dataset
+        #
+
+        aggregation = fo.Distinct("predictions.detections.label", approx=True)
+        count = dataset.aggregate(aggregation)
+        print(count)  # the approximate number of distinct values
+
     Args:
         field_or_expr: a field name, ``embedded.field.name``,
             :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -893,19 +1004,36 @@ class Distinct(Aggregation):
             aggregating
         safe (False): whether to ignore nan/inf values when dealing with
             floating point values
+        approx (False): whether to return an estimate of the *number* of
+            distinct values, computed via a
+            :class:`fiftyone.core.sketches.CardinalitySketch`, rather than the
+            distinct values themselves. The estimate has a standard error of
+            about 0.8%
     """
 
-    def __init__(self, field_or_expr, expr=None, safe=False):
+    def __init__(self, field_or_expr, expr=None, safe=False, approx=False):
         super().__init__(field_or_expr, expr=expr, safe=safe)
+        self._approx = approx
 
         self._field_type = None
 
+    @property
+    def approx(self):
+        """Whether the number of distinct values is estimated."""
+        return self._approx
+
+    def _kwargs(self):
+        return super()._kwargs() + [["approx", self._approx]]
+
     def default_result(self):
         """Returns the default result for this aggregation.
 
         Returns:
-            ``[]``
+            ``[]``, or ``0`` if ``approx`` is True
         """
+        if self._approx:
+            return 0
+
         return []
 
     def parse_result(self, d):
@@ -915,8 +1043,13 @@ class Distinct(Aggregation):
             d: the result dict
 
         Returns:
-            a sorted list of distinct values
+            a sorted list of distinct values, or the approximate number of
+            distinct values if ``approx`` is True
         """
+        if self._approx:
+            sketch = fosk.CardinalitySketch()
+            return _parse_cardinality_result(d, sketch)
+
         values = d["values"]
 
         if self._field_type is not None:
@@ -940,8 +1073,13 @@ class Distinct(Aggregation):
         else:
             value = "$" + path
 
+        pipeline.append({"$match": {"$expr": {"$gt": ["$" + path, None]}}})
+
+        if self._approx:
+            sketch = fosk.CardinalitySketch()
+            return pipeline + _make_cardinality_pipeline(value, sketch)
+
         pipeline += [
-            {"$match": {"$expr": {"$gt": ["$" + path, None]}}},
             {"$group": {"_id": None, "values": {"$addToSet": value}}},
             {"$unwind": "$values"},
             {"$sort": {"values": 1}},
@@ -1020,6 +1158,16 @@ class HistogramValues(Aggregation):
         plot_hist(counts, edges)
         plt.show(block=False)
 
+        #
+        # Compute an approximate histogram of a numeric field in one pass
+        #
+
+        aggregation = fo.HistogramValues("numeric_field", bins=50, approx=True)
+        counts, edges, other = dataset.aggregate(aggregation)
+
+        plot_hist(counts, edges)
+        plt.show(block=False)
+
     Args:
         field_or_expr: a field name, ``embedded.field.name``,
             :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -1041,15 +1189,30 @@ class HistogramValues(Aggregation):
             to evenly distribute the counts in each bin. If this option is
             chosen, ``bins`` will only be used if it is an integer, and the
             ``range`` parameter is ignored
+        approx (False): whether to compute the histogram from a
+            :class:`fiftyone.core.sketches.QuantileSketch` of the values
+            rather than counting the values in each bin. Approximate
+            histograms are computed in a single pass over the collection,
+            even when bin edges must be computed from the bounds of the
+            field, but values within about 1% of a bin edge may be counted
+            in an adjacent bin. Only numeric values are supported, and nan/inf
+            values are ignored
     """
 
     def __init__(
-        self, field_or_expr, expr=None, bins=None, range=None, auto=False
+        self,
+        field_or_expr,
+        expr=None,
+        bins=None,
+        range=None,
+        auto=False,
+        approx=False,
     ):
         super().__init__(field_or_expr, expr=expr)
         self._bins = bins
         self._range = range
         self._auto = auto
+        self._approx = approx
 
         self._field_type = None
         self._is_datetime = False
@@ -1066,8 +1229,14 @@ class HistogramValues(Aggregation):
             ["bins", self._bins],
             ["range", self._range],
             ["auto", self._auto],
+            ["approx", self._approx],
         ]
 
+    @property
+    def approx(self):
+        """Whether the histogram is computed from a sketch of the values."""
+        return self._approx
+
     def default_result(self):
         """Returns the default result for this aggregation.
 
@@ -1096,6 +1265,9 @@ class HistogramValues(Aggregation):
                 ``[lower, upper)``, including the rightmost bin
             -   **other**: the number of items outside the bins
         """
+        if self._approx:
+            return self._parse_result_approx(d)
+
         if self._auto:
             return self._parse_result_auto(d)
 
@@ -1113,6 +1285,17 @@ class HistogramValues(Aggregation):
         else:
             value = "$" + path
 
+        if self._approx:
+            if self._is_datetime or isinstance(
+                field_type, (fof.DateField, fof.DateTimeField)
+            ):
+                raise ValueError(
+                    "Approximate histograms do not support date fields"
+                )
+
+            sketch = fosk.QuantileSketch()
+            return pipeline + _make_quantile_pipeline(value, sketch)
+
         if self._auto:
             pipeline.append(
                 {
@@ -1215,6 +1398,36 @@ class HistogramValues(Aggregation):
 
         return counts, edges, other
 
+    def _parse_result_approx(self, d):
+        sketch = fosk.QuantileSketch()
+        _parse_quantile_result(d, sketch)
+
+        if self._auto:
+            num_bins = self._num_bins
+            edges = sketch.quantiles(np.linspace(0, 1, num_bins + 1))
+            edges = sorted(set(edges))
+            if len(edges) < 2:
+                edges = [sketch.min, sketch.max]
+
+            # The rightmost bin of `auto` histograms includes the max value
+            _edges = edges[:-1] + [np.nextafter(edges[-1], np.inf)]
+            counts, other = sketch.histogram(_edges)
+        else:
+            if self._edges is not None:
+                edges = self._edges
+            else:
+                edges = list(
+                    np.linspace(
+                        sketch.min, sketch.max + 1e-6, self._num_bins + 1
+                    )
+                )
+
+            counts, other = sketch.histogram(edges)
+
+        edges = self._parse_edges(edges)
+
+        return counts, edges, other
+
     def _parse_result_auto(self, d):
         counts = []
         edges = []
@@ -1412,6 +1625,16 @@ class Quantiles(Aggregation):
         quantiles = dataset.aggregate(aggregation)
         print(quantiles)  # the quantiles
 
+        #
+        # Compute approximate quantiles of a numeric list field
+        #
+
+        aggregation = fo.Quantiles(
+            "numeric_list_field", [0.1, 0.5, 0.9], approx=True
+        )
+        quantiles = dataset.aggregate(aggregation)
+        print(quantiles)  # the approximate quantiles
+
     Args:
         field_or_expr: a field name, ``embedded.field.name``,
             :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -1425,13 +1648,22 @@ class Quantiles(Aggregation):
             aggregating
         safe (False): whether to ignore nan/inf values when dealing with
             floating point values
+        approx (False): whether to compute the quantiles from a
+            :class:`fiftyone.core.sketches.QuantileSketch` of the values
+            rather than sorting all values. Approximate quantiles are within
+            1% of the exact quantiles' values and require memory that is
+            independent of the number of values. nan/inf values are always
+            ignored
     """
 
-    def __init__(self, field_or_expr, quantiles, expr=None, safe=False):
+    def __init__(
+        self, field_or_expr, quantiles, expr=None, safe=False, approx=False
+    ):
         quantiles_list, is_scalar = self._parse_quantiles(quantiles)
 
         super().__init__(field_or_expr, expr=expr, safe=safe)
         self._quantiles = quantiles
+        self._approx = approx
 
         self._quantiles_list = quantiles_list
         self._is_scalar = is_scalar
@@ -1442,8 +1674,14 @@ class Quantiles(Aggregation):
             ["quantiles", self._quantiles],
             ["expr", self._expr],
             ["safe", self._safe],
+            ["approx", self._approx],
         ]
 
+    @property
+    def approx(self):
+        """Whether the quantiles are computed from a sketch of the values."""
+        return self._approx
+
     def default_result(self):
         """Returns the default result for this aggregation.
 
@@ -1464,10 +1702,17 @@ class Quantiles(Aggregation):
         Returns:
             the quantile or list of quantiles
         """
+        if self._approx:
+            sketch = fosk.QuantileSketch()
+            _parse_quantile_result(d, sketch)
+            quantiles = sketch.quantiles(self._quantiles_list)
+        else:
+            quantiles = d["quantiles"]
+
         if self._is_scalar:
-            return d["quantiles"][0]
+            return quantiles[0]
 
-        return d["quantiles"]
+        return quantiles
 
     def to_mongo(self, sample_collection):
         path, pipeline, _, id_to_str, _ = _parse_field_and_expr(
@@ -1482,6 +1727,10 @@ class Quantiles(Aggregation):
         else:
             value = "$" + path
 
+        if self._approx:
+            sketch = fosk.QuantileSketch()
+            return pipeline + _make_quantile_pipeline(value, sketch)
+
         # Compute quantile
         # Note that we don't need to explicitly handle empty `values` here
         # because the `group` stage only outputs a document if there's at least
@@ -1841,6 +2090,23 @@ class Values(Aggregation):
         aggregation = fo.Values("ground_truth.detections.label")
         labels = dataset.aggregate(aggregation)
 
+        #
+        # Get values as contiguous arrays
+        #
+
+        # flat array of confidences, plus offsets such that the values for
+        # the i-th sample are `confs[offsets[i]:offsets[i + 1]]`
+        aggregation = fo.Values(
+            "predictions.detections.confidence", format="numpy"
+        )
+        confs, offsets = dataset.aggregate(aggregation)
+
+        # a `pyarrow.ListArray`
+        aggregation = fo.Values(
+            "predictions.detections.confidence", format="arrow"
+        )
+        confs = dataset.aggregate(aggregation)
+
     Args:
         field_or_expr: a field name, ``embedded.field.name``,
             :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -1855,6 +2121,21 @@ class Values(Aggregation):
         unwind (False): whether to automatically unwind all recognized list
             fields (True) or unwind all list fields except the top-level sample
             field (-1)
+        format (None): the format in which to return the values. Supported
+            values are:
+
+            -   ``None`` (default): a (potentially nested) list of values
+            -   ``"numpy"``: a numpy array of values. Missing numeric values
+                are represented as ``nan``, and
+                :class:`fiftyone.core.fields.VectorField` values are stacked
+                into a single matrix. When the values contain ``k`` levels of
+                list nesting, a ``(values, offsets1, ..., offsetsk)`` tuple is
+                returned, where ``values`` is a flat array and ``offsets1``
+                contains the start indices of each top-level list in the next
+                level, followed by the total length. Missing lists are
+                treated as empty
+            -   ``"arrow"``: a ``pyarrow.Array`` of values. List values are
+                returned as ``pyarrow.ListArray`` instances
     """
 
     def __init__(
@@ -1863,13 +2144,21 @@ class Values(Aggregation):
         expr=None,
         missing_value=None,
         unwind=False,
+        format=None,
         _allow_missing=False,
         _big_result=True,
         _raw=False,
     ):
+        if format not in _VALUES_FORMATS:
+            raise ValueError(
+                "Unsupported format '%s'; supported values are %s"
+                % (format, _VALUES_FORMATS)
+            )
+
         super().__init__(field_or_expr, expr=expr)
         self._missing_value = missing_value
         self._unwind = unwind
+        self._format = format
         self._allow_missing = _allow_missing
         self._big_result = _big_result
         self._raw = _raw
@@ -1884,6 +2173,7 @@ class Values(Aggregation):
             ["expr", self._expr],
             ["missing_value", self._missing_value],
             ["unwind", self._unwind],
+            ["format", self._format],
             ["_allow_missing", self._allow_missing],
             ["_big_result", self._big_result],
             ["_raw", self._raw],
@@ -1907,8 +2197,11 @@ class Values(Aggregation):
         """Returns the default result for this aggregation.
 
         Returns:
-            ``[]``
+            ``[]``, or an empty array if a ``format`` was specified
         """
+        if self._format is not None:
+            return self._format_values([])
+
         return []
 
     def parse_result(self, d):
@@ -1918,7 +2211,8 @@ class Values(Aggregation):
             d: the result dict
 
         Returns:
-            the list of field values
+            the list of field values, or an array if a ``format`` was
+            specified
         """
         if self._big_result:
             values = [di[self._big_field] for di in d]
@@ -1928,6 +2222,9 @@ class Values(Aggregation):
         if self._raw:
             return values
 
+        if self._format is not None:
+            return self._format_values(values)
+
         if self._field is not None:
             fcn = self._field.to_python
             level = 1 + self._num_list_fields
@@ -1968,6 +2265,258 @@ class Values(Aggregation):
 
         return pipeline
 
+    def _format_values(self, values):
+        field = self._field
+        num_list_fields = self._num_list_fields or 0
+
+        # Array fields are decoded in bulk rather than via `to_python()`
+        is_array_field = isinstance(field, (fof.VectorField, fof.ArrayField))
+        if field is not None and not is_array_field:
+            if self._format == "arrow":
+                raise ValueError(
+                    "The 'arrow' format does not support %s fields"
+                    % type(field).__name__
+                )
+
+            values = _transform_values(
+                values, field.to_python, level=1 + num_list_fields
+            )
+
+        if self._format == "arrow":
+            return _to_arrow_values(values, num_list_fields, is_array_field)
+
+        return _to_numpy_values(values, num_list_fields, is_array_field)
+
+
+_VALUES_FORMATS = (None, "numpy", "arrow")
+
+
+def _to_numpy_values(values, num_list_fields, is_array_field):
+    offsets = []
+    for _ in range(num_list_fields):
+        values, _offsets = _flatten_values(values)
+        offsets.append(_offsets)
+
+    if is_array_field:
+        values = _stack_arrays(values)
+    else:
+        values = _to_numpy_array(values)
+
+    if offsets:
+        return (values,) + tuple(offsets)
+
+    return values
+
+
+def _to_arrow_values(values, num_list_fields, is_array_field):
+    if not is_array_field:
+        return pa.array(values)
+
+    # Decode all arrays in bulk, then rebuild the list structure around them
+    if num_list_fields > 0:
+        offsets = []
+        for _ in range(num_list_fields):
+            valid = [v is not None for v in values]
+            values, _offsets = _flatten_values(values)
+            offsets.append((_offsets, valid))
+
+        array = _to_arrow_values(values, 0, True)
+        for _offsets, valid in reversed(offsets):
+            mask = pa.array(np.logical_not(valid))
+            _offsets = pa.array(_offsets.astype(np.int32), mask=mask)
+            array = pa.ListArray.from_arrays(_offsets, array)
+
+        return array
+
+    if all(v is not None for v in values):
+        try:
+            values = fou.deserialize_numpy_arrays(values)
+        except ValueError:
+            values = [fou.deserialize_numpy_array(v) for v in values]
+    else:
+        values = [
+            fou.deserialize_numpy_array(v) if v is not None else None
+            for v in values
+        ]
+
+    if isinstance(values, np.ndarray) and values.ndim == 2:
+        flat = pa.array(values.ravel())
+        return pa.FixedSizeListArray.from_arrays(flat, values.shape[1])
+
+    return pa.array(
+        [v.ravel() if v is not None else None for v in values],
+        type=pa.list_(_get_arrow_type(values)),
+    )
+
+
+def _get_arrow_type(arrays):
+    for array in arrays:
+        if array is not None:
+            return pa.from_numpy_dtype(array.dtype)
+
+    return pa.float64()
+
+
+def _flatten_values(values):
+    num_values = len(values)
+    lengths = np.fromiter(
+        (len(v) if v is not None else 0 for v in values),
+        dtype=np.int64,
+        count=num_values,
+    )
+
+    offsets = np.zeros(num_values + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    flat = list(
+        itertools.chain.from_iterable(v for v in values if v is not None)
+    )
+
+    return flat, offsets
+
+
+def _stack_arrays(values):
+    missing = [v is None for v in values]
+    if not any(missing):
+        try:
+            return fou.deserialize_numpy_arrays(values)
+        except ValueError:
+            # Arrays of varying shape cannot be stacked
+            return _to_object_array(
+                [fou.deserialize_numpy_array(v) for v in values]
+            )
+
+    arrays = [
+        fou.deserialize_numpy_array(v) if v is not None else None
+        for v in values
+    ]
+
+    shapes = set(a.shape for a in arrays if a is not None)
+    if len(shapes) != 1:
+        return _to_object_array(arrays)
+
+    # Missing arrays are filled with nan
+    shape = shapes.pop()
+    stacked = np.full((len(arrays),) + shape, np.nan)
+    for idx, array in enumerate(arrays):
+        if array is not None:
+            stacked[idx] = array
+
+    return stacked
+
+
+def _to_numpy_array(values):
+    if any(v is None for v in values):
+        if all(
+            v is None
+            or (isinstance(v, numbers.Number) and not isinstance(v, bool))
+            for v in values
+        ):
+            return np.array(
+                [v if v is not None else np.nan for v in values], dtype=float
+            )
+
+        return _to_object_array(values)
+
+    if values and not isinstance(values[0], (numbers.Number, str)):
+        return _to_object_array(values)
+
+    try:
+        return np.array(values)
+    except ValueError:
+        return _to_object_array(values)
+
+
+def _to_object_array(values):
+    array = np.empty(len(values), dtype=object)
+    for idx, value in enumerate(values):
+        array[idx] = value
+
+    return array
+
+
+# The maximum number of values sampled by approximate aggregations
+_APPROX_SAMPLE_SIZE = 100000
+
+
+def _make_quantile_pipeline(value, sketch):
+    is_finite = {
+        "$and": [
+            {"$isNumber": value},
+            {
+                "$not": {
+                    "$in": [value, [float("nan"), float("inf"), -float("inf")]]
+                }
+            },
+        ]
+    }
+
+    return [
+        {"$match": {"$expr": is_finite}},
+        {
+            "$group": {
+                "_id": sketch.get_bin_expr(value),
+                "count": {"$sum": 1},
+                "min": {"$min": value},
+                "max": {"$max": value},
+            }
+        },
+        {
+            "$group": {
+                "_id": None,
+                "bins": {
+                    "$push": {"s": "$_id.s", "k": "$_id.k", "count": "$count"}
+                },
+                "min": {"$min": "$min"},
+                "max": {"$max": "$max"},
+            }
+        },
+    ]
+
+
+def _parse_quantile_result(d, sketch):
+    bins = [(b["s"], b["k"], b["count"]) for b in d["bins"]]
+    sketch.add_bins(bins, min_value=d["min"], max_value=d["max"])
+
+
+def _make_cardinality_pipeline(value, sketch):
+    # MongoDB hashes doubles by first truncating them to integers, so
+    # non-integral numbers are hashed via their string representations
+    is_fractional = {
+        "$and": [
+            {"$isNumber": value},
+            {"$ne": [value, {"$trunc": [value, 0]}]},
+        ]
+    }
+    hash_value = {
+        "$cond": [
+            is_fractional,
+            {"$concat": ["number:", {"$toString": value}]},
+            value,
+        ]
+    }
+
+    return [
+        {"$project": {"hash": {"$toHashedIndexKey": hash_value}}},
+        {
+            "$group": {
+                "_id": sketch.get_register_expr("$hash"),
+                "rank": {"$max": sketch.get_rank_expr("$hash")},
+            }
+        },
+        {
+            "$group": {
+                "_id": None,
+                "registers": {"$push": {"r": "$_id", "rank": "$rank"}},
+            }
+        },
+    ]
+
+
+def _parse_cardinality_result(d, sketch):
+    sketch.add_registers((r["r"], r["rank"]) for r in d["registers"])
+    return sketch.estimate()
+
 
 class _AggregationRepr(reprlib.Repr):
     def repr_ViewExpression(self, expr, level):
@@ -9,10 +9,13 @@ from collections import defaultdict
 import fnmatch
 import itertools
 import logging
+import math
 import numbers
 import os
+import queue
 import random
 import string
+import threading
 import timeit
 import warnings
 
@@ -164,6 +167,112 @@ class SaveContext(object):
             self._reload_parents.clear()
 
 
+class AsyncSaveContext(SaveContext):
+    """A :class:`SaveContext` that performs its batched writes in a background
+    thread.
+
+    Sample edits are converted into database operations in the calling thread,
+    so samples may be freely modified again after they are saved, but the
+    operations are written to the database by a writer thread while the
+    caller continues working. At most ``max_pending`` batches may be awaiting
+    write at any time; :meth:`save` blocks when this limit is reached.
+
+    Any error that occurs while writing is raised in the calling thread by the
+    next batched :meth:`save` or when the context exits.
+
+    Args:
+        sample_collection: a
+            :class:`fiftyone.core.collections.SampleCollection`
+        batch_size (None): the batching strategy to use. Can either be an
+            integer specifying the number of samples to save in a batch, or a
+            float number of seconds between batched saves
+        max_pending (2): the maximum number of batches that may be awaiting
+            write
+    """
+
+    def __init__(self, sample_collection, batch_size=None, max_pending=2):
+        super().__init__(sample_collection, batch_size=batch_size)
+        self.max_pending = max_pending
+
+        self._queue = None
+        self._thread = None
+        self._error = None
+        self._error_raised = False
+        self._write_time = 0.0
+
+    @property
+    def write_time(self):
+        """The total time, in seconds, that the writer thread has spent
+        writing batches.
+        """
+        return self._write_time
+
+    def __enter__(self):
+        self._queue = queue.Queue(maxsize=self.max_pending)
+        self._error = None
+        self._error_raised = False
+        self._thread = threading.Thread(
+            target=self._write_batches, daemon=True
+        )
+        self._thread.start()
+        return super().__enter__()
+
+    def __exit__(self, *args):
+        try:
+            super().__exit__(*args)
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+        if args[0] is None:
+            self._raise_error()
+
+    def _save_batch(self):
+        self._curr_batch_size = 0
+        self._raise_error()
+
+        if self._sample_ops or self._frame_ops or self._reload_parents:
+            self._queue.put(
+                (self._sample_ops, self._frame_ops, self._reload_parents)
+            )
+            self._sample_ops = []
+            self._frame_ops = []
+            self._reload_parents = []
+
+    def _write_batches(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+
+            if self._error is not None:
+                continue  # discard remaining batches
+
+            sample_ops, frame_ops, reload_parents = batch
+            start = timeit.default_timer()
+
+            try:
+                if sample_ops:
+                    foo.bulk_write(
+                        sample_ops, self._sample_coll, ordered=False
+                    )
+
+                if frame_ops:
+                    foo.bulk_write(frame_ops, self._frame_coll, ordered=False)
+
+                for sample in reload_parents:
+                    sample._reload_parents()
+            except Exception as e:
+                self._error = e
+
+            self._write_time += timeit.default_timer() - start
+
+    def _raise_error(self):
+        if self._error is not None and not self._error_raised:
+            self._error_raised = True
+            raise self._error
+
+
 class SampleCollection(object):
     """Abstract class representing an ordered collection of
     :class:`fiftyone.core.sample.Sample` instances in a
@@ -858,6 +967,217 @@ class SampleCollection(object):
         """
         return SaveContext(self, batch_size=batch_size)
 
+    def map_samples(
+        self,
+        map_fcn,
+        save=False,
+        num_workers=None,
+        shard_by="_id",
+        batch_size=None,
+        progress=False,
+        reduce_fcn=None,
+    ):
+        """Applies the given function to each sample in the collection.
+
+        When ``num_workers`` is provided, the collection is split into ranges
+        of its ``shard_by`` field, and each range is processed by a pool of
+        worker processes, each of which uses its own database connection. Any
+        edits that ``map_fcn`` makes to the samples are sent back to the main
+        process in batches and written to the database via bulk writes.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            def count_objects(sample):
+                num_objects = len(sample.ground_truth.detections)
+                sample["num_objects"] = num_objects
+                return num_objects
+
+            counts = dataset.map_samples(
+                count_objects, save=True, num_workers=4, progress=True
+            )
+
+        .. note::
+
+            When worker processes are started via the ``spawn`` method, the
+            ``map_fcn`` must be picklable, e.g., a module-level function.
+            The outputs of ``map_fcn`` must always be picklable.
+
+        Args:
+            map_fcn: a function that accepts a
+                :class:`fiftyone.core.sample.Sample` or
+                :class:`fiftyone.core.sample.SampleView` and optionally edits
+                it and/or returns an output
+            save (False): whether to save any edits made to the samples by
+                ``map_fcn``
+            num_workers (None): the number of worker processes to use. By
+                default, all samples are processed in the main process
+            shard_by ("_id"): the field whose values are used to split the
+                collection into shards when ``num_workers`` is provided. The
+                field must contain unique, non-None values that support range
+                queries
+            batch_size (None): a batch size to use when saving samples. Can
+                either be an integer specifying the number of samples to save
+                in a batch, or a float number of seconds between batched saves
+            progress (False): whether to render a progress bar tracking the
+                progress of the operation
+            reduce_fcn (None): an optional function that accepts two outputs
+                of ``map_fcn`` and combines them into one. If provided, the
+                outputs are reduced as they are generated, by the workers and
+                then by the main process, so only the reduced output is ever
+                held in memory. Since shards may finish in any order, this
+                function must be associative and commutative
+
+        Returns:
+            a dict mapping sample IDs to the outputs of ``map_fcn``, in the
+            order of the samples in the collection, or, if a ``reduce_fcn`` is
+            provided, the reduced output, which is ``None`` if the collection
+            is empty
+        """
+        if num_workers is not None and num_workers > 1:
+            if self._is_generated or self.media_type == fom.GROUP:
+                logger.warning(
+                    "Mapping %s collections with `num_workers > 1` is not "
+                    "supported; processing in the main process",
+                    "generated" if self._is_generated else "grouped",
+                )
+            else:
+                return self._map_samples_multi(
+                    map_fcn,
+                    save,
+                    num_workers,
+                    shard_by,
+                    batch_size,
+                    progress,
+                    reduce_fcn,
+                )
+
+        outputs = {}
+        reducer = _MapReducer(reduce_fcn)
+        for sample in self.iter_samples(
+            progress=progress, autosave=save, batch_size=batch_size
+        ):
+            output = map_fcn(sample)
+            if reduce_fcn is not None:
+                reducer.add(output)
+            else:
+                outputs[sample.id] = output
+
+        if reduce_fcn is not None:
+            return reducer.output
+
+        return outputs
+
+    def _map_samples_multi(
+        self,
+        map_fcn,
+        save,
+        num_workers,
+        shard_by,
+        batch_size,
+        progress,
+        reduce_fcn,
+    ):
+        if shard_by in ("id", "_id"):
+            path = "_id"
+        else:
+            path = self._handle_db_field(shard_by)
+
+        sample_ids, keys = self.values(["id", path], _raw=True)
+        num_samples = len(keys)
+        if num_samples == 0:
+            return None if reduce_fcn is not None else {}
+
+        if any(k is None for k in keys):
+            raise ValueError(
+                "Cannot shard by field '%s' because some samples have no "
+                "value for it" % shard_by
+            )
+
+        keys = sorted(keys)
+
+        # Use multiple shards per worker so that the load stays balanced
+        num_shards = min(4 * num_workers, num_samples)
+        shard_size = int(math.ceil(num_samples / num_shards))
+        bounds = keys[::shard_size]
+        ranges = list(zip(bounds, bounds[1:] + [None]))
+
+        dataset = self._dataset
+        if isinstance(self, fov.DatasetView):
+            stages = self._serialize()
+        else:
+            stages = []
+
+        ctx = fou.get_multiprocessing_context()
+        results_queue = ctx.Queue()
+        initargs = (
+            dataset.name,
+            stages,
+            path,
+            map_fcn,
+            save,
+            batch_size,
+            reduce_fcn,
+            results_queue,
+        )
+
+        pb_kwargs = {} if progress else {"quiet": True}
+
+        outputs = {}
+        reducer = _MapReducer(reduce_fcn)
+        with fou.ProgressBar(total=num_samples, **pb_kwargs) as pb:
+            with ctx.Pool(
+                processes=num_workers,
+                initializer=_init_map_worker,
+                initargs=initargs,
+            ) as pool:
+                # The pool replaces workers that die, but their tasks are lost
+                workers = list(pool._pool)
+                result = pool.map_async(_map_samples_shard, ranges)
+
+                num_done = 0
+                while num_done < len(ranges):
+                    try:
+                        (
+                            _outputs,
+                            count,
+                            sample_ops,
+                            frame_ops,
+                            done,
+                        ) = results_queue.get(timeout=0.5)
+                    except queue.Empty:
+                        if result.ready() and not result.successful():
+                            result.get()  # raises the worker's exception
+
+                        _check_map_workers(workers)
+                        continue
+
+                    if sample_ops:
+                        dataset._bulk_write(sample_ops)
+
+                    if frame_ops:
+                        dataset._bulk_write(frame_ops, frames=True)
+
+                    if reduce_fcn is not None:
+                        if count > 0:
+                            reducer.add(_outputs)
+                    else:
+                        outputs.update(_outputs)
+
+                    pb.update(count=count)
+                    num_done += int(done)
+
+                result.get()
+
+        if reduce_fcn is not None:
+            return reducer.output
+
+        return {_id: outputs[_id] for _id in sample_ids}
+
     def _get_default_sample_fields(
         self, include_private=False, use_db_fields=False
     ):
@@ -2010,7 +2330,11 @@ class SampleCollection(object):
         self._dataset.delete_labels(ids=ids, fields=fields)
 
     def compute_metadata(
-        self, overwrite=False, num_workers=None, skip_failures=True
+        self,
+        overwrite=False,
+        num_workers=None,
+        skip_failures=True,
+        skip_unchanged=False,
     ):
         """Populates the ``metadata`` field of all samples in the collection.
 
@@ -2023,12 +2347,19 @@ class SampleCollection(object):
                 ``multiprocessing.cpu_count()`` is used
             skip_failures (True): whether to gracefully continue without
                 raising an error if metadata cannot be computed for a sample
+            skip_unchanged (False): whether to skip samples whose local media
+                files have the same size as recorded by their existing
+                metadata. Only applicable when ``overwrite`` is True. Note
+                that metadata does not record file modification times, so
+                files whose contents changed without changing their size are
+                also skipped
         """
         fomt.compute_metadata(
             self,
             overwrite=overwrite,
             num_workers=num_workers,
             skip_failures=skip_failures,
+            skip_unchanged=skip_unchanged,
         )
 
     def apply_model(
@@ -2406,6 +2737,8 @@ class SampleCollection(object):
         use_masks=False,
         use_boxes=False,
         classwise=True,
+        num_workers=None,
+        incremental=False,
         **kwargs,
     ):
         """Evaluates the specified predicted detections in this collection with
@@ -2490,6 +2823,15 @@ class SampleCollection(object):
                 instances rather than using their actual geometries
             classwise (True): whether to only match objects with the same class
                 label (True) or allow matches between classes (False)
+            num_workers (None): the number of worker processes to use to
+                evaluate the samples. Each worker evaluates a shard of the
+                samples using its own database connection. By default, all
+                samples are evaluated in the main process
+            incremental (False): whether to record a fingerprint of the
+                ground truth and predicted labels of each sample so that
+                subsequent runs with the same ``eval_key``, config, and view
+                only re-evaluate the samples whose labels have changed. Only
+                applicable when an ``eval_key`` is provided
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.detection.DetectionEvaluationConfig`
                 being used
@@ -2509,6 +2851,8 @@ class SampleCollection(object):
             use_masks=use_masks,
             use_boxes=use_boxes,
             classwise=classwise,
+            num_workers=num_workers,
+            incremental=incremental,
             **kwargs,
         )
 
@@ -2519,6 +2863,7 @@ class SampleCollection(object):
         eval_key=None,
         mask_targets=None,
         method="simple",
+        num_workers=None,
         **kwargs,
     ):
         """Evaluates the specified semantic segmentation masks in this
@@ -2567,6 +2912,10 @@ class SampleCollection(object):
                 provided, the observed pixel values are used
             method ("simple"): a string specifying the evaluation method to
                 use. Supported values are ``("simple")``
+            num_workers (None): the number of worker processes to use to
+                evaluate the samples. Each worker evaluates a shard of the
+                samples using its own database connection. By default, all
+                samples are evaluated in the main process
             **kwargs: optional keyword arguments for the constructor of the
                 :class:`fiftyone.utils.eval.segmentation.SegmentationEvaluationConfig`
                 being used
@@ -2581,6 +2930,7 @@ class SampleCollection(object):
             eval_key=eval_key,
             mask_targets=mask_targets,
             method=method,
+            num_workers=num_workers,
             **kwargs,
         )
 
@@ -5080,6 +5430,55 @@ class SampleCollection(object):
             )
         )
 
+    @view_stage
+    def select_set(self, name, field=None):
+        """Selects the samples in the collection whose IDs are in the given
+        selection set.
+
+        Selection sets are created via
+        :meth:`fiftyone.core.dataset.Dataset.create_selection_set` and are
+        stored in the database, so the returned view only contains the name
+        of the set rather than its IDs, and the selection is performed by
+        joining against the set in the database.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+            from fiftyone import ViewField as F
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            #
+            # Create a view containing the samples in a selection set
+            #
+
+            ids = dataset.match(F("uniqueness") > 0.5).values("id")
+            dataset.create_selection_set(ids, name="unique")
+
+            view = dataset.select_set("unique")
+            print(len(view))
+
+            #
+            # Create a patches view containing the objects whose source
+            # samples are in a selection set
+            #
+
+            patches = dataset.to_patches("ground_truth")
+            view = patches.select_set("unique", field="sample_id")
+            print(view.distinct("sample_id") == sorted(ids))
+
+        Args:
+            name: the name of a selection set of the collection's dataset
+            field (None): an optional ID field or ``embedded.field.name``
+                whose values to look up in the selection set. By default, the
+                IDs of the samples in the collection are used
+
+        Returns:
+            a :class:`fiftyone.core.view.DatasetView`
+        """
+        return self._add_view_stage(fos.SelectSet(name, field=field))
+
     @view_stage
     def shuffle(self, seed=None):
         """Randomly shuffles the samples in the collection.
@@ -5716,6 +6115,9 @@ class SampleCollection(object):
             force_sample (False): whether to resample videos whose sampled
                 frames already exist. Only applicable when
                 ``sample_frames=True``
+            num_workers (None): the number of videos to sample concurrently.
+                By default, videos are sampled serially. Only applicable when
+                ``sample_frames=True``
             skip_failures (True): whether to gracefully continue without
                 raising an error if a video cannot be sampled
             verbose (False): whether to log information about the frames that
@@ -5919,7 +6321,7 @@ class SampleCollection(object):
         return self._make_and_aggregate(make, field_or_expr)
 
     @aggregation
-    def count_values(self, field_or_expr, expr=None, safe=False):
+    def count_values(self, field_or_expr, expr=None, safe=False, approx=False):
         """Counts the occurrences of field values in the collection.
 
         This aggregation is typically applied to *countable* field types (or
@@ -6003,17 +6405,23 @@ class SampleCollection(object):
                 aggregating
             safe (False): whether to treat nan/inf values as None when dealing
                 with floating point values
+            approx (False): whether to estimate the counts of the most common
+                values from a uniform random sample of at most 100,000 values
+                rather than counting all values. Only values that appear in
+                the sample are returned, so rare values may be omitted. The
+                results are exact when there are fewer values than the sample
+                size
 
         Returns:
             a dict mapping values to counts
         """
         make = lambda field_or_expr: foa.CountValues(
-            field_or_expr, expr=expr, safe=safe
+            field_or_expr, expr=expr, safe=safe, approx=approx
         )
         return self._make_and_aggregate(make, field_or_expr)
 
     @aggregation
-    def distinct(self, field_or_expr, expr=None, safe=False):
+    def distinct(self, field_or_expr, expr=None, safe=False, approx=False):
         """Computes the distinct values of a field in the collection.
 
         ``None``-valued fields are ignored.
@@ -6099,18 +6507,30 @@ class SampleCollection(object):
                 aggregating
             safe (False): whether to ignore nan/inf values when dealing with
                 floating point values
+            approx (False): whether to return an estimate of the *number* of
+                distinct values, computed via a
+                :class:`fiftyone.core.sketches.CardinalitySketch`, rather than
+                the distinct values themselves. The estimate has a standard
+                error of about 0.8%
 
         Returns:
-            a sorted list of distinct values
+            a sorted list of distinct values, or the approximate number of
+            distinct values if ``approx`` is True
         """
         make = lambda field_or_expr: foa.Distinct(
-            field_or_expr, expr=expr, safe=safe
+            field_or_expr, expr=expr, safe=safe, approx=approx
         )
         return self._make_and_aggregate(make, field_or_expr)
 
     @aggregation
     def histogram_values(
-        self, field_or_expr, expr=None, bins=None, range=None, auto=False
+        self,
+        field_or_expr,
+        expr=None,
+        bins=None,
+        range=None,
+        auto=False,
+        approx=False,
     ):
         """Computes a histogram of the field values in the collection.
 
@@ -6206,6 +6626,14 @@ class SampleCollection(object):
                 attempt to evenly distribute the counts in each bin. If this
                 option is chosen, ``bins`` will only be used if it is an
                 integer, and the ``range`` parameter is ignored
+            approx (False): whether to compute the histogram from a
+                :class:`fiftyone.core.sketches.QuantileSketch` of the values
+                rather than counting the values in each bin. Approximate
+                histograms are computed in a single pass over the collection,
+                even when bin edges must be computed from the bounds of the
+                field, but values within about 1% of a bin edge may be
+                counted in an adjacent bin. Only numeric values are
+                supported, and nan/inf values are ignored
 
         Returns:
             a tuple of
@@ -6218,7 +6646,12 @@ class SampleCollection(object):
             -   other: the number of items outside the bins
         """
         make = lambda field_or_expr: foa.HistogramValues(
-            field_or_expr, expr=expr, bins=bins, range=range, auto=auto
+            field_or_expr,
+            expr=expr,
+            bins=bins,
+            range=range,
+            auto=auto,
+            approx=approx,
         )
         return self._make_and_aggregate(make, field_or_expr)
 
@@ -6305,7 +6738,9 @@ class SampleCollection(object):
         return self._make_and_aggregate(make, field_or_expr)
 
     @aggregation
-    def quantiles(self, field_or_expr, quantiles, expr=None, safe=False):
+    def quantiles(
+        self, field_or_expr, quantiles, expr=None, safe=False, approx=False
+    ):
         """Computes the quantile(s) of the field values of a collection.
 
         ``None``-valued fields are ignored.
@@ -6376,12 +6811,18 @@ class SampleCollection(object):
                 aggregating
             safe (False): whether to ignore nan/inf values when dealing with
                 floating point values
+            approx (False): whether to compute the quantiles from a
+                :class:`fiftyone.core.sketches.QuantileSketch` of the values
+                rather than sorting all values. Approximate quantiles are
+                within 1% of the exact quantiles' values and require memory
+                that is independent of the number of values. nan/inf values
+                are always ignored
 
         Returns:
             the quantile or list of quantiles
         """
         make = lambda field_or_expr: foa.Quantiles(
-            field_or_expr, quantiles, expr=expr, safe=safe
+            field_or_expr, quantiles, expr=expr, safe=safe, approx=approx
         )
         return self._make_and_aggregate(make, field_or_expr)
 
@@ -6559,6 +7000,7 @@ class SampleCollection(object):
         expr=None,
         missing_value=None,
         unwind=False,
+        format=None,
         _allow_missing=False,
         _big_result=True,
         _raw=False,
@@ -6648,6 +7090,21 @@ class SampleCollection(object):
             # list of lists of detection labels
             labels = dataset.values("ground_truth.detections.label")
 
+            #
+            # Get values as contiguous arrays
+            #
+
+            # flat array of confidences, plus offsets such that the values
+            # for the i-th sample are `confs[offsets[i]:offsets[i + 1]]`
+            confs, offsets = dataset.values(
+                "predictions.detections.confidence", format="numpy"
+            )
+
+            # a `pyarrow.ListArray`
+            confs = dataset.values(
+                "predictions.detections.confidence", format="arrow"
+            )
+
         Args:
             field_or_expr: a field name, ``embedded.field.name``,
                 :class:`fiftyone.core.expressions.ViewExpression`, or
@@ -6665,15 +7122,32 @@ class SampleCollection(object):
             unwind (False): whether to automatically unwind all recognized list
                 fields (True) or unwind all list fields except the top-level
                 sample field (-1)
+            format (None): the format in which to return the values.
+                Supported values are:
+
+                -   ``None`` (default): a (potentially nested) list of values
+                -   ``"numpy"``: a numpy array of values. Missing numeric
+                    values are represented as ``nan``, and
+                    :class:`fiftyone.core.fields.VectorField` values are
+                    stacked into a single matrix. When the values contain
+                    ``k`` levels of list nesting, a
+                    ``(values, offsets1, ..., offsetsk)`` tuple is returned,
+                    where ``values`` is a flat array and ``offsets1``
+                    contains the start indices of each top-level list in the
+                    next level, followed by the total length. Missing lists
+                    are treated as empty
+                -   ``"arrow"``: a ``pyarrow.Array`` of values. List values
+                    are returned as ``pyarrow.ListArray`` instances
 
         Returns:
-            the list of values
+            the list of values, or an array if a ``format`` was specified
         """
         make = lambda field_or_expr: foa.Values(
             field_or_expr,
             expr=expr,
             missing_value=missing_value,
             unwind=unwind,
+            format=format,
             _allow_missing=_allow_missing,
             _big_result=_big_result,
             _raw=_raw,
@@ -6893,6 +7367,8 @@ class SampleCollection(object):
                 -   ``"move"``: move all media files into the output directory
                 -   ``"symlink"``: create symlinks to the media files in the
                     output directory
+                -   ``"hardlink"``: create hard links to the media files in the
+                    output directory
                 -   ``"manifest"``: create a ``data.json`` in the output
                     directory that maps UUIDs used in the labels files to the
                     filepaths of the source media, rather than exporting the
@@ -7466,6 +7942,243 @@ class SampleCollection(object):
 
         coll.drop_index(index_map[name])
 
+    def explain(self, verbosity="executionStats"):
+        """Explains how MongoDB executes the aggregation pipeline that defines
+        this collection.
+
+        The pipeline is partitioned into the view stages that generated it,
+        and the winning query plan is inspected for collection scans, index
+        scans that fetch documents only to discard them, and in-memory sorts,
+        and the fields involved that are not indexed are reported.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+            from fiftyone import ViewField as F
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            view = dataset.match(F("uniqueness") > 0.5).sort_by("filepath")
+
+            report = view.explain()
+
+            # The `filepath` index is used for sorting, but every sample is
+            # fetched in order to filter by `uniqueness`
+            print(report["plan"])  # ['FETCH', 'IXSCAN']
+            print(report["collection_scan"])  # False
+            print(report["unindexed_fields"])  # ['uniqueness']
+            print(report["num_docs_examined"])  # 200
+
+            for stage in report["stages"]:
+                print(stage["stage"], stage["pipeline"])
+
+        Args:
+            verbosity ("executionStats"): the verbosity of the explanation.
+                Supported values are
+                ``("queryPlanner", "executionStats", "allPlansExecution")``.
+                Execution statistics are only available for the latter two
+                values, which require executing the pipeline
+
+        Returns:
+            a dict with the following keys:
+
+            -   ``pipeline``: the pipeline that was executed, after
+                optimization by
+                :func:`fiftyone.core.odm.optimizer.optimize_pipeline`
+            -   ``stages``: a list of dicts with ``stage`` and ``pipeline``
+                keys describing the MongoDB stages generated by each view
+                stage, prior to optimization. Stages that were injected by
+                FiftyOne, such as frame lookups for video collections, have a
+                ``stage`` of ``None``
+            -   ``plan``: the list of stage names in the winning query plan,
+                e.g., ``["FETCH", "IXSCAN"]``
+            -   ``indexes_used``: the list of indexes used by the query
+            -   ``collection_scan``: whether the query scans the entire
+                collection
+            -   ``unindexed_fields``: the list of fields that are not indexed
+                and that are filtered by a collection scan, filtered after
+                fetching documents that are then discarded, or sorted in
+                memory. These fields could be indexed via
+                :meth:`create_index`
+            -   ``num_docs_examined``: the number of documents examined
+            -   ``num_keys_examined``: the number of index keys examined
+            -   ``num_returned``: the number of documents returned by the
+                query
+            -   ``time``: the execution time of the query, in seconds
+            -   ``explain``: the raw MongoDB explain output
+        """
+        pipeline = self._pipeline()
+        segments = self._get_pipeline_segments(pipeline)
+
+        # Explain the pipeline that is actually executed
+        optimized_pipeline = foo.optimize_pipeline(pipeline)
+
+        coll = self._dataset._sample_collection
+        result = foo.explain_aggregate(
+            coll, optimized_pipeline, verbosity=verbosity, optimize=False
+        )
+
+        plans = []
+        stats = []
+        _find_explain_dicts(result, plans, stats)
+
+        plan_stages = []
+        for plan in plans:
+            plan_stages.extend(_get_plan_stages(plan))
+
+        def _sum_stats(key):
+            values = [s[key] for s in stats if key in s]
+            return sum(values) if values else None
+
+        num_docs_examined = _sum_stats("totalDocsExamined")
+        num_returned = _sum_stats("nReturned")
+
+        # Documents that are fetched and then filtered are only a concern if
+        # the filter discards some of them. Without execution statistics, we
+        # cannot tell
+        if num_docs_examined is not None and num_returned is not None:
+            fetch_discards = num_docs_examined > num_returned
+        else:
+            fetch_discards = True
+
+        indexes_used = []
+        unindexed = []
+        for plan_stage in plan_stages:
+            name = plan_stage.get("stage", None)
+            if name == "IXSCAN":
+                index_name = plan_stage.get("indexName", None)
+                if index_name is not None:
+                    indexes_used.append(index_name)
+            elif name == "COLLSCAN" or (name == "FETCH" and fetch_discards):
+                unindexed.extend(_get_query_fields(plan_stage.get("filter")))
+            elif name == "SORT":
+                unindexed.extend(plan_stage.get("sortPattern", {}).keys())
+
+        collection_scan = any(
+            s.get("stage") == "COLLSCAN" for s in plan_stages
+        )
+
+        indexed = set()
+        for info in coll.index_information().values():
+            indexed.add(info["key"][0][0])
+
+        fields_map = self._get_db_fields_map(reverse=True)
+        unindexed_fields = []
+        for path in unindexed:
+            if path in indexed:
+                continue
+
+            field = fields_map.get(path, path)
+            if field not in unindexed_fields:
+                unindexed_fields.append(field)
+
+        time_ms = _sum_stats("executionTimeMillis")
+
+        return {
+            "pipeline": optimized_pipeline,
+            "stages": [
+                {
+                    "stage": str(stage) if stage is not None else None,
+                    "pipeline": stage_pipeline,
+                }
+                for stage, stage_pipeline in segments
+            ],
+            "plan": [s["stage"] for s in plan_stages if "stage" in s],
+            "indexes_used": indexes_used,
+            "collection_scan": collection_scan,
+            "unindexed_fields": unindexed_fields,
+            "num_docs_examined": num_docs_examined,
+            "num_keys_examined": _sum_stats("totalKeysExamined"),
+            "num_returned": num_returned,
+            "time": time_ms / 1000 if time_ms is not None else None,
+            "explain": result,
+        }
+
+    def profile(self):
+        """Profiles the execution of each stage of the aggregation pipeline
+        that defines this collection.
+
+        The pipeline is partitioned into the view stages that generated it,
+        and each successive prefix of the pipeline is executed to measure the
+        number of documents that flow into and out of each stage and the time
+        that each stage adds to the pipeline.
+
+        Note that MongoDB may reorder and coalesce stages of a pipeline, so
+        the reported times are approximate.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+            from fiftyone import ViewField as F
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            view = (
+                dataset
+                .match(F("uniqueness") > 0.5)
+                .filter_labels("predictions", F("confidence") > 0.9)
+                .sort_by("filepath")
+            )
+
+            for stage in view.profile():
+                print(
+                    "%8.4f %5d %5d %s"
+                    % (
+                        stage["time"],
+                        stage["num_in"],
+                        stage["num_out"],
+                        stage["stage"],
+                    )
+                )
+
+        Returns:
+            a list of dicts with the following keys, one per view stage:
+
+            -   ``stage``: a string representation of the view stage, or
+                ``None`` for stages that were injected by FiftyOne, such as
+                frame lookups for video collections
+            -   ``pipeline``: the MongoDB stages generated by the view stage
+            -   ``num_in``: the number of documents input to the stage
+            -   ``num_out``: the number of documents output by the stage
+            -   ``time``: the time added by the stage, in seconds
+            -   ``cumulative_time``: the time to execute the pipeline through
+                the end of the stage, in seconds
+        """
+        pipeline = self._pipeline()
+        segments = self._get_pipeline_segments(pipeline)
+
+        coll = self._dataset._sample_collection
+
+        prefix = []
+        num_docs, last_time = _profile_pipeline(coll, prefix)
+
+        results = []
+        for stage, stage_pipeline in segments:
+            num_in = num_docs
+
+            if stage_pipeline:
+                prefix.extend(stage_pipeline)
+                num_docs, cumulative_time = _profile_pipeline(coll, prefix)
+            else:
+                cumulative_time = last_time
+
+            results.append(
+                {
+                    "stage": str(stage) if stage is not None else None,
+                    "pipeline": stage_pipeline,
+                    "num_in": num_in,
+                    "num_out": num_docs,
+                    "time": max(cumulative_time - last_time, 0),
+                    "cumulative_time": cumulative_time,
+                }
+            )
+
+            last_time = cumulative_time
+
+        return results
+
     def _get_default_indexes(self, frames=False):
         if frames:
             if self._has_frame_fields():
@@ -7881,6 +8594,35 @@ class SampleCollection(object):
 
         return aggregation.default_result()
 
+    def _get_pipeline_segments(self, pipeline):
+        # Partitions `pipeline` into the contiguous segments generated by each
+        # view stage. Any stages that were injected by the collection itself,
+        # e.g. frame lookups, are assigned to `None`
+        view = self.view()
+        _view = view._base_view
+
+        segments = []
+        idx = 0
+        for stage in view._stages:
+            stage_pipeline = stage.to_mongo(_view)
+            _view = _view.add_stage(stage)
+
+            start = _find_subpipeline(pipeline, stage_pipeline, idx)
+            if start is None:
+                segments.append((stage, []))
+                continue
+
+            if start > idx:
+                segments.append((None, pipeline[idx:start]))
+
+            segments.append((stage, stage_pipeline))
+            idx = start + len(stage_pipeline)
+
+        if idx < len(pipeline):
+            segments.append((None, pipeline[idx:]))
+
+        return segments
+
     def _pipeline(
         self,
         pipeline=None,
@@ -9285,3 +10027,177 @@ def _add_db_fields_to_schema(schema):
             additions[field.db_field] = field
 
     schema.update(additions)
+
+
+_map_worker_args = None
+
+
+def _find_subpipeline(pipeline, subpipeline, start):
+    num_stages = len(subpipeline)
+    for idx in range(start, len(pipeline) - num_stages + 1):
+        if pipeline[idx : idx + num_stages] == subpipeline:
+            return idx
+
+    return None
+
+
+def _profile_pipeline(coll, pipeline):
+    start_time = timeit.default_timer()
+    result = list(foo.aggregate(coll, pipeline + [{"$count": "count"}]))
+    elapsed = timeit.default_timer() - start_time
+
+    num_docs = result[0]["count"] if result else 0
+
+    return num_docs, elapsed
+
+
+def _find_explain_dicts(d, plans, stats):
+    if isinstance(d, dict):
+        for key, value in d.items():
+            if key == "winningPlan" and isinstance(value, dict):
+                plans.append(value)
+            elif key == "executionStats" and isinstance(value, dict):
+                stats.append(value)
+            else:
+                _find_explain_dicts(value, plans, stats)
+    elif isinstance(d, list):
+        for value in d:
+            _find_explain_dicts(value, plans, stats)
+
+
+def _get_plan_stages(plan):
+    # MongoDB 5.1+ nests plans that use the slot-based execution engine under
+    # a `queryPlan` key
+    plan = plan.get("queryPlan", plan)
+
+    stages = [plan]
+    for key in ("inputStage", "outerStage", "innerStage"):
+        if isinstance(plan.get(key, None), dict):
+            stages.extend(_get_plan_stages(plan[key]))
+
+    for input_stage in plan.get("inputStages", []):
+        stages.extend(_get_plan_stages(input_stage))
+
+    return stages
+
+
+def _get_query_fields(query):
+    # Returns the fields referenced by query operators that could be served by
+    # an index. Aggregation expressions (`$expr`) are not considered
+    fields = []
+
+    if isinstance(query, dict):
+        for key, value in query.items():
+            if key in ("$and", "$or", "$nor"):
+                for q in value:
+                    fields.extend(_get_query_fields(q))
+            elif not key.startswith("$"):
+                fields.append(key)
+    elif isinstance(query, list):
+        for q in query:
+            fields.extend(_get_query_fields(q))
+
+    return fields
+
+
+def _init_map_worker(*args):
+    global _map_worker_args
+    _map_worker_args = args
+
+    foo.database._reconnect()
+
+
+def _check_map_workers(workers):
+    for worker in workers:
+        if worker.exitcode is not None:
+            raise RuntimeError(
+                "A map_samples() worker exited unexpectedly with code %d; "
+                "it may have run out of memory" % worker.exitcode
+            )
+
+
+def _map_samples_shard(key_range):
+    (
+        dataset_name,
+        stages,
+        path,
+        map_fcn,
+        save,
+        batch_size,
+        reduce_fcn,
+        results_queue,
+    ) = _map_worker_args
+
+    if batch_size is None:
+        batch_size = 0.2
+
+    dynamic_batches = not isinstance(batch_size, numbers.Integral)
+
+    dataset = fod.load_dataset(dataset_name)
+    view = fov.DatasetView._build(dataset, stages)
+
+    min_key, max_key = key_range
+    match = {"$gte": min_key}
+    if max_key is not None:
+        match["$lt"] = max_key
+
+    view = view.mongo([{"$match": {path: match}}])
+
+    # When reducing, each batch sends the reduction of its outputs
+    outputs = []
+    reducer = _MapReducer(reduce_fcn)
+    count = 0
+    sample_ops = []
+    frame_ops = []
+    last_time = timeit.default_timer()
+    for sample in view.iter_samples():
+        output = map_fcn(sample)
+        if reduce_fcn is not None:
+            reducer.add(output)
+        else:
+            outputs.append((sample.id, output))
+
+        count += 1
+
+        if save:
+            sample_op, _frame_ops = sample._save(deferred=True)
+            if sample_op is not None:
+                sample_ops.append(sample_op)
+
+            frame_ops.extend(_frame_ops)
+
+        if dynamic_batches:
+            send = timeit.default_timer() - last_time >= batch_size
+        else:
+            send = count >= batch_size
+
+        if send:
+            if reduce_fcn is not None:
+                outputs = reducer.output
+
+            results_queue.put((outputs, count, sample_ops, frame_ops, False))
+            outputs = []
+            reducer = _MapReducer(reduce_fcn)
+            count = 0
+            sample_ops = []
+            frame_ops = []
+            last_time = timeit.default_timer()
+
+    if reduce_fcn is not None:
+        outputs = reducer.output
+
+    results_queue.put((outputs, count, sample_ops, frame_ops, True))
+
+
+class _MapReducer(object):
+    def __init__(self, reduce_fcn):
+        self.reduce_fcn = reduce_fcn
+        self.output = None
+        self._empty = True
+
+    def add(self, output):
+        if self._empty:
+            self.output = output
+            self._empty = False
+        else:
+            self.output = self.reduce_fcn(self.output, output)
@@ -203,6 +203,42 @@ class FiftyOneConfig(EnvConfig):
             env_var="FIFTYONE_REQUIREMENT_ERROR_LEVEL",
             default=0,
         )
+        self.server_cache_size = self.parse_int(
+            d,
+            "server_cache_size",
+            env_var="FIFTYONE_SERVER_CACHE_SIZE",
+            default=128,
+        )
+        self.server_cache_ttl = self.parse_int(
+            d,
+            "server_cache_ttl",
+            env_var="FIFTYONE_SERVER_CACHE_TTL",
+            default=5,
+        )
+        self.metadata_cache_size = self.parse_int(
+            d,
+            "metadata_cache_size",
+            env_var="FIFTYONE_METADATA_CACHE_SIZE",
+            default=10000,
+        )
+        self.metadata_write_back = self.parse_bool(
+            d,
+            "metadata_write_back",
+            env_var="FIFTYONE_METADATA_WRITE_BACK",
+            default=False,
+        )
+        self.thumbnail_cache_dir = self.parse_path(
+            d,
+            "thumbnail_cache_dir",
+            env_var="FIFTYONE_THUMBNAIL_CACHE_DIR",
+            default=None,
+        )
+        self.thumbnail_cache_size = self.parse_int(
+            d,
+            "thumbnail_cache_size",
+            env_var="FIFTYONE_THUMBNAIL_CACHE_SIZE",
+            default=1073741824,
+        )
         self.timezone = self.parse_string(
             d, "timezone", env_var="FIFTYONE_TIMEZONE", default=None
         )
@@ -240,6 +276,11 @@ class FiftyOneConfig(EnvConfig):
                 self.default_dataset_dir, "__models__"
             )
 
+        if self.thumbnail_cache_dir is None:
+            self.thumbnail_cache_dir = os.path.join(
+                foc.FIFTYONE_CONFIG_DIR, "thumbnails"
+            )
+
         if self.default_ml_backend is None:
             installed_packages = _get_installed_packages()
 
@@ -43,6 +43,7 @@ from fiftyone.core.odm.dataset import SampleFieldDocument
 from fiftyone.core.odm.dataset import DatasetAppConfig
 import fiftyone.migrations as fomi
 import fiftyone.core.odm as foo
+import fiftyone.core.odm.sample as foos
 import fiftyone.core.sample as fos
 from fiftyone.core.singletons import DatasetSingleton
 import fiftyone.core.utils as fou
@@ -54,6 +55,8 @@ foud = fou.lazy_import("fiftyone.utils.data")
 
 logger = logging.getLogger(__name__)
 
+_SELECTION_SETS_PREFIX = "selections."
+
 
 def list_datasets(info=False):
     """Lists the available FiftyOne datasets.
@@ -1979,9 +1982,48 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         in-place to reflect membership in this dataset. Any sample instances
         that belong to other datasets are not modified.
 
+        Samples can also be provided as dicts that map field names to values,
+        which must include a ``filepath`` key. Label values may be provided
+        either as :class:`fiftyone.core.labels.Label` instances or as dicts in
+        the format returned by
+        :meth:`fiftyone.core.labels.Label.to_dict`, which may omit default
+        fields and IDs. Dicts are serialized directly to the database, the
+        schema is inferred once per batch of samples, and no
+        :class:`fiftyone.core.sample.Sample` instances are constructed, which
+        makes this the fastest way to ingest large numbers of image samples.
+        The values of dicts are validated against the dataset's schema in
+        their serialized form, without instantiating any documents.
+        Embedded document dicts without a ``_cls`` key are interpreted as the
+        type declared by their field, and untyped ``metadata`` dicts are
+        interpreted as :class:`fiftyone.core.metadata.ImageMetadata` or
+        :class:`fiftyone.core.metadata.VideoMetadata` based on the media type
+        of the sample.
+
+        Examples::
+
+            import fiftyone as fo
+
+            dataset = fo.Dataset()
+            dataset.add_samples(
+                [
+                    {
+                        "filepath": "/path/to/image.png",
+                        "ground_truth": {
+                            "_cls": "Detections",
+                            "detections": [
+                                {
+                                    "label": "cat",
+                                    "bounding_box": [0.1, 0.1, 0.4, 0.4],
+                                },
+                            ],
+                        },
+                    },
+                ]
+            )
+
         Args:
             samples: an iterable of :class:`fiftyone.core.sample.Sample`
-                instances or a
+                instances or dicts, or a
                 :class:`fiftyone.core.collections.SampleCollection`
             expand_schema (True): whether to dynamically add new sample fields
                 encountered to the dataset schema. If False, an error is raised
@@ -2068,6 +2110,9 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         return self.skip(num_samples).values("id")
 
     def _add_samples_batch(self, samples, expand_schema, validate):
+        if samples and isinstance(samples[0], dict):
+            return self._add_dicts_batch(samples, expand_schema, validate)
+
         samples = [s.copy() if s._in_db else s for s in samples]
 
         if self.media_type is None and samples:
@@ -2096,6 +2141,98 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
         return [str(d["_id"]) for d in dicts]
 
+    def _add_dicts_batch(self, sample_dicts, expand_schema, validate):
+        schema = self.get_field_schema(include_private=True)
+        dicts = [_make_sample_dict(d, schema) for d in sample_dicts]
+
+        media_types = set(d["_media_type"] for d in dicts)
+        if fom.VIDEO in media_types:
+            raise ValueError(
+                "Video samples cannot be added as dicts; use "
+                "`fiftyone.core.sample.Sample` instances instead"
+            )
+
+        if self.media_type is None and dicts:
+            self.media_type = dicts[0]["_media_type"]
+
+        if self.media_type == fom.GROUP:
+            raise ValueError(
+                "Samples cannot be added to grouped datasets as dicts; use "
+                "`fiftyone.core.sample.Sample` instances instead"
+            )
+
+        if expand_schema:
+            self._expand_schema_from_dicts(dicts, schema)
+
+        if validate:
+            self._validate_dicts(dicts, media_types)
+
+        db_fields_map = self._get_db_fields_map()
+        if db_fields_map:
+            for d in dicts:
+                for field_name, db_field in db_fields_map.items():
+                    if field_name in d:
+                        d[db_field] = d.pop(field_name)
+
+        try:
+            # adds `_id` to each dict
+            self._sample_collection.insert_many(dicts)
+        except BulkWriteError as bwe:
+            msg = bwe.details["writeErrors"][0]["errmsg"]
+            raise ValueError(msg) from bwe
+
+        return [str(d["_id"]) for d in dicts]
+
+    def _expand_schema_from_dicts(self, dicts, schema):
+        expanded = False
+        for d in dicts:
+            for field_name, value in d.items():
+                if field_name in schema or value is None:
+                    continue
+
+                self._sample_doc_cls.add_implied_field(
+                    field_name, _deserialize_dict_value(value)
+                )
+                schema = self.get_field_schema(include_private=True)
+                expanded = True
+
+        if expanded:
+            self._reload()
+
+    def _validate_dicts(self, dicts, media_types):
+        if media_types != {self.media_type}:
+            raise fom.MediaTypeError(
+                "Sample media types %s do not match dataset media type '%s'"
+                % (media_types, self.media_type)
+            )
+
+        schema = self.get_field_schema(include_private=True)
+
+        non_existent_fields = set()
+        for d in dicts:
+            for field_name, value in d.items():
+                if field_name == "_id" or value is None:
+                    continue
+
+                field = schema.get(field_name, None)
+                if field is None:
+                    non_existent_fields.add(field_name)
+                    continue
+
+                try:
+                    foo.utils._validate_dict_value(value, field)
+                except moe.ValidationError as e:
+                    raise moe.ValidationError(
+                        "Invalid value for field '%s'. Reason: %s"
+                        % (field_name, str(e))
+                    )
+
+        if non_existent_fields:
+            raise ValueError(
+                "Fields %s do not exist on dataset '%s'"
+                % (non_existent_fields, self.name)
+            )
+
     def _upsert_samples(
         self, samples, expand_schema=True, validate=True, num_samples=None
     ):
@@ -2152,6 +2289,7 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
 
     def _make_dict(self, sample, include_id=False):
         d = sample.to_mongo_dict(include_id=include_id)
+        d = foo.utils._apply_array_codecs(d, sample._doc, self._sample_doc_cls)
 
         # We omit None here to allow samples with None-valued new fields to
         # be added without raising nonexistent field errors. This is safe
@@ -2771,6 +2909,151 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
         """
         self.delete_samples(samples_or_ids)
 
+    def create_selection_set(self, ids, name=None):
+        """Stores the given IDs as a selection set of this dataset.
+
+        Selection sets are stored in the database, so a view that selects a
+        set via :meth:`select_set() <fiftyone.core.collections.SampleCollection.select_set>`
+        only contains the name of the set. Such views are cheap to serialize
+        and to send to the App, regardless of how many IDs the set contains.
+
+        If a selection set with the given name already exists, it is
+        replaced.
+
+        Examples::
+
+            import fiftyone as fo
+            import fiftyone.zoo as foz
+            from fiftyone import ViewField as F
+
+            dataset = foz.load_zoo_dataset("quickstart")
+
+            ids = dataset.match(F("uniqueness") > 0.5).values("id")
+            dataset.create_selection_set(ids, name="unique")
+
+            view = dataset.select_set("unique")
+            print(len(view))
+
+        Args:
+            ids: the IDs to store. Can be any of the following:
+
+                -   an iterable of sample, frame, or label IDs
+                -   a :class:`fiftyone.core.collections.SampleCollection`,
+                    whose sample IDs are stored
+
+            name (None): a name for the selection set. By default, a unique
+                name is generated
+
+        Returns:
+            the name of the selection set
+        """
+        if name is None:
+            name = str(ObjectId())
+        else:
+            _validate_selection_set_name(name)
+
+        if isinstance(ids, foc.SampleCollection):
+            ids = ids.values("_id")
+
+        ids = dict.fromkeys(
+            _id if isinstance(_id, ObjectId) else ObjectId(_id) for _id in ids
+        )
+
+        # The set is written to a temporary collection and then renamed so
+        # that views never see a partially written set
+        conn = foo.get_db_conn()
+        tmp_coll = conn.create_collection(
+            _SELECTION_SETS_PREFIX + "tmp." + str(ObjectId())
+        )
+
+        try:
+            for batch in fou.iter_batches(ids, 100000):
+                tmp_coll.insert_many(
+                    [{"_id": _id} for _id in batch], ordered=False
+                )
+
+            tmp_coll.rename(
+                self._get_selection_set_collection_name(name),
+                dropTarget=True,
+            )
+        except:
+            tmp_coll.drop()
+            raise
+
+        return name
+
+    def has_selection_set(self, name):
+        """Whether this dataset has a selection set with the given name.
+
+        Args:
+            name: the name of a selection set
+
+        Returns:
+            True/False
+        """
+        coll_name = self._get_selection_set_collection_name(name)
+        conn = foo.get_db_conn()
+        return bool(conn.list_collection_names(filter={"name": coll_name}))
+
+    def list_selection_sets(self):
+        """Returns the names of the selection sets of this dataset.
+
+        Returns:
+            a sorted list of selection set names
+        """
+        prefix = self._get_selection_set_collection_name("")
+        conn = foo.get_db_conn()
+        return sorted(
+            coll_name[len(prefix) :]
+            for coll_name in conn.list_collection_names()
+            if coll_name.startswith(prefix)
+        )
+
+    def load_selection_set(self, name):
+        """Loads the IDs in the selection set with the given name.
+
+        Args:
+            name: the name of a selection set
+
+        Returns:
+            a list of IDs
+        """
+        self._validate_selection_set(name)
+
+        conn = foo.get_db_conn()
+        coll = conn[self._get_selection_set_collection_name(name)]
+        return [str(d["_id"]) for d in coll.find({}, {"_id": True})]
+
+    def delete_selection_set(self, name):
+        """Deletes the selection set with the given name.
+
+        Args:
+            name: the name of a selection set
+        """
+        self._validate_selection_set(name)
+
+        conn = foo.get_db_conn()
+        conn.drop_collection(self._get_selection_set_collection_name(name))
+
+    def delete_selection_sets(self):
+        """Deletes all selection sets of this dataset."""
+        conn = foo.get_db_conn()
+        for name in self.list_selection_sets():
+            conn.drop_collection(self._get_selection_set_collection_name(name))
+
+    def _get_selection_set_collection_name(self, name):
+        return "%s%s.%s" % (
+            _SELECTION_SETS_PREFIX,
+            self._sample_collection_name,
+            name,
+        )
+
+    def _validate_selection_set(self, name):
+        if not self.has_selection_set(name):
+            raise ValueError(
+                "Dataset '%s' has no selection set '%s'" % (self.name, name)
+            )
+
     def save(self):
         """Saves the dataset to the database.
 
@@ -3072,6 +3355,8 @@ class Dataset(foc.SampleCollection, metaclass=DatasetSingleton):
             self._frame_collection.drop()
             fofr.Frame._reset_docs(self._frame_collection_name)
 
+        self.delete_selection_sets()
+
         # Update singleton
         self._instances.pop(self._doc.name, None)
 
@@ -5758,6 +6043,17 @@ def _do_load_dataset(name, virtual=False):
     return dataset_doc, sample_doc_cls, frame_doc_cls
 
 
+def _validate_selection_set_name(name):
+    if not etau.is_str(name) or not name:
+        raise ValueError("Selection set names must be non-empty strings")
+
+    if "$" in name or "\0" in name:
+        raise ValueError(
+            "Invalid selection set name '%s'; names cannot contain '$' or "
+            "null characters" % name
+        )
+
+
 def _delete_dataset_doc(dataset_doc):
     #
     # Must manually cleanup run results, which are stored using GridFS
@@ -7113,6 +7409,64 @@ def _finalize_frames(sample_collection, key_field, frame_key_field):
     foo.bulk_write(ops, frame_coll)
 
 
+def _make_sample_dict(d, schema):
+    d = dict(d)
+
+    try:
+        filepath = fou.normalize_path(d.pop("filepath"))
+    except KeyError:
+        raise ValueError("Sample dicts must contain a 'filepath' key")
+
+    sd = {}
+
+    _id = d.pop("id", d.pop("_id", None))
+    if _id is not None:
+        sd["_id"] = foo.utils._to_object_id(_id)
+
+    media_type = fom.get_media_type(filepath)
+
+    # The type of untyped metadata is inferred from the media type
+    metadata = d.pop("metadata", None)
+    if isinstance(metadata, dict) and "_cls" not in metadata:
+        metadata = dict(metadata, _cls=_get_metadata_cls(media_type))
+
+    sd["filepath"] = filepath
+    sd["tags"] = list(d.pop("tags", None) or [])
+    sd["metadata"] = foo.utils._serialize_dict_value(
+        metadata, schema["metadata"]
+    )
+    sd["_media_type"] = media_type
+    sd["_rand"] = foos._generate_rand(filepath=filepath)
+
+    for field_name, value in d.items():
+        # We omit None here to allow samples with None-valued new fields to
+        # be added without raising nonexistent field errors. This is safe
+        # because None and missing are equivalent in our data model
+        if value is not None:
+            sd[field_name] = foo.utils._serialize_dict_value(
+                value, schema.get(field_name, None)
+            )
+
+    return sd
+
+
+def _get_metadata_cls(media_type):
+    if media_type == fom.IMAGE:
+        return fome.ImageMetadata.__name__
+
+    if media_type == fom.VIDEO:
+        return fome.VideoMetadata.__name__
+
+    return fome.Metadata.__name__
+
+
+def _deserialize_dict_value(value):
+    if isinstance(value, list):
+        return [_deserialize_dict_value(v) for v in value]
+
+    return foo.deserialize_value(value)
+
+
 def _get_media_type(sample):
     for field, value in sample.iter_fields():
         if isinstance(value, fog.Group):
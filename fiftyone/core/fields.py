@@ -496,20 +496,22 @@ class GeoMultiPolygonField(_GeoField, mongoengine.fields.MultiPolygonField):
         super().validate(value)
 
 
-class VectorField(mongoengine.fields.BinaryField, Field):
-    """A one-dimensional array field.
+class _ArrayCodecMixin(object):
+    def __init__(self, codec=None, **kwargs):
+        if codec is not None and codec not in fou._NUMPY_CODECS:
+            raise ValueError(
+                "Unsupported codec '%s'; supported values are %s"
+                % (codec, fou._NUMPY_CODECS)
+            )
 
-    :class:`VectorField` instances accept numeric lists, tuples, and 1D numpy
-    array values. The underlying data is serialized and stored in the database
-    as zlib-compressed bytes generated by ``numpy.save`` and always retrieved
-    as a numpy array.
-    """
+        self.codec = codec
+        super().__init__(**kwargs)
 
     def to_mongo(self, value):
         if value is None:
             return None
 
-        bytes = fou.serialize_numpy_array(value)
+        bytes = fou.serialize_numpy_array(value, codec=self.codec)
         return super().to_mongo(bytes)
 
     def to_python(self, value):
@@ -518,6 +520,22 @@ class VectorField(mongoengine.fields.BinaryField, Field):
 
         return fou.deserialize_numpy_array(value)
 
+
+class VectorField(_ArrayCodecMixin, mongoengine.fields.BinaryField, Field):
+    """A one-dimensional array field.
+
+    :class:`VectorField` instances accept numeric lists, tuples, and 1D numpy
+    array values. By default, the underlying data is serialized and stored in
+    the database as zlib-compressed bytes generated by ``numpy.save``. Pass
+    ``codec="raw"`` to instead store uncompressed little-endian bytes that can
+    be decoded without decompression. Values are always retrieved as numpy
+    arrays, regardless of the codec that was used to store them.
+
+    Args:
+        codec (None): the codec to use to serialize values. Supported values
+            are ``("zlib", "raw")``. The default is ``"zlib"``
+    """
+
     def validate(self, value):
         if isinstance(value, np.ndarray):
             if value.ndim > 1:
@@ -529,26 +547,20 @@ class VectorField(mongoengine.fields.BinaryField, Field):
             )
 
 
-class ArrayField(mongoengine.fields.BinaryField, Field):
+class ArrayField(_ArrayCodecMixin, mongoengine.fields.BinaryField, Field):
     """An n-dimensional array field.
 
-    :class:`ArrayField` instances accept numpy array values. The underlying
-    data is serialized and stored in the database as zlib-compressed bytes
-    generated by ``numpy.save`` and always retrieved as a numpy array.
-    """
+    :class:`ArrayField` instances accept numpy array values. By default, the
+    underlying data is serialized and stored in the database as
+    zlib-compressed bytes generated by ``numpy.save``. Pass ``codec="raw"`` to
+    instead store uncompressed little-endian bytes that can be decoded
+    without decompression. Values are always retrieved as numpy arrays,
+    regardless of the codec that was used to store them.
 
-    def to_mongo(self, value):
-        if value is None:
-            return None
-
-        bytes = fou.serialize_numpy_array(value)
-        return super().to_mongo(bytes)
-
-    def to_python(self, value):
-        if value is None or isinstance(value, np.ndarray):
-            return value
-
-        return fou.deserialize_numpy_array(value)
+    Args:
+        codec (None): the codec to use to serialize values. Supported values
+            are ``("zlib", "raw")``. The default is ``"zlib"``
+    """
 
     def validate(self, value):
         if not isinstance(value, (np.ndarray, Binary)):
@@ -595,6 +595,9 @@ class Frames(object):
 
     def _make_dict(self, frame, include_id=False):
         d = frame.to_mongo_dict(include_id=include_id)
+        d = foo.utils._apply_array_codecs(
+            d, frame._doc, self._dataset._frame_doc_cls
+        )
 
         # We omit None here to allow frames with None-valued new fields to
         # be added without raising nonexistent field errors. This is safe
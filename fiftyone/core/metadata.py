@@ -12,6 +12,7 @@ import os
 import requests
 
 from PIL import Image
+from pymongo import UpdateOne
 
 import eta.core.utils as etau
 import eta.core.video as etav
@@ -24,6 +25,8 @@ import fiftyone.core.utils as fou
 
 logger = logging.getLogger(__name__)
 
+_WRITE_BATCH_SIZE = 1000
+
 
 class Metadata(DynamicEmbeddedDocument):
     """Base class for storing metadata about generic samples.
@@ -229,7 +232,11 @@ def compute_sample_metadata(sample, overwrite=False, skip_failures=False):
 
 
 def compute_metadata(
-    sample_collection, overwrite=False, num_workers=None, skip_failures=True
+    sample_collection,
+    overwrite=False,
+    num_workers=None,
+    skip_failures=True,
+    skip_unchanged=False,
 ):
     """Populates the ``metadata`` field of all samples in the collection.
 
@@ -244,6 +251,11 @@ def compute_metadata(
             ``multiprocessing.cpu_count()`` is used
         skip_failures (True): whether to gracefully continue without raising an
             error if metadata cannot be computed for a sample
+        skip_unchanged (False): whether to skip samples whose local media
+            files have the same size as recorded by their existing metadata.
+            Only applicable when ``overwrite`` is True. Note that metadata does
+            not record file modification times, so files whose contents
+            changed without changing their size are also skipped
     """
     if num_workers is None:
         num_workers = multiprocessing.cpu_count()
@@ -253,14 +265,12 @@ def compute_metadata(
             _allow_mixed=True
         )
 
-    if num_workers <= 1:
-        _compute_metadata(sample_collection, overwrite=overwrite)
-    else:
-        _compute_metadata_multi(
-            sample_collection,
-            num_workers,
-            overwrite=overwrite,
-        )
+    _compute_metadata(
+        sample_collection,
+        num_workers,
+        overwrite=overwrite,
+        skip_unchanged=skip_unchanged,
+    )
 
     num_missing = len(sample_collection.exists("metadata", False))
     if num_missing > 0:
@@ -289,30 +299,26 @@ def get_image_info(f):
     return (img.width, img.height, len(img.getbands()))
 
 
-def _compute_metadata(sample_collection, overwrite=False):
-    if not overwrite:
-        sample_collection = sample_collection.exists("metadata", False)
-
-    num_samples = len(sample_collection)
-    if num_samples == 0:
-        return
-
-    logger.info("Computing metadata...")
-    with fou.ProgressBar(total=num_samples) as pb:
-        for sample in pb(sample_collection.select_fields()):
-            compute_sample_metadata(sample, skip_failures=True)
-
-
-def _compute_metadata_multi(sample_collection, num_workers, overwrite=False):
+def _compute_metadata(
+    sample_collection, num_workers, overwrite=False, skip_unchanged=False
+):
     if not overwrite:
         sample_collection = sample_collection.exists("metadata", False)
 
     ids, filepaths, media_types = sample_collection.values(
-        ["id", "filepath", "_media_type"],
+        ["_id", "filepath", "_media_type"],
         _allow_missing=True,
     )
 
-    inputs = list(zip(ids, filepaths, media_types))
+    if overwrite and skip_unchanged:
+        # Workers compare these to the sizes of the files
+        sizes = sample_collection.values(
+            "metadata.size_bytes", _allow_missing=True
+        )
+    else:
+        sizes = itertools.repeat(None)
+
+    inputs = list(zip(ids, filepaths, media_types, sizes))
     num_samples = len(inputs)
 
     if num_samples == 0:
@@ -320,27 +326,69 @@ def _compute_metadata_multi(sample_collection, num_workers, overwrite=False):
 
     logger.info("Computing metadata...")
 
-    view = sample_collection.select_fields()
+    if num_workers <= 1:
+        results = map(_do_compute_metadata, inputs)
+        _write_metadata(sample_collection, results, num_samples)
+        return
+
+    # Send tasks in chunks to reduce IPC overhead, while still keeping all
+    # workers busy
+    chunksize = max(1, min(num_samples // (4 * num_workers), 64))
+
+    with fou.get_multiprocessing_context().Pool(processes=num_workers) as pool:
+        results = pool.imap_unordered(
+            _do_compute_metadata, inputs, chunksize=chunksize
+        )
+        _write_metadata(sample_collection, results, num_samples)
+
+
+def _write_metadata(sample_collection, results, num_samples):
+    dataset = sample_collection._dataset
+
+    ops = []
     with fou.ProgressBar(total=num_samples) as pb:
-        with fou.get_multiprocessing_context().Pool(
-            processes=num_workers
-        ) as pool:
-            for sample_id, metadata in pb(
-                pool.imap_unordered(_do_compute_metadata, inputs)
-            ):
-                sample = view[sample_id]
-                sample.metadata = metadata
-                sample.save()
+        for _id, metadata in pb(results):
+            # The existing metadata is up-to-date
+            if metadata is False:
+                continue
+
+            if metadata is not None:
+                metadata = metadata.to_mongo()
+
+            ops.append(
+                UpdateOne({"_id": _id}, {"$set": {"metadata": metadata}})
+            )
+
+            if len(ops) >= _WRITE_BATCH_SIZE:
+                dataset._bulk_write(ops)
+                ops = []
+
+    if ops:
+        dataset._bulk_write(ops)
 
 
 def _do_compute_metadata(args):
-    sample_id, filepath, media_type = args
+    sample_id, filepath, media_type, size_bytes = args
+
+    if size_bytes is not None and _get_file_size(filepath) == size_bytes:
+        return sample_id, False
+
     metadata = _compute_sample_metadata(
         filepath, media_type, skip_failures=True
     )
     return sample_id, metadata
 
 
+def _get_file_size(filepath):
+    if filepath.startswith("http"):
+        return None
+
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return None
+
+
 def _compute_sample_metadata(filepath, media_type, skip_failures=False):
     if not skip_failures:
         return _get_metadata(filepath, media_type)
@@ -8,6 +8,7 @@ FiftyOne models.
 import contextlib
 import inspect
 import logging
+import timeit
 
 import numpy as np
 
@@ -27,6 +28,7 @@ import fiftyone.core.validation as fov
 
 tud = fou.lazy_import("torch.utils.data")
 
+foc = fou.lazy_import("fiftyone.core.collections")
 foue = fou.lazy_import("fiftyone.utils.eta")
 fouf = fou.lazy_import("fiftyone.utils.flash")
 foup = fou.lazy_import("fiftyone.utils.patches")
@@ -231,21 +233,32 @@ def _apply_image_model_single(
     samples, model, label_field, confidence_thresh, skip_failures
 ):
     samples = samples.select_fields()
+    imgs_loader = _make_image_loader(samples, 1)
+    stats = _PipelineStats()
 
     with fou.ProgressBar() as pb:
-        for sample in pb(samples):
-            try:
-                img = etai.read(sample.filepath)
-                labels = model.predict(img)
+        with foc.AsyncSaveContext(samples) as ctx:
+            for sample, imgs in zip(pb(samples), stats.load(imgs_loader)):
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
 
-                sample.add_labels(
-                    labels, label_field, confidence_thresh=confidence_thresh
-                )
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                    with stats.infer(1):
+                        labels = model.predict(imgs[0])
 
-                logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                    sample._add_labels(
+                        labels,
+                        label_field,
+                        confidence_thresh=confidence_thresh,
+                    )
+                    ctx.save(sample)
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
+
+                    logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+
+    stats.log(ctx)
 
 
 def _apply_image_model_batch(
@@ -253,32 +266,43 @@ def _apply_image_model_batch(
 ):
     samples = samples.select_fields()
     samples_loader = fou.iter_batches(samples, batch_size)
+    imgs_loader = _make_image_loader(samples, batch_size)
+    stats = _PipelineStats()
 
     with fou.ProgressBar(samples) as pb:
-        for sample_batch in samples_loader:
-            try:
-                imgs = [etai.read(sample.filepath) for sample in sample_batch]
-                labels_batch = model.predict_all(imgs)
+        with foc.AsyncSaveContext(samples) as ctx:
+            for sample_batch, imgs in zip(
+                samples_loader, stats.load(imgs_loader)
+            ):
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
+
+                    with stats.infer(len(sample_batch)):
+                        labels_batch = model.predict_all(imgs)
 
-                for sample, labels in zip(sample_batch, labels_batch):
-                    sample.add_labels(
-                        labels,
-                        label_field,
-                        confidence_thresh=confidence_thresh,
-                    )
+                    for sample, labels in zip(sample_batch, labels_batch):
+                        sample._add_labels(
+                            labels,
+                            label_field,
+                            confidence_thresh=confidence_thresh,
+                        )
+                        ctx.save(sample)
 
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-                logger.warning(
-                    "Batch: %s - %s\nError: %s\n",
-                    sample_batch[0].id,
-                    sample_batch[-1].id,
-                    e,
-                )
+                    logger.warning(
+                        "Batch: %s - %s\nError: %s\n",
+                        sample_batch[0].id,
+                        sample_batch[-1].id,
+                        e,
+                    )
+
+                pb.update(len(sample_batch))
 
-            pb.update(len(sample_batch))
+    stats.log(ctx)
 
 
 def _apply_image_model_data_loader(
@@ -295,34 +319,42 @@ def _apply_image_model_data_loader(
     data_loader = _make_data_loader(
         samples, model, batch_size, num_workers, skip_failures
     )
+    stats = _PipelineStats()
 
     with fou.ProgressBar(samples) as pb:
-        for sample_batch, imgs in zip(samples_loader, data_loader):
-            try:
-                if isinstance(imgs, Exception):
-                    raise imgs
+        with foc.AsyncSaveContext(samples) as ctx:
+            for sample_batch, imgs in zip(
+                samples_loader, stats.load(data_loader)
+            ):
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
+
+                    with stats.infer(len(sample_batch)):
+                        labels_batch = model.predict_all(imgs)
 
-                labels_batch = model.predict_all(imgs)
+                    for sample, labels in zip(sample_batch, labels_batch):
+                        sample._add_labels(
+                            labels,
+                            label_field,
+                            confidence_thresh=confidence_thresh,
+                        )
+                        ctx.save(sample)
 
-                for sample, labels in zip(sample_batch, labels_batch):
-                    sample.add_labels(
-                        labels,
-                        label_field,
-                        confidence_thresh=confidence_thresh,
-                    )
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                    logger.warning(
+                        "Batch: %s - %s\nError: %s\n",
+                        sample_batch[0].id,
+                        sample_batch[-1].id,
+                        e,
+                    )
 
-                logger.warning(
-                    "Batch: %s - %s\nError: %s\n",
-                    sample_batch[0].id,
-                    sample_batch[-1].id,
-                    e,
-                )
+                pb.update(len(sample_batch))
 
-            pb.update(len(sample_batch))
+    stats.log(ctx)
 
 
 def _apply_image_model_to_frames_single(
@@ -331,37 +363,43 @@ def _apply_image_model_to_frames_single(
     samples = samples.select_fields()
     frame_counts, total_frame_count = _get_frame_counts(samples)
     is_clips = samples._dataset._is_clips
+    stats = _PipelineStats(unit="frames")
 
     with fou.ProgressBar(total=total_frame_count) as pb:
-        for idx, sample in enumerate(samples):
-            if is_clips:
-                frames = etaf.FrameRange(*sample.support)
-            else:
-                frames = None
+        with foc.AsyncSaveContext(samples) as ctx:
+            for idx, sample in enumerate(samples):
+                if is_clips:
+                    frames = etaf.FrameRange(*sample.support)
+                else:
+                    frames = None
 
-            try:
-                with etav.FFmpegVideoReader(
-                    sample.filepath, frames=frames
-                ) as video_reader:
-                    for img in video_reader:
-                        labels = model.predict(img)
+                frames_loader = _make_frames_loader(sample, frames, 1)
+
+                try:
+                    for fns, imgs in stats.load(frames_loader):
+                        with stats.infer(1):
+                            labels = model.predict(imgs[0])
 
-                        sample.add_labels(
-                            {video_reader.frame_number: labels},
+                        sample._add_labels(
+                            {fns[0]: labels},
                             label_field,
                             confidence_thresh=confidence_thresh,
                         )
 
                         pb.update()
 
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-                logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                    logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                finally:
+                    ctx.save(sample)
 
-            # Explicitly set in case actual # frames differed from expected #
-            pb.set_iteration(frame_counts[idx])
+                # Explicitly set in case actual # frames differed from expected
+                pb.set_iteration(frame_counts[idx])
+
+    stats.log(ctx)
 
 
 def _apply_image_model_to_frames_batch(
@@ -370,22 +408,24 @@ def _apply_image_model_to_frames_batch(
     samples = samples.select_fields()
     frame_counts, total_frame_count = _get_frame_counts(samples)
     is_clips = samples._dataset._is_clips
+    stats = _PipelineStats(unit="frames")
 
     with fou.ProgressBar(total=total_frame_count) as pb:
-        for idx, sample in enumerate(samples):
-            if is_clips:
-                frames = etaf.FrameRange(*sample.support)
-            else:
-                frames = None
+        with foc.AsyncSaveContext(samples) as ctx:
+            for idx, sample in enumerate(samples):
+                if is_clips:
+                    frames = etaf.FrameRange(*sample.support)
+                else:
+                    frames = None
 
-            try:
-                with etav.FFmpegVideoReader(
-                    sample.filepath, frames=frames
-                ) as video_reader:
-                    for fns, imgs in _iter_batches(video_reader, batch_size):
-                        labels_batch = model.predict_all(imgs)
+                frames_loader = _make_frames_loader(sample, frames, batch_size)
+
+                try:
+                    for fns, imgs in stats.load(frames_loader):
+                        with stats.infer(len(imgs)):
+                            labels_batch = model.predict_all(imgs)
 
-                        sample.add_labels(
+                        sample._add_labels(
                             {
                                 fn: labels
                                 for fn, labels in zip(fns, labels_batch)
@@ -396,14 +436,18 @@ def _apply_image_model_to_frames_batch(
 
                         pb.update(len(imgs))
 
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-                logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                    logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                finally:
+                    ctx.save(sample)
 
-            # Explicitly set in case actual # frames differed from expected #
-            pb.set_iteration(frame_counts[idx])
+                # Explicitly set in case actual # frames differed from expected
+                pb.set_iteration(frame_counts[idx])
+
+    stats.log(ctx)
 
 
 def _apply_video_model(
@@ -413,26 +457,30 @@ def _apply_video_model(
     is_clips = samples._dataset._is_clips
 
     with fou.ProgressBar() as pb:
-        for sample in pb(samples):
-            if is_clips:
-                frames = etaf.FrameRange(*sample.support)
-            else:
-                frames = None
+        with foc.AsyncSaveContext(samples) as ctx:
+            for sample in pb(samples):
+                if is_clips:
+                    frames = etaf.FrameRange(*sample.support)
+                else:
+                    frames = None
 
-            try:
-                with etav.FFmpegVideoReader(
-                    sample.filepath, frames=frames
-                ) as video_reader:
-                    labels = model.predict(video_reader)
+                try:
+                    with etav.FFmpegVideoReader(
+                        sample.filepath, frames=frames
+                    ) as video_reader:
+                        labels = model.predict(video_reader)
 
-                sample.add_labels(
-                    labels, label_field, confidence_thresh=confidence_thresh
-                )
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                    sample._add_labels(
+                        labels,
+                        label_field,
+                        confidence_thresh=confidence_thresh,
+                    )
+                    ctx.save(sample)
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-                logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                    logger.warning("Sample: %s\nError: %s\n", sample.id, e)
 
 
 def _get_frame_counts(samples):
@@ -542,6 +590,119 @@ def _make_data_loader(samples, model, batch_size, num_workers, skip_failures):
     )
 
 
+def _make_image_loader(samples, batch_size, max_prefetch=2):
+    # Reads batches of images in a background thread, so that they are ready
+    # by the time the model needs them
+    filepaths = samples.values("filepath")
+    return fou.iter_prefetch(
+        _iter_image_batches(filepaths, batch_size), max_prefetch=max_prefetch
+    )
+
+
+def _iter_image_batches(filepaths, batch_size):
+    for filepaths_batch in fou.iter_batches(filepaths, batch_size):
+        try:
+            yield [etai.read(filepath) for filepath in filepaths_batch]
+        except Exception as e:
+            yield e
+
+
+def _make_frames_loader(sample, frames, batch_size, max_prefetch=2):
+    # Decodes batches of frames in a background thread, so that they are ready
+    # by the time the model needs them
+    return fou.iter_prefetch(
+        _iter_frame_batches(sample.filepath, frames, batch_size),
+        max_prefetch=max_prefetch,
+    )
+
+
+def _iter_frame_batches(filepath, frames, batch_size):
+    # The reader is opened and closed by the thread that decodes the frames
+    with etav.FFmpegVideoReader(filepath, frames=frames) as video_reader:
+        yield from _iter_batches(video_reader, batch_size)
+
+
+def _make_save_context(samples, embeddings_field):
+    if embeddings_field:
+        return foc.AsyncSaveContext(samples)
+
+    return contextlib.nullcontext()
+
+
+class _PipelineStats(object):
+    """Records the time spent by each stage of a load, inference, and write
+    pipeline so that their throughputs can be reported.
+
+    Args:
+        unit ("samples"): the name of the unit of work, for logging purposes
+    """
+
+    def __init__(self, unit="samples"):
+        self.unit = unit
+        self.num_samples = 0
+        self.load_time = 0.0
+        self.inference_time = 0.0
+
+    def load(self, loader):
+        """Wraps the given loader, recording the time spent waiting on it."""
+        loader = iter(loader)
+        while True:
+            start = timeit.default_timer()
+            try:
+                item = next(loader)
+            except StopIteration:
+                return
+            finally:
+                self.load_time += timeit.default_timer() - start
+
+            yield item
+
+    @contextlib.contextmanager
+    def infer(self, num_samples):
+        """Context that records the time spent performing inference on the
+        given number of samples.
+        """
+        start = timeit.default_timer()
+        try:
+            yield
+        finally:
+            self.inference_time += timeit.default_timer() - start
+            self.num_samples += num_samples
+
+    def log(self, save_context=None):
+        """Logs the throughput of each stage of the pipeline.
+
+        Args:
+            save_context (None): the
+                :class:`fiftyone.core.collections.AsyncSaveContext` used to
+                write the results, if any
+        """
+        if not self.num_samples:
+            return
+
+        write_time = getattr(save_context, "write_time", None)
+
+        logger.info(
+            "Pipeline throughput: load wait %s, inference %s, write %s",
+            self._format(self.load_time),
+            self._format(self.inference_time),
+            self._format(write_time),
+        )
+
+    def _format(self, duration):
+        if duration is None:
+            return "n/a"
+
+        if duration <= 0:
+            return "%.2fs" % duration
+
+        return "%.2fs (%.1f %s/s)" % (
+            duration,
+            self.num_samples / duration,
+            self.unit,
+        )
+
+
 def compute_embeddings(
     samples,
     model,
@@ -711,29 +872,37 @@ def _compute_image_embeddings_single(
     samples, model, embeddings_field, skip_failures
 ):
     samples = samples.select_fields()
-    embeddings = []
+    imgs_loader = _make_image_loader(samples, 1)
+    stats = _PipelineStats()
 
+    embeddings = []
     errors = False
 
     with fou.ProgressBar() as pb:
-        for sample in pb(samples):
-            embedding = None
+        with _make_save_context(samples, embeddings_field) as ctx:
+            for sample, imgs in zip(pb(samples), stats.load(imgs_loader)):
+                embedding = None
 
-            try:
-                img = etai.read(sample.filepath)
-                embedding = model.embed(img)[0]
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
 
-                errors = True
-                logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+                    with stats.infer(1):
+                        embedding = model.embed(imgs[0])[0]
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
 
-            if embeddings_field:
-                sample[embeddings_field] = embedding
-                sample.save()
-            else:
-                embeddings.append(embedding)
+                    errors = True
+                    logger.warning("Sample: %s\nError: %s\n", sample.id, e)
+
+                if embeddings_field:
+                    sample[embeddings_field] = embedding
+                    ctx.save(sample)
+                else:
+                    embeddings.append(embedding)
+
+    stats.log(ctx)
 
     if embeddings_field:
         return None
@@ -749,37 +918,50 @@ def _compute_image_embeddings_batch(
 ):
     samples = samples.select_fields()
     samples_loader = fou.iter_batches(samples, batch_size)
+    imgs_loader = _make_image_loader(samples, batch_size)
+    stats = _PipelineStats()
 
     embeddings = []
     errors = False
 
     with fou.ProgressBar(samples) as pb:
-        for sample_batch in samples_loader:
-            embeddings_batch = [None] * len(sample_batch)
-
-            try:
-                imgs = [etai.read(sample.filepath) for sample in sample_batch]
-                embeddings_batch = list(model.embed_all(imgs))  # list of 1D
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+        with _make_save_context(samples, embeddings_field) as ctx:
+            for sample_batch, imgs in zip(
+                samples_loader, stats.load(imgs_loader)
+            ):
+                embeddings_batch = [None] * len(sample_batch)
+
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
+
+                    with stats.infer(len(sample_batch)):
+                        # list of 1D
+                        embeddings_batch = list(model.embed_all(imgs))
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
+
+                    errors = True
+                    logger.warning(
+                        "Batch: %s - %s\nError: %s\n",
+                        sample_batch[0].id,
+                        sample_batch[-1].id,
+                        e,
+                    )
 
-                errors = True
-                logger.warning(
-                    "Batch: %s - %s\nError: %s\n",
-                    sample_batch[0].id,
-                    sample_batch[-1].id,
-                    e,
-                )
+                if embeddings_field:
+                    for sample, embedding in zip(
+                        sample_batch, embeddings_batch
+                    ):
+                        sample[embeddings_field] = embedding
+                        ctx.save(sample)
+                else:
+                    embeddings.extend(embeddings_batch)
 
-            if embeddings_field:
-                for sample, embedding in zip(sample_batch, embeddings_batch):
-                    sample[embeddings_field] = embedding
-                    sample.save()
-            else:
-                embeddings.extend(embeddings_batch)
+                pb.update(len(sample_batch))
 
-            pb.update(len(sample_batch))
+    stats.log(ctx)
 
     if embeddings_field:
         return None
@@ -798,39 +980,49 @@ def _compute_image_embeddings_data_loader(
     data_loader = _make_data_loader(
         samples, model, batch_size, num_workers, skip_failures
     )
+    stats = _PipelineStats()
 
     embeddings = []
     errors = False
 
     with fou.ProgressBar(samples) as pb:
-        for sample_batch, imgs in zip(samples_loader, data_loader):
-            embeddings_batch = [None] * len(sample_batch)
-
-            try:
-                if isinstance(imgs, Exception):
-                    raise imgs
-
-                embeddings_batch = list(model.embed_all(imgs))  # list of 1D
-            except Exception as e:
-                if not skip_failures:
-                    raise e
+        with _make_save_context(samples, embeddings_field) as ctx:
+            for sample_batch, imgs in zip(
+                samples_loader, stats.load(data_loader)
+            ):
+                embeddings_batch = [None] * len(sample_batch)
+
+                try:
+                    if isinstance(imgs, Exception):
+                        raise imgs
+
+                    with stats.infer(len(sample_batch)):
+                        # list of 1D
+                        embeddings_batch = list(model.embed_all(imgs))
+                except Exception as e:
+                    if not skip_failures:
+                        raise e
+
+                    errors = True
+                    logger.warning(
+                        "Batch: %s - %s\nError: %s\n",
+                        sample_batch[0].id,
+                        sample_batch[-1].id,
+                        e,
+                    )
 
-                errors = True
-                logger.warning(
-                    "Batch: %s - %s\nError: %s\n",
-                    sample_batch[0].id,
-                    sample_batch[-1].id,
-                    e,
-                )
+                if embeddings_field:
+                    for sample, embedding in zip(
+                        sample_batch, embeddings_batch
+                    ):
+                        sample[embeddings_field] = embedding
+                        ctx.save(sample)
+                else:
+                    embeddings.extend(embeddings_batch)
 
-            if embeddings_field:
-                for sample, embedding in zip(sample_batch, embeddings_batch):
-                    sample[embeddings_field] = embedding
-                    sample.save()
-            else:
-                embeddings.extend(embeddings_batch)
+                pb.update(len(sample_batch))
 
-            pb.update(len(sample_batch))
+    stats.log(ctx)
 
     if embeddings_field:
         return None
@@ -9,6 +9,7 @@ import types
 
 from .database import (
     aggregate,
+    explain_aggregate,
     get_db_config,
     establish_db_conn,
     get_db_client,
@@ -34,6 +35,9 @@ from .database import (
     export_collection,
     import_document,
     import_collection,
+    iter_json_array,
+    export_bson_collection,
+    import_bson_collection,
     insert_documents,
     bulk_write,
 )
@@ -57,6 +61,7 @@ from .mixins import (
     get_default_fields,
     validate_fields_match,
 )
+from .optimizer import optimize_pipeline
 from .sample import (
     DatasetSampleDocument,
     NoDatasetSampleDocument,
@@ -64,6 +69,7 @@ from .sample import (
 from .utils import (
     serialize_value,
     deserialize_value,
+    serialize_document_dict,
     validate_field_name,
     get_field_kwargs,
     get_implied_field_kwargs,
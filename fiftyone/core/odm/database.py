@@ -6,15 +6,22 @@ Database utilities.
 |
 """
 import atexit
+from collections import deque
 from datetime import datetime
+import itertools
+import json
 import logging
+import multiprocessing
 from multiprocessing.pool import ThreadPool
 import os
+import struct
 
 import asyncio
+import bson
 from bson import json_util
 from bson.codec_options import CodecOptions
-from mongoengine import connect
+from bson.raw_bson import RawBSONDocument
+from mongoengine import connect, disconnect
 import mongoengine.errors as moe
 import motor.motor_asyncio as mtr
 
@@ -23,6 +30,7 @@ import pymongo
 from pymongo.errors import BulkWriteError, ServerSelectionTimeoutError
 import pytz
 
+import eta.core.serial as etas
 import eta.core.utils as etau
 
 import fiftyone as fo
@@ -33,8 +41,10 @@ import fiftyone.core.service as fos
 import fiftyone.core.utils as fou
 
 from .document import Document
+from .optimizer import optimize_pipeline
 
 fod = fou.lazy_import("fiftyone.core.dataset")
+fomi = fou.lazy_import("fiftyone.migrations")
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +52,17 @@ _client = None
 _async_client = None
 _connection_kwargs = {}
 _db_service = None
+_db_conn_established = False
+
+# The number of documents parsed at a time by background parsing threads
+_PARSE_BATCH_SIZE = 1000
+
+_JSON_WHITESPACE = " \t\n\r"
+
+_BSON_INDEX_FILENAME = "index.json"
+
+# Every BSON document begins with its size as a little-endian int32
+_BSON_SIZE = struct.Struct("<i")
 
 
 #
@@ -125,6 +146,12 @@ def establish_db_conn(config):
     URI. Otherwise, a :class:`fiftyone.core.service.DatabaseService` is
     created.
 
+    Once connected, the database is migrated to the client's version, if
+    necessary.
+
+    This method is called automatically the first time that the database is
+    used, so ``import fiftyone`` never starts or connects to ``mongod``.
+
     Args:
         config: a :class:`fiftyone.core.config.FiftyOneConfig`
 
@@ -141,6 +168,7 @@ def establish_db_conn(config):
     global _client
     global _db_service
     global _connection_kwargs
+    global _db_conn_established
 
     established_port = os.environ.get("FIFTYONE_PRIVATE_DATABASE_PORT", None)
     if established_port is not None:
@@ -193,9 +221,18 @@ def establish_db_conn(config):
             % (config.type, foc.CLIENT_TYPE)
         )
 
+    _db_conn_established = True
+
+    if os.environ.get("FIFTYONE_DISABLE_SERVICES", "0") != "1":
+        fomi.migrate_database_if_necessary()
+
 
 def _connect():
     global _client
+    if _client is None:
+        if not _db_conn_established:
+            establish_db_conn(fo.config)
+
     if _client is None:
         global _connection_kwargs
 
@@ -205,9 +242,28 @@ def _connect():
         connect(fo.config.database_name, **_connection_kwargs)
 
 
+def _reconnect():
+    """Replaces the current database connections with new ones.
+
+    Worker processes that are forked from a process that had already connected
+    to the database must call this before issuing any database operations.
+    """
+    global _client
+    global _async_client
+
+    _client = None
+    _async_client = None
+    disconnect()
+
+    _connect()
+
+
 def _async_connect():
     global _async_client
     if _async_client is None:
+        # Ensures that the connection parameters have been established
+        _connect()
+
         global _connection_kwargs
         _async_client = mtr.AsyncIOMotorClient(
             **_connection_kwargs, appname=foc.DATABASE_APPNAME
@@ -268,7 +324,7 @@ def _validate_db_version(config, client):
         )
 
 
-def aggregate(collection, pipelines):
+def aggregate(collection, pipelines, optimize=True):
     """Executes one or more aggregations on a collection.
 
     Multiple aggregations are executed using multiple threads, and their
@@ -278,6 +334,9 @@ def aggregate(collection, pipelines):
         collection: a ``pymongo.collection.Collection`` or
             ``motor.motor_asyncio.AsyncIOMotorCollection``
         pipelines: a MongoDB aggregation pipeline or a list of pipelines
+        optimize (True): whether to rewrite the pipeline(s) via
+            :func:`fiftyone.core.odm.optimizer.optimize_pipeline` before
+            executing them
 
     Returns:
         -   If a single pipeline is provided, a
@@ -293,6 +352,9 @@ def aggregate(collection, pipelines):
     if not is_list:
         pipelines = [pipelines]
 
+    if optimize:
+        pipelines = [optimize_pipeline(p) for p in pipelines]
+
     num_pipelines = len(pipelines)
     if isinstance(collection, mtr.AsyncIOMotorCollection):
         if num_pipelines == 1 and not is_list:
@@ -307,6 +369,39 @@ def aggregate(collection, pipelines):
     return _do_pooled_aggregate(collection, pipelines)
 
 
+def explain_aggregate(
+    collection, pipeline, verbosity="executionStats", optimize=True
+):
+    """Returns the MongoDB query plan for an aggregation on a collection.
+
+    Args:
+        collection: a ``pymongo.collection.Collection``
+        pipeline: a MongoDB aggregation pipeline
+        verbosity ("executionStats"): the verbosity of the explanation.
+            Supported values are
+            ``("queryPlanner", "executionStats", "allPlansExecution")``
+        optimize (True): whether to rewrite the pipeline via
+            :func:`fiftyone.core.odm.optimizer.optimize_pipeline` before
+            explaining it, as :func:`aggregate` does
+
+    Returns:
+        the explain output dict
+    """
+    if optimize:
+        pipeline = optimize_pipeline(pipeline)
+
+    return collection.database.command(
+        {
+            "explain": {
+                "aggregate": collection.name,
+                "pipeline": pipeline,
+                "cursor": {},
+            },
+            "verbosity": verbosity,
+        }
+    )
+
+
 def _do_pooled_aggregate(collection, pipelines):
     # @todo: MongoDB 5.0 supports snapshots which can be used to make the
     # results consistent, i.e. read from the same point in time
@@ -441,9 +536,18 @@ def drop_orphan_collections(dry_run=False):
     coll_prefixes = ("samples.", "frames.", "patches.", "clips.")
 
     for coll_name in conn.list_collection_names():
-        if coll_name not in colls_in_use and any(
-            coll_name.startswith(prefix) for prefix in coll_prefixes
-        ):
+        if coll_name.startswith("selections."):
+            # Selection sets are named `selections.<sample_coll_name>.<name>`
+            is_orphan = not any(
+                coll_name.startswith("selections.%s." % c)
+                for c in colls_in_use
+            )
+        else:
+            is_orphan = coll_name not in colls_in_use and any(
+                coll_name.startswith(prefix) for prefix in coll_prefixes
+            )
+
+        if is_orphan:
             _logger.info("Dropping collection '%s'", coll_name)
             if not dry_run:
                 conn.drop_collection(coll_name)
@@ -603,34 +707,165 @@ def import_document(json_path):
         return json_util.loads(f.read())
 
 
-def import_collection(json_dir_or_path, key="documents"):
+def import_collection(
+    json_dir_or_path, key="documents", parse_in_background=False
+):
     """Imports the collection from JSON on disk.
 
+    When ``json_dir_or_path`` is a single JSON file, its documents are parsed
+    incrementally as they are consumed, so the memory required to import the
+    collection is independent of its size.
+
     Args:
         json_dir_or_path: the path to a JSON file on disk, or a directory
             containing per-document JSON files
         key ("documents"): the field name under which the documents are stored
             when ``json_path`` is a single JSON file
+        parse_in_background (False): whether to parse the documents in a
+            background thread, so that parsing can overlap with the
+            processing of previously parsed documents, e.g., their insertion
+            into the database
 
     Returns:
         a tuple of
 
         -   an iterable of BSON documents
-        -   the number of documents
+        -   the number of documents, or None if it is not known in advance
     """
     if json_dir_or_path.endswith(".json"):
-        return _import_collection_single(json_dir_or_path, key)
+        docs, num_docs = _import_collection_single(json_dir_or_path, key)
+    else:
+        docs, num_docs = _import_collection_multi(json_dir_or_path)
 
-    return _import_collection_multi(json_dir_or_path)
+    if parse_in_background:
+        batches = fou.iter_prefetch(
+            fou.iter_batches(docs, _PARSE_BATCH_SIZE), max_prefetch=2
+        )
+        docs = itertools.chain.from_iterable(batches)
 
+    return docs, num_docs
 
-def _import_collection_single(json_path, key):
+
+def iter_json_array(json_path, key, chunk_size=1048576):
+    """Iterates over the BSON documents in a JSON file of the form
+    ``{"<key>": [doc1, doc2, ...]}``, such as those written by
+    :func:`export_collection`.
+
+    The file is read and parsed incrementally, so only one document at a time
+    is held in memory.
+
+    Args:
+        json_path: the path to the JSON file
+        key: the field name under which the documents are stored
+        chunk_size (1048576): the number of characters to read from the file
+            at a time
+
+    Returns:
+        a generator that emits BSON document dicts
+    """
     with open(json_path, "r") as f:
-        docs = json_util.loads(f.read()).get(key, [])
+        reader = _JSONReader(f, chunk_size)
+
+        reader.expect("{")
+        while not reader.consume("}"):
+            _key = reader.decode()
+            reader.expect(":")
+
+            if _key != key:
+                reader.decode()  # skip value
+            else:
+                reader.expect("[")
+                if not reader.consume("]"):
+                    while True:
+                        yield reader.decode(bson=True)
+                        if reader.consume("]"):
+                            break
+
+                        reader.expect(",")
+
+            reader.consume(",")
+
+
+class _JSONReader(object):
+    def __init__(self, f, chunk_size):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._idx = 0
+        self._offset = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+        self._bson_decoder = json.JSONDecoder(
+            object_pairs_hook=json_util.object_pairs_hook
+        )
 
-    num_docs = len(docs)
+    def expect(self, char):
+        if not self.consume(char):
+            raise ValueError(
+                "Expected '%s' at position %d of the JSON file"
+                % (char, self._get_position())
+            )
 
-    return docs, num_docs
+    def consume(self, char):
+        if not self._skip_whitespace():
+            return False
+
+        if self._buffer[self._idx] != char:
+            return False
+
+        self._idx += 1
+        return True
+
+    def decode(self, bson=False):
+        decoder = self._bson_decoder if bson else self._decoder
+
+        self._skip_whitespace()
+        while True:
+            try:
+                value, idx = decoder.raw_decode(self._buffer, self._idx)
+
+                # Numbers may continue beyond the end of the buffer
+                if idx < len(self._buffer) or self._eof:
+                    self._idx = idx
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            # The value is incomplete, so read more of the file
+            self._read(self._chunk_size + len(self._buffer) - self._idx)
+
+    def _skip_whitespace(self):
+        while True:
+            while (
+                self._idx < len(self._buffer)
+                and self._buffer[self._idx] in _JSON_WHITESPACE
+            ):
+                self._idx += 1
+
+            if self._idx < len(self._buffer):
+                return True
+
+            if self._eof:
+                return False
+
+            self._read(self._chunk_size)
+
+    def _read(self, size):
+        chunk = self._f.read(size)
+        if not chunk:
+            self._eof = True
+
+        self._buffer = self._buffer[self._idx :] + chunk
+        self._offset += self._idx
+        self._idx = 0
+
+    def _get_position(self):
+        return self._offset + self._idx
+
+
+def _import_collection_single(json_path, key):
+    return iter_json_array(json_path, key), None
 
 
 def _import_collection_multi(json_dir):
@@ -644,6 +879,176 @@ def _import_collection_multi(json_dir):
     return docs, len(json_paths)
 
 
+def export_bson_collection(
+    docs, bson_dir, num_docs=None, shard_size=67108864, num_workers=None
+):
+    """Exports the collection to disk as shards of raw BSON.
+
+    The documents are written, in order, to files of the form
+    ``<bson_dir>/<idx:06d>.bson`` that each contain a sequence of BSON
+    documents totaling approximately ``shard_size`` bytes. Since every BSON
+    document begins with its length, the shards can be split back into
+    documents without parsing them. An ``index.json`` file records the number
+    of documents and bytes in each shard.
+
+    Documents are encoded in the calling thread, so that shards can be sized
+    by their actual number of bytes, and the worker threads only write the
+    shards to disk. Note that ``bson.encode()`` holds the GIL, so using more
+    workers does not parallelize the encoding of documents.
+
+    Args:
+        docs: an iterable of BSON document dicts or
+            ``bson.raw_bson.RawBSONDocument`` instances
+        bson_dir: the directory in which to write the shards
+        num_docs (None): the total number of documents. If omitted, this is
+            computed via ``len(docs)``, if possible
+        shard_size (67108864): the target size of each shard, in bytes
+        num_workers (None): the number of worker threads to use to write
+            shards. By default, ``min(8, multiprocessing.cpu_count())``
+            is used
+    """
+    if num_docs is None:
+        try:
+            num_docs = len(docs)
+        except:
+            pass
+
+    if num_workers is None:
+        num_workers = min(8, multiprocessing.cpu_count())
+
+    etau.ensure_empty_dir(bson_dir)
+
+    shards = []
+    pending = deque()
+
+    def _wait(max_pending):
+        while len(pending) > max_pending:
+            shard, result = pending.popleft()
+            shard["num_bytes"] = result.get()
+
+    def _submit(pool, batch):
+        filename = "%06d.bson" % len(shards)
+        shard = {"filename": filename, "num_docs": len(batch)}
+        shards.append(shard)
+
+        shard_path = os.path.join(bson_dir, filename)
+        result = pool.apply_async(_write_bson_shard, (batch, shard_path))
+        pending.append((shard, result))
+
+        # Bound the number of shards that are held in memory
+        _wait(2 * num_workers)
+
+    with ThreadPool(processes=num_workers) as pool:
+        with fou.ProgressBar(total=num_docs, iters_str="docs") as pb:
+            batch = []
+            batch_size = 0
+            for doc in pb(docs):
+                if not isinstance(doc, RawBSONDocument):
+                    doc = RawBSONDocument(bson.encode(doc))
+
+                batch.append(doc)
+                batch_size += len(doc.raw)
+                if batch_size >= shard_size:
+                    _submit(pool, batch)
+                    batch = []
+                    batch_size = 0
+
+            if batch:
+                _submit(pool, batch)
+
+            _wait(0)
+
+    index = {"num_docs": sum(s["num_docs"] for s in shards), "shards": shards}
+    etas.write_json(index, os.path.join(bson_dir, _BSON_INDEX_FILENAME))
+
+
+def import_bson_collection(bson_dir, raw=False, num_workers=None):
+    """Imports a collection that was exported by
+    :func:`export_bson_collection`.
+
+    Shards are read and split into documents by a pool of worker threads
+    while the previously read documents are being consumed. At most
+    ``2 * num_workers`` shards are held in memory at a time.
+
+    Args:
+        bson_dir: the directory containing the shards
+        raw (False): whether to return ``bson.raw_bson.RawBSONDocument``
+            instances, which can be inserted into the database as-is,
+            rather than decoding the documents into dicts
+        num_workers (None): the number of worker threads to use to read
+            shards. By default, ``min(8, multiprocessing.cpu_count())`` is
+            used
+
+    Returns:
+        a tuple of
+
+        -   an iterable of BSON documents
+        -   the number of documents
+    """
+    if num_workers is None:
+        num_workers = min(8, multiprocessing.cpu_count())
+
+    index = etas.read_json(os.path.join(bson_dir, _BSON_INDEX_FILENAME))
+    shard_paths = [
+        os.path.join(bson_dir, s["filename"]) for s in index["shards"]
+    ]
+
+    docs = _iter_bson_shards(shard_paths, raw, num_workers)
+
+    return docs, index["num_docs"]
+
+
+def _iter_bson_shards(shard_paths, raw, num_workers):
+    if not shard_paths:
+        return
+
+    pending = deque()
+    shard_paths = iter(shard_paths)
+
+    with ThreadPool(processes=num_workers) as pool:
+        for shard_path in itertools.islice(shard_paths, 2 * num_workers):
+            pending.append(
+                pool.apply_async(_read_bson_shard, (shard_path, raw))
+            )
+
+        while pending:
+            docs = pending.popleft().get()
+
+            shard_path = next(shard_paths, None)
+            if shard_path is not None:
+                pending.append(
+                    pool.apply_async(_read_bson_shard, (shard_path, raw))
+                )
+
+            yield from docs
+
+
+def _write_bson_shard(docs, shard_path):
+    with open(shard_path, "wb") as f:
+        for doc in docs:
+            f.write(doc.raw)
+
+        return f.tell()
+
+
+def _read_bson_shard(shard_path, raw):
+    with open(shard_path, "rb") as f:
+        data = f.read()
+
+    if not raw:
+        return bson.decode_all(data)
+
+    docs = []
+    view = memoryview(data)
+    offset = 0
+    while offset < len(data):
+        (size,) = _BSON_SIZE.unpack_from(view, offset)
+        docs.append(RawBSONDocument(bytes(view[offset : offset + size])))
+        offset += size
+
+    return docs
+
+
 def insert_documents(docs, coll, ordered=False, progress=False, num_docs=None):
     """Inserts documents into a collection.
 
@@ -766,6 +1171,13 @@ def delete_dataset(name, dry_run=False):
         if not dry_run:
             conn.drop_collection(frame_collection_name)
 
+    selections_prefix = "selections.%s." % sample_collection_name
+    for coll_name in collections:
+        if coll_name.startswith(selections_prefix):
+            _logger.info("Dropping collection '%s'", coll_name)
+            if not dry_run:
+                conn.drop_collection(coll_name)
+
     delete_results = _get_result_ids(dataset_dict)
 
     if delete_results:
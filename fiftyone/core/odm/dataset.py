@@ -150,6 +150,7 @@ class SampleFieldDocument(EmbeddedDocument):
     fields = ListField(
         EmbeddedDocumentField(document_type="SampleFieldDocument")
     )
+    codec = StringField(null=True)
 
     def to_field(self):
         """Creates the :class:`fiftyone.core.fields.Field` specified by this
@@ -172,6 +173,10 @@ class SampleFieldDocument(EmbeddedDocument):
         if self.fields is not None:
             fields = [field_doc.to_field() for field_doc in list(self.fields)]
 
+        field_kwargs = {}
+        if self.codec is not None:
+            field_kwargs["codec"] = self.codec
+
         return create_field(
             self.name,
             ftype,
@@ -179,6 +184,7 @@ class SampleFieldDocument(EmbeddedDocument):
             subfield=subfield,
             db_field=self.db_field,
             fields=fields,
+            **field_kwargs,
         )
 
     @classmethod
@@ -204,6 +210,7 @@ class SampleFieldDocument(EmbeddedDocument):
             embedded_doc_type=embedded_doc_type,
             db_field=field.db_field,
             fields=cls._get_field_documents(field),
+            codec=getattr(field, "codec", None),
         )
 
     def matches_field(self, field):
@@ -20,6 +20,8 @@ import fiftyone.core.utils as fou
 
 from .utils import serialize_value, deserialize_value
 
+food = fou.lazy_import("fiftyone.core.odm.database")
+
 
 class SerializableDocument(object):
     """Mixin for documents that can be serialized in BSON or JSON format."""
@@ -517,6 +519,12 @@ class DynamicDocument(DynamicMixin, BaseDocument, mongoengine.DynamicDocument):
 
     meta = {"abstract": True}
 
+    @classmethod
+    def _get_db(cls):
+        # The database connection is established on first use
+        food._connect()
+        return super()._get_db()
+
 
 class Document(BaseDocument, mongoengine.Document):
     """Base class for documents that are stored in a MongoDB collection.
@@ -532,6 +540,12 @@ class Document(BaseDocument, mongoengine.Document):
 
     meta = {"abstract": True}
 
+    @classmethod
+    def _get_db(cls):
+        # The database connection is established on first use
+        food._connect()
+        return super()._get_db()
+
     def save(self, validate=True, clean=True, **kwargs):
         """Saves the document to the database.
 
@@ -0,0 +1,493 @@
+"""
+MongoDB aggregation pipeline optimization.
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+from collections import OrderedDict
+
+
+# Stages that output exactly one document per input document
+_ONE_TO_ONE_STAGES = ("$set", "$addFields", "$unset", "$project", "$lookup")
+
+# Query operators that can appear at the top-level of a `$match` stage
+_LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+
+# Expression operators that can implicitly reference the current document
+_ROOT_OPERATORS = ("$getField", "$setField", "$unsetField")
+
+
+def optimize_pipeline(pipeline):
+    """Rewrites the given MongoDB aggregation pipeline into an equivalent
+    pipeline that is cheaper to execute.
+
+    View stages compile into pipelines independently of one another, so a
+    compiled view often contains stages in an order that prevents MongoDB
+    from using indexes or that performs expensive work on documents that are
+    later discarded. This method applies the following semantics-preserving
+    rewrites:
+
+    -   ``$match`` stages are split into their conjuncts, and each conjunct
+        is moved ahead of any preceding ``$set``, ``$addFields``,
+        ``$unset``, ``$project``, ``$lookup``, or ``$sort`` stages that do
+        not modify the fields it references. Adjacent ``$match`` stages are
+        then fused into a single stage
+    -   ``$sort`` stages are moved ahead of any preceding ``$set``,
+        ``$addFields``, ``$unset``, or ``$lookup`` stages that do not modify
+        the fields being sorted
+    -   ``$limit`` and ``$skip`` stages are moved ahead of any preceding
+        stages that output one document per input document, so that they
+        can be coalesced with a preceding ``$sort`` and so that fewer
+        documents flow through the skipped stages
+    -   Simple ``$project`` stages are moved ahead of any preceding
+        ``$set``, ``$addFields``, or ``$unset`` stages whose inputs they
+        retain, and fields that are computed but then immediately projected
+        away are removed entirely
+
+    Stages that the optimizer does not understand act as barriers that no
+    stage is moved across.
+
+    Args:
+        pipeline: a MongoDB aggregation pipeline (list of dicts)
+
+    Returns:
+        the optimized pipeline
+    """
+    pipeline = _split_matches(pipeline)
+
+    # Each rewrite moves a stage strictly earlier in the pipeline or removes
+    # a stage, so this loop terminates, but we guard against regressions
+    max_iters = len(pipeline) ** 2 + 1
+    for _ in range(max_iters):
+        if not _rewrite_pass(pipeline):
+            break
+
+    return _fuse_matches(pipeline)
+
+
+def _rewrite_pass(pipeline):
+    changed = False
+
+    idx = 1
+    while idx < len(pipeline):
+        stage = pipeline[idx]
+
+        prev_idx = idx - 1
+        if _get_op(stage) == "$match":
+            # Conjuncts commute, so a $match can move past preceding $match
+            # stages to the first stage that it can't be swapped with
+            while prev_idx > 0 and _get_op(pipeline[prev_idx]) == "$match":
+                prev_idx -= 1
+
+        stages = _rewrite(pipeline[prev_idx], stage)
+        if stages is None:
+            idx += 1
+            continue
+
+        skipped = pipeline[prev_idx + 1 : idx]
+        pipeline[prev_idx : idx + 1] = stages + skipped
+        changed = True
+
+        # The moved stage may be able to move even further
+        idx = max(prev_idx, 1)
+
+    return changed
+
+
+def _rewrite(prev, stage):
+    prev_op = _get_op(prev)
+    op = _get_op(stage)
+
+    if prev_op is None or op is None:
+        return None
+
+    if op == "$match":
+        if _can_hoist_match(prev_op, prev[prev_op], stage["$match"]):
+            return [stage, prev]
+
+        return None
+
+    if op == "$sort":
+        if _can_hoist_sort(prev_op, prev[prev_op], stage["$sort"]):
+            return [stage, prev]
+
+        return None
+
+    if op in ("$limit", "$skip"):
+        if prev_op in _ONE_TO_ONE_STAGES:
+            return [stage, prev]
+
+        return None
+
+    if op == "$project":
+        return _hoist_project(prev_op, prev[prev_op], stage)
+
+    return None
+
+
+def _get_op(stage):
+    if not isinstance(stage, dict) or len(stage) != 1:
+        return None
+
+    return next(iter(stage.keys()))
+
+
+###############################################################################
+# $match
+###############################################################################
+
+
+def _split_matches(pipeline):
+    _pipeline = []
+    for stage in pipeline:
+        if _get_op(stage) != "$match":
+            _pipeline.append(stage)
+            continue
+
+        query = stage["$match"]
+        if _get_query_fields(query) is None:
+            # Queries like $text must remain intact
+            _pipeline.append(stage)
+            continue
+
+        for conjunct in _split_query(query):
+            _pipeline.append({"$match": conjunct})
+
+    return _pipeline
+
+
+def _split_query(query):
+    conjuncts = []
+    for key, value in query.items():
+        if key == "$and" and isinstance(value, list):
+            for q in value:
+                if isinstance(q, dict):
+                    conjuncts.extend(_split_query(q))
+                else:
+                    conjuncts.append({"$and": [q]})
+        else:
+            conjuncts.append({key: value})
+
+    return conjuncts
+
+
+def _fuse_matches(pipeline):
+    _pipeline = []
+    for stage in pipeline:
+        if _get_op(stage) != "$match":
+            _pipeline.append(stage)
+            continue
+
+        query = stage["$match"]
+
+        if isinstance(query, dict) and not query:
+            # An empty $match is a no-op
+            continue
+
+        prev = _pipeline[-1] if _pipeline else None
+        if _get_op(prev) != "$match":
+            _pipeline.append(stage)
+            continue
+
+        _pipeline[-1] = {"$match": _merge_queries(prev["$match"], query)}
+
+    return _pipeline
+
+
+def _merge_queries(query1, query2):
+    if not set(query1.keys()) & set(query2.keys()):
+        query = OrderedDict(query1)
+        query.update(query2)
+        return dict(query)
+
+    conjuncts = []
+    for query in (query1, query2):
+        if list(query.keys()) == ["$and"]:
+            conjuncts.extend(query["$and"])
+        else:
+            conjuncts.append(query)
+
+    return {"$and": conjuncts}
+
+
+def _can_hoist_match(prev_op, prev_spec, query):
+    if prev_op not in _ONE_TO_ONE_STAGES and prev_op != "$sort":
+        return False
+
+    fields = _get_query_fields(query)
+    if fields is None:
+        return False
+
+    if prev_op == "$project":
+        spec = _parse_project(prev_spec)
+        if spec is None:
+            return False
+
+        return all(_is_kept(f, spec) for f in fields)
+
+    modified = _get_modified_fields(prev_op, prev_spec)
+    if modified is None:
+        return False
+
+    return not any(_overlaps(f, m) for f in fields for m in modified)
+
+
+def _get_query_fields(query):
+    # Returns the set of fields referenced by a query, or None if they cannot
+    # be determined
+    if not isinstance(query, dict):
+        return None
+
+    fields = set()
+    for key, value in query.items():
+        if key in _LOGICAL_OPERATORS:
+            if not isinstance(value, list):
+                return None
+
+            for q in value:
+                _fields = _get_query_fields(q)
+                if _fields is None:
+                    return None
+
+                fields.update(_fields)
+        elif key == "$expr":
+            _fields = _get_expr_fields(value)
+            if _fields is None:
+                return None
+
+            fields.update(_fields)
+        elif key == "$comment":
+            continue
+        elif key.startswith("$"):
+            # $text, $where, $jsonSchema, etc.
+            return None
+        else:
+            fields.add(key)
+
+    return fields
+
+
+###############################################################################
+# $sort
+###############################################################################
+
+
+def _can_hoist_sort(prev_op, prev_spec, sort):
+    if prev_op not in ("$set", "$addFields", "$unset", "$lookup"):
+        return False
+
+    if not isinstance(sort, dict):
+        return False
+
+    if not all(v in (1, -1) for v in sort.values()):
+        # Ex: {"$meta": "textScore"}
+        return False
+
+    modified = _get_modified_fields(prev_op, prev_spec)
+    if modified is None:
+        return False
+
+    return not any(_overlaps(f, m) for f in sort.keys() for m in modified)
+
+
+###############################################################################
+# $project
+###############################################################################
+
+
+def _hoist_project(prev_op, prev_spec, stage):
+    if prev_op not in ("$set", "$addFields", "$unset"):
+        return None
+
+    spec = _parse_project(stage["$project"])
+    if spec is None:
+        return None
+
+    if prev_op == "$unset":
+        unset_fields = _get_modified_fields(prev_op, prev_spec)
+        if unset_fields is None:
+            return None
+
+        keep = []
+        for field in unset_fields:
+            if _is_removed(field, spec):
+                continue
+
+            if not _is_kept(field, spec):
+                return None
+
+            keep.append(field)
+
+        if keep:
+            return [stage, {"$unset": keep}]
+
+        return [stage]
+
+    if not isinstance(prev_spec, dict):
+        return None
+
+    keep = OrderedDict()
+    for field, expr in prev_spec.items():
+        if _is_removed(field, spec):
+            # The field is computed and then immediately projected away
+            continue
+
+        if not _is_kept(field, spec):
+            return None
+
+        # After moving the projection, the expression must still be able to
+        # read all of its inputs
+        inputs = _get_expr_fields(expr)
+        if inputs is None or not all(_is_kept(f, spec) for f in inputs):
+            return None
+
+        keep[field] = expr
+
+    if keep:
+        return [stage, {prev_op: dict(keep)}]
+
+    return [stage]
+
+
+def _parse_project(project):
+    # Parses a projection that only includes/excludes fields into a
+    # `(is_inclusion, fields)` tuple, or returns None if the projection is
+    # not of this form
+    if not isinstance(project, dict) or not project:
+        return None
+
+    included = set()
+    excluded = set()
+    for field, value in project.items():
+        if isinstance(value, bool) or value in (0, 1):
+            if value:
+                included.add(field)
+            else:
+                excluded.add(field)
+        else:
+            # Computed fields, $slice, $elemMatch, nested specs, etc.
+            return None
+
+    if included - {"_id"} or (included and not excluded):
+        if excluded - {"_id"}:
+            return None
+
+        if "_id" not in excluded:
+            included.add("_id")
+
+        return True, included
+
+    return False, excluded
+
+
+def _is_kept(field, spec):
+    # Whether `field` has the same value before and after the projection
+    is_inclusion, fields = spec
+    if is_inclusion:
+        return _is_covered(field, fields)
+
+    return not any(_overlaps(field, f) for f in fields)
+
+
+def _is_removed(field, spec):
+    # Whether `field` does not exist at all after the projection
+    is_inclusion, fields = spec
+    if is_inclusion:
+        return not any(_overlaps(field, f) for f in fields)
+
+    return _is_covered(field, fields)
+
+
+###############################################################################
+# Field analysis
+###############################################################################
+
+
+def _get_modified_fields(op, spec):
+    # Returns the set of fields that a stage may add, modify, or remove, or
+    # None if they cannot be determined
+    if op in ("$set", "$addFields"):
+        if not isinstance(spec, dict):
+            return None
+
+        return set(spec.keys())
+
+    if op == "$unset":
+        if isinstance(spec, str):
+            return {spec}
+
+        if isinstance(spec, list) and all(isinstance(f, str) for f in spec):
+            return set(spec)
+
+        return None
+
+    if op == "$lookup":
+        if not isinstance(spec, dict) or "as" not in spec:
+            return None
+
+        return {spec["as"]}
+
+    if op == "$sort":
+        return set()
+
+    return None
+
+
+def _get_expr_fields(expr):
+    # Returns the set of fields referenced by an aggregation expression, or
+    # None if the expression may reference the entire document
+    if isinstance(expr, str):
+        if expr.startswith("$$"):
+            var = expr[2:].split(".", 1)[0]
+            if var in ("ROOT", "CURRENT"):
+                return None
+
+            return set()
+
+        if expr.startswith("$") and len(expr) > 1:
+            return {expr[1:]}
+
+        return set()
+
+    if isinstance(expr, dict):
+        fields = set()
+        for key, value in expr.items():
+            if key == "$literal":
+                continue
+
+            if key in _ROOT_OPERATORS:
+                return None
+
+            _fields = _get_expr_fields(value)
+            if _fields is None:
+                return None
+
+            fields.update(_fields)
+
+        return fields
+
+    if isinstance(expr, (list, tuple)):
+        fields = set()
+        for value in expr:
+            _fields = _get_expr_fields(value)
+            if _fields is None:
+                return None
+
+            fields.update(_fields)
+
+        return fields
+
+    return set()
+
+
+def _overlaps(field1, field2):
+    return (
+        field1 == field2
+        or field1.startswith(field2 + ".")
+        or field2.startswith(field1 + ".")
+    )
+
+
+def _is_covered(field, fields):
+    return any(field == f or field.startswith(f + ".") for f in fields)
@@ -50,7 +50,7 @@ from collections import OrderedDict
 import random
 
 import fiftyone.core.fields as fof
-import fiftyone.core.metadata as fom
+import fiftyone.core.metadata as fom  # registers the `Metadata` document
 import fiftyone.core.media as fomm
 import fiftyone.core.utils as fou
 
@@ -84,7 +84,9 @@ class DatasetSampleDocument(DatasetMixin, Document):
     id = fof.ObjectIdField(required=True, primary_key=True, db_field="_id")
     filepath = fof.StringField(required=True)
     tags = fof.ListField(fof.StringField())
-    metadata = fof.EmbeddedDocumentField(fom.Metadata, null=True)
+    # referenced by name so that `fiftyone.core.metadata` can be imported
+    # before this module without a circular import
+    metadata = fof.EmbeddedDocumentField("Metadata", null=True)
 
     _media_type = fof.StringField()
     _rand = fof.FloatField(default=_generate_rand)
@@ -120,6 +120,218 @@ def deserialize_value(value):
     return value
 
 
+def serialize_document_dict(d, document_type=None):
+    """Serializes a dict describing an embedded document into the BSON
+    representation that would be stored in the database, without
+    instantiating the document.
+
+    The dict may contain either the document's field names or their database
+    names as keys. Default values are populated for any missing fields, a new
+    ``_id`` is generated for documents that have IDs, and nested embedded
+    document dicts are recursively serialized.
+
+    Args:
+        d: a dict, which must contain a ``_cls`` key unless ``document_type``
+            is provided
+        document_type (None): the
+            :class:`fiftyone.core.odm.BaseEmbeddedDocument` type of the
+            document. Only used when ``d`` has no ``_cls`` key
+
+    Returns:
+        a BSON dict
+
+    Raises:
+        ValueError: if the document type cannot be determined
+    """
+    _cls = d.get("_cls", None)
+    if _cls is not None:
+        document_type = _document_registry[_cls]
+    elif document_type is None:
+        raise ValueError(
+            "Embedded document dicts must contain a '_cls' key; found %s" % d
+        )
+
+    fields, defaults = _get_document_spec(document_type)
+
+    sd = {}
+    for name, value in d.items():
+        field = fields.get(name, None)
+        if field is None:
+            # Dynamic attribute
+            sd[name] = _serialize_dict_value(value, None)
+        elif isinstance(field, fof.ObjectIdField):
+            sd[field.db_field] = _to_object_id(value)
+        else:
+            sd[field.db_field] = _serialize_dict_value(value, field)
+
+    sd["_cls"] = document_type.__name__
+
+    for db_field, make_default in defaults:
+        if db_field not in sd:
+            sd[db_field] = make_default()
+
+    return sd
+
+
+def _to_object_id(value):
+    if value is None:
+        return None
+
+    if isinstance(value, dict):
+        # Extended JSON
+        return ObjectId(value["$oid"])
+
+    return ObjectId(value)
+
+
+def _validate_dict_value(value, field):
+    # Validates a value serialized by `_serialize_dict_value()` against the
+    # given field without instantiating any documents
+    if value is None or field is None:
+        return
+
+    if isinstance(field, fof.EmbeddedDocumentField):
+        if not isinstance(value, dict):
+            field.error("Expected a dict; found %s" % type(value))
+
+        try:
+            document_type = _document_registry[value.get("_cls", None)]
+        except DocumentRegistryError:
+            document_type = None
+
+        if document_type is None or not issubclass(
+            document_type, field.document_type
+        ):
+            field.error(
+                "Expected a %s; found '%s'"
+                % (field.document_type.__name__, value.get("_cls", None))
+            )
+
+        fields, _ = _get_document_spec(document_type)
+        for name, _value in value.items():
+            if name != "_cls":
+                _validate_dict_value(_value, fields.get(name, None))
+
+        return
+
+    sub_field = getattr(field, "field", None)
+    if isinstance(sub_field, fof.EmbeddedDocumentField):
+        if isinstance(field, fof.DictField):
+            if not isinstance(value, dict):
+                field.error("Expected a dict; found %s" % type(value))
+
+            value = value.values()
+        elif not isinstance(value, list):
+            field.error("Expected a list; found %s" % type(value))
+
+        for _value in value:
+            _validate_dict_value(_value, sub_field)
+
+        return
+
+    if isinstance(value, six.binary_type) and isinstance(
+        field, (fof.VectorField, fof.ArrayField)
+    ):
+        # Serialized array
+        return
+
+    field.validate(value)
+
+
+def _serialize_dict_value(value, field):
+    if value is None or type(value) in _BSON_PRIMITIVES:
+        return value
+
+    if isinstance(value, dict) and not isinstance(value, SON):
+        if any(k in value for k in _EXTENDED_JSON_KEYS):
+            value = json_util.loads(json.dumps(value))
+        elif "_cls" in value:
+            return serialize_document_dict(value)
+        elif isinstance(field, fof.EmbeddedDocumentField):
+            return serialize_document_dict(
+                value, document_type=field.document_type
+            )
+
+    if isinstance(value, (list, tuple)):
+        if all(type(v) in _BSON_PRIMITIVES for v in value):
+            return list(value)
+
+        if isinstance(field, fof.ListField):
+            return [_serialize_dict_value(v, field.field) for v in value]
+
+    if isinstance(value, six.binary_type):
+        # Already serialized array
+        return value
+
+    if isinstance(field, (fof.VectorField, fof.ArrayField)):
+        # Respect the field's codec
+        return field.to_mongo(value)
+
+    return serialize_value(value)
+
+
+def _apply_array_codecs(d, doc, doc_cls):
+    # Documents that are not yet in a dataset serialize their arrays with the
+    # default codec, so we re-encode any top-level fields that declare a
+    # codec in the dataset's schema. Embedded documents already serialize
+    # their arrays via the fields declared by their own classes
+    if isinstance(doc, doc_cls):
+        return d
+
+    for field in doc_cls._fields.values():
+        if getattr(field, "codec", None) is None:
+            continue
+
+        if not doc.has_field(field.name):
+            continue
+
+        value = doc.get_field(field.name)
+        if value is not None:
+            d[field.db_field or field.name] = field.to_mongo(value)
+
+    return d
+
+
+def _get_document_spec(document_type):
+    spec = _document_specs.get(document_type, None)
+    if spec is not None:
+        return spec
+
+    # pylint: disable=no-member
+    fields = {}
+    defaults = []
+    for name, field in document_type._fields.items():
+        if name == "_cls":
+            continue
+
+        fields[name] = field
+        fields[field.db_field] = field
+
+        default = field.default
+        if default is None:
+            continue
+
+        if isinstance(field, fof.ObjectIdField):
+            make_default = ObjectId
+        elif callable(default):
+            make_default = default
+        else:
+            make_default = lambda default=default: default
+
+        defaults.append((field.db_field, make_default))
+
+    spec = (fields, defaults)
+    _document_specs[document_type] = spec
+    return spec
+
+
+_document_specs = {}
+
+_EXTENDED_JSON_KEYS = ("$oid", "$binary", "$date")
+
+_BSON_PRIMITIVES = (str, int, float, bool)
+
+
 def validate_field_name(field_name, media_type=None, is_frame_field=False):
     """Verifies that the given field name is valid.
 
@@ -195,6 +407,10 @@ def get_field_kwargs(field):
         "null": field.null,
     }
 
+    if isinstance(field, (fof.VectorField, fof.ArrayField)):
+        if field.codec is not None:
+            kwargs["codec"] = field.codec
+
     if isinstance(field, (fof.ListField, fof.DictField)):
         field = field.field
         if field is not None:
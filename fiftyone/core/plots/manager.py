@@ -6,6 +6,7 @@ Session plot manager.
 |
 """
 import datetime
+import hashlib
 import itertools
 import logging
 
@@ -16,6 +17,7 @@ import eta.core.utils as etau
 import fiftyone.core.clips as foc
 from fiftyone.core.expressions import ViewField as F
 import fiftyone.core.patches as fop
+import fiftyone.core.stages as fosg
 import fiftyone.core.video as fov
 
 from .base import ResponsivePlot, ViewPlot, InteractivePlot
@@ -52,10 +54,22 @@ class PlotManager(object):
         points in the plot corresponding to all labels in the view are selected
         in the plot
 
+    When more than :attr:`PlotManager.MAX_INLINE_IDS` samples, frames, or
+    patches are selected in a plot, the selection is stored as a
+    ``"plot.<hash>"`` selection set of the dataset (see
+    :meth:`fiftyone.core.dataset.Dataset.create_selection_set`), so that the
+    session's view only references the set rather than containing every
+    selected ID. Sets are named by a hash of the selected IDs, so views that
+    reference them are never affected by later selections. The sets that a
+    manager creates are deleted once the session's view no longer references
+    them, and when the manager is disconnected.
+
     Args:
         session: a :class:`fiftyone.core.session.Session`
     """
 
+    MAX_INLINE_IDS = 1000
+
     _MIN_UPDATE_DELTA_SECONDS = 1
 
     def __init__(self, session):
@@ -68,6 +82,7 @@ class PlotManager(object):
         self._last_session_view = None
         self._last_update = None
         self._last_updates = {}
+        self._selection_sets = []
         self._connected = False
         self._disconnected = False
 
@@ -357,6 +372,8 @@ class PlotManager(object):
         for name in self._plots:
             self._disconnect_plot(name)
 
+        self._delete_selection_sets()
+
         self._last_update = None
         self._last_updates = {}
         self._connected = False
@@ -398,6 +415,7 @@ class PlotManager(object):
         if self._session.view == self._last_session_view:
             return
 
+        self._delete_selection_sets(view=self._session.view)
         self._update_ids_from_session()
         self._update_plots_from_session()
 
@@ -428,10 +446,10 @@ class PlotManager(object):
                 plot_view, (fop.PatchesView, fov.FramesView, foc.ClipsView)
             ):
                 # Create a view that only contains the selected samples
-                plot_view = plot_view.select_by("sample_id", ids)
+                plot_view = self._select(plot_view, ids, field="sample_id")
             else:
                 # Create a view that only contains the selected samples
-                plot_view = plot_view.select(ids)
+                plot_view = self._select(plot_view, ids)
 
             # This plot is linked to samples, so we already know exactly which
             # IDs to use
@@ -453,7 +471,7 @@ class PlotManager(object):
             # Update `plot_view` to only contain the right content
             if isinstance(plot_view, fov.FramesView):
                 # Create a view that only contains the selected frames
-                plot_view = plot_view.select(ids)
+                plot_view = self._select(plot_view, ids)
             elif plot.selection_mode == "select":
                 # Create a view that only contains the selected frames
                 plot_view = plot_view.select_frames(ids)
@@ -504,7 +522,7 @@ class PlotManager(object):
             elif plot.selection_mode == "patches":
                 if isinstance(plot_view, fop.PatchesView):
                     # Create a view that only contains the selected labels
-                    plot_view = plot_view.select(ids)
+                    plot_view = self._select(plot_view, ids)
                 else:
                     # We shouldn't actually get here, since `plot_view` should
                     # have been a `PatchesView`...
@@ -549,8 +567,50 @@ class PlotManager(object):
         self._current_frame_ids = frame_ids
         self._current_labels = labels
         self._update_session(plot_view)
+        self._delete_selection_sets(view=self._session.view)
         self._update_plots_from_session(exclude=[name])
 
+    def _select(self, plot_view, ids, field=None):
+        if len(ids) <= self.MAX_INLINE_IDS:
+            if field is None:
+                return plot_view.select(ids)
+
+            return plot_view.select_by(field, ids)
+
+        # Large selections are stored in the database so that the view only
+        # references them by name. Sets are named by their contents, so a set
+        # is never modified once a view references it
+        dataset = plot_view._root_dataset
+        set_name = "plot." + _get_ids_hash(ids)
+        if not dataset.has_selection_set(set_name):
+            dataset.create_selection_set(ids, name=set_name)
+            self._selection_sets.append((dataset, set_name))
+
+        return plot_view.select_set(set_name, field=field)
+
+    def _delete_selection_sets(self, view=None):
+        # Deletes the selection sets created by this manager, except for any
+        # that are referenced by the given view
+        if view is not None:
+            dataset_name = view._root_dataset.name
+            keep = set(
+                stage.name
+                for stage in view._stages
+                if isinstance(stage, fosg.SelectSet)
+            )
+        else:
+            dataset_name = None
+            keep = set()
+
+        selection_sets = []
+        for dataset, set_name in self._selection_sets:
+            if dataset.name == dataset_name and set_name in keep:
+                selection_sets.append((dataset, set_name))
+            elif not dataset.deleted and dataset.has_selection_set(set_name):
+                dataset.delete_selection_set(set_name)
+
+        self._selection_sets = selection_sets
+
     def _update_ids_from_session(self):
         session = self._session
         current_view = session._collection.view()
@@ -763,3 +823,8 @@ class PlotManager(object):
             self._last_updates[name] = now
 
         return ready
+
+
+def _get_ids_hash(ids):
+    ids_str = "\n".join(sorted(str(_id) for _id in ids))
+    return hashlib.sha1(ids_str.encode()).hexdigest()
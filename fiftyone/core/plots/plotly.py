@@ -15,6 +15,7 @@ import numpy as np
 from PIL import ImageColor
 import plotly.colors as pc
 import plotly.express as px
+from plotly.callbacks import BoxSelector, LassoSelector
 import plotly.graph_objects as go
 import sklearn.linear_model as skl
 import sklearn.metrics as skm
@@ -30,6 +31,7 @@ import fiftyone.core.utils as fou
 import fiftyone.core.video as fov
 
 from .base import Plot, InteractivePlot, ResponsivePlot
+from .utils import GridIndex
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +44,7 @@ _DEFAULT_LAYOUT = dict(
 _DEFAULT_LINE_COLOR = "#FF6D04"
 _DEFAULT_CONTINUOUS_COLORSCALE = "viridis"
 _MAX_LABEL_TRACES = 25
+_LOD_MAX_POINTS = 100000
 
 
 def plot_confusion_matrix(
@@ -992,6 +995,8 @@ def scatterplot(
     edges_title=None,
     show_colorbar_title=None,
     axis_equal=False,
+    lod=None,
+    max_points=None,
     **kwargs,
 ):
     """Generates an interactive scatterplot of the given points.
@@ -1008,6 +1013,11 @@ def scatterplot(
     You can use the ``labels`` parameters to define a coloring for the points,
     and you can use the ``sizes`` parameter to scale the sizes of the points.
 
+    Large 2D scatterplots are rendered in level-of-detail mode via
+    :class:`InteractiveLODScatter`, which only sends a subsample of the points
+    in the current viewport to the plot and resolves selections against all
+    points.
+
     Args:
         points: a ``num_points x num_dims`` array-like of points
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
@@ -1084,12 +1094,21 @@ def scatterplot(
             ``labels_title`` or an appropriate default can be inferred from
             the ``labels`` parameter
         axis_equal (False): whether to set the axes to equal scale
+        lod (None): whether to render the points in level-of-detail mode. Only
+            applicable to 2D points when ``sizes``, ``edges``, and ``figure``
+            are not provided. In this mode, all points are rendered in a
+            single trace. By default, this mode is used when there are more
+            than ``max_points`` points
+        max_points (None): the maximum number of points to render at once in
+            level-of-detail mode. The default is 100,000
         **kwargs: optional keyword arguments for
             :meth:`plotly:plotly.graph_objects.Figure.update_layout`
 
     Returns:
         one of the following
 
+        -   an :class:`InteractiveLODScatter`, for 2D points rendered in
+            level-of-detail mode
         -   an :class:`InteractiveScatter`, for 2D points and when IDs are
             available
         -   a :class:`PlotlyNotebookPlot`, if you're working in a Jupyter
@@ -1118,6 +1137,65 @@ def scatterplot(
         points, samples, ids, link_field, labels, sizes, edges, classes
     )
 
+    if max_points is None:
+        max_points = _LOD_MAX_POINTS
+
+    supports_lod = (
+        num_dims == 2 and sizes is None and edges is None and figure is None
+    )
+
+    if lod is None:
+        lod = supports_lod and len(points) > max_points
+    elif lod and not supports_lod:
+        raise ValueError(
+            "Level-of-detail mode is only supported for 2D points when no "
+            "`sizes`, `edges`, or `figure` are provided"
+        )
+
+    if lod:
+        figure, colors = _plot_scatter_lod(
+            points,
+            labels,
+            classes,
+            categorical,
+            ids,
+            max_points,
+            marker_size,
+            colorscale,
+            log_colorscale,
+            trace_title,
+            labels_title,
+            colorbar_title,
+            axis_equal,
+        )
+
+        figure.update_layout(**_DEFAULT_LAYOUT)
+        figure.update_layout(title=title, **kwargs)
+
+        (
+            link_type,
+            label_fields,
+            selection_mode,
+            init_fcn,
+        ) = InteractiveLODScatter.recommend_link_type(
+            label_field=link_field,
+            samples=samples,
+        )
+
+        return InteractiveLODScatter(
+            figure,
+            points,
+            ids=ids,
+            colors=colors,
+            text=labels if categorical else None,
+            max_points=max_points,
+            link_type=link_type,
+            init_view=samples,
+            label_fields=label_fields,
+            selection_mode=selection_mode,
+            init_fcn=init_fcn,
+        )
+
     if categorical:
         if multi_trace is None:
             multi_trace = len(classes) <= _MAX_LABEL_TRACES
@@ -2128,6 +2206,252 @@ class InteractiveScatter(PlotlyInteractivePlot):
         return ready
 
 
+class InteractiveLODScatter(PlotlyInteractivePlot):
+    """An interactive Plotly scatterplot of 2D points that renders a
+    level-of-detail representation of the points so that it can scale to
+    millions of points.
+
+    At most ``max_points`` points are rendered at once. When the current
+    viewport contains more points than this, the viewport is divided into a
+    grid and one point from each occupied cell is rendered, so that sparse
+    regions and outliers remain visible while dense regions are thinned.
+    Whenever the plot is zoomed or panned, the rendered points are recomputed
+    for the new viewport.
+
+    Lasso and box selections are resolved against all points, including
+    those that are not currently rendered, via a
+    :class:`fiftyone.core.plots.utils.GridIndex`.
+
+    The first scatter trace of ``figure`` is used to render the points. Its
+    ``x``, ``y``, ``customdata``, ``text``, and ``marker.color`` attributes
+    are populated by this class.
+
+    Args:
+        figure: a :class:`plotly:plotly.graph_objects.Figure` containing a
+            scatter trace
+        points: a ``num_points x 2`` array-like of points
+        ids (None): an array-like of IDs corresponding to the points. If not
+            provided, points cannot be selected
+        colors (None): an optional array-like of per-point numeric marker
+            colors
+        text (None): an optional array-like of per-point text
+        max_points (None): the maximum number of points to render at once.
+            The default is 100,000
+        **kwargs: keyword arguments for the
+            :class:`fiftyone.core.plots.base.InteractivePlot` constructor
+    """
+
+    def __init__(
+        self,
+        figure,
+        points,
+        ids=None,
+        colors=None,
+        text=None,
+        max_points=None,
+        **kwargs,
+    ):
+        if max_points is None:
+            max_points = _LOD_MAX_POINTS
+
+        if ids is not None:
+            ids = np.asarray(ids)
+
+        if colors is not None:
+            colors = np.asarray(colors)
+
+        if text is not None:
+            text = np.asarray(text)
+
+        self.max_points = max_points
+
+        self._figure = figure
+        self._index = GridIndex(points, seed=51)
+        self._ids = ids
+        self._colors = colors
+        self._text = text
+        self._id_order = None
+        self._sorted_ids = None
+        self._trace = None
+        self._curr_inds = None
+        self._curr_ranges = None
+        self._selected_inds = None
+
+        if ids is not None:
+            self._id_order = np.argsort(ids, kind="stable")
+            self._sorted_ids = ids[self._id_order]
+
+        widget = self._make_widget()
+
+        super().__init__(widget, **kwargs)
+
+    @property
+    def supports_session_updates(self):
+        return True
+
+    @property
+    def _selected_ids(self):
+        if self._selected_inds is None or self._ids is None:
+            return None
+
+        return self._ids[self._selected_inds].tolist()
+
+    def _make_widget(self):
+        widget = go.FigureWidget(self._figure)
+
+        self._trace = widget.data[0]
+        self._curr_ranges = None
+
+        with widget.batch_update():
+            self._set_ranges(widget, *self._get_full_ranges())
+
+        widget.layout.on_change(
+            self._on_relayout,
+            "xaxis.range",
+            "yaxis.range",
+            "xaxis.autorange",
+            "yaxis.autorange",
+        )
+
+        return widget
+
+    def _connect(self):
+        def _on_selection(trace, points, selector):
+            self._on_selection(points, selector)
+
+        def _on_deselect(trace, points):
+            self._select_inds(None)
+
+        with self._widget.batch_update():
+            self._trace.on_selection(_on_selection)
+            self._trace.on_deselect(_on_deselect)
+
+    def _disconnect(self):
+        with self._widget.batch_update():
+            self._trace.on_selection(None)
+            self._trace.on_deselect(None)
+
+    def _reopen(self):
+        self._widget = self._make_widget()
+
+    def _select_ids(self, ids, view=None):
+        if ids is None or self._ids is None:
+            self._selected_inds = None
+        else:
+            self._selected_inds = self._get_inds(ids)
+
+        self._update_selected_points()
+
+    def _on_selection(self, points, selector):
+        if isinstance(selector, BoxSelector):
+            inds = self._index.query_box(selector.xrange, selector.yrange)
+        elif isinstance(selector, LassoSelector):
+            inds = self._index.query_polygon(selector.xs, selector.ys)
+        else:
+            # Ex: clicks, which can only select rendered points
+            inds = np.sort(self._curr_inds[list(points.point_inds)])
+
+        self._select_inds(inds)
+
+    def _select_inds(self, inds):
+        self._selected_inds = inds
+        self._update_selected_points()
+
+        if self._selection_callback is not None:
+            self._selection_callback(self.selected_ids)
+
+    def _on_relayout(self, layout, xrange, yrange, xauto, yauto):
+        if xauto or yauto:
+            # Autoranging would only consider the rendered points
+            full_xrange, full_yrange = self._get_full_ranges()
+            if xauto:
+                xrange = full_xrange
+
+            if yauto:
+                yrange = full_yrange
+
+            self._set_ranges(self._widget, xrange, yrange)
+            return
+
+        if xrange is None or yrange is None:
+            return
+
+        self._render(xrange, yrange)
+
+    def _set_ranges(self, widget, xrange, yrange):
+        widget.layout.xaxis.update(range=xrange, autorange=False)
+        widget.layout.yaxis.update(range=yrange, autorange=False)
+        self._render(xrange, yrange, widget=widget)
+
+    def _render(self, xrange, yrange, widget=None):
+        if widget is None:
+            widget = self._widget
+
+        ranges = (tuple(xrange), tuple(yrange))
+        if ranges == self._curr_ranges:
+            return
+
+        self._curr_ranges = ranges
+
+        inds = self._index.sample(self.max_points, xrange, yrange)
+        self._curr_inds = inds
+
+        points = self._index.points[inds]
+
+        with widget.batch_update():
+            self._trace.x = points[:, 0]
+            self._trace.y = points[:, 1]
+
+            if self._ids is not None:
+                self._trace.customdata = self._ids[inds]
+
+            if self._colors is not None:
+                self._trace.marker.color = self._colors[inds]
+
+            if self._text is not None:
+                self._trace.text = self._text[inds]
+
+            self._update_selected_points()
+
+    def _update_selected_points(self):
+        if self._curr_inds is None:
+            return
+
+        if self._selected_inds is None:
+            self._trace.selectedpoints = None
+            return
+
+        # Both index arrays are sorted
+        inds = np.searchsorted(self._selected_inds, self._curr_inds)
+        inds = np.minimum(inds, max(len(self._selected_inds) - 1, 0))
+        if len(self._selected_inds) > 0:
+            found = self._selected_inds[inds] == self._curr_inds
+        else:
+            found = np.zeros(len(self._curr_inds), dtype=bool)
+
+        self._trace.selectedpoints = np.flatnonzero(found).tolist()
+
+    def _get_inds(self, ids):
+        # Binary search over the sorted IDs avoids per-point dicts
+        ids = np.asarray(ids, dtype=self._sorted_ids.dtype)
+        if len(ids) == 0 or len(self._sorted_ids) == 0:
+            return np.array([], dtype=int)
+
+        inds = np.searchsorted(self._sorted_ids, ids)
+        inds = np.minimum(inds, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[inds] == ids
+
+        return np.unique(self._id_order[inds[found]])
+
+    def _get_full_ranges(self):
+        ranges = []
+        for vmin, vmax in self._index.bounds:
+            pad = 0.05 * (vmax - vmin) if vmax > vmin else 1.0
+            ranges.append([vmin - pad, vmax + pad])
+
+        return ranges
+
+
 class InteractiveHeatmap(PlotlyInteractivePlot):
     """An interactive Plotly heatmap.
 
@@ -2766,6 +3090,86 @@ def _plot_scatter_numeric(
     return figure
 
 
+def _plot_scatter_lod(
+    points,
+    labels,
+    classes,
+    categorical,
+    ids,
+    max_points,
+    marker_size,
+    colorscale,
+    log_colorscale,
+    trace_title,
+    labels_title,
+    colorbar_title,
+    axis_equal,
+):
+    # The figure is initialized with a random subset of the points, which
+    # InteractiveLODScatter replaces with the points in the current viewport
+    num_points = len(points)
+    inds = np.random.default_rng(51).permutation(num_points)[:max_points]
+
+    if labels is not None and not categorical and num_points > 0:
+        # Log colorscales are computed relative to the maximum value
+        inds = np.union1d(inds, [np.argmax(labels), np.argmin(labels)])
+
+    inds = np.sort(inds)
+
+    _ids = ids[inds] if ids is not None else None
+
+    if categorical:
+        # Vectorized version of `classes.index(label)`
+        _classes, _inds = np.unique(labels, return_inverse=True)
+        lut = np.array([classes.index(c) for c in _classes], dtype=int)
+        colors = lut[_inds]
+
+        figure = _plot_scatter_categorical_single_trace(
+            points[inds],
+            labels[inds],
+            classes,
+            None,
+            None,
+            _ids,
+            None,
+            marker_size,
+            trace_title,
+            labels_title,
+            None,
+            None,
+            colorbar_title,
+            axis_equal,
+        )
+    else:
+        colors = labels
+
+        figure = _plot_scatter_numeric(
+            points[inds],
+            labels[inds] if labels is not None else None,
+            None,
+            None,
+            _ids,
+            None,
+            marker_size,
+            colorscale,
+            log_colorscale,
+            trace_title,
+            labels_title,
+            None,
+            None,
+            colorbar_title,
+            axis_equal,
+        )
+
+        if labels is not None and num_points > 0:
+            # Fix the color limits so that colors don't change on zoom
+            figure.update_traces(
+                marker=dict(cmin=labels.min(), cmax=labels.max())
+            )
+
+    return figure, colors
+
+
 def _plot_scatter_mapbox_categorical(
     coords,
     labels,
@@ -85,3 +85,200 @@ def pad_icon(img, pad, fill=0):
     img_pad = np.full((h + 2 * pad, w + 2 * pad, c), fill, dtype=img.dtype)
     img_pad[pad : (pad + h), pad : (pad + w), :] = img
     return img_pad
+
+
+class GridIndex(object):
+    """A spatial index of 2D points that supports efficient box and polygon
+    queries and level-of-detail sampling.
+
+    The bounding box of the points is divided into a uniform grid, and the
+    point indices are sorted by grid cell so that the points in any
+    rectangular region can be found by slicing a few contiguous ranges of a
+    single array rather than scanning all points.
+
+    Args:
+        points: a ``num_points x 2`` array-like of points
+        points_per_cell (16): the desired average number of points per grid
+            cell
+        seed (None): an optional random seed to use when assigning the
+            sampling priorities of the points
+    """
+
+    def __init__(self, points, points_per_cell=16, seed=None):
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError("Expected a num_points x 2 array of points")
+
+        num_points = len(points)
+
+        if num_points > 0:
+            mins = points.min(axis=0)
+            maxs = points.max(axis=0)
+        else:
+            mins = np.zeros(2)
+            maxs = np.zeros(2)
+
+        num_cells = int(np.sqrt(num_points / max(points_per_cell, 1)))
+        num_cells = min(max(num_cells, 1), _MAX_GRID_CELLS)
+
+        self.points = points
+        self.bounds = (
+            (float(mins[0]), float(maxs[0])),
+            (float(mins[1]), float(maxs[1])),
+        )
+
+        self._mins = mins
+        self._cell_size = np.maximum(maxs - mins, 1e-12) / num_cells
+        self._num_cells = num_cells
+
+        keys = self._get_keys(points)
+        self._order = np.argsort(keys, kind="stable")
+        self._offsets = np.searchsorted(
+            keys[self._order], np.arange(num_cells**2 + 1)
+        )
+
+        # Points with lower priorities are preferred when sampling. Fixing
+        # the priorities makes sampling deterministic, so points tend to stay
+        # visible as the query box shrinks
+        rng = np.random.default_rng(seed)
+        self._by_priority = rng.permutation(num_points)
+        self._priority = np.empty(num_points, dtype=int)
+        self._priority[self._by_priority] = np.arange(num_points)
+
+    def __len__(self):
+        return len(self.points)
+
+    def query_box(self, xrange, yrange):
+        """Returns the indices of the points in the given box.
+
+        Args:
+            xrange: a ``(xmin, xmax)`` tuple
+            yrange: a ``(ymin, ymax)`` tuple
+
+        Returns:
+            a sorted array of point indices
+        """
+        xmin, xmax = sorted(xrange)
+        ymin, ymax = sorted(yrange)
+
+        inds = self._get_candidates(xmin, xmax, ymin, ymax)
+        x = self.points[inds, 0]
+        y = self.points[inds, 1]
+        found = (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+        return np.sort(inds[found])
+
+    def query_polygon(self, xs, ys):
+        """Returns the indices of the points in the given polygon.
+
+        Args:
+            xs: the x coordinates of the polygon's vertices
+            ys: the y coordinates of the polygon's vertices
+
+        Returns:
+            a sorted array of point indices
+        """
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        if len(xs) < 3:
+            return np.array([], dtype=int)
+
+        inds = self._get_candidates(xs.min(), xs.max(), ys.min(), ys.max())
+        x = self.points[inds, 0]
+        y = self.points[inds, 1]
+
+        # Even-odd rule: count the edges crossed by a ray cast from each point
+        inside = np.zeros(len(inds), dtype=bool)
+        for x1, y1, x2, y2 in zip(xs, ys, np.roll(xs, 1), np.roll(ys, 1)):
+            crosses = (y1 > y) != (y2 > y)
+            if not crosses.any():
+                continue
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xint = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+
+            inside ^= crosses & (x < xint)
+
+        return np.sort(inds[inside])
+
+    def sample(self, max_points, xrange=None, yrange=None):
+        """Returns the indices of at most ``max_points`` points in the given
+        box that are spread evenly over the box.
+
+        If the box contains more than ``max_points`` points, it is divided
+        into a grid with at most ``max_points`` cells, and one point from
+        each occupied cell is returned. Sparse regions and outliers are
+        therefore always represented, while dense regions are thinned.
+
+        Args:
+            max_points: the maximum number of points to return
+            xrange (None): an optional ``(xmin, xmax)`` tuple. By default, the
+                full extent of the points is used
+            yrange (None): an optional ``(ymin, ymax)`` tuple. By default, the
+                full extent of the points is used
+
+        Returns:
+            a sorted array of point indices
+        """
+        if xrange is None:
+            xrange = self.bounds[0]
+
+        if yrange is None:
+            yrange = self.bounds[1]
+
+        inds = self.query_box(xrange, yrange)
+        if len(inds) <= max_points:
+            return inds
+
+        xmin, xmax = sorted(xrange)
+        ymin, ymax = sorted(yrange)
+
+        res = max(int(np.sqrt(max_points)), 1)
+        cx = (self.points[inds, 0] - xmin) / max(xmax - xmin, 1e-12) * res
+        cy = (self.points[inds, 1] - ymin) / max(ymax - ymin, 1e-12) * res
+        cx = np.clip(cx.astype(int), 0, res - 1)
+        cy = np.clip(cy.astype(int), 0, res - 1)
+
+        # Keep the point with the lowest priority in each cell
+        best = np.full(res * res, len(self.points), dtype=int)
+        np.minimum.at(best, cy * res + cx, self._priority[inds])
+        best = best[best < len(self.points)]
+
+        return np.sort(self._by_priority[best])
+
+    def _get_keys(self, points):
+        cells = np.floor((points - self._mins) / self._cell_size).astype(int)
+        cells = np.clip(cells, 0, self._num_cells - 1)
+        return cells[:, 1] * self._num_cells + cells[:, 0]
+
+    def _get_cell_range(self, vmin, vmax, dim):
+        n = self._num_cells
+        size = self._cell_size[dim]
+        c0 = int(np.clip(np.floor((vmin - self._mins[dim]) / size), 0, n - 1))
+        c1 = int(np.clip(np.floor((vmax - self._mins[dim]) / size), 0, n - 1))
+        return c0, c1
+
+    def _get_candidates(self, xmin, xmax, ymin, ymax):
+        (x0, x1), (y0, y1) = self.bounds
+        if len(self.points) == 0 or xmax < x0 or xmin > x1:
+            return np.array([], dtype=int)
+
+        if ymax < y0 or ymin > y1:
+            return np.array([], dtype=int)
+
+        cx0, cx1 = self._get_cell_range(xmin, xmax, 0)
+        cy0, cy1 = self._get_cell_range(ymin, ymax, 1)
+
+        # Each row of cells is a contiguous range of the sorted points
+        n = self._num_cells
+        chunks = []
+        for cy in range(cy0, cy1 + 1):
+            start = self._offsets[cy * n + cx0]
+            stop = self._offsets[cy * n + cx1 + 1]
+            chunks.append(self._order[start:stop])
+
+        return np.concatenate(chunks)
+
+
+# The maximum number of grid cells per dimension of a GridIndex
+_MAX_GRID_CELLS = 1024
@@ -181,6 +181,23 @@ class _SampleMixin(object):
                 encountered to the dataset schema. If False, an error is raised
                 if any fields are not in the dataset schema
         """
+        self._add_labels(
+            labels,
+            label_field=label_field,
+            confidence_thresh=confidence_thresh,
+            expand_schema=expand_schema,
+        )
+
+        if self._in_db:
+            self.save()
+
+    def _add_labels(
+        self,
+        labels,
+        label_field=None,
+        confidence_thresh=None,
+        expand_schema=True,
+    ):
         if isinstance(label_field, dict):
             label_key = lambda k: label_field.get(k, k)
         elif label_field is not None:
@@ -240,9 +257,6 @@ class _SampleMixin(object):
             # Single sample-level field
             self.set_field(label_field, labels, create=expand_schema)
 
-        if self._in_db:
-            self.save()
-
     def merge(
         self,
         sample,
@@ -0,0 +1,375 @@
+"""
+Mergeable sketches for approximate aggregations.
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+from collections import defaultdict
+import math
+
+import numpy as np
+
+
+class QuantileSketch(object):
+    """A mergeable sketch of a distribution of numeric values that supports
+    quantile and histogram queries with relative accuracy guarantees.
+
+    This is an implementation of
+    `DDSketch <https://arxiv.org/abs/1908.10693>`_. Values are assigned to
+    logarithmically-spaced bins so that any quantile returned by the sketch is
+    within ``relative_accuracy`` of the true quantile's value, regardless of
+    the number of values that were added. Because a bin depends only on its
+    value, bin counts can be computed by a MongoDB ``$group`` stage (see
+    :meth:`get_bin_expr`) and sketches of disjoint collections can be merged
+    exactly via :meth:`merge`.
+
+    Args:
+        relative_accuracy (0.01): the relative accuracy of the sketch
+        zero_threshold (1e-9): the smallest absolute value that is
+            distinguished from zero
+    """
+
+    def __init__(self, relative_accuracy=0.01, zero_threshold=1e-9):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(
+                "Relative accuracy must be in (0, 1); found %s"
+                % relative_accuracy
+            )
+
+        self.relative_accuracy = relative_accuracy
+        self.zero_threshold = zero_threshold
+
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._ln_gamma = math.log(self._gamma)
+        self._bins = defaultdict(int)
+        self._count = 0
+        self._min = None
+        self._max = None
+
+    @property
+    def count(self):
+        """The number of values in the sketch."""
+        return self._count
+
+    @property
+    def min(self):
+        """The minimum value in the sketch, or None if it is empty."""
+        return self._min
+
+    @property
+    def max(self):
+        """The maximum value in the sketch, or None if it is empty."""
+        return self._max
+
+    def get_bin_expr(self, value):
+        """Returns a MongoDB aggregation expression that computes the bin of
+        the given numeric value, as expected by :meth:`add_bins`.
+
+        Args:
+            value: a MongoDB aggregation expression that resolves to a finite
+                numeric value
+
+        Returns:
+            a MongoDB aggregation expression
+        """
+        abs_value = {"$abs": value}
+        key = {"$ceil": {"$divide": [{"$ln": abs_value}, self._ln_gamma]}}
+        return {
+            "$cond": [
+                {"$lt": [abs_value, self.zero_threshold]},
+                {"s": 0, "k": 0},
+                {"s": {"$cond": [{"$gt": [value, 0]}, 1, -1]}, "k": key},
+            ]
+        }
+
+    def add(self, values):
+        """Adds the given values to the sketch.
+
+        Args:
+            values: an iterable of finite numeric values
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return
+
+        abs_values = np.abs(values)
+        is_zero = abs_values < self.zero_threshold
+
+        signs = np.where(is_zero, 0, np.sign(values)).astype(int)
+        keys = np.zeros(values.shape, dtype=int)
+        keys[~is_zero] = np.ceil(np.log(abs_values[~is_zero]) / self._ln_gamma)
+
+        bins = np.stack([signs, keys], axis=1)
+        bins, counts = np.unique(bins, axis=0, return_counts=True)
+        self.add_bins(
+            [(s, k, c) for (s, k), c in zip(bins.tolist(), counts.tolist())],
+            min_value=float(values.min()),
+            max_value=float(values.max()),
+        )
+
+    def add_bins(self, bins, min_value=None, max_value=None):
+        """Adds the given bin counts to the sketch.
+
+        Args:
+            bins: an iterable of ``(sign, key, count)`` tuples, where
+                ``{"s": sign, "k": key}`` is the output of
+                :meth:`get_bin_expr`
+            min_value (None): the minimum value that was binned, if known
+            max_value (None): the maximum value that was binned, if known
+        """
+        for sign, key, count in bins:
+            self._bins[(int(sign), int(key))] += count
+            self._count += count
+
+        if min_value is not None:
+            if self._min is None or min_value < self._min:
+                self._min = min_value
+
+        if max_value is not None:
+            if self._max is None or max_value > self._max:
+                self._max = max_value
+
+    def merge(self, other):
+        """Merges the given sketch into this sketch.
+
+        Args:
+            other: a :class:`QuantileSketch` with the same relative accuracy
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+
+        self.add_bins(
+            [(s, k, c) for (s, k), c in other._bins.items()],
+            min_value=other.min,
+            max_value=other.max,
+        )
+
+    def quantiles(self, quantiles):
+        """Returns the approximate quantiles of the values in the sketch.
+
+        The ``q`` quantile is the value at index
+        ``max(ceil(q * count) - 1, 0)`` of the sorted values.
+
+        Args:
+            quantiles: an iterable of quantiles in ``[0, 1]``
+
+        Returns:
+            a list of quantiles, or a list of ``None`` if the sketch is empty
+        """
+        if self._count == 0:
+            return [None] * len(quantiles)
+
+        keys, values, counts = self._get_sorted_bins()
+        cumsum = np.cumsum(counts)
+
+        results = []
+        for q in quantiles:
+            rank = max(math.ceil(q * self._count) - 1, 0)
+            idx = int(np.searchsorted(cumsum, rank, side="right"))
+            value = values[min(idx, len(values) - 1)]
+            results.append(float(self._clip(value)))
+
+        return results
+
+    def histogram(self, edges):
+        """Returns the approximate counts of the values in the sketch in the
+        given bins.
+
+        Args:
+            edges: a monotonically increasing list of bin edges. Each bin is
+                treated as having an inclusive lower boundary and exclusive
+                upper boundary
+
+        Returns:
+            a tuple of
+
+            -   **counts**: a list of counts in each bin
+            -   **other**: the number of values outside of the bins
+        """
+        num_bins = len(edges) - 1
+        counts = np.zeros(num_bins, dtype=int)
+        if self._count == 0:
+            return counts.tolist(), 0
+
+        _, values, bin_counts = self._get_sorted_bins()
+        values = self._clip(values)
+
+        inds = np.searchsorted(edges, values, side="right") - 1
+        valid = (inds >= 0) & (inds < num_bins)
+        np.add.at(counts, inds[valid], bin_counts[valid])
+        other = int(bin_counts[~valid].sum())
+
+        return counts.tolist(), other
+
+    def _clip(self, values):
+        # The exact bounds of the values are tighter than the bins' values
+        if self._min is not None:
+            values = np.maximum(values, self._min)
+
+        if self._max is not None:
+            values = np.minimum(values, self._max)
+
+        return values
+
+    def _get_sorted_bins(self):
+        keys = sorted(self._bins.keys(), key=self._sort_key)
+        values = np.array([self._get_value(s, k) for s, k in keys])
+        counts = np.array([self._bins[key] for key in keys])
+        return keys, values, counts
+
+    def _sort_key(self, sign_key):
+        sign, key = sign_key
+        return sign, sign * key
+
+    def _get_value(self, sign, key):
+        if sign == 0:
+            return 0.0
+
+        # The value in the bin with minimal relative error
+        return sign * 2 * self._gamma**key / (self._gamma + 1)
+
+
+class CardinalitySketch(object):
+    """A mergeable sketch that estimates the number of distinct values in a
+    collection.
+
+    This is an implementation of
+    `HyperLogLog <https://en.wikipedia.org/wiki/HyperLogLog>`_ whose inputs
+    are 64-bit hashes, which can be computed by MongoDB via
+    ``$toHashedIndexKey``. The register updates can be computed by a MongoDB
+    ``$group`` stage (see :meth:`get_register_expr` and
+    :meth:`get_rank_expr`), and sketches of disjoint collections can be
+    merged exactly via :meth:`merge`.
+
+    The standard error of the estimate is ``1.04 / sqrt(2 ** precision)``,
+    which is about 0.8% for the default precision.
+
+    Args:
+        precision (14): the number of hash bits used to select a register.
+            Must be in ``[4, 18]``
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError(
+                "Precision must be in [4, 18]; found %s" % precision
+            )
+
+        self.precision = precision
+
+        self._num_registers = 2**precision
+        self._num_rank_bits = 64 - precision
+        self._registers = np.zeros(self._num_registers, dtype=np.uint8)
+
+    def get_register_expr(self, hash_expr):
+        """Returns a MongoDB aggregation expression that computes the
+        register of the given hash.
+
+        Args:
+            hash_expr: a MongoDB aggregation expression that resolves to a
+                64-bit integer hash
+
+        Returns:
+            a MongoDB aggregation expression
+        """
+        m = self._num_registers
+        return {"$mod": [{"$add": [{"$mod": [hash_expr, m]}, m]}, m]}
+
+    def get_rank_expr(self, hash_expr):
+        """Returns a MongoDB aggregation expression that computes the rank of
+        the given hash, i.e., the position of the leftmost 1 bit in the hash
+        bits that are not used to select a register.
+
+        Args:
+            hash_expr: a MongoDB aggregation expression that resolves to a
+                64-bit integer hash
+
+        Returns:
+            a MongoDB aggregation expression
+        """
+        offset = 2 ** (self._num_rank_bits - 1)
+        value = {
+            "$max": [
+                {
+                    "$add": [
+                        {
+                            "$floor": {
+                                "$divide": [hash_expr, self._num_registers]
+                            }
+                        },
+                        offset,
+                    ]
+                },
+                1,
+            ]
+        }
+        return {
+            "$subtract": [
+                self._num_rank_bits,
+                {"$floor": {"$log": [value, 2]}},
+            ]
+        }
+
+    def add_hashes(self, hashes):
+        """Adds the given hashes to the sketch.
+
+        Args:
+            hashes: an iterable of signed 64-bit integer hashes
+        """
+        hashes = np.asarray(hashes, dtype=np.int64).ravel()
+        if hashes.size == 0:
+            return
+
+        registers = np.mod(hashes, self._num_registers)
+        values = np.floor_divide(hashes, self._num_registers)
+        values = values + 2 ** (self._num_rank_bits - 1)
+        values = np.maximum(values, 1).astype(float)
+        ranks = self._num_rank_bits - np.floor(np.log2(values))
+
+        self.add_registers(zip(registers.tolist(), ranks.tolist()))
+
+    def add_registers(self, registers):
+        """Adds the given register values to the sketch.
+
+        Args:
+            registers: an iterable of ``(register, rank)`` tuples
+        """
+        for register, rank in registers:
+            register = int(register)
+            rank = min(int(rank), 255)
+            if rank > self._registers[register]:
+                self._registers[register] = rank
+
+    def merge(self, other):
+        """Merges the given sketch into this sketch.
+
+        Args:
+            other: a :class:`CardinalitySketch` with the same precision
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precisions")
+
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def estimate(self):
+        """Returns the estimated number of distinct values.
+
+        Returns:
+            the estimated count
+        """
+        m = self._num_registers
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        registers = self._registers.astype(float)
+        estimate = alpha * m**2 / np.sum(2.0**-registers)
+
+        num_zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and num_zeros > 0:
+            # Small range correction via linear counting
+            estimate = m * math.log(m / num_zeros)
+
+        return int(round(estimate))
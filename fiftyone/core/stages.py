@@ -8,13 +8,15 @@ View stages.
 from collections import defaultdict, OrderedDict
 import contextlib
 from copy import deepcopy
+import functools
 import itertools
+import logging
 import random
 import reprlib
 import uuid
 import warnings
 
-from bson import ObjectId
+from bson import json_util, ObjectId
 import numpy as np
 
 import eta.core.utils as etau
@@ -41,6 +43,15 @@ fovi = fou.lazy_import("fiftyone.core.video")
 foug = fou.lazy_import("fiftyone.utils.geojson")
 
 
+logger = logging.getLogger(__name__)
+
+# The maximum number of generated patches/clips/frames datasets that are
+# tracked for reuse by subsequent conversions of the same collection
+_MAX_GENERATED_DATASETS = 16
+_NUM_FINGERPRINT_BUCKETS = 1024
+_generated_datasets = OrderedDict()
+
+
 class ViewStage(object):
     """Abstract base class for all view stages.
 
@@ -5683,6 +5694,102 @@ class SelectLabels(ViewStage):
             self._pipeline = self._make_pipeline(sample_collection)
 
 
+class SelectSet(ViewStage):
+    """Selects the samples whose IDs are in the given selection set.
+
+    Selection sets are created via
+    :meth:`fiftyone.core.dataset.Dataset.create_selection_set` and are stored
+    in the database, so this stage only contains the name of the set, and the
+    selection is performed by joining against the set in the database.
+
+    Examples::
+
+        import fiftyone as fo
+        import fiftyone.zoo as foz
+        from fiftyone import ViewField as F
+
+        dataset = foz.load_zoo_dataset("quickstart")
+
+        ids = dataset.match(F("uniqueness") > 0.5).values("id")
+        dataset.create_selection_set(ids, name="unique")
+
+        stage = fo.SelectSet("unique")
+        view = dataset.add_stage(stage)
+        print(len(view))
+
+    Args:
+        name: the name of a selection set of the collection's dataset
+        field (None): an optional ID field or ``embedded.field.name`` whose
+            values to look up in the selection set. By default, the IDs of
+            the samples in the collection are used
+    """
+
+    def __init__(self, name, field=None):
+        self._name = name
+        self._field = field
+
+    @property
+    def name(self):
+        """The name of the selection set."""
+        return self._name
+
+    @property
+    def field(self):
+        """The ID field whose values to look up in the selection set."""
+        return self._field
+
+    def to_mongo(self, sample_collection):
+        if self._field is not None:
+            path, _, _ = sample_collection._handle_id_fields(self._field)
+        else:
+            path = "_id"
+
+        dataset = sample_collection._root_dataset
+        coll_name = dataset._get_selection_set_collection_name(self._name)
+
+        # The lookup uses the `_id` index of the selection set's collection
+        return [
+            {
+                "$lookup": {
+                    "from": coll_name,
+                    "localField": path,
+                    "foreignField": "_id",
+                    "as": "_selection_set",
+                }
+            },
+            {"$match": {"_selection_set": {"$ne": []}}},
+            {"$unset": "_selection_set"},
+        ]
+
+    def _kwargs(self):
+        return [["name", self._name], ["field", self._field]]
+
+    @classmethod
+    def _params(cls):
+        return [
+            {"name": "name", "type": "str", "placeholder": "name"},
+            {
+                "name": "field",
+                "type": "NoneType|field|str",
+                "default": "None",
+                "placeholder": "field (default=None)",
+            },
+        ]
+
+    def validate(self, sample_collection):
+        dataset = sample_collection._root_dataset
+        if not dataset.has_selection_set(self._name):
+            raise ValueError(
+                "Dataset '%s' has no selection set '%s'"
+                % (dataset.name, self._name)
+            )
+
+        if self._field is not None:
+            _, is_id, _ = sample_collection._handle_id_fields(self._field)
+            if not is_id:
+                raise ValueError("Field '%s' is not an ID field" % self._field)
+
+
 class Shuffle(ViewStage):
     """Randomly shuffles the samples in a collection.
 
@@ -6004,7 +6111,18 @@ class SortBy(ViewStage):
 
         if etau.is_str(field_or_expr):
             sample_collection.validate_fields_exist(field_or_expr)
-            sample_collection.create_index(field_or_expr)
+            _create_sort_index(sample_collection, field_or_expr)
+
+
+def _create_sort_index(sample_collection, field):
+    # Sample fields are indexed together with their IDs, so that the index
+    # also breaks ties, which allows sorted samples to be paginated via range
+    # queries
+    _field, is_frame_field = sample_collection._handle_frame_field(field)
+    if is_frame_field or _field in ("id", "_id"):
+        sample_collection.create_index(field)
+    else:
+        sample_collection.create_index([(field, 1), ("id", 1)])
 
 
 def _serialize_sort_expr(field_or_expr):
@@ -6413,14 +6531,23 @@ class ToPatches(ViewStage):
 
         if state != last_state or not fod.dataset_exists(name):
             kwargs = self._config or {}
-            patches_dataset = fop.make_patches_dataset(
-                sample_collection, self._field, **kwargs
+            make_dataset = functools.partial(
+                fop.make_patches_dataset, field=self._field, **kwargs
             )
 
             # Other views may use the same generated dataset, so reuse the old
             # name if possible
-            if name is not None and state == last_state:
-                patches_dataset.name = name
+            if state != last_state:
+                name = None
+
+            patches_dataset = _load_generated_dataset(
+                self,
+                sample_collection,
+                state,
+                make_dataset,
+                src_id_field=_get_patches_src_id_field(sample_collection),
+                name=name,
+            )
 
             state["name"] = patches_dataset.name
             self._state = state
@@ -6556,14 +6683,25 @@ class ToEvaluationPatches(ViewStage):
 
         if state != last_state or not fod.dataset_exists(name):
             kwargs = self._config or {}
-            eval_patches_dataset = fop.make_evaluation_patches_dataset(
-                sample_collection, self._eval_key, **kwargs
+            make_dataset = functools.partial(
+                fop.make_evaluation_patches_dataset,
+                eval_key=self._eval_key,
+                **kwargs,
             )
 
             # Other views may use the same generated dataset, so reuse the old
             # name if possible
-            if name is not None and state == last_state:
-                eval_patches_dataset.name = name
+            if state != last_state:
+                name = None
+
+            eval_patches_dataset = _load_generated_dataset(
+                self,
+                sample_collection,
+                state,
+                make_dataset,
+                src_id_field=_get_patches_src_id_field(sample_collection),
+                name=name,
+            )
 
             state["name"] = eval_patches_dataset.name
             self._state = state
@@ -6713,14 +6851,35 @@ class ToClips(ViewStage):
 
         if state != last_state or not fod.dataset_exists(name):
             kwargs = self._config or {}
-            clips_dataset = focl.make_clips_dataset(
-                sample_collection, self._field_or_expr, **kwargs
+            make_dataset = functools.partial(
+                focl.make_clips_dataset,
+                field_or_expr=self._field_or_expr,
+                **kwargs,
             )
 
+            # Manually defined clips are specified relative to the samples of
+            # the input collection, so they cannot be regenerated per-sample
+            if (
+                isinstance(self._field_or_expr, (list, tuple))
+                or sample_collection._dataset._is_clips
+            ):
+                src_id_field = None
+            else:
+                src_id_field = "_sample_id"
+
             # Other views may use the same generated dataset, so reuse the old
             # name if possible
-            if name is not None and state == last_state:
-                clips_dataset.name = name
+            if state != last_state:
+                name = None
+
+            clips_dataset = _load_generated_dataset(
+                self,
+                sample_collection,
+                state,
+                make_dataset,
+                src_id_field=src_id_field,
+                name=name,
+            )
 
             state["name"] = clips_dataset.name
             self._state = state
@@ -6907,14 +7066,28 @@ class ToFrames(ViewStage):
 
         if state != last_state or not fod.dataset_exists(name):
             kwargs = self._config or {}
-            frames_dataset = fovi.make_frames_dataset(
-                sample_collection, **kwargs
+            make_dataset = functools.partial(
+                fovi.make_frames_dataset, **kwargs
             )
 
+            if sample_collection._dataset._is_clips:
+                src_id_field = None
+            else:
+                src_id_field = "_sample_id"
+
             # Other views may use the same generated dataset, so reuse the old
             # name if possible
-            if name is not None and state == last_state:
-                frames_dataset.name = name
+            if state != last_state:
+                name = None
+
+            frames_dataset = _load_generated_dataset(
+                self,
+                sample_collection,
+                state,
+                make_dataset,
+                src_id_field=src_id_field,
+                name=name,
+            )
 
             state["name"] = frames_dataset.name
             self._state = state
@@ -7186,6 +7359,181 @@ def _get_default_similarity_run(sample_collection):
     return brain_key
 
 
+def _load_generated_dataset(
+    stage,
+    sample_collection,
+    state,
+    make_dataset,
+    src_id_field=None,
+    name=None,
+):
+    # Generated datasets are cached by the state of the stage that generated
+    # them, so subsequent conversions of the same collection can reuse them.
+    # If the source collection has changed since the dataset was generated,
+    # a new dataset is built that only regenerates the contents of modified
+    # samples. Existing datasets are never modified, since other views may
+    # still be using them
+    config = state.get("config", None) or {}
+    if config.get("name", None) is not None:
+        return make_dataset(sample_collection)
+
+    key = json_util.dumps([etau.get_class_name(stage), state], sort_keys=True)
+    schema = _get_schema_fingerprint(sample_collection)
+
+    dataset = None
+
+    entry = _generated_datasets.pop(key, None)
+    if entry is not None:
+        last_name, last_schema, last_fingerprints = entry
+        if last_schema == schema and fod.dataset_exists(last_name):
+            fingerprints = _compute_fingerprints(sample_collection)
+            buckets = _get_changed_buckets(fingerprints, last_fingerprints)
+
+            if not buckets:
+                dataset = fod.load_dataset(last_name)
+            elif src_id_field is not None and 2 * len(buckets) <= len(
+                fingerprints
+            ):
+                # Otherwise it is cheaper to regenerate the dataset
+                dataset = _refresh_generated_dataset(
+                    fod.load_dataset(last_name),
+                    sample_collection,
+                    make_dataset,
+                    buckets,
+                    src_id_field,
+                )
+
+    if dataset is None:
+        dataset = make_dataset(sample_collection)
+        if name is not None:
+            dataset.name = name
+
+    # Computed after generation, since generating frames datasets may modify
+    # the source collection
+    fingerprints = _compute_fingerprints(sample_collection)
+
+    _generated_datasets[key] = (dataset.name, schema, fingerprints)
+    while len(_generated_datasets) > _MAX_GENERATED_DATASETS:
+        _generated_datasets.popitem(last=False)
+
+    return dataset
+
+
+def _refresh_generated_dataset(
+    dataset, sample_collection, make_dataset, buckets, src_id_field
+):
+    logger.info(
+        "Regenerating %d/%d buckets of samples...",
+        len(buckets),
+        _NUM_FINGERPRINT_BUCKETS,
+    )
+
+    bucket_expr = _get_bucket_expr("$_id")
+    changed_view = sample_collection.mongo(
+        [{"$match": {"$expr": {"$in": [bucket_expr, buckets]}}}]
+    )
+    new_dataset = make_dataset(changed_view)
+
+    # Contents are gathered in the order of the source collection, from the
+    # new dataset for samples in changed buckets and from the existing
+    # dataset otherwise
+    new_coll_name = new_dataset._sample_collection_name
+    sample_collection._aggregate(
+        pipeline=[
+            {"$project": {"_id": True}},
+            {
+                "$lookup": {
+                    "from": dataset._sample_collection_name,
+                    "localField": "_id",
+                    "foreignField": src_id_field,
+                    "as": "_old",
+                }
+            },
+            {
+                "$lookup": {
+                    "from": new_coll_name,
+                    "localField": "_id",
+                    "foreignField": src_id_field,
+                    "as": "_new",
+                }
+            },
+            {
+                "$project": {
+                    "_docs": {
+                        "$cond": [
+                            {"$in": [bucket_expr, buckets]},
+                            "$_new",
+                            "$_old",
+                        ]
+                    }
+                }
+            },
+            {"$unwind": "$_docs"},
+            {"$replaceRoot": {"newRoot": "$_docs"}},
+            {"$out": new_coll_name},
+        ]
+    )
+
+    return new_dataset
+
+
+def _compute_fingerprints(sample_collection):
+    # Sums the hashes of the source documents, including their frames, in
+    # buckets of sample IDs. This is done in the database so that documents
+    # need not be loaded, and changes can still be localized to buckets
+    fingerprints = {}
+    for d in sample_collection._aggregate(
+        pipeline=[
+            {
+                "$group": {
+                    "_id": _get_bucket_expr("$_id"),
+                    "hash": {
+                        "$sum": {"$toDecimal": {"$toHashedIndexKey": "$$ROOT"}}
+                    },
+                    "count": {"$sum": 1},
+                }
+            }
+        ],
+        attach_frames=True,
+    ):
+        fingerprints[d["_id"]] = (d["hash"].to_decimal(), d["count"])
+
+    return fingerprints
+
+
+def _get_changed_buckets(fingerprints, last_fingerprints):
+    buckets = set(fingerprints.keys()) | set(last_fingerprints.keys())
+    return sorted(
+        b
+        for b in buckets
+        if fingerprints.get(b, None) != last_fingerprints.get(b, None)
+    )
+
+
+def _get_bucket_expr(id_expr):
+    return {"$mod": [{"$toHashedIndexKey": id_expr}, _NUM_FINGERPRINT_BUCKETS]}
+
+
+def _get_patches_src_id_field(sample_collection):
+    # Patches of frames views record the source frame in `frame_id`
+    if sample_collection._is_frames:
+        return "_frame_id"
+
+    return "_sample_id"
+
+
+def _get_schema_fingerprint(sample_collection):
+    schema = sample_collection.get_field_schema()
+    frame_schema = sample_collection.get_frame_field_schema() or {}
+    return json_util.dumps(
+        [
+            {k: str(v) for k, v in schema.items()},
+            {k: str(v) for k, v in frame_schema.items()},
+        ],
+        sort_keys=True,
+    )
+
+
 class _ViewStageRepr(reprlib.Repr):
     def repr_ViewExpression(self, expr, level):
         return self.repr1(expr.to_mongo(), level=level - 1)
@@ -7232,6 +7580,7 @@ _STAGES = [
     SelectGroups,
     SelectGroupSlices,
     SelectLabels,
+    SelectSet,
     SetField,
     Skip,
     SortBy,
@@ -7263,6 +7612,7 @@ _STAGES_THAT_SELECT_OR_REORDER = {
     MatchTags,
     Select,
     SelectBy,
+    SelectSet,
     Skip,
     Take,
 }
@@ -11,9 +11,6 @@ from socket import gaierror
 import threading
 import uuid
 
-from httpx import HTTPError
-import universal_analytics as ua
-
 import fiftyone as fo
 import fiftyone.constants as foc
 from fiftyone.core.context import _get_context
@@ -74,6 +71,11 @@ def log_import_if_allowed(test=False):
     if multiprocessing.current_process().name != "MainProcess":
         return
 
+    # The HTTP client is imported here so that its import cost is only paid
+    # when tracking is enabled
+    from httpx import HTTPError
+    import universal_analytics as ua
+
     if test:
         uid, first_import = "test", False
     else:
@@ -81,9 +83,13 @@ def log_import_if_allowed(test=False):
 
     kind = "new" if first_import else "returning"
 
+    # The client is created in the main thread because it imports modules
+    # that cannot be imported once the interpreter has begun shutting down
+    request = ua.HTTPRequest()
+
     def send_import_event():
         try:
-            with ua.HTTPRequest() as http:
+            with request as http:
                 tracker = ua.Tracker(foc.UA_ID, http, client_id=uid)
                 tracker.send(
                     "event",
@@ -22,10 +22,12 @@ import ntpath
 import os
 import posixpath
 import platform
+import queue
 import signal
 import struct
 import subprocess
 import sys
+import threading
 import timeit
 import types
 from xml.parsers.expat import ExpatError
@@ -1252,20 +1254,42 @@ def compute_filehash(filepath, method=None, chunk_size=None):
     return hasher.hexdigest()
 
 
-def serialize_numpy_array(array, ascii=False):
+def serialize_numpy_array(array, ascii=False, codec=None):
     """Serializes a numpy array.
 
+    The following codecs are supported:
+
+    -   ``"zlib"`` (default): zlib-compressed bytes generated by
+        ``numpy.save``
+    -   ``"raw"``: the uncompressed little-endian array bytes, prefixed by a
+        compact header that records the array's dtype and shape. This format
+        is larger on disk but can be decoded via ``numpy.frombuffer`` without
+        any decompression
+
     Args:
         array: a numpy array-like
         ascii (False): whether to return a base64-encoded ASCII string instead
             of raw bytes
+        codec (None): the codec to use. Supported values are
+            ``("zlib", "raw")``. The default is ``"zlib"``
 
     Returns:
         the serialized bytes
     """
-    with io.BytesIO() as f:
-        np.save(f, np.asarray(array), allow_pickle=False)
-        bytes_str = zlib.compress(f.getvalue())
+    if codec is None:
+        codec = "zlib"
+
+    if codec == "raw":
+        bytes_str = _serialize_raw_numpy_array(np.asarray(array))
+    elif codec == "zlib":
+        with io.BytesIO() as f:
+            np.save(f, np.asarray(array), allow_pickle=False)
+            bytes_str = zlib.compress(f.getvalue())
+    else:
+        raise ValueError(
+            "Unsupported codec '%s'; supported values are %s"
+            % (codec, _NUMPY_CODECS)
+        )
 
     if ascii:
         bytes_str = b64encode(bytes_str).decode("ascii")
@@ -1277,6 +1301,12 @@ def deserialize_numpy_array(numpy_bytes, ascii=False):
     """Loads a serialized numpy array generated by
     :func:`serialize_numpy_array`.
 
+    The codec that was used to serialize the array is automatically detected.
+
+    Arrays that were serialized with the ``"raw"`` codec are decoded without
+    copying, so the returned array shares memory with ``numpy_bytes`` and is
+    read-only if ``numpy_bytes`` is immutable.
+
     Args:
         numpy_bytes: the serialized numpy array bytes
         ascii (False): whether the bytes were generated with the
@@ -1288,10 +1318,110 @@ def deserialize_numpy_array(numpy_bytes, ascii=False):
     if ascii:
         numpy_bytes = b64decode(numpy_bytes.encode("ascii"))
 
+    if _is_raw_numpy_bytes(numpy_bytes):
+        dtype, shape, offset = _parse_raw_numpy_header(numpy_bytes)
+        return np.frombuffer(numpy_bytes, dtype=dtype, offset=offset).reshape(
+            shape
+        )
+
     with io.BytesIO(zlib.decompress(numpy_bytes)) as f:
         return np.load(f)
 
 
+def deserialize_numpy_arrays(numpy_bytes_list, ascii=False):
+    """Loads a list of serialized numpy arrays generated by
+    :func:`serialize_numpy_array` and stacks them into a single contiguous
+    array.
+
+    All arrays must have the same shape and dtype. When all arrays were
+    serialized with the ``"raw"`` codec, their contents are decoded directly
+    into the output array without materializing the individual arrays.
+
+    Args:
+        numpy_bytes_list: a list of serialized numpy array bytes
+        ascii (False): whether the bytes were generated with the
+            ``ascii == True`` parameter of :func:`serialize_numpy_array`
+
+    Returns:
+        a numpy array whose first dimension indexes the input arrays
+    """
+    if ascii:
+        numpy_bytes_list = [
+            b64decode(b.encode("ascii")) for b in numpy_bytes_list
+        ]
+
+    if not numpy_bytes_list:
+        return np.empty(0)
+
+    first = numpy_bytes_list[0]
+    if _is_raw_numpy_bytes(first):
+        dtype, shape, offset = _parse_raw_numpy_header(first)
+        header = first[:offset]
+        if all(b[:offset] == header for b in numpy_bytes_list):
+            data = bytearray().join(
+                memoryview(b)[offset:] for b in numpy_bytes_list
+            )
+            return np.frombuffer(data, dtype=dtype).reshape(
+                (len(numpy_bytes_list),) + shape
+            )
+
+    return np.stack([deserialize_numpy_array(b) for b in numpy_bytes_list])
+
+
+_NUMPY_CODECS = ("zlib", "raw")
+
+# zlib streams never begin with a null byte, so this prefix unambiguously
+# identifies arrays that were serialized with the "raw" codec
+_RAW_NUMPY_MAGIC = b"\x00FOA"
+_RAW_NUMPY_VERSION = 1
+
+
+def _serialize_raw_numpy_array(array):
+    if array.dtype.hasobject or array.dtype.names is not None:
+        raise ValueError(
+            "The 'raw' codec does not support arrays with dtype %s"
+            % array.dtype
+        )
+
+    dtype = array.dtype.newbyteorder("<")
+    array = array.astype(dtype, order="C", copy=False)
+    dtype_str = dtype.str.encode("ascii")
+
+    header = struct.pack(
+        "<4sBB%dsB%dQ" % (len(dtype_str), array.ndim),
+        _RAW_NUMPY_MAGIC,
+        _RAW_NUMPY_VERSION,
+        len(dtype_str),
+        dtype_str,
+        array.ndim,
+        *array.shape,
+    )
+
+    return header + array.tobytes()
+
+
+def _is_raw_numpy_bytes(numpy_bytes):
+    return numpy_bytes[:4] == _RAW_NUMPY_MAGIC
+
+
+def _parse_raw_numpy_header(numpy_bytes):
+    version, dtype_len = struct.unpack_from("<BB", numpy_bytes, 4)
+    if version != _RAW_NUMPY_VERSION:
+        raise ValueError("Unsupported raw array version %d" % version)
+
+    offset = 6
+    dtype_str = bytes(numpy_bytes[offset : offset + dtype_len])
+    offset += dtype_len
+
+    (ndim,) = struct.unpack_from("<B", numpy_bytes, offset)
+    offset += 1
+
+    shape = struct.unpack_from("<%dQ" % ndim, numpy_bytes, offset)
+    offset += 8 * ndim
+
+    return np.dtype(dtype_str.decode("ascii")), tuple(shape), offset
+
+
 def iter_batches(iterable, batch_size):
     """Iterates over the given iterable in batches.
 
@@ -1339,6 +1469,67 @@ def iter_slices(sliceable, batch_size):
         yield chunk
 
 
+def iter_prefetch(iterable, max_prefetch=2):
+    """Iterates over the given iterable, eagerly generating up to
+    ``max_prefetch`` of its elements in a background thread.
+
+    This is useful when generating elements is expensive and the consumer of
+    the elements spends time waiting on I/O, since the two can then overlap.
+
+    Any exception raised while generating elements is re-raised by this
+    generator when the corresponding element is requested.
+
+    Args:
+        iterable: an iterable
+        max_prefetch (2): the maximum number of elements to generate ahead of
+            the consumer
+
+    Returns:
+        a generator that emits the elements of the input
+    """
+    items = queue.Queue(maxsize=max_prefetch)
+    done = threading.Event()
+
+    def _put(item):
+        while not done.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put((True, item)):
+                    return
+        except Exception as e:
+            _put((False, e))
+            return
+
+        _put(None)
+
+    thread = threading.Thread(target=_produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            entry = items.get()
+            if entry is None:
+                break
+
+            success, item = entry
+            if not success:
+                raise item
+
+            yield item
+    finally:
+        done.set()
+        thread.join()
+
+
 def call_on_exit(callback):
     """Registers the given callback function so that it will be called when the
     process exits for (almost) any reason
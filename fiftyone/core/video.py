@@ -426,6 +426,7 @@ def make_frames_dataset(
     rel_dir=None,
     frames_patt=None,
     force_sample=False,
+    num_workers=None,
     skip_failures=True,
     verbose=False,
     name=None,
@@ -548,6 +549,9 @@ def make_frames_dataset(
             ``fiftyone.config.default_sequence_idx + fiftyone.config.default_image_ext``
         force_sample (False): whether to resample videos whose sampled frames
             already exist. Only applicable when ``sample_frames=True``
+        num_workers (None): the number of videos to sample concurrently. By
+            default, videos are sampled serially. Only applicable when
+            ``sample_frames=True``
         skip_failures (True): whether to gracefully continue without raising
             an error if a video cannot be sampled
         verbose (False): whether to log information about the frames that will
@@ -613,22 +617,58 @@ def make_frames_dataset(
             ids_to_sample, ordered=True
         )
 
-        fouv.sample_videos(
+        # Each video's frames are merged into the frames dataset as soon as
+        # the video has been sampled
+        if sample_collection._dataset._is_clips:
+            id_path = "_sample_id"
+        else:
+            id_path = "_id"
+
+        def _merge_video_frames(sample):
+            video_view = sample_collection.mongo(
+                [{"$match": {id_path: sample._id}}]
+            )
+            _merge_frames(video_view, dataset, sample_frames)
+
+        fouv._transform_videos(
             to_sample_view,
-            output_dir=output_dir,
-            rel_dir=rel_dir,
-            frames_patt=frames_patt,
             frames=frames_to_sample,
             size=size,
             min_size=min_size,
             max_size=max_size,
+            sample_frames=True,
             original_frame_numbers=True,
-            force_sample=True,
+            frames_patt=frames_patt,
+            force_reencode=True,
+            output_dir=output_dir,
+            rel_dir=rel_dir,
             save_filepaths=True,
+            num_workers=num_workers,
             skip_failures=skip_failures,
+            finalize_fcn=_merge_video_frames,
+        )
+
+    # Merge frame data of all videos, including those that were not sampled
+    _merge_frames(sample_collection, dataset, sample_frames)
+
+    # Delete samples for frames without filepaths
+    if sample_frames == True:
+        dataset._sample_collection.delete_many({"filepath": None})
+
+    if sample_frames == False and not dataset:
+        logger.warning(
+            "Your frames view is empty. Note that you must either "
+            "pre-populate the `filepath` field on the frames of your video "
+            "collection or pass `sample_frames=True` to this method to "
+            "perform the sampling. See "
+            "https://voxel51.com/docs/fiftyone/user_guide/using_views.html#frame-views "
+            "for more information."
         )
 
-    # Merge frame data
+    return dataset
+
+
+def _merge_frames(sample_collection, dataset, sample_frames):
     pipeline = sample_collection._pipeline(frames_only=True)
 
     if sample_frames == "dynamic":
@@ -647,22 +687,6 @@ def make_frames_dataset(
 
     sample_collection._dataset._aggregate(pipeline=pipeline)
 
-    # Delete samples for frames without filepaths
-    if sample_frames == True:
-        dataset._sample_collection.delete_many({"filepath": None})
-
-    if sample_frames == False and not dataset:
-        logger.warning(
-            "Your frames view is empty. Note that you must either "
-            "pre-populate the `filepath` field on the frames of your video "
-            "collection or pass `sample_frames=True` to this method to "
-            "perform the sampling. See "
-            "https://voxel51.com/docs/fiftyone/user_guide/using_views.html#frame-views "
-            "for more information."
-        )
-
-    return dataset
-
 
 def _make_pretty_summary(dataset):
     set_fields = ["id", "sample_id", "filepath", "frame_number"]
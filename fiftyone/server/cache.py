@@ -0,0 +1,237 @@
+"""
+FiftyOne Server aggregation cache
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+from collections import defaultdict, OrderedDict
+from copy import deepcopy
+import logging
+import time
+
+from bson import json_util
+
+import fiftyone as fo
+import fiftyone.core.aggregations as foa
+import fiftyone.core.odm as foo
+
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+
+
+class AggregationCache(object):
+    """A least-recently-used cache of aggregation results with time-to-live
+    expiration.
+
+    Results are keyed by the name of the root dataset, a generation marker of
+    the dataset that is bumped by :meth:`invalidate`, a marker of the state
+    of the dataset's collections in the database, the serialized view stages
+    and group slice of the collection, and the serialized aggregations.
+
+    The database marker consists of the number of documents and the maximum
+    ``_id`` of the collections, so samples and frames that are added or
+    deleted by any process, e.g., via Python, are noticed immediately.
+    In-place edits made outside of the server are not detected, so they may
+    go unnoticed for up to ``ttl`` seconds.
+
+    Args:
+        max_size (128): the maximum number of results to cache. A value of
+            ``0`` disables caching
+        ttl (5): the number of seconds for which cached results are valid,
+            or ``None`` for no expiration
+    """
+
+    def __init__(self, max_size=128, ttl=5):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._results = OrderedDict()
+        self._generations = defaultdict(int)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def aggregate(self, sample_collection, aggregations):
+        """Returns the results of the given aggregation(s) on the collection,
+        using cached results when possible.
+
+        Args:
+            sample_collection: a
+                :class:`fiftyone.core.collections.SampleCollection`
+            aggregations: an :class:`fiftyone.core.aggregations.Aggregation`
+                or iterable of :class:`fiftyone.core.aggregations.Aggregation`
+                instances
+
+        Returns:
+            an aggregation result or list of aggregation results corresponding
+            to the input aggregation(s)
+        """
+        key = self._make_key(sample_collection, aggregations)
+
+        if key is not None:
+            key += (await _get_db_marker(sample_collection),)
+
+            entry = self._results.get(key, None)
+            if entry is not None:
+                timestamp, results = entry
+                if self.ttl is None or time.time() - timestamp < self.ttl:
+                    self._results.move_to_end(key)
+                    self._hits += 1
+                    return deepcopy(results)
+
+                del self._results[key]
+
+        self._misses += 1
+        results = await sample_collection._async_aggregate(aggregations)
+
+        if key is not None:
+            self._results[key] = (time.time(), deepcopy(results))
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+        return results
+
+    def invalidate(self, dataset_name=None):
+        """Invalidates the cached results for the given dataset.
+
+        Args:
+            dataset_name (None): the name of a dataset. By default, all
+                results are invalidated
+        """
+        if dataset_name is None:
+            self._generations.clear()
+            self._results.clear()
+            return
+
+        self._generations[dataset_name] += 1
+        for key in list(self._results.keys()):
+            if key[0] == dataset_name:
+                del self._results[key]
+
+    def get_stats(self):
+        """Returns a dict of statistics about the cache.
+
+        Returns:
+            a dict with ``hits``, ``misses``, ``evictions``, ``size``, and
+            ``max_size`` keys
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "size": len(self._results),
+            "max_size": self.max_size,
+        }
+
+    def _make_key(self, sample_collection, aggregations):
+        if self.max_size <= 0:
+            return None
+
+        if isinstance(aggregations, foa.Aggregation):
+            aggregations = [aggregations]
+            scalar_result = True
+        else:
+            scalar_result = False
+
+        dataset_name = sample_collection._root_dataset.name
+
+        try:
+            spec = json_util.dumps(
+                [
+                    sample_collection.view()._serialize(include_uuids=False),
+                    sample_collection.group_slice,
+                    [a._serialize(include_uuid=False) for a in aggregations],
+                    scalar_result,
+                ],
+                sort_keys=True,
+            )
+        except Exception as e:
+            # Aggregations that can't be serialized are never cached
+            logger.debug("Unable to generate cache key: %s", e)
+            return None
+
+        return dataset_name, self._generations[dataset_name], spec
+
+
+async def _get_db_marker(sample_collection):
+    dataset = sample_collection._dataset
+    conn = foo.get_async_db_conn()
+
+    marker = []
+    for coll_name in (
+        dataset._sample_collection_name,
+        dataset._frame_collection_name,
+    ):
+        if coll_name is None:
+            continue
+
+        coll = conn[coll_name]
+        count = await coll.estimated_document_count()
+        last = await coll.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        marker.append((count, last["_id"] if last else None))
+
+    return tuple(marker)
+
+
+def get_cache():
+    """Returns the :class:`AggregationCache` of the server process.
+
+    The cache is configured via the ``server_cache_size`` and
+    ``server_cache_ttl`` settings of the FiftyOne config.
+
+    Returns:
+        an :class:`AggregationCache`
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = AggregationCache(
+            max_size=fo.config.server_cache_size,
+            ttl=fo.config.server_cache_ttl,
+        )
+
+    return _cache
+
+
+async def aggregate(sample_collection, aggregations):
+    """Returns the results of the given aggregation(s) on the collection,
+    using the server's :class:`AggregationCache`.
+
+    Args:
+        sample_collection: a
+            :class:`fiftyone.core.collections.SampleCollection`
+        aggregations: an :class:`fiftyone.core.aggregations.Aggregation` or
+            iterable of :class:`fiftyone.core.aggregations.Aggregation`
+            instances
+
+    Returns:
+        an aggregation result or list of aggregation results corresponding to
+        the input aggregation(s)
+    """
+    return await get_cache().aggregate(sample_collection, aggregations)
+
+
+def invalidate(dataset_name=None):
+    """Invalidates the cached aggregation results of the given dataset.
+
+    This method must be called whenever the server modifies a dataset.
+
+    Args:
+        dataset_name (None): the name of a dataset. By default, all results
+            are invalidated
+    """
+    get_cache().invalidate(dataset_name=dataset_name)
+
+
+def get_stats():
+    """Returns hit/miss statistics about the server's
+    :class:`AggregationCache`.
+
+    Returns:
+        a dict of statistics
+    """
+    return get_cache().get_stats()
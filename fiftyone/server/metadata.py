@@ -5,6 +5,7 @@ FiftyOne Server JIT metadata utilities
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import OrderedDict
 from enum import Enum
 import logging
 import shutil
@@ -13,19 +14,27 @@ import typing as t
 
 import asyncio
 import aiofiles
+from aiofiles.os import stat as aio_stat
+from pymongo import UpdateOne
 import strawberry as gql
 
 import eta.core.serial as etas
 import eta.core.utils as etau
 import eta.core.video as etav
-from fiftyone.core.collections import SampleCollection
 
+import fiftyone as fo
+from fiftyone.core.collections import SampleCollection
 import fiftyone.core.media as fom
+import fiftyone.core.metadata as focm
+import fiftyone.core.odm as foo
+import fiftyone.server.cache as fosc
 
 logger = logging.getLogger(__name__)
 
 _FFPROBE_BINARY_PATH = shutil.which("ffprobe")
 
+_cache = None
+
 
 @gql.enum
 class MediaType(Enum):
@@ -35,67 +44,198 @@ class MediaType(Enum):
     video = "video"
 
 
+class MetadataCache(object):
+    """A least-recently-used cache of the media metadata that the App needs to
+    render samples whose ``metadata`` field is not populated.
+
+    Entries are keyed by filepath and modification time, so metadata is
+    recomputed automatically when a file changes on disk.
+
+    Args:
+        max_size (10000): the maximum number of files whose metadata to cache.
+            A value of ``0`` disables caching
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+
+        self._results = OrderedDict()
+        self._pending = {}
+        self._hits = 0
+        self._misses = 0
+
+    async def get(self, filepath, is_video):
+        """Returns the metadata for the given media file, reading it from disk
+        if necessary.
+
+        Args:
+            filepath: the path to the file
+            is_video: whether the file is a video
+
+        Returns:
+            a tuple of
+
+            -   metadata: the App metadata dict for the file
+            -   media_metadata: the
+                :class:`fiftyone.core.metadata.ImageMetadata` or
+                :class:`fiftyone.core.metadata.VideoMetadata` that was read
+                from disk, or ``None`` if the metadata was cached
+        """
+        mtime = (await aio_stat(filepath)).st_mtime
+        key = (filepath, mtime)
+
+        metadata = self._results.get(key, None)
+        if metadata is not None:
+            self._results.move_to_end(key)
+            self._hits += 1
+            return metadata, None
+
+        task = self._pending.get(key, None)
+        if task is None:
+            self._misses += 1
+            task = asyncio.ensure_future(_read_metadata(filepath, is_video))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+            is_owner = True
+        else:
+            is_owner = False
+
+        metadata, media_metadata = await asyncio.shield(task)
+
+        if self.max_size > 0:
+            self._results[key] = metadata
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+        return metadata, media_metadata if is_owner else None
+
+    def clear(self):
+        """Deletes all entries from the cache."""
+        self._results.clear()
+
+    def get_stats(self):
+        """Returns a dict of statistics about the cache.
+
+        Returns:
+            a dict with ``hits``, ``misses``, ``size``, and ``max_size`` keys
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "size": len(self._results),
+            "max_size": self.max_size,
+        }
+
+
+def get_cache():
+    """Returns the :class:`MetadataCache` of the server process.
+
+    The cache is configured via the ``metadata_cache_size`` setting of the
+    FiftyOne config.
+
+    Returns:
+        a :class:`MetadataCache`
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = MetadataCache(max_size=fo.config.metadata_cache_size)
+
+    return _cache
+
+
 async def get_metadata(
     collection: SampleCollection,
     sample: t.Dict,
-    media_type: t.Dict[str, t.Dict],
-    metadata_cache: t.Dict[str, t.Dict[str, str]],
-    url_cache: t.Dict[str, str],
+    media_type: str,
+    writes: t.Optional[t.List] = None,
 ):
-    """Gets the metadata for the given local media file.
+    """Gets the App metadata for the given sample.
+
+    Pre-existing ``metadata`` of the sample is used if possible. Otherwise,
+    the metadata is read from disk via the server's :class:`MetadataCache`.
+    If the ``metadata_write_back`` setting of the FiftyOne config is enabled,
+    the metadata of images and videos that are read from disk is also stored
+    in the ``metadata`` field of their samples.
 
     Args:
-        filepath: the path to the file
-        media_type: the file's media type
-        metadata (None): a pre-existing metadata dict to use if possible
+        collection: the :class:`fiftyone.core.collections.SampleCollection`
+            that contains the sample
+        sample: the sample dict
+        media_type: the sample's media type
+        writes (None): an optional list to which to append the metadata
+            write-back operation for the sample, if any, so that the writes
+            of many samples can be performed in a batch via
+            :func:`write_metadata`. By default, metadata is written
+            immediately
 
     Returns:
         metadata dict
     """
     filepath = sample["filepath"]
     is_video = media_type == fom.VIDEO
-    metadata = sample.get("metadata", None)
-    urls = _create_media_urls(collection, sample, url_cache)
+    urls = _create_media_urls(collection, sample)
 
     # If sufficient pre-existing metadata exists, use it
-    if filepath not in metadata_cache and metadata:
+    metadata = _parse_metadata(sample.get("metadata", None), is_video)
+    if metadata is not None:
+        return dict(urls=urls, **metadata)
+
+    try:
+        # Retrieve media metadata from disk
+        metadata, media_metadata = await get_cache().get(filepath, is_video)
+    except Exception as exc:
+        # Immediately fail so the user knows they should install FFmpeg
+        if isinstance(exc, FFmpegNotFoundException):
+            raise exc
+
+        # Something went wrong (ie non-existent file), so we gracefully return
+        # some placeholder metadata so the App grid can be rendered
         if is_video:
-            width = metadata.get("frame_width", None)
-            height = metadata.get("frame_height", None)
-            frame_rate = metadata.get("frame_rate", None)
+            metadata = dict(aspect_ratio=1, frame_rate=30)
+        else:
+            metadata = dict(aspect_ratio=1)
+
+        return dict(urls=urls, **metadata)
 
-            if width and height and frame_rate:
-                metadata_cache[sample["filepath"]] = dict(
-                    aspect_ratio=width / height,
-                    frame_rate=frame_rate,
-                )
+    if media_metadata is not None and fo.config.metadata_write_back:
+        # Only populate missing metadata; never overwrite existing values
+        op = UpdateOne(
+            {"_id": sample["_id"], "metadata": None},
+            {"$set": {"metadata": media_metadata.to_dict()}},
+        )
 
+        if writes is not None:
+            writes.append(op)
         else:
-            width = metadata.get("width", None)
-            height = metadata.get("height", None)
-
-            if width and height:
-                metadata_cache[sample["filepath"]] = dict(
-                    aspect_ratio=width / height,
-                )
-
-    if filepath not in metadata_cache:
-        try:
-            # Retrieve media metadata from disk
-            metadata_cache[filepath] = await read_metadata(filepath, is_video)
-        except Exception as exc:
-            # Immediately fail so the user knows they should install FFmpeg
-            if isinstance(exc, FFmpegNotFoundException):
-                raise exc
-
-            # Something went wrong (ie non-existent file), so we gracefully return
-            # some placeholder metadata so the App grid can be rendered
-            if is_video:
-                metadata_cache[filepath] = dict(aspect_ratio=1, frame_rate=30)
-            else:
-                metadata_cache[filepath] = dict(aspect_ratio=1)
+            await write_metadata(collection, [op])
+
+    return dict(urls=urls, **metadata)
 
-    return dict(urls=urls, **metadata_cache[filepath])
+
+async def write_metadata(collection: SampleCollection, writes: t.List):
+    """Performs the given metadata write-back operations that were generated
+    by :func:`get_metadata` in a single batch.
+
+    Args:
+        collection: the :class:`fiftyone.core.collections.SampleCollection`
+            that contains the samples
+        writes: a list of write operations
+    """
+    if not writes:
+        return
+
+    coll_name = collection._dataset._sample_collection_name
+
+    try:
+        await foo.get_async_db_conn()[coll_name].bulk_write(
+            writes, ordered=False
+        )
+    except Exception as e:
+        logger.warning("Failed to write metadata: %s", e)
+        return
+
+    fosc.invalidate(collection._root_dataset.name)
 
 
 async def read_metadata(filepath, is_video):
@@ -108,16 +248,8 @@ async def read_metadata(filepath, is_video):
     Returns:
         dict
     """
-    if is_video:
-        info = await get_stream_info(filepath)
-        return dict(
-            aspect_ratio=info.frame_size[0] / info.frame_size[1],
-            frame_rate=info.frame_rate,
-        )
-
-    async with aiofiles.open(filepath, "rb") as f:
-        width, height = await get_image_dimensions(f)
-        return dict(aspect_ratio=width / height)
+    metadata, _ = await _read_metadata(filepath, is_video)
+    return metadata
 
 
 class Reader(object):
@@ -356,20 +488,69 @@ class FFmpegNotFoundException(RuntimeError):
 
 
 def _create_media_urls(
-    collection: SampleCollection, sample: t.Dict, cache: t.Dict
-) -> t.Dict[str, str]:
+    collection: SampleCollection, sample: t.Dict
+) -> t.List[t.Dict[str, str]]:
     media_fields = (
         collection.app_config.media_fields
         if collection.app_config
         else ["filepath"]
     )
-    media_urls = []
 
-    for field in media_fields:
-        path = sample.get(field, None)
-        if path not in cache:
-            cache[path] = path
+    return [
+        dict(field=field, url=sample.get(field, None))
+        for field in media_fields
+    ]
+
+
+def _parse_metadata(metadata, is_video):
+    if not metadata:
+        return None
+
+    if is_video:
+        width = metadata.get("frame_width", None)
+        height = metadata.get("frame_height", None)
+        frame_rate = metadata.get("frame_rate", None)
+
+        if width and height and frame_rate:
+            return dict(aspect_ratio=width / height, frame_rate=frame_rate)
 
-        media_urls.append(dict(field=field, url=path))
+        return None
 
-    return media_urls
+    width = metadata.get("width", None)
+    height = metadata.get("height", None)
+
+    if width and height:
+        return dict(aspect_ratio=width / height)
+
+    return None
+
+
+async def _read_metadata(filepath, is_video):
+    if is_video:
+        info = await get_stream_info(filepath)
+        metadata = dict(
+            aspect_ratio=info.frame_size[0] / info.frame_size[1],
+            frame_rate=info.frame_rate,
+        )
+        media_metadata = focm.VideoMetadata(
+            size_bytes=info.size_bytes,
+            mime_type=info.mime_type,
+            frame_width=info.frame_size[0],
+            frame_height=info.frame_size[1],
+            frame_rate=info.frame_rate,
+            total_frame_count=info.total_frame_count,
+            duration=info.duration,
+            encoding_str=info.encoding_str,
+        )
+        return metadata, media_metadata
+
+    async with aiofiles.open(filepath, "rb") as f:
+        width, height = await get_image_dimensions(f)
+
+    media_metadata = focm.ImageMetadata(
+        size_bytes=(await aio_stat(filepath)).st_size,
+        mime_type=etau.guess_mime_type(filepath),
+        width=width,
+        height=height,
+    )
+    return dict(aspect_ratio=width / height), media_metadata
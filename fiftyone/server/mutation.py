@@ -16,6 +16,7 @@ import fiftyone.constants as foc
 from fiftyone.core.session.events import StateUpdate
 import fiftyone.core.view as fov
 
+import fiftyone.server.cache as fosc
 from fiftyone.server.data import Info
 from fiftyone.server.events import get_state, dispatch_event
 from fiftyone.server.query import Dataset
@@ -47,7 +48,14 @@ class Mutation:
         info: Info,
     ) -> bool:
         state = get_state()
-        state.dataset = fo.load_dataset(name) if name is not None else None
+
+        if name is not None:
+            # Always show the latest contents of newly loaded datasets
+            fosc.invalidate(name)
+            state.dataset = fo.load_dataset(name)
+        else:
+            state.dataset = None
+
         state.selected = []
         state.selected_labels = []
         state.view = None
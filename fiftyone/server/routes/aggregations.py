@@ -14,6 +14,7 @@ import fiftyone.core.fields as fof
 import fiftyone.core.media as fom
 import fiftyone.core.view as fov
 
+import fiftyone.server.cache as fosc
 from fiftyone.server.decorators import route
 from fiftyone.server.filters import GroupElementFilter, SampleFilter
 from fiftyone.server.utils import meets_type
@@ -74,7 +75,7 @@ class Aggregations(HTTPEndpoint):
         results, slice_count = await asyncio.gather(
             *(
                 get_app_statistics(view, filters),
-                slice_view._async_aggregate(foa.Count()),
+                fosc.aggregate(slice_view, foa.Count()),
             )
         )
 
@@ -107,7 +108,7 @@ async def get_app_statistics(view, filters):
             )
 
     ordered = [agg for path in aggregations.values() for agg in path.values()]
-    results = await view._async_aggregate(ordered)
+    results = await fosc.aggregate(view, ordered)
 
     for aggregation, result in zip(ordered, results):
         aggregations[aggregation.field_name or ""][
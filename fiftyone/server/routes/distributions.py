@@ -17,6 +17,7 @@ import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
 import fiftyone.core.utils as fou
 
+import fiftyone.server.cache as fosc
 from fiftyone.server.constants import LIST_LIMIT
 from fiftyone.server.decorators import route
 import fiftyone.server.view as fosv
@@ -175,7 +176,7 @@ def _parse_count_values(result, field):
 
 
 async def _gather_results(aggs, fields, paths, view, ticks=None):
-    response = await view._async_aggregate(aggs)
+    response = await fosc.aggregate(view, aggs)
 
     sorters = {
         foa.HistogramValues: _parse_histogram_values,
@@ -271,7 +272,7 @@ async def _numeric_histograms(view, schema, prefix=""):
             fields.append(field)
 
     aggs = _numeric_bounds(paths)
-    bounds = await view._async_aggregate(aggs)
+    bounds = await fosc.aggregate(view, aggs)
     aggregations = []
     ticks = []
     nonfinites = []
@@ -12,6 +12,7 @@ from starlette.requests import Request
 
 import fiftyone.core.session.events as fose
 
+import fiftyone.server.cache as fosc
 from fiftyone.server.decorators import route
 from fiftyone.server.events import dispatch_event
 
@@ -19,9 +20,16 @@ from fiftyone.server.events import dispatch_event
 class Event(HTTPEndpoint):
     @route
     async def post(self, request: Request, data: t.Dict) -> t.Dict:
-        await dispatch_event(
-            data["subscription"],
-            fose.Event.from_data(data["event"], data["data"]),
-        )
+        event = fose.Event.from_data(data["event"], data["data"])
+
+        # Python sessions may have modified the dataset before updating the
+        # state of the App
+        if (
+            isinstance(event, fose.StateUpdate)
+            and event.state.dataset is not None
+        ):
+            fosc.invalidate(event.state.dataset.name)
+
+        await dispatch_event(data["subscription"], event)
 
         return {}
@@ -5,6 +5,7 @@ FiftyOne Server /media route
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import logging
 import typing as t
 
 import aiofiles
@@ -19,6 +20,11 @@ from starlette.responses import (
     guess_type,
 )
 
+import fiftyone.server.thumbnails as fost
+
+
+logger = logging.getLogger(__name__)
+
 
 async def ranged(
     file: AsyncBufferedReader,
@@ -56,6 +62,12 @@ class Media(HTTPEndpoint):
         self, request: Request
     ) -> t.Union[FileResponse, StreamingResponse]:
         path = request.query_params["filepath"]
+        max_size = request.query_params.get("max_size", None)
+
+        if max_size is not None and not request.headers.get("range"):
+            response = await self.thumbnail_response(path, max_size, request)
+            if response is not None:
+                return response
 
         response: t.Union[FileResponse, StreamingResponse]
         if request.headers.get("range"):
@@ -68,6 +80,51 @@ class Media(HTTPEndpoint):
 
         return response
 
+    async def thumbnail_response(
+        self, path: str, max_size: str, request: Request
+    ) -> t.Optional[Response]:
+        media_type = guess_type(path)[0]
+        if media_type is None or not media_type.startswith("image/"):
+            return None
+
+        fmt = request.query_params.get("format", "jpeg")
+
+        try:
+            max_size = int(max_size)
+        except ValueError:
+            max_size = 0
+
+        if max_size <= 0 or not fost.is_supported_format(fmt):
+            return Response(
+                "Invalid thumbnail parameters max_size=%s, format=%s"
+                % (request.query_params["max_size"], fmt),
+                status_code=400,
+            )
+
+        try:
+            key, thumbnail_path = await fost.get_thumbnail(
+                path, max_size, fmt=fmt
+            )
+        except Exception as e:
+            # Fall back to serving the original file
+            logger.debug("Failed to generate thumbnail of '%s': %s", path, e)
+            return None
+
+        if thumbnail_path is None:
+            return None
+
+        etag = '"%s"' % key
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        return FileResponse(
+            thumbnail_path,
+            media_type=fost.get_media_type(fmt),
+            headers=headers,
+        )
+
     async def ranged_file_response(
         self, path: str, request: Request
     ) -> StreamingResponse:
@@ -14,6 +14,7 @@ import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
 import fiftyone.core.view as fov
 
+import fiftyone.server.cache as fosc
 from fiftyone.server.decorators import route
 from fiftyone.server.filters import GroupElementFilter, SampleFilter
 import fiftyone.server.tags as fost
@@ -60,6 +61,11 @@ class Tag(HTTPEndpoint):
         else:
             fosu.change_sample_tags(view, changes)
 
+        if changes:
+            # Tags of generated views are synced to their source datasets
+            fosc.invalidate(view._dataset.name)
+            fosc.invalidate(view._root_dataset.name)
+
         if not modal:
             return {"samples": []}
 
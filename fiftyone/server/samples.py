@@ -6,6 +6,10 @@ FiftyOne Server samples pagination
 |
 """
 import asyncio
+import base64
+from copy import copy
+
+from bson import json_util, ObjectId
 from dacite import Config, from_dict
 import strawberry as gql
 import typing as t
@@ -14,8 +18,11 @@ import typing as t
 import fiftyone.core.clips as focl
 from fiftyone.core.collections import SampleCollection
 from fiftyone.core.expressions import ViewField as F
+import fiftyone.core.fields as fof
+import fiftyone.core.labels as fol
 import fiftyone.core.media as fom
 import fiftyone.core.odm as foo
+import fiftyone.core.stages as fosg
 from fiftyone.server.filters import SampleFilter
 
 import fiftyone.server.metadata as fosm
@@ -96,19 +103,39 @@ async def paginate_samples(
     if media == fom.GROUP:
         media = view.group_media_types[view.group_slice]
 
-    if after is None:
-        after = "-1"
+    manual_group_select = (
+        sample_filter
+        and sample_filter.group
+        and (sample_filter.group.id and not sample_filter.group.slice)
+    )
+
+    offset, key_value, last_id = _parse_cursor(after)
+
+    keyset = None
+    if not manual_group_select:
+        keyset = _get_keyset(view)
 
-    view = view.skip(int(after) + 1)
+    sort = None
+    if keyset is not None:
+        key, order = keyset
+        coll = foo.get_async_db_conn()[view._dataset._sample_collection_name]
+        sort = _get_keyset_sort(await coll.index_information(), key, order)
+
+    if sort is not None:
+        view = _make_keyset_view(view, sort, key, order, key_value, last_id)
+        if last_id is None and offset >= 0:
+            view = view.skip(offset + 1)
+    elif offset >= 0:
+        view = view.skip(offset + 1)
+
+    view = view.limit(first + 1)
 
     samples = await foo.aggregate(
         foo.get_async_db_conn()[view._dataset._sample_collection_name],
         view._pipeline(
             attach_frames=True,
             detach_frames=False,
-            manual_group_select=sample_filter
-            and sample_filter.group
-            and (sample_filter.group.id and not sample_filter.group.slice),
+            manual_group_select=manual_group_select,
             support=[1, 1],
         ),
     ).to_list(first + 1)
@@ -118,23 +145,20 @@ async def paginate_samples(
         samples = samples[:first]
         more = True
 
-    metadata_cache = {}
-    url_cache = {}
+    writes = []
     nodes = await asyncio.gather(
-        *[
-            _create_sample_item(view, sample, metadata_cache, url_cache)
-            for sample in samples
-        ]
+        *[_create_sample_item(view, sample, writes) for sample in samples]
     )
+    await fosm.write_metadata(view, writes)
 
     edges = []
-    for idx, node in enumerate(nodes):
-        edges.append(
-            Edge(
-                node=node,
-                cursor=str(idx + int(after) + 1),
-            )
-        )
+    for idx, (sample, node) in enumerate(zip(samples, nodes)):
+        if sort is not None:
+            cursor = _make_cursor(offset + idx + 1, sample, key)
+        else:
+            cursor = str(offset + idx + 1)
+
+        edges.append(Edge(node=node, cursor=cursor))
 
     return Connection(
         page_info=PageInfo(
@@ -148,10 +172,7 @@ async def paginate_samples(
 
 
 async def _create_sample_item(
-    dataset: SampleCollection,
-    sample: t.Dict,
-    metadata_cache: t.Dict[str, t.Dict],
-    url_cache: t.Dict[str, str],
+    dataset: SampleCollection, sample: t.Dict, writes: t.List
 ) -> SampleItem:
     media_type = fom.get_media_type(sample["filepath"])
 
@@ -165,7 +186,7 @@ async def _create_sample_item(
         raise ValueError(f"unknown media type '{media_type}'")
 
     metadata = await fosm.get_metadata(
-        dataset, sample, media_type, metadata_cache, url_cache
+        dataset, sample, media_type, writes=writes
     )
 
     return from_dict(
@@ -173,3 +194,234 @@ async def _create_sample_item(
         {"id": sample["_id"], "sample": sample, **metadata},
         Config(check_types=False),
     )
+
+
+# Stages whose output order is not determined by a sort on a single field
+_UNORDERED_STAGES = (
+    fosg.Concat,
+    fosg.GeoNear,
+    fosg.GroupBy,
+    fosg.Limit,
+    fosg.SelectGroupSlices,
+    fosg.Shuffle,
+    fosg.Skip,
+    fosg.SortBySimilarity,
+    fosg.Take,
+)
+
+# Stages that can modify the contents of the field(s) they are applied to
+_MODIFY_FIELD_STAGES = (
+    fosg.FilterField,
+    fosg.FilterKeypoints,
+    fosg.FilterLabels,
+    fosg.LimitLabels,
+    fosg.MapLabels,
+    fosg.SetField,
+)
+
+_MODIFY_LABELS_STAGES = _MODIFY_FIELD_STAGES + (
+    fosg.ExcludeLabels,
+    fosg.SelectLabels,
+)
+
+# Field types whose values can be compared with range queries
+_KEYSET_FIELD_TYPES = (
+    fof.BooleanField,
+    fof.DateField,
+    fof.DateTimeField,
+    fof.FloatField,
+    fof.IntField,
+    fof.StringField,
+)
+
+
+def _parse_cursor(after):
+    # Returns an ``(offset, key_value, last_id)`` tuple. Integer cursors are
+    # offsets, which are supported for backwards compatibility
+    if after is None:
+        return -1, None, None
+
+    try:
+        return int(after), None, None
+    except ValueError:
+        pass
+
+    d = json_util.loads(base64.urlsafe_b64decode(after.encode()).decode())
+    return d["offset"], d.get("key", None), d["id"]
+
+
+def _make_cursor(offset, sample, key):
+    value = sample
+    for chunk in key.split("."):
+        try:
+            value = value.get(chunk, None)
+        except AttributeError:
+            value = None
+            break
+
+    d = {"offset": offset, "id": str(sample["_id"]), "key": value}
+    return base64.urlsafe_b64encode(json_util.dumps(d).encode()).decode()
+
+
+def _get_keyset(view):
+    # Returns a ``(key, order)`` tuple describing the order of the view if it
+    # can be paginated by range queries on ``(key, _id)``, or None if the view
+    # must be paginated via offsets. Unsorted views are paginated by ``_id``
+    sort_stage = None
+    for stage in view._stages:
+        if isinstance(stage, _UNORDERED_STAGES):
+            return None
+
+        if isinstance(stage, (fosg.Select, fosg.SelectBy)) and stage.ordered:
+            return None
+
+        if isinstance(stage, fosg.SortBy):
+            sort_stage = stage
+
+    if sort_stage is None:
+        return "_id", 1
+
+    key = sort_stage._get_mongo_field_or_expr()
+    order = -1 if sort_stage.reverse else 1
+
+    if isinstance(key, list) and len(key) == 1:
+        key, _order = key[0]
+        order *= _order
+
+    if key in ("id", "_id"):
+        return "_id", order
+
+    if not _is_keyset_field(view, key):
+        return None
+
+    return key, order
+
+
+def _is_keyset_field(view, key):
+    if not isinstance(key, str):
+        return False
+
+    if view._is_frame_field(key) or view._is_group_field(key):
+        return False
+
+    field = view.get_field(key)
+    if not isinstance(field, _KEYSET_FIELD_TYPES):
+        return False
+
+    # The key must be unchanged by every stage, since pagination sorts on its
+    # stored value but reads the cursor from the output samples
+    root = key.split(".", 1)[0]
+    root_field = view.get_field(root)
+    in_label = isinstance(
+        root_field, fof.EmbeddedDocumentField
+    ) and issubclass(root_field.document_type, fol.Label)
+
+    for stage in view._stages:
+        if in_label and isinstance(stage, _MODIFY_LABELS_STAGES):
+            return False
+
+        if isinstance(stage, _MODIFY_FIELD_STAGES) and _overlaps(
+            stage.field, key
+        ):
+            return False
+
+        if isinstance(stage, fosg.Mongo) and not _is_safe_pipeline(
+            stage.pipeline, key
+        ):
+            return False
+
+    return True
+
+
+def _is_safe_pipeline(pipeline, key):
+    for stage in pipeline:
+        for op, spec in stage.items():
+            if op == "$match":
+                continue
+
+            if op in ("$set", "$addFields"):
+                fields = spec.keys()
+            elif op == "$unset":
+                fields = [spec] if isinstance(spec, str) else spec
+            else:
+                return False
+
+            if any(_overlaps(f, key) for f in fields):
+                return False
+
+    return True
+
+
+def _overlaps(path, key):
+    path, key = path + ".", key + "."
+    return path.startswith(key) or key.startswith(path)
+
+
+def _get_keyset_sort(index_info, key, order):
+    # Returns the ``$sort`` to use to paginate by ``key``, or None if no
+    # existing index supports it. Indexes are never created here, since doing
+    # so can take minutes on large datasets
+    if key == "_id":
+        return {"_id": order}
+
+    for info in index_info.values():
+        if info.get("sparse", False) or "partialFilterExpression" in info:
+            continue
+
+        fields = info["key"]
+        if fields[0][0] != key or not isinstance(fields[0][1], (int, float)):
+            continue
+
+        # Values of unique keys have no ties to break
+        if len(fields) == 1 and info.get("unique", False):
+            return {key: order}
+
+        # Compound indexes support both sort directions
+        if (
+            len(fields) > 1
+            and fields[1][0] == "_id"
+            and fields[1][1] == fields[0][1]
+        ):
+            return {key: order, "_id": order}
+
+    return None
+
+
+def _make_keyset_view(view, sort, key, order, key_value, last_id):
+    pipeline = [{"$sort": sort}]
+    if last_id is not None:
+        pipeline.append(
+            {"$match": _make_keyset_match(key, order, key_value, last_id)}
+        )
+
+    # Sorting first lets MongoDB walk the index and stop as soon as a page of
+    # samples has passed the view's remaining (order-preserving) stages
+    stages = [
+        stage for stage in view._stages if not isinstance(stage, fosg.SortBy)
+    ]
+
+    _view = copy(view)
+    _view._stages[:] = [fosg.Mongo(pipeline)] + stages
+    return _view
+
+
+def _make_keyset_match(key, order, key_value, last_id):
+    op = "$gt" if order == 1 else "$lt"
+    if key == "_id":
+        return {"_id": {op: ObjectId(last_id)}}
+
+    after_id = {key: key_value, "_id": {op: ObjectId(last_id)}}
+
+    if key_value is None:
+        # None/missing values sort first in ascending order and last in
+        # descending order
+        if order == 1:
+            return {"$or": [after_id, {key: {"$ne": None}}]}
+
+        return after_id
+
+    conditions = [{key: {op: key_value}}, after_id]
+    if order == -1:
+        conditions.append({key: None})
+
+    return {"$or": conditions}
@@ -0,0 +1,320 @@
+"""
+FiftyOne Server thumbnail cache
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+
+from PIL import Image, ImageOps
+
+import eta.core.utils as etau
+
+import fiftyone as fo
+
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+
+_FORMATS = {
+    "jpeg": (".jpg", "image/jpeg"),
+    "webp": (".webp", "image/webp"),
+}
+
+_MAX_ORIGINALS = 10000
+
+
+class ThumbnailCache(object):
+    """A bounded on-disk cache of downscaled images.
+
+    Thumbnails are keyed by the path, modification time, and size of the
+    source image as well as the requested maximum dimension and format, so
+    thumbnails of images that are modified on disk are regenerated
+    automatically. When the total size of the cache exceeds ``max_size``
+    bytes, the least recently used thumbnails are evicted.
+
+    Thumbnails are generated in a pool of worker threads so that image
+    decoding does not block the server's event loop, and concurrent requests
+    for the same thumbnail share a single generation task.
+
+    Args:
+        cache_dir: the directory in which to store thumbnails
+        max_size (1073741824): the maximum size of the cache, in bytes. A
+            value of ``0`` disables thumbnails
+        num_workers (None): the number of worker threads to use to generate
+            thumbnails. By default, ``min(8, multiprocessing.cpu_count())``
+            is used
+    """
+
+    def __init__(self, cache_dir, max_size=1073741824, num_workers=None):
+        if num_workers is None:
+            num_workers = min(8, multiprocessing.cpu_count())
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.num_workers = num_workers
+
+        self._executor = None
+        self._pending = {}
+        self._originals = OrderedDict()
+        self._size = None
+        self._lock = threading.Lock()
+
+    async def get(self, path, max_size, fmt="jpeg"):
+        """Returns a thumbnail of the given image whose largest dimension is
+        at most ``max_size``, generating it if necessary.
+
+        Args:
+            path: the path to the source image
+            max_size: the maximum width and height of the thumbnail
+            fmt ("jpeg"): the thumbnail format. Supported values are
+                ``("jpeg", "webp")``
+
+        Returns:
+            a tuple of
+
+            -   key: a string that uniquely identifies the contents of the
+                thumbnail, suitable for use as an ETag
+            -   thumbnail_path: the path to the thumbnail, or ``None`` if the
+                source image should be served as-is because it is already
+                small enough or thumbnails are disabled
+        """
+        if fmt not in _FORMATS:
+            raise ValueError(
+                "Unsupported thumbnail format '%s'; supported values are %s"
+                % (fmt, tuple(_FORMATS.keys()))
+            )
+
+        loop = asyncio.get_running_loop()
+        stat = await loop.run_in_executor(None, os.stat, path)
+        key = _make_key(path, stat, max_size, fmt)
+
+        if self.max_size <= 0 or key in self._originals:
+            return key, None
+
+        thumbnail_path = self._get_thumbnail_path(key, fmt)
+
+        task = self._pending.get(key, None)
+        if task is None:
+            task = asyncio.ensure_future(
+                loop.run_in_executor(
+                    self._get_executor(),
+                    self._get_or_make_thumbnail,
+                    path,
+                    thumbnail_path,
+                    max_size,
+                    fmt,
+                )
+            )
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+
+        did_resize = await asyncio.shield(task)
+
+        if not did_resize:
+            self._originals[key] = True
+            while len(self._originals) > _MAX_ORIGINALS:
+                self._originals.popitem(last=False)
+
+            return key, None
+
+        return key, thumbnail_path
+
+    def clear(self):
+        """Deletes all thumbnails from the cache."""
+        with self._lock:
+            etau.delete_dir(self.cache_dir)
+            self._originals.clear()
+            self._size = 0
+
+    def get_size(self):
+        """Returns the total size of the thumbnails in the cache, in bytes.
+
+        Returns:
+            the size in bytes
+        """
+        with self._lock:
+            return self._get_size()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+
+        return self._executor
+
+    def _get_thumbnail_path(self, key, fmt):
+        ext = _FORMATS[fmt][0]
+        return os.path.join(self.cache_dir, key[:2], key + ext)
+
+    def _get_or_make_thumbnail(self, path, thumbnail_path, max_size, fmt):
+        if os.path.isfile(thumbnail_path):
+            try:
+                # Record the access for least recently used eviction
+                os.utime(thumbnail_path)
+                return True
+            except FileNotFoundError:
+                pass
+
+        did_resize = _make_thumbnail(path, thumbnail_path, max_size, fmt)
+
+        if did_resize:
+            self._add(os.path.getsize(thumbnail_path))
+
+        return did_resize
+
+    def _get_size(self):
+        if self._size is None:
+            self._size = sum(s for _, s, _ in self._list_thumbnails())
+
+        return self._size
+
+    def _add(self, num_bytes):
+        with self._lock:
+            self._size = self._get_size() + num_bytes
+            if self._size > self.max_size:
+                self._evict()
+
+    def _evict(self):
+        # Evict down to 90% of the maximum size so that eviction does not
+        # occur on every subsequent write
+        target_size = 0.9 * self.max_size
+
+        thumbnails = sorted(self._list_thumbnails(), key=lambda t: t[2])
+        size = sum(s for _, s, _ in thumbnails)
+
+        for path, num_bytes, _ in thumbnails:
+            if size <= target_size:
+                break
+
+            try:
+                os.remove(path)
+                size -= num_bytes
+            except OSError:
+                pass
+
+        self._size = size
+
+    def _list_thumbnails(self):
+        thumbnails = []
+
+        if not os.path.isdir(self.cache_dir):
+            return thumbnails
+
+        for root, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                thumbnails.append((path, stat.st_size, stat.st_mtime))
+
+        return thumbnails
+
+
+def get_cache():
+    """Returns the :class:`ThumbnailCache` of the server process.
+
+    The cache is configured via the ``thumbnail_cache_dir`` and
+    ``thumbnail_cache_size`` settings of the FiftyOne config.
+
+    Returns:
+        a :class:`ThumbnailCache`
+    """
+    global _cache
+
+    if _cache is None:
+        _cache = ThumbnailCache(
+            fo.config.thumbnail_cache_dir,
+            max_size=fo.config.thumbnail_cache_size,
+        )
+
+    return _cache
+
+
+async def get_thumbnail(path, max_size, fmt="jpeg"):
+    """Returns a thumbnail of the given image via the server's
+    :class:`ThumbnailCache`.
+
+    Args:
+        path: the path to the source image
+        max_size: the maximum width and height of the thumbnail
+        fmt ("jpeg"): the thumbnail format. Supported values are
+            ``("jpeg", "webp")``
+
+    Returns:
+        a ``(key, thumbnail_path)`` tuple. See :meth:`ThumbnailCache.get`
+    """
+    return await get_cache().get(path, max_size, fmt=fmt)
+
+
+def is_supported_format(fmt):
+    """Determines whether the given thumbnail format is supported.
+
+    Args:
+        fmt: a thumbnail format
+
+    Returns:
+        True/False
+    """
+    return fmt in _FORMATS
+
+
+def get_media_type(fmt):
+    """Returns the MIME type of the given thumbnail format.
+
+    Args:
+        fmt: a thumbnail format
+
+    Returns:
+        the MIME type
+    """
+    return _FORMATS[fmt][1]
+
+
+def _make_key(path, stat, max_size, fmt):
+    spec = "%s:%d:%d:%d:%s" % (
+        os.path.abspath(path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        max_size,
+        fmt,
+    )
+    return hashlib.sha1(spec.encode()).hexdigest()
+
+
+def _make_thumbnail(path, thumbnail_path, max_size, fmt):
+    with Image.open(path) as img:
+        if max(img.size) <= max_size:
+            return False
+
+        # Allows JPEG images to be decoded directly at a reduced scale
+        img.draft("RGB", (max_size, max_size))
+
+        img = ImageOps.exif_transpose(img)
+
+        if fmt == "jpeg" and img.mode != "RGB":
+            img = img.convert("RGB")
+        elif img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+
+        img.thumbnail((max_size, max_size))
+
+        # Write to a temporary path first so that partially written
+        # thumbnails are never served
+        etau.ensure_basedir(thumbnail_path)
+        tmp_path = "%s.%d.tmp" % (thumbnail_path, threading.get_ident())
+        img.save(tmp_path, format=fmt.upper(), quality=85)
+        os.replace(tmp_path, thumbnail_path)
+
+    return True
@@ -773,6 +773,31 @@ class FiftyOneDataset(Dataset):
         return foud.FiftyOneDatasetExporter
 
 
+class FiftyOneBSONDataset(Dataset):
+    """A disk representation of an entire
+    :class:`fiftyone.core.dataset.Dataset` stored on disk in a sharded binary
+    BSON format along with its source media.
+
+    This format is more compact and much faster to write and read than
+    :class:`FiftyOneDataset`, which makes it well-suited for backing up and
+    restoring large datasets.
+
+    See :ref:`this page <FiftyOneBSONDataset-import>` for importing datasets
+    of this type, and see :ref:`this page <FiftyOneBSONDataset-export>` for
+    exporting datasets of this type.
+    """
+
+    def get_dataset_importer_cls(self):
+        import fiftyone.utils.data as foud
+
+        return foud.FiftyOneBSONDatasetImporter
+
+    def get_dataset_exporter_cls(self):
+        import fiftyone.utils.data as foud
+
+        return foud.FiftyOneBSONDatasetExporter
+
+
 class LegacyFiftyOneDataset(Dataset):
     """Legacy disk representation of an entire
     :class:`fiftyone.core.dataset.Dataset` stored on disk in a serialized JSON
@@ -660,6 +660,8 @@ class COCODetectionDatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
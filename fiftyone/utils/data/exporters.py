@@ -5,13 +5,19 @@ Dataset exporters.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 import inspect
 import logging
+import multiprocessing
 import os
+import shutil
+import stat
+import sys
 import warnings
 
 from bson import json_util
+from bson.raw_bson import RawBSONDocument
 import numpy as np
 
 import eta.core.datasets as etad
@@ -44,6 +50,14 @@ from .parsers import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import fcntl
+
+    # The Linux ioctl that clones a file via copy-on-write
+    _FICLONE = 0x40049409 if sys.platform.startswith("linux") else None
+except ImportError:
+    _FICLONE = None
+
 
 def export_samples(
     samples,
@@ -163,6 +177,8 @@ def export_samples(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
@@ -1001,6 +1017,14 @@ class MediaExporter(object):
     users of this class can restrict the available options via the
     ``supported_modes`` parameter.
 
+    Media files on disk are copied or linked by a pool of worker threads, so
+    the paths returned by :meth:`export` may not exist until :meth:`close` is
+    called. When copying, a copy-on-write clone of each file is attempted
+    first on filesystems that support it. Files whose outputs already exist
+    and have the same size and modification time (copies), inode (hard
+    links), or target (symlinks) are skipped, so repeated exports into the
+    same directory only transfer media that has changed.
+
     Args:
         export_mode: the export mode to use. The supported values are:
 
@@ -1011,14 +1035,17 @@ class MediaExporter(object):
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory. Files on different filesystems than the
+                output directory are copied instead
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
         export_path (None): the location to export the media. Can be any of the
             following:
 
-            -   When ``export_media`` is True, "move", or "symlink", a
-                directory in which to export the media
+            -   When ``export_media`` is True, "move", "symlink", or
+                "hardlink", a directory in which to export the media
             -   When ``export_mode`` is "manifest", the path to write a JSON
                 file mapping UUIDs to input filepaths
             -   When ``export_media`` is False, this parameter has no effect
@@ -1035,6 +1062,11 @@ class MediaExporter(object):
             output paths
         ignore_exts (False): whether to omit file extensions when generating
             UUIDs for files
+        num_workers (None): the number of worker threads to use to transfer
+            media files. By default, ``min(8, multiprocessing.cpu_count())``
+            is used
+        reflink (True): whether to attempt copy-on-write clones of files
+            when copying them
     """
 
     def __init__(
@@ -1045,9 +1077,21 @@ class MediaExporter(object):
         supported_modes=None,
         default_ext=None,
         ignore_exts=False,
+        num_workers=None,
+        reflink=True,
     ):
+        if num_workers is None:
+            num_workers = min(8, multiprocessing.cpu_count())
+
         if supported_modes is None:
-            supported_modes = (True, False, "move", "symlink", "manifest")
+            supported_modes = (
+                True,
+                False,
+                "move",
+                "symlink",
+                "hardlink",
+                "manifest",
+            )
 
         if export_mode not in supported_modes:
             raise ValueError(
@@ -1067,10 +1111,15 @@ class MediaExporter(object):
         self.supported_modes = supported_modes
         self.default_ext = default_ext
         self.ignore_exts = ignore_exts
+        self.num_workers = num_workers
+        self.reflink = reflink
 
         self._filename_maker = None
         self._manifest = None
         self._manifest_path = None
+        self._executor = None
+        self._pending = None
+        self._can_reflink = None
 
     def _write_media(self, media, outpath):
         raise NotImplementedError("subclass must implement _write_media()")
@@ -1103,7 +1152,7 @@ class MediaExporter(object):
         manifest_path = None
         manifest = None
 
-        if self.export_mode in (True, "move", "symlink"):
+        if self.export_mode in (True, "move", "symlink", "hardlink"):
             output_dir = self.export_path
         elif self.export_mode == "manifest":
             manifest_path = self.export_path
@@ -1118,6 +1167,8 @@ class MediaExporter(object):
         )
         self._manifest_path = manifest_path
         self._manifest = manifest
+        self._pending = deque()
+        self._can_reflink = self.reflink and _FICLONE is not None
 
     def export(self, media_or_path, outpath=None):
         """Exports the given media.
@@ -1149,12 +1200,12 @@ class MediaExporter(object):
                 outpath = self._filename_maker.get_output_path(media_path)
                 uuid = self._get_uuid(outpath)
 
-            if self.export_mode == True:
-                etau.copy_file(media_path, outpath)
-            elif self.export_mode == "move":
+            if self.export_mode == "move":
+                # Moves are typically renames, and callers may expect the
+                # source to be gone when this method returns
                 etau.move_file(media_path, outpath)
-            elif self.export_mode == "symlink":
-                etau.symlink_file(media_path, outpath)
+            elif self.export_mode in (True, "symlink", "hardlink"):
+                self._submit(media_path, outpath)
             elif self.export_mode == "manifest":
                 self._manifest[uuid] = media_path
         else:
@@ -1178,9 +1229,62 @@ class MediaExporter(object):
 
     def close(self):
         """Performs any necessary actions to complete the export."""
+        try:
+            self._wait(0)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
         if self.export_mode == "manifest":
             etas.write_json(self._manifest, self._manifest_path)
 
+    def _submit(self, inpath, outpath):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+
+        future = self._executor.submit(self._transfer, inpath, outpath)
+        self._pending.append(future)
+
+        # Bound the number of pending transfers and surface errors promptly
+        self._wait(4 * self.num_workers)
+
+    def _wait(self, max_pending):
+        while self._pending and len(self._pending) > max_pending:
+            self._pending.popleft().result()
+
+    def _transfer(self, inpath, outpath):
+        # Concurrent transfers may need to create the same directories
+        os.makedirs(os.path.dirname(outpath), exist_ok=True)
+
+        if self.export_mode == "symlink":
+            if not _is_same_symlink(inpath, outpath):
+                _remove_file(outpath)
+                os.symlink(os.path.realpath(inpath), outpath)
+        elif self.export_mode == "hardlink":
+            if not _is_same_inode(inpath, outpath) and not _link_file(
+                inpath, outpath
+            ):
+                self._copy_file(inpath, outpath)
+        else:
+            self._copy_file(inpath, outpath)
+
+    def _copy_file(self, inpath, outpath):
+        if _is_same_copy(inpath, outpath):
+            return
+
+        # Never write through an existing link to the source file
+        _remove_file(outpath)
+
+        if self._can_reflink:
+            if _reflink_file(inpath, outpath):
+                return
+
+            # Don't retry on filesystems that don't support clones
+            self._can_reflink = False
+
+        shutil.copy2(inpath, outpath)
+
 
 class ImageExporter(MediaExporter):
     """Utility class for :class:`DatasetExporter` instances that export images.
@@ -1214,6 +1318,60 @@ class VideoExporter(MediaExporter):
         raise ValueError("Only video paths can be exported")
 
 
+def _is_same_copy(inpath, outpath):
+    try:
+        instat = os.stat(inpath)
+        outstat = os.lstat(outpath)
+    except OSError:
+        return False
+
+    return (
+        not stat.S_ISLNK(outstat.st_mode)
+        and instat.st_size == outstat.st_size
+        and abs(instat.st_mtime - outstat.st_mtime) < 1
+    )
+
+
+def _is_same_inode(inpath, outpath):
+    try:
+        return os.path.samefile(inpath, outpath)
+    except OSError:
+        return False
+
+
+def _is_same_symlink(inpath, outpath):
+    return os.path.islink(outpath) and os.readlink(
+        outpath
+    ) == os.path.realpath(inpath)
+
+
+def _remove_file(path):
+    if os.path.lexists(path):
+        os.remove(path)
+
+
+def _link_file(inpath, outpath):
+    _remove_file(outpath)
+
+    try:
+        os.link(inpath, outpath)
+        return True
+    except OSError:
+        # Ex: the paths are on different filesystems
+        return False
+
+
+def _reflink_file(inpath, outpath):
+    try:
+        with open(inpath, "rb") as src, open(outpath, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        return False
+
+    shutil.copystat(inpath, outpath)
+    return True
+
+
 class DatasetExporter(object):
     """Base interface for exporting datsets.
 
@@ -1595,6 +1753,8 @@ class LegacyFiftyOneDatasetExporter(GenericSampleDatasetExporter):
             -   ``"move"``: move media files into the export directory
             -   ``"symlink"``: create symlinks to each media file in the export
                 directory
+            -   ``"hardlink"``: create hard links to each media file in the
+                export directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each media. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -1652,7 +1812,7 @@ class LegacyFiftyOneDatasetExporter(GenericSampleDatasetExporter):
             self.export_media,
             export_path=self._data_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, False, "move", "symlink"),
+            supported_modes=(True, False, "move", "symlink", "hardlink"),
         )
         self._media_exporter.setup()
 
@@ -1782,6 +1942,8 @@ class FiftyOneDatasetExporter(BatchDatasetExporter):
             -   ``"move"``: move media files into the export directory
             -   ``"symlink"``: create symlinks to each media file in the export
                 directory
+            -   ``"hardlink"``: create hard links to each media file in the
+                export directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each media. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -1847,7 +2009,7 @@ class FiftyOneDatasetExporter(BatchDatasetExporter):
             self.export_media,
             export_path=self._data_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, False, "move", "symlink"),
+            supported_modes=(True, False, "move", "symlink", "hardlink"),
         )
         self._media_exporter.setup()
 
@@ -1895,12 +2057,12 @@ class FiftyOneDatasetExporter(BatchDatasetExporter):
         else:
             patt = None
 
-        foo.export_collection(
+        self._export_docs(
             map(_prep_sample, _samples, _outpaths),
             self._samples_path,
-            key="samples",
-            patt=patt,
-            num_docs=num_samples,
+            "samples",
+            patt,
+            num_samples,
         )
 
         if sample_collection._contains_videos(any_slice=True):
@@ -1918,13 +2080,9 @@ class FiftyOneDatasetExporter(BatchDatasetExporter):
 
             coll, pipeline = fod._get_frames_pipeline(_video_collection)
             num_frames = foo.count_documents(coll, pipeline)
-            frames = foo.aggregate(coll, pipeline)
-            foo.export_collection(
-                frames,
-                self._frames_path,
-                key="frames",
-                patt=patt,
-                num_docs=num_frames,
+            frames = self._get_frames(coll, pipeline)
+            self._export_docs(
+                frames, self._frames_path, "frames", patt, num_frames
             )
 
         dataset = sample_collection._dataset
@@ -1957,6 +2115,98 @@ class FiftyOneDatasetExporter(BatchDatasetExporter):
 
         self._media_exporter.close()
 
+    def _get_frames(self, coll, pipeline):
+        return foo.aggregate(coll, pipeline)
+
+    def _export_docs(self, docs, path, key, patt, num_docs):
+        foo.export_collection(
+            docs, path, key=key, patt=patt, num_docs=num_docs
+        )
+
+
+class FiftyOneBSONDatasetExporter(FiftyOneDatasetExporter):
+    """Exporter that writes an entire FiftyOne dataset to disk in a sharded
+    binary BSON format along with its source media.
+
+    This format is equivalent to :class:`FiftyOneDatasetExporter` except that
+    sample and frame documents are stored as raw BSON rather than JSON, which
+    is more compact and is much faster to write and read. Sample documents
+    are encoded in the main thread and the resulting shards are written by a
+    pool of worker threads, and frame documents are streamed from the database
+    without ever being decoded.
+
+    See :ref:`this page <FiftyOneBSONDataset-export>` for format details.
+
+    Args:
+        export_dir: the directory to write the export
+        export_media (None): defines how to export the raw media contained
+            in the dataset. The supported values are:
+
+            -   ``True`` (default): copy all media files into the export
+                directory
+            -   ``False``: don't export media
+            -   ``"move"``: move media files into the export directory
+            -   ``"symlink"``: create symlinks to each media file in the export
+                directory
+            -   ``"hardlink"``: create hard links to each media file in the
+                export directory
+        rel_dir (None): an optional relative directory to strip from each input
+            filepath to generate a unique identifier for each media. When
+            exporting media, this identifier is joined with ``export_dir`` to
+            generate an output path for each exported media. This argument
+            allows for populating nested subdirectories that match the shape of
+            the input paths. The path is converted to an absolute path (if
+            necessary) via :func:`fiftyone.core.utils.normalize_path`
+        export_runs (True): whether to include annotation/brain/evaluation
+            runs in the export. Only applicable when exporting full datasets
+        shard_size (67108864): the target size of each shard file, in bytes
+        num_workers (None): the number of worker threads to use to write
+            shards. Encoding documents holds the GIL, so it is not
+            parallelized by these workers. By default,
+            ``min(8, multiprocessing.cpu_count())`` is used
+    """
+
+    def __init__(
+        self,
+        export_dir,
+        export_media=None,
+        rel_dir=None,
+        export_runs=True,
+        shard_size=67108864,
+        num_workers=None,
+    ):
+        super().__init__(
+            export_dir,
+            export_media=export_media,
+            rel_dir=rel_dir,
+            export_runs=export_runs,
+        )
+
+        self.shard_size = shard_size
+        self.num_workers = num_workers
+
+    def setup(self):
+        super().setup()
+
+        self._samples_path = os.path.join(self.export_dir, "samples")
+        self._frames_path = os.path.join(self.export_dir, "frames")
+
+    def _get_frames(self, coll, pipeline):
+        codec_options = coll.codec_options.with_options(
+            document_class=RawBSONDocument
+        )
+        coll = coll.with_options(codec_options=codec_options)
+        return foo.aggregate(coll, pipeline)
+
+    def _export_docs(self, docs, path, key, patt, num_docs):
+        foo.export_bson_collection(
+            docs,
+            path,
+            num_docs=num_docs,
+            shard_size=self.shard_size,
+            num_workers=self.num_workers,
+        )
+
 
 def _export_annotation_results(sample_collection, anno_dir):
     for anno_key in sample_collection.list_annotation_runs():
@@ -2001,6 +2251,8 @@ class ImageDirectoryExporter(UnlabeledImageDatasetExporter):
             -   ``"move"``: move media files into the export directory
             -   ``"symlink"``: create symlinks to each media file in the export
                 directory
+            -   ``"hardlink"``: create hard links to each media file in the
+                export directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each image. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -2036,7 +2288,7 @@ class ImageDirectoryExporter(UnlabeledImageDatasetExporter):
             self.export_media,
             export_path=self.export_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
             default_ext=self.image_format,
         )
         self._media_exporter.setup()
@@ -2067,6 +2319,8 @@ class VideoDirectoryExporter(UnlabeledVideoDatasetExporter):
             -   ``"move"``: move media files into the export directory
             -   ``"symlink"``: create symlinks to each media file in the export
                 directory
+            -   ``"hardlink"``: create hard links to each media file in the
+                export directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each video. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -2096,7 +2350,7 @@ class VideoDirectoryExporter(UnlabeledVideoDatasetExporter):
             self.export_media,
             export_path=self.export_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
         )
         self._media_exporter.setup()
 
@@ -2162,6 +2416,8 @@ class FiftyOneImageClassificationDatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
@@ -2313,6 +2569,8 @@ class ImageClassificationDirectoryTreeExporter(LabeledImageDatasetExporter):
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each image. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -2363,7 +2621,7 @@ class ImageClassificationDirectoryTreeExporter(LabeledImageDatasetExporter):
         self._filename_counts = defaultdict(int)
         self._media_exporter = ImageExporter(
             self.export_media,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
         )
         self._media_exporter.setup()
 
@@ -2429,6 +2687,8 @@ class VideoClassificationDirectoryTreeExporter(LabeledVideoDatasetExporter):
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each video. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -2471,7 +2731,7 @@ class VideoClassificationDirectoryTreeExporter(LabeledVideoDatasetExporter):
         self._filename_counts = defaultdict(int)
         self._media_exporter = VideoExporter(
             self.export_media,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
         )
         self._media_exporter.setup()
 
@@ -2563,6 +2823,8 @@ class FiftyOneImageDetectionDatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
@@ -2748,6 +3010,8 @@ class FiftyOneTemporalDetectionDatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
@@ -2937,6 +3201,8 @@ class ImageSegmentationDirectoryExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
             -   ``"manifest"``: create a ``data.json`` in the output directory
                 that maps UUIDs used in the labels files to the filepaths of
                 the source media, rather than exporting the actual media
@@ -3097,6 +3363,8 @@ class FiftyOneImageLabelsDatasetExporter(LabeledImageDatasetExporter):
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each image. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -3161,7 +3429,7 @@ class FiftyOneImageLabelsDatasetExporter(LabeledImageDatasetExporter):
             self.export_media,
             export_path=self._data_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
             default_ext=self.image_format,
             ignore_exts=True,
         )
@@ -3216,6 +3484,8 @@ class FiftyOneVideoLabelsDatasetExporter(LabeledVideoDatasetExporter):
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
         rel_dir (None): an optional relative directory to strip from each input
             filepath to generate a unique identifier for each video. When
             exporting media, this identifier is joined with ``export_dir`` to
@@ -3275,7 +3545,7 @@ class FiftyOneVideoLabelsDatasetExporter(LabeledVideoDatasetExporter):
             self.export_media,
             export_path=self._data_dir,
             rel_dir=self.rel_dir,
-            supported_modes=(True, "move", "symlink"),
+            supported_modes=(True, "move", "symlink", "hardlink"),
             ignore_exts=True,
         )
         self._media_exporter.setup()
@@ -1577,6 +1577,9 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
         seed (None): a random seed to use when shuffling
         max_samples (None): a maximum number of samples to import. By default,
             all samples are imported
+        parse_in_background (False): whether to parse the samples and frames
+            in a background thread while previously parsed documents are
+            being inserted into the database
     """
 
     def __init__(
@@ -1587,6 +1590,7 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
         shuffle=False,
         seed=None,
         max_samples=None,
+        parse_in_background=False,
     ):
         super().__init__(
             dataset_dir=dataset_dir,
@@ -1597,6 +1601,7 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
 
         self.rel_dir = rel_dir
         self.ordered = ordered
+        self.parse_in_background = parse_in_background
 
         self._data_dir = None
         self._anno_dir = None
@@ -1708,9 +1713,7 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
         #
 
         logger.info("Importing samples...")
-        samples, num_samples = foo.import_collection(
-            self._samples_path, key="samples"
-        )
+        samples, num_samples = self._import_docs(self._samples_path, "samples")
 
         samples = self._preprocess_list(samples)
 
@@ -1747,15 +1750,12 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
 
         if self._has_frames:
             logger.info("Importing frames...")
-            frames, num_frames = foo.import_collection(
-                self._frames_path, key="frames"
-            )
+            frames, num_frames = self._import_docs(self._frames_path, "frames")
 
-            # @todo optimize by only loading these docs in the first place
             if self.max_samples is not None:
                 _sample_ids = set(sample_ids)
-                frames = [f for f in frames if f["_sample_id"] in _sample_ids]
-                num_frames = len(frames)
+                frames = (f for f in frames if f["_sample_id"] in _sample_ids)
+                num_frames = None
 
             foo.insert_documents(
                 frames,
@@ -1794,6 +1794,11 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
 
         return sample_ids
 
+    def _import_docs(self, path, key):
+        return foo.import_collection(
+            path, key=key, parse_in_background=self.parse_in_background
+        )
+
     @staticmethod
     def _get_classes(dataset_dir):
         # Used only by dataset zoo
@@ -1814,8 +1819,7 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
     def _get_num_samples(dataset_dir):
         # Used only by dataset zoo
         samples_path = os.path.join(dataset_dir, "samples.json")
-        samples = etas.read_json(samples_path).get("samples", [])
-        return len(samples)
+        return sum(1 for _ in foo.iter_json_array(samples_path, "samples"))
 
     def _is_legacy_format_data(self):
         metadata_path = os.path.join(self.dataset_dir, "metadata.json")
@@ -1835,6 +1839,78 @@ class FiftyOneDatasetImporter(BatchDatasetImporter):
         )
 
 
+class FiftyOneBSONDatasetImporter(FiftyOneDatasetImporter):
+    """Importer for FiftyOne datasets stored on disk in a sharded binary BSON
+    format.
+
+    Shards are read by a pool of worker threads while previously read
+    documents are being inserted into the database, and frame documents are
+    inserted as raw BSON without ever being decoded.
+
+    See :ref:`this page <FiftyOneBSONDataset-import>` for format details.
+
+    Args:
+        dataset_dir: the dataset directory
+        rel_dir (None): a relative directory to prepend to the ``filepath`` of
+            each sample if the filepath is not absolute. This path is converted
+            to an absolute path (if necessary) via
+            :func:`fiftyone.core.utils.normalize_path`
+        ordered (True): whether to preserve document order when importing
+        shuffle (False): whether to randomly shuffle the order in which the
+            samples are imported
+        seed (None): a random seed to use when shuffling
+        max_samples (None): a maximum number of samples to import. By default,
+            all samples are imported
+        num_workers (None): the number of worker threads to use to read
+            shards. By default, ``min(8, multiprocessing.cpu_count())`` is
+            used
+    """
+
+    def __init__(
+        self,
+        dataset_dir,
+        rel_dir=None,
+        ordered=True,
+        shuffle=False,
+        seed=None,
+        max_samples=None,
+        num_workers=None,
+    ):
+        super().__init__(
+            dataset_dir,
+            rel_dir=rel_dir,
+            ordered=ordered,
+            shuffle=shuffle,
+            seed=seed,
+            max_samples=max_samples,
+        )
+
+        self.num_workers = num_workers
+
+    def setup(self):
+        super().setup()
+
+        self._samples_path = os.path.join(self.dataset_dir, "samples")
+        self._frames_path = os.path.join(self.dataset_dir, "frames")
+        self._has_frames = os.path.isdir(self._frames_path)
+
+    def _import_docs(self, path, key):
+        # Samples are decoded because their filepaths may need to be modified
+        raw = key == "frames"
+        return foo.import_bson_collection(
+            path, raw=raw, num_workers=self.num_workers
+        )
+
+    @staticmethod
+    def _get_num_samples(dataset_dir):
+        # Used only by dataset zoo
+        index_path = os.path.join(dataset_dir, "samples", "index.json")
+        return etas.read_json(index_path)["num_docs"]
+
+    def _is_legacy_format_data(self):
+        return False
+
+
 def _import_run_results(dataset, run_dir, run_cls, keys=None):
     if keys is None:
         keys = [os.path.splitext(f)[0] for f in etau.list_files(run_dir)]
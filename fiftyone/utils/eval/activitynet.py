@@ -316,6 +316,11 @@ class ActivityNetDetectionResults(DetectionResults):
             given this label for evaluation purposes
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
             for which the results were computed
+        sample_ids (None): an optional list of the sample IDs of each match,
+            which is recorded by incremental evaluations
+        fingerprints (None): an optional dict mapping sample IDs to
+            fingerprints of their ground truth and predicted labels, which is
+            recorded by incremental evaluations
     """
 
     def __init__(
@@ -332,6 +337,8 @@ class ActivityNetDetectionResults(DetectionResults):
         pred_field=None,
         missing=None,
         samples=None,
+        sample_ids=None,
+        fingerprints=None,
     ):
         super().__init__(
             matches,
@@ -341,6 +348,8 @@ class ActivityNetDetectionResults(DetectionResults):
             classes=classes,
             missing=missing,
             samples=samples,
+            sample_ids=sample_ids,
+            fingerprints=fingerprints,
         )
 
         self.precision = np.asarray(precision)
@@ -47,6 +47,9 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
             polylines for instance masks. Typical values are 1-3 pixels
+        dense_masks (False): whether to compute IoUs directly from the dense
+            instance masks rather than from their polygonal approximations.
+            Only applicable when ``use_masks`` is True
         compute_mAP (False): whether to perform the necessary computations so
             that mAP and PR curves can be generated
         iou_threshs (None): a list of IoU thresholds to use when computing mAP
@@ -75,6 +78,7 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         use_masks=False,
         use_boxes=False,
         tolerance=None,
+        dense_masks=False,
         compute_mAP=False,
         iou_threshs=None,
         max_preds=None,
@@ -95,6 +99,7 @@ class COCOEvaluationConfig(DetectionEvaluationConfig):
         self.use_masks = use_masks
         self.use_boxes = use_boxes
         self.tolerance = tolerance
+        self.dense_masks = dense_masks
         self.compute_mAP = compute_mAP
         self.iou_threshs = iou_threshs
         self.max_preds = max_preds
@@ -205,13 +210,15 @@ class COCOEvaluation(DetectionEvaluation):
                 samples=samples,
             )
 
+        sweep_matches = _compute_sweep_matches(samples, config)
+
         (
             precision,
             recall,
             thresholds,
             iou_threshs,
             classes,
-        ) = _compute_pr_curves(samples, config, classes=classes)
+        ) = _compute_pr_curves(sweep_matches.values(), config, classes=classes)
 
         return COCODetectionResults(
             matches,
@@ -227,6 +234,100 @@ class COCOEvaluation(DetectionEvaluation):
             samples=samples,
         )
 
+    def update_results(
+        self,
+        samples,
+        matches,
+        eval_samples,
+        previous_results=None,
+        eval_key=None,
+        classes=None,
+        missing=None,
+    ):
+        """Generates aggregate evaluation results for an incremental
+        evaluation in which only ``eval_samples`` were (re-)evaluated.
+
+        If ``self.config.compute_mAP`` is True, the IoU sweep is only
+        performed on ``eval_samples``, and the sweep matches of the remaining
+        samples are reused from ``previous_results``. The resulting
+        :class:`COCODetectionResults` records the sweep matches of all samples
+        so that future runs can do the same.
+
+        Args:
+            samples: a :class:`fiftyone.core.collections.SampleCollection`
+            matches: a list of
+                ``(gt_label, pred_label, iou, pred_confidence, gt_id, pred_id)``
+                matches for all samples in ``samples``. Either label can be
+                ``None`` to indicate an unmatched object
+            eval_samples: a
+                :class:`fiftyone.core.collections.SampleCollection` containing
+                the samples that were (re-)evaluated
+            previous_results (None): the :class:`DetectionResults` of the
+                previous run, if any
+            eval_key (None): the evaluation key for this evaluation
+            classes (None): the list of possible classes. If not provided, the
+                observed ground truth/predicted labels are used for results
+                purposes
+            missing (None): a missing label string. Any unmatched objects are
+                given this label for results purposes
+
+        Returns:
+            a :class:`DetectionResults`
+        """
+        config = self.config
+
+        if not config.compute_mAP:
+            return super().update_results(
+                samples,
+                matches,
+                eval_samples,
+                previous_results=previous_results,
+                eval_key=eval_key,
+                classes=classes,
+                missing=missing,
+            )
+
+        if previous_results is not None:
+            prev_sweep_matches = previous_results.sweep_matches
+        else:
+            prev_sweep_matches = None
+
+        if prev_sweep_matches is None:
+            eval_samples = samples
+            prev_sweep_matches = {}
+
+        _sweep_matches = _compute_sweep_matches(eval_samples, config)
+
+        sweep_matches = {}
+        for _id in samples.values("id"):
+            if _id in _sweep_matches:
+                sweep_matches[_id] = _sweep_matches[_id]
+            else:
+                sweep_matches[_id] = prev_sweep_matches.get(_id, [])
+
+        (
+            precision,
+            recall,
+            thresholds,
+            iou_threshs,
+            classes,
+        ) = _compute_pr_curves(sweep_matches.values(), config, classes=classes)
+
+        return COCODetectionResults(
+            matches,
+            precision,
+            recall,
+            iou_threshs,
+            classes,
+            thresholds=thresholds,
+            eval_key=eval_key,
+            gt_field=config.gt_field,
+            pred_field=config.pred_field,
+            missing=missing,
+            samples=samples,
+            sweep_matches=sweep_matches,
+        )
+
 
 class COCODetectionResults(DetectionResults):
     """Class that stores the results of a COCO detection evaluation.
@@ -250,6 +351,14 @@ class COCODetectionResults(DetectionResults):
             given this label for evaluation purposes
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
             for which the results were computed
+        sample_ids (None): an optional list of the sample IDs of each match,
+            which is recorded by incremental evaluations
+        fingerprints (None): an optional dict mapping sample IDs to
+            fingerprints of their ground truth and predicted labels, which is
+            recorded by incremental evaluations
+        sweep_matches (None): an optional dict mapping sample IDs to lists of
+            ``(iou_thresh_ind, gt_label, pred_label, pred_confidence, iscrowd)``
+            IoU sweep matches, which is recorded by incremental evaluations
     """
 
     def __init__(
@@ -265,6 +374,9 @@ class COCODetectionResults(DetectionResults):
         pred_field=None,
         missing=None,
         samples=None,
+        sample_ids=None,
+        fingerprints=None,
+        sweep_matches=None,
     ):
         super().__init__(
             matches,
@@ -274,6 +386,8 @@ class COCODetectionResults(DetectionResults):
             classes=classes,
             missing=missing,
             samples=samples,
+            sample_ids=sample_ids,
+            fingerprints=fingerprints,
         )
 
         self.precision = np.asarray(precision)
@@ -283,6 +397,8 @@ class COCODetectionResults(DetectionResults):
             np.asarray(thresholds) if thresholds is not None else None
         )
 
+        self.sweep_matches = sweep_matches
+
         self._classwise_AP = np.mean(precision, axis=(0, 2))
 
     def plot_pr_curves(
@@ -403,6 +519,7 @@ class COCODetectionResults(DetectionResults):
         recall = d["recall"]
         iou_threshs = d["iou_threshs"]
         thresholds = d.get("thresholds", None)
+        sweep_matches = d.get("sweep_matches", None)
         return super()._from_dict(
             d,
             samples,
@@ -411,6 +528,7 @@ class COCODetectionResults(DetectionResults):
             recall=recall,
             iou_threshs=iou_threshs,
             thresholds=thresholds,
+            sweep_matches=sweep_matches,
             **kwargs,
         )
 
@@ -474,7 +592,11 @@ def _coco_evaluation_setup(
     iou_kwargs = dict(iscrowd=iscrowd, error_level=config.error_level)
 
     if config.use_masks:
-        iou_kwargs.update(use_masks=True, tolerance=config.tolerance)
+        iou_kwargs.update(
+            use_masks=True,
+            tolerance=config.tolerance,
+            dense_masks=config.dense_masks,
+        )
 
     if config.use_boxes:
         iou_kwargs.update(use_boxes=True)
@@ -635,21 +757,16 @@ def _compute_matches(
     return matches
 
 
-def _compute_pr_curves(samples, config, classes=None):
+def _compute_sweep_matches(samples, config):
     gt_field = config.gt_field
     pred_field = config.pred_field
-    iou_threshs = config.iou_threshs
 
     samples = samples.select_fields([gt_field, pred_field])
 
     gt_field, processing_frames = samples._handle_frame_field(gt_field)
     pred_field, _ = samples._handle_frame_field(pred_field)
 
-    num_threshs = len(iou_threshs)
-    thresh_matches = [{} for _ in range(num_threshs)]
-
-    if classes is None:
-        _classes = set()
+    sweep_matches = {}
 
     logger.info("Performing IoU sweep...")
     for sample in samples.iter_samples(progress=True):
@@ -658,6 +775,7 @@ def _compute_pr_curves(samples, config, classes=None):
         else:
             images = [sample]
 
+        sample_matches = []
         for image in images:
             # Don't edit user's data during sweep
             gts = _copy_labels(image[gt_field])
@@ -667,33 +785,50 @@ def _compute_pr_curves(samples, config, classes=None):
 
             for idx, matches in enumerate(matches_list):
                 for match in matches:
-                    gt_label = match[0]
-                    pred_label = match[1]
-                    iscrowd = match[-1]
+                    # (thresh_ind, gt_label, pred_label, confidence, iscrowd)
+                    sample_matches.append(
+                        (idx, match[0], match[1], match[3], match[-1])
+                    )
 
-                    if classes is None:
-                        _classes.add(gt_label)
-                        _classes.add(pred_label)
+        sweep_matches[sample.id] = sample_matches
 
-                    if iscrowd:
-                        continue
+    return sweep_matches
+
+
+def _compute_pr_curves(sweep_matches, config, classes=None):
+    iou_threshs = config.iou_threshs
+
+    num_threshs = len(iou_threshs)
+    thresh_matches = [{} for _ in range(num_threshs)]
+
+    if classes is None:
+        _classes = set()
+
+    for sample_matches in sweep_matches:
+        for idx, gt_label, pred_label, conf, iscrowd in sample_matches:
+            if classes is None:
+                _classes.add(gt_label)
+                _classes.add(pred_label)
+
+            if iscrowd:
+                continue
 
-                    c = gt_label if gt_label is not None else pred_label
+            c = gt_label if gt_label is not None else pred_label
 
-                    if c not in thresh_matches[idx]:
-                        thresh_matches[idx][c] = {
-                            "tp": [],
-                            "fp": [],
-                            "num_gt": 0,
-                        }
+            if c not in thresh_matches[idx]:
+                thresh_matches[idx][c] = {
+                    "tp": [],
+                    "fp": [],
+                    "num_gt": 0,
+                }
 
-                    if gt_label == pred_label:
-                        thresh_matches[idx][c]["tp"].append(match)
-                    elif pred_label:
-                        thresh_matches[idx][c]["fp"].append(match)
+            if gt_label == pred_label:
+                thresh_matches[idx][c]["tp"].append(conf)
+            elif pred_label:
+                thresh_matches[idx][c]["fp"].append(conf)
 
-                    if gt_label:
-                        thresh_matches[idx][c]["num_gt"] += 1
+            if gt_label:
+                thresh_matches[idx][c]["num_gt"] += 1
 
     if classes is None:
         _classes.discard(None)
@@ -718,7 +853,7 @@ def _compute_pr_curves(samples, config, classes=None):
             tp = matches["tp"]
             fp = matches["fp"]
             tp_fp = np.array([1] * len(tp) + [0] * len(fp))
-            confs = np.array([m[3] for m in tp] + [m[3] for m in fp])
+            confs = np.array(tp + fp)
             if None in confs:
                 raise ValueError(
                     "All predicted objects must have their `confidence` "
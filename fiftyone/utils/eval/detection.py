@@ -5,9 +5,13 @@ Detection evaluation.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from collections import defaultdict
+import functools
+import hashlib
 import itertools
 import logging
 
+from bson import json_util
 import numpy as np
 
 import fiftyone.core.evaluation as foe
@@ -35,6 +39,8 @@ def evaluate_detections(
     use_masks=False,
     use_boxes=False,
     classwise=True,
+    num_workers=None,
+    incremental=False,
     **kwargs,
 ):
     """Evaluates the predicted detections in the given samples with respect to
@@ -119,6 +125,15 @@ def evaluate_detections(
             rather than using their actual geometries
         classwise (True): whether to only match objects with the same class
             label (True) or allow matches between classes (False)
+        num_workers (None): the number of worker processes to use to evaluate
+            the samples. Each worker evaluates a shard of the samples using its
+            own database connection. By default, all samples are evaluated in
+            the main process
+        incremental (False): whether to record a fingerprint of the ground
+            truth and predicted labels of each sample so that subsequent runs
+            with the same ``eval_key``, config, and view only re-evaluate the
+            samples whose labels have changed. Only applicable when an
+            ``eval_key`` is provided
         **kwargs: optional keyword arguments for the constructor of the
             :class:`DetectionEvaluationConfig` being used
 
@@ -153,7 +168,19 @@ def evaluate_detections(
     eval_method = config.build()
     eval_method.ensure_requirements()
 
-    eval_method.register_run(samples, eval_key)
+    if incremental:
+        _validate_incremental(eval_method, eval_key)
+        previous_results = _load_incremental_results(
+            samples, eval_key, eval_method
+        )
+    else:
+        previous_results = None
+
+    # Incremental runs must not cleanup the existing run, since the results of
+    # unchanged samples are reused
+    if previous_results is None:
+        eval_method.register_run(samples, eval_key)
+
     eval_method.register_samples(samples)
 
     if config.requires_additional_fields:
@@ -179,44 +206,253 @@ def evaluate_detections(
             dataset.add_frame_field(fp_field, fof.IntField)
             dataset.add_frame_field(fn_field, fof.IntField)
 
-    matches = []
-    logger.info("Evaluating detections...")
-    for sample in _samples.iter_samples(progress=True):
-        if processing_frames:
-            docs = sample.frames.values()
-        else:
-            docs = [sample]
-
-        sample_tp = 0
-        sample_fp = 0
-        sample_fn = 0
-        for doc in docs:
-            doc_matches = eval_method.evaluate(doc, eval_key=eval_key)
-            matches.extend(doc_matches)
-            tp, fp, fn = _tally_matches(doc_matches)
-            sample_tp += tp
-            sample_fp += fp
-            sample_fn += fn
-
-            if processing_frames and eval_key is not None:
-                doc[tp_field] = tp
-                doc[fp_field] = fp
-                doc[fn_field] = fn
-
-        if eval_key is not None:
-            sample[tp_field] = sample_tp
-            sample[fp_field] = sample_fp
-            sample[fn_field] = sample_fn
-            sample.save()
-
-    results = eval_method.generate_results(
-        samples, matches, eval_key=eval_key, classes=classes, missing=missing
+    if incremental:
+        fingerprints = _compute_fingerprints(samples, eval_method, eval_key)
+    else:
+        fingerprints = None
+
+    if previous_results is not None:
+        eval_ids = [
+            _id
+            for _id, fingerprint in fingerprints.items()
+            if previous_results.fingerprints.get(_id, None) != fingerprint
+        ]
+        eval_samples = _samples.select(eval_ids)
+        logger.info(
+            "Evaluating detections for %d/%d samples whose labels have "
+            "changed...",
+            len(eval_ids),
+            len(fingerprints),
+        )
+    else:
+        eval_samples = _samples
+        logger.info("Evaluating detections...")
+
+    evaluate_sample = functools.partial(
+        _evaluate_sample,
+        eval_method=eval_method,
+        eval_key=eval_key,
+        processing_frames=processing_frames,
     )
+    outputs = eval_samples.map_samples(
+        evaluate_sample,
+        save=eval_key is not None,
+        num_workers=num_workers,
+        progress=True,
+    )
+
+    if incremental:
+        if previous_results is not None:
+            sample_matches = _get_sample_matches(previous_results)
+        else:
+            sample_matches = {}
+
+        sample_ids = []
+        matches = []
+        for _id in fingerprints.keys():
+            if _id in outputs:
+                _matches = outputs[_id]
+            else:
+                _matches = sample_matches.get(_id, [])
+
+            sample_ids.extend([_id] * len(_matches))
+            matches.extend(_matches)
+
+        results = eval_method.update_results(
+            samples,
+            matches,
+            eval_samples,
+            previous_results=previous_results,
+            eval_key=eval_key,
+            classes=classes,
+            missing=missing,
+        )
+        results.sample_ids = np.array(sample_ids)
+        results.fingerprints = fingerprints
+    else:
+        matches = list(itertools.chain.from_iterable(outputs.values()))
+        results = eval_method.generate_results(
+            samples,
+            matches,
+            eval_key=eval_key,
+            classes=classes,
+            missing=missing,
+        )
+
     eval_method.save_run_results(samples, eval_key, results)
 
     return results
 
 
+def _evaluate_sample(sample, eval_method, eval_key, processing_frames):
+    if processing_frames:
+        docs = sample.frames.values()
+    else:
+        docs = [sample]
+
+    matches = []
+    sample_tp = 0
+    sample_fp = 0
+    sample_fn = 0
+    for doc in docs:
+        doc_matches = eval_method.evaluate(doc, eval_key=eval_key)
+        matches.extend(doc_matches)
+        tp, fp, fn = _tally_matches(doc_matches)
+        sample_tp += tp
+        sample_fp += fp
+        sample_fn += fn
+
+        if processing_frames and eval_key is not None:
+            doc["%s_tp" % eval_key] = tp
+            doc["%s_fp" % eval_key] = fp
+            doc["%s_fn" % eval_key] = fn
+
+    if eval_key is not None:
+        sample["%s_tp" % eval_key] = sample_tp
+        sample["%s_fp" % eval_key] = sample_fp
+        sample["%s_fn" % eval_key] = sample_fn
+
+    return matches
+
+
+def _validate_incremental(eval_method, eval_key):
+    if eval_key is None:
+        raise ValueError(
+            "You must provide an `eval_key` in order to run an incremental "
+            "evaluation"
+        )
+
+    if eval_method.config.requires_additional_fields:
+        raise ValueError(
+            "Evaluation method '%s' does not support incremental evaluation "
+            "because it requires fields besides `gt_field` and `pred_field`"
+            % eval_method.config.method
+        )
+
+
+def _load_incremental_results(samples, eval_key, eval_method):
+    if not samples.has_evaluation(eval_key):
+        return None
+
+    try:
+        info = samples.get_evaluation_info(eval_key)
+        view = samples.load_evaluation_view(eval_key)
+        results = samples.load_evaluation_results(eval_key)
+    except Exception as e:
+        logger.warning(
+            "Unable to load existing evaluation '%s'; performing a full "
+            "evaluation: %s",
+            eval_key,
+            e,
+        )
+        return None
+
+    if not isinstance(results, DetectionResults):
+        return None
+
+    if results.fingerprints is None or results.sample_ids is None:
+        logger.info(
+            "Evaluation '%s' was not incremental; performing a full "
+            "evaluation",
+            eval_key,
+        )
+        return None
+
+    if _to_json(info.config.serialize()) != _to_json(
+        eval_method.config.serialize()
+    ):
+        logger.info(
+            "The config of evaluation '%s' has changed; performing a full "
+            "evaluation",
+            eval_key,
+        )
+        return None
+
+    if _to_json(view._serialize(include_uuids=False)) != _to_json(
+        samples.view()._serialize(include_uuids=False)
+    ):
+        logger.info(
+            "The view of evaluation '%s' has changed; performing a full "
+            "evaluation",
+            eval_key,
+        )
+        return None
+
+    return results
+
+
+def _to_json(d):
+    return json_util.loads(json_util.dumps(d))
+
+
+def _compute_fingerprints(samples, eval_method, eval_key):
+    # Attributes that evaluations populate on the labels themselves are
+    # excluded so that fingerprints are unaffected by (re-)evaluation
+    eval_keys = set(samples.list_evaluations())
+    eval_keys.add(eval_key)
+    exclude = set()
+    for key in eval_keys:
+        exclude.update((key, "%s_id" % key, "%s_iou" % key))
+
+    ids, gts, preds = samples.values(
+        ["_id", eval_method.config.gt_field, eval_method.config.pred_field],
+        _raw=True,
+    )
+
+    fingerprints = {}
+    for _id, gt, pred in zip(ids, gts, preds):
+        value = _strip_keys([gt, pred], exclude)
+        value_str = json_util.dumps(value, sort_keys=True)
+        fingerprints[str(_id)] = hashlib.md5(value_str.encode()).hexdigest()
+
+    return fingerprints
+
+
+def _strip_keys(value, exclude):
+    if isinstance(value, dict):
+        return {
+            k: _strip_keys(v, exclude)
+            for k, v in value.items()
+            if k not in exclude
+        }
+
+    if isinstance(value, list):
+        return [_strip_keys(v, exclude) for v in value]
+
+    return value
+
+
+def _get_sample_matches(results):
+    missing = results.missing
+
+    if results.confs is not None:
+        confs = results.confs.tolist()
+    else:
+        confs = itertools.repeat(None)
+
+    sample_matches = defaultdict(list)
+    for _id, gt_label, pred_label, iou, conf, gt_id, pred_id in zip(
+        results.sample_ids.tolist(),
+        results.ytrue.tolist(),
+        results.ypred.tolist(),
+        results.ious.tolist(),
+        confs,
+        results.ytrue_ids.tolist(),
+        results.ypred_ids.tolist(),
+    ):
+        if gt_label == missing:
+            gt_label = None
+
+        if pred_label == missing:
+            pred_label = None
+
+        sample_matches[_id].append(
+            (gt_label, pred_label, iou, conf, gt_id, pred_id)
+        )
+
+    return sample_matches
+
+
 class DetectionEvaluationConfig(foe.EvaluationMethodConfig):
     """Base class for configuring :class:`DetectionEvaluation` instances.
 
@@ -328,6 +564,53 @@ class DetectionEvaluation(foe.EvaluationMethod):
             samples=samples,
         )
 
+    def update_results(
+        self,
+        samples,
+        matches,
+        eval_samples,
+        previous_results=None,
+        eval_key=None,
+        classes=None,
+        missing=None,
+    ):
+        """Generates aggregate evaluation results for an incremental
+        evaluation in which only ``eval_samples`` were (re-)evaluated.
+
+        By default, this method simply calls :meth:`generate_results`.
+        Subclasses whose results require additional passes over the samples
+        can override this method to reuse the state stored in
+        ``previous_results`` for the samples that were not re-evaluated.
+
+        Args:
+            samples: a :class:`fiftyone.core.collections.SampleCollection`
+            matches: a list of
+                ``(gt_label, pred_label, iou, pred_confidence, gt_id, pred_id)``
+                matches for all samples in ``samples``. Either label can be
+                ``None`` to indicate an unmatched object
+            eval_samples: a
+                :class:`fiftyone.core.collections.SampleCollection` containing
+                the samples that were (re-)evaluated
+            previous_results (None): the :class:`DetectionResults` of the
+                previous run, if any
+            eval_key (None): the evaluation key for this evaluation
+            classes (None): the list of possible classes. If not provided, the
+                observed ground truth/predicted labels are used for results
+                purposes
+            missing (None): a missing label string. Any unmatched objects are
+                given this label for results purposes
+
+        Returns:
+            a :class:`DetectionResults`
+        """
+        return self.generate_results(
+            samples,
+            matches,
+            eval_key=eval_key,
+            classes=classes,
+            missing=missing,
+        )
+
     def get_fields(self, samples, eval_key):
         pred_field = self.config.pred_field
         pred_type = samples._get_label_field_type(pred_field)
@@ -425,6 +708,11 @@ class DetectionResults(BaseEvaluationResults):
             this label for evaluation purposes
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
             for which the results were computed
+        sample_ids (None): an optional list of the sample IDs of each match,
+            which is recorded by incremental evaluations
+        fingerprints (None): an optional dict mapping sample IDs to
+            fingerprints of their ground truth and predicted labels, which is
+            recorded by incremental evaluations
     """
 
     def __init__(
@@ -436,6 +724,8 @@ class DetectionResults(BaseEvaluationResults):
         classes=None,
         missing=None,
         samples=None,
+        sample_ids=None,
+        fingerprints=None,
     ):
         if matches:
             ytrue, ypred, ious, confs, ytrue_ids, ypred_ids = zip(*matches)
@@ -463,6 +753,10 @@ class DetectionResults(BaseEvaluationResults):
             samples=samples,
         )
         self.ious = np.array(ious)
+        self.sample_ids = (
+            np.asarray(sample_ids) if sample_ids is not None else None
+        )
+        self.fingerprints = fingerprints
 
     @classmethod
     def _from_dict(cls, d, samples, config, **kwargs):
@@ -487,6 +781,8 @@ class DetectionResults(BaseEvaluationResults):
         pred_field = d.get("pred_field", None)
         classes = d.get("classes", None)
         missing = d.get("missing", None)
+        sample_ids = d.get("sample_ids", None)
+        fingerprints = d.get("fingerprints", None)
 
         matches = list(zip(ytrue, ypred, ious, confs, ytrue_ids, ypred_ids))
 
@@ -498,6 +794,8 @@ class DetectionResults(BaseEvaluationResults):
             classes=classes,
             missing=missing,
             samples=samples,
+            sample_ids=sample_ids,
+            fingerprints=fingerprints,
             **kwargs,
         )
 
@@ -42,6 +42,9 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
             polylines for instance masks. Typical values are 1-3 pixels
+        dense_masks (False): whether to compute IoUs directly from the dense
+            instance masks rather than from their polygonal approximations.
+            Only applicable when ``use_masks`` is True
         max_preds (None): the maximum number of predicted objects to evaluate
             when computing mAP and PR curves
         error_level (1): the error level to use when manipulating instance
@@ -78,6 +81,7 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
         use_masks=False,
         use_boxes=False,
         tolerance=None,
+        dense_masks=False,
         max_preds=None,
         error_level=1,
         hierarchy=None,
@@ -95,6 +99,7 @@ class OpenImagesEvaluationConfig(DetectionEvaluationConfig):
         self.use_masks = use_masks
         self.use_boxes = use_boxes
         self.tolerance = tolerance
+        self.dense_masks = dense_masks
         self.max_preds = max_preds
         self.error_level = error_level
         self.hierarchy = hierarchy
@@ -280,6 +285,11 @@ class OpenImagesDetectionResults(DetectionResults):
             given this label for evaluation purposes
         samples (None): the :class:`fiftyone.core.collections.SampleCollection`
             for which the results were computed
+        sample_ids (None): an optional list of the sample IDs of each match,
+            which is recorded by incremental evaluations
+        fingerprints (None): an optional dict mapping sample IDs to
+            fingerprints of their ground truth and predicted labels, which is
+            recorded by incremental evaluations
     """
 
     def __init__(
@@ -294,6 +304,8 @@ class OpenImagesDetectionResults(DetectionResults):
         pred_field=None,
         missing=None,
         samples=None,
+        sample_ids=None,
+        fingerprints=None,
     ):
         super().__init__(
             matches,
@@ -303,6 +315,8 @@ class OpenImagesDetectionResults(DetectionResults):
             classes=classes,
             missing=missing,
             samples=samples,
+            sample_ids=sample_ids,
+            fingerprints=fingerprints,
         )
 
         self.precision = precision
@@ -504,7 +518,11 @@ def _open_images_evaluation_setup(
     iou_kwargs = dict(iscrowd=iscrowd, error_level=config.error_level)
 
     if config.use_masks:
-        iou_kwargs.update(use_masks=True, tolerance=config.tolerance)
+        iou_kwargs.update(
+            use_masks=True,
+            tolerance=config.tolerance,
+            dense_masks=config.dense_masks,
+        )
 
     if config.use_boxes:
         iou_kwargs.update(use_boxes=True)
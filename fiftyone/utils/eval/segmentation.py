@@ -5,11 +5,12 @@ Segmentation evaluation.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import functools
 import logging
+import operator
 import warnings
 
 import numpy as np
-import sklearn.metrics as skm
 
 import eta.core.image as etai
 
@@ -31,6 +32,7 @@ def evaluate_segmentations(
     eval_key=None,
     mask_targets=None,
     method="simple",
+    num_workers=None,
     **kwargs,
 ):
     """Evaluates the specified semantic segmentation masks in the given
@@ -78,6 +80,10 @@ def evaluate_segmentations(
             provided, the observed pixel values are used
         method ("simple"): a string specifying the evaluation method to use.
             Supported values are ``("simple")``
+        num_workers (None): the number of worker processes to use to evaluate
+            the samples. Each worker evaluates a shard of the samples using its
+            own database connection. By default, all samples are evaluated in
+            the main process
         **kwargs: optional keyword arguments for the constructor of the
             :class:`SegmentationEvaluationConfig` being used
 
@@ -95,7 +101,10 @@ def evaluate_segmentations(
     eval_method.register_run(samples, eval_key)
 
     results = eval_method.evaluate_samples(
-        samples, eval_key=eval_key, mask_targets=mask_targets
+        samples,
+        eval_key=eval_key,
+        mask_targets=mask_targets,
+        num_workers=num_workers,
     )
     eval_method.save_run_results(samples, eval_key, results)
 
@@ -125,7 +134,9 @@ class SegmentationEvaluation(foe.EvaluationMethod):
         config: a :class:`SegmentationEvaluationConfig`
     """
 
-    def evaluate_samples(self, samples, eval_key=None, mask_targets=None):
+    def evaluate_samples(
+        self, samples, eval_key=None, mask_targets=None, num_workers=None
+    ):
         """Evaluates the predicted segmentation masks in the given samples with
         respect to the specified ground truth masks.
 
@@ -136,6 +147,9 @@ class SegmentationEvaluation(foe.EvaluationMethod):
                 contain a subset of the possible classes if you wish to
                 evaluate a subset of the semantic classes. By default, the
                 observed pixel values are used as labels
+            num_workers (None): the number of worker processes to use to
+                evaluate the samples. By default, all samples are evaluated in
+                the main process
 
         Returns:
             a :class:`SegmentationResults` instance
@@ -215,7 +229,9 @@ class SimpleEvaluation(SegmentationEvaluation):
         config: a :class:`SimpleEvaluationConfig`
     """
 
-    def evaluate_samples(self, samples, eval_key=None, mask_targets=None):
+    def evaluate_samples(
+        self, samples, eval_key=None, mask_targets=None, num_workers=None
+    ):
         pred_field = self.config.pred_field
         gt_field = self.config.gt_field
 
@@ -223,7 +239,9 @@ class SimpleEvaluation(SegmentationEvaluation):
             values, classes = zip(*sorted(mask_targets.items()))
         else:
             logger.info("Computing possible mask values...")
-            values = _get_mask_values(samples, pred_field, gt_field)
+            values = _get_mask_values(
+                samples, pred_field, gt_field, num_workers=num_workers
+            )
             classes = [str(v) for v in values]
 
         _samples = samples.select_fields([gt_field, pred_field])
@@ -231,10 +249,6 @@ class SimpleEvaluation(SegmentationEvaluation):
         gt_field, _ = samples._handle_frame_field(gt_field)
 
         nc = len(values)
-        confusion_matrix = np.zeros((nc, nc), dtype=int)
-
-        bandwidth = self.config.bandwidth
-        average = self.config.average
 
         if eval_key is not None:
             acc_field = "%s_accuracy" % eval_key
@@ -253,51 +267,26 @@ class SimpleEvaluation(SegmentationEvaluation):
                 dataset.add_frame_field(rec_field, fof.FloatField)
 
         logger.info("Evaluating segmentations...")
-        for sample in _samples.iter_samples(progress=True):
-            if processing_frames:
-                images = sample.frames.values()
-            else:
-                images = [sample]
-
-            sample_conf_mat = np.zeros((nc, nc), dtype=int)
-            for image in images:
-                gt_seg = image[gt_field]
-                if gt_seg is None or gt_seg.mask is None:
-                    msg = "Skipping sample with missing ground truth mask"
-                    warnings.warn(msg)
-                    continue
-
-                pred_seg = image[pred_field]
-                if pred_seg is None or pred_seg.mask is None:
-                    msg = "Skipping sample with missing prediction mask"
-                    warnings.warn(msg)
-                    continue
-
-                image_conf_mat = _compute_pixel_confusion_matrix(
-                    pred_seg.mask, gt_seg.mask, values, bandwidth=bandwidth
-                )
-                sample_conf_mat += image_conf_mat
-
-                # Record frame stats, if requested
-                if processing_frames and eval_key is not None:
-                    facc, fpre, frec = _compute_accuracy_precision_recall(
-                        image_conf_mat, values, average
-                    )
-                    image[acc_field] = facc
-                    image[pre_field] = fpre
-                    image[rec_field] = frec
-
-            confusion_matrix += sample_conf_mat
-
-            # Record sample stats, if requested
-            if eval_key is not None:
-                sacc, spre, srec = _compute_accuracy_precision_recall(
-                    sample_conf_mat, values, average
-                )
-                sample[acc_field] = sacc
-                sample[pre_field] = spre
-                sample[rec_field] = srec
-                sample.save()
+        evaluate_sample = functools.partial(
+            _evaluate_sample,
+            pred_field=pred_field,
+            gt_field=gt_field,
+            values=values,
+            bandwidth=self.config.bandwidth,
+            average=self.config.average,
+            eval_key=eval_key,
+            processing_frames=processing_frames,
+        )
+        confusion_matrix = _samples.map_samples(
+            evaluate_sample,
+            save=eval_key is not None,
+            num_workers=num_workers,
+            progress=True,
+            reduce_fcn=operator.add,
+        )
+
+        if confusion_matrix is None:
+            confusion_matrix = np.zeros((nc, nc), dtype=int)
 
         if nc > 0:
             missing = classes[0] if values[0] == 0 else None
@@ -409,6 +398,62 @@ def _parse_config(pred_field, gt_field, method, **kwargs):
     raise ValueError("Unsupported evaluation method '%s'" % method)
 
 
+def _evaluate_sample(
+    sample,
+    pred_field,
+    gt_field,
+    values,
+    bandwidth,
+    average,
+    eval_key,
+    processing_frames,
+):
+    if processing_frames:
+        images = sample.frames.values()
+    else:
+        images = [sample]
+
+    nc = len(values)
+    sample_conf_mat = np.zeros((nc, nc), dtype=int)
+    for image in images:
+        gt_seg = image[gt_field]
+        if gt_seg is None or gt_seg.mask is None:
+            msg = "Skipping sample with missing ground truth mask"
+            warnings.warn(msg)
+            continue
+
+        pred_seg = image[pred_field]
+        if pred_seg is None or pred_seg.mask is None:
+            msg = "Skipping sample with missing prediction mask"
+            warnings.warn(msg)
+            continue
+
+        image_conf_mat = _compute_pixel_confusion_matrix(
+            pred_seg.mask, gt_seg.mask, values, bandwidth=bandwidth
+        )
+        sample_conf_mat += image_conf_mat
+
+        # Record frame stats, if requested
+        if processing_frames and eval_key is not None:
+            facc, fpre, frec = _compute_accuracy_precision_recall(
+                image_conf_mat, values, average
+            )
+            image["%s_accuracy" % eval_key] = facc
+            image["%s_precision" % eval_key] = fpre
+            image["%s_recall" % eval_key] = frec
+
+    # Record sample stats, if requested
+    if eval_key is not None:
+        sacc, spre, srec = _compute_accuracy_precision_recall(
+            sample_conf_mat, values, average
+        )
+        sample["%s_accuracy" % eval_key] = sacc
+        sample["%s_precision" % eval_key] = spre
+        sample["%s_recall" % eval_key] = srec
+
+    return sample_conf_mat
+
+
 def _compute_pixel_confusion_matrix(
     pred_mask, gt_mask, values, bandwidth=None
 ):
@@ -426,15 +471,34 @@ def _compute_pixel_confusion_matrix(
             pred_mask, gt_mask, bandwidth
         )
 
-    try:
-        return skm.confusion_matrix(
-            gt_mask.ravel(), pred_mask.ravel(), labels=values
-        )
-    except ValueError:
-        # Assume that no `values` appear in `gt_mask`, which causes
-        # `skm.confusion_matrix` to raise an error
-        num_classes = len(values)
-        return np.zeros((num_classes, num_classes), dtype=int)
+    num_classes = len(values)
+    if num_classes == 0:
+        return np.zeros((0, 0), dtype=int)
+
+    gt_inds = _to_value_inds(gt_mask.ravel(), values)
+    pred_inds = _to_value_inds(pred_mask.ravel(), values)
+
+    # Pixels whose values aren't in `values` are ignored
+    found = (gt_inds < num_classes) & (pred_inds < num_classes)
+    inds = gt_inds[found] * num_classes + pred_inds[found]
+
+    return np.bincount(inds, minlength=num_classes**2).reshape(
+        num_classes, num_classes
+    )
+
+
+def _to_value_inds(mask, values):
+    # Maps the pixel values in `mask` to their indexes in `values`. Values
+    # that don't appear in `values` are mapped to `len(values)`
+    values = np.asarray(values)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+
+    inds = np.searchsorted(sorted_values, mask)
+    inds = np.minimum(inds, len(values) - 1)
+    found = sorted_values[inds] == mask
+
+    return np.where(found, order[inds], len(values))
 
 
 def _extract_contour_band_values(pred_mask, gt_mask, bandwidth):
@@ -452,23 +516,38 @@ def _compute_accuracy_precision_recall(confusion_matrix, values, average):
     return metrics["accuracy"], metrics["precision"], metrics["recall"]
 
 
-def _get_mask_values(samples, pred_field, gt_field):
+def _get_mask_values(samples, pred_field, gt_field, num_workers=None):
     _samples = samples.select_fields([gt_field, pred_field])
     pred_field, processing_frames = samples._handle_frame_field(pred_field)
     gt_field, _ = samples._handle_frame_field(gt_field)
 
-    values = set()
+    get_values = functools.partial(
+        _get_sample_mask_values,
+        pred_field=pred_field,
+        gt_field=gt_field,
+        processing_frames=processing_frames,
+    )
+    values = _samples.map_samples(
+        get_values,
+        num_workers=num_workers,
+        progress=True,
+        reduce_fcn=operator.or_,
+    )
+
+    return sorted(values or [])
 
-    for sample in _samples.iter_samples(progress=True):
-        if processing_frames:
-            images = sample.frames.values()
-        else:
-            images = [sample]
 
-        for image in images:
-            for field in (pred_field, gt_field):
-                seg = image[field]
-                if seg is not None and seg.mask is not None:
-                    values.update(seg.mask.ravel())
+def _get_sample_mask_values(sample, pred_field, gt_field, processing_frames):
+    if processing_frames:
+        images = sample.frames.values()
+    else:
+        images = [sample]
+
+    values = set()
+    for image in images:
+        for field in (pred_field, gt_field):
+            seg = image[field]
+            if seg is not None and seg.mask is not None:
+                values.update(np.unique(seg.mask).tolist())
 
-    return sorted(values)
+    return values
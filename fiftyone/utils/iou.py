@@ -6,6 +6,7 @@ Intersection over union (IoU) utilities.
 |
 """
 import contextlib
+import itertools
 import logging
 
 import numpy as np
@@ -21,6 +22,10 @@ sg = fou.lazy_import("shapely.geometry")
 so = fou.lazy_import("shapely.ops")
 
 
+_MAX_MASK_FRAME_DIM = 8192
+_MAX_MASK_CHUNK_SIZE = 2**24
+
+
 def compute_ious(
     preds,
     gts,
@@ -29,6 +34,7 @@ def compute_ious(
     use_masks=False,
     use_boxes=False,
     tolerance=None,
+    dense_masks=False,
     error_level=1,
 ):
     """Computes the pairwise IoUs between the predicted and ground truth
@@ -54,7 +60,11 @@ def compute_ious(
             of the provided :class:`fiftyone.core.labels.Polyline` instances
             rather than using their actual geometries
         tolerance (None): a tolerance, in pixels, when generating approximate
-            polylines for instance masks. Typical values are 1-3 pixels
+            polylines for instance masks. Typical values are 1-3 pixels. The
+            default is 2 pixels
+        dense_masks (False): whether to compute IoUs directly from the dense
+            instance masks rather than from their polygonal approximations.
+            Only applicable when ``use_masks`` is True
         error_level (1): the error level to use when manipulating instance
             masks or polylines. Valid values are:
 
@@ -72,7 +82,8 @@ def compute_ious(
         return np.zeros((len(preds), len(gts)))
 
     if etau.is_str(iscrowd):
-        iscrowd = lambda l: bool(l.get_attribute_value(iscrowd, False))
+        crowd_attr = iscrowd
+        iscrowd = lambda l: bool(l.get_attribute_value(crowd_attr, False))
 
     if isinstance(preds[0], fol.Polyline):
         if use_boxes:
@@ -85,8 +96,11 @@ def compute_ious(
         )
 
     if use_masks:
-        # @todo when tolerance is None, consider using dense masks rather than
-        # polygonal approximations?
+        if dense_masks:
+            return _compute_dense_mask_ious(
+                preds, gts, iscrowd=iscrowd, classwise=classwise
+            )
+
         if tolerance is None:
             tolerance = 2
 
@@ -402,9 +416,9 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
     is_symmetric = preds is gts
 
     if iscrowd is not None:
-        gt_crowds = [iscrowd(gt) for gt in gts]
+        gt_crowds = np.array([iscrowd(gt) for gt in gts], dtype=bool)
     else:
-        gt_crowds = [False] * len(gts)
+        gt_crowds = None
 
     if isinstance(preds[0], fol.Polyline):
         preds = _polylines_to_detections(preds)
@@ -414,47 +428,87 @@ def _compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
         else:
             gts = _polylines_to_detections(gts)
 
-    ious = np.zeros((len(preds), len(gts)))
+    pred_boxes = _to_bbox_array(preds)
 
-    for j, (gt, gt_crowd) in enumerate(zip(gts, gt_crowds)):
-        gx, gy, gw, gh = gt.bounding_box
-        gt_area = gh * gw
+    if is_symmetric:
+        gt_boxes = pred_boxes
+    else:
+        gt_boxes = _to_bbox_array(gts)
 
-        for i, pred in enumerate(preds):
-            if is_symmetric and i < j:
-                iou = ious[j, i]
-            elif is_symmetric and i == j:
-                iou = 1
-            elif classwise and pred.label != gt.label:
-                continue
-            else:
-                px, py, pw, ph = pred.bounding_box
-                pred_area = ph * pw
+    ious = _compute_bbox_iou_matrix(pred_boxes, gt_boxes, gt_crowds=gt_crowds)
 
-                # Width of intersection
-                w = min(px + pw, gx + gw) - max(px, gx)
-                if w <= 0:
-                    continue
+    if classwise:
+        pred_labels, gt_labels = _to_label_arrays(preds, gts, is_symmetric)
+        ious[pred_labels[:, np.newaxis] != gt_labels[np.newaxis, :]] = 0
 
-                # Height of intersection
-                h = min(py + ph, gy + gh) - max(py, gy)
-                if h <= 0:
-                    continue
+    if is_symmetric:
+        # Only the lower triangle is used so that the matrix is exactly
+        # symmetric even when crowd semantics make IoU order-dependent
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
 
-                inter = h * w
+    return ious
 
-                if gt_crowd:
-                    union = pred_area
-                else:
-                    union = pred_area + gt_area - inter
 
-                iou = min(etan.safe_divide(inter, union), 1)
+def _compute_bbox_iou_matrix(pred_boxes, gt_boxes, gt_crowds=None):
+    # Computes all pairwise IoUs between the ``(N, 4)`` and ``(M, 4)`` arrays
+    # of ``[top-left-x, top-left-y, width, height]`` boxes via broadcasting
+    px, py, pw, ph = pred_boxes.T
+    gx, gy, gw, gh = gt_boxes.T
 
-            ious[i, j] = iou
+    pred_areas = pw * ph
+    gt_areas = gw * gh
+
+    # Width and height of intersections
+    w = np.minimum((px + pw)[:, np.newaxis], (gx + gw)[np.newaxis, :])
+    w -= np.maximum(px[:, np.newaxis], gx[np.newaxis, :])
+    np.maximum(w, 0, out=w)
+
+    h = np.minimum((py + ph)[:, np.newaxis], (gy + gh)[np.newaxis, :])
+    h -= np.maximum(py[:, np.newaxis], gy[np.newaxis, :])
+    np.maximum(h, 0, out=h)
+
+    inter = w * h
+
+    union = pred_areas[:, np.newaxis] + gt_areas[np.newaxis, :] - inter
+    if gt_crowds is not None and gt_crowds.any():
+        union[:, gt_crowds] = np.broadcast_to(
+            pred_areas[:, np.newaxis], (len(pred_areas), gt_crowds.sum())
+        )
+
+    ious = np.zeros(inter.shape, dtype=float)
+    np.divide(inter, union, out=ious, where=union != 0)
+    np.minimum(ious, 1, out=ious)
 
     return ious
 
 
+def _to_bbox_array(detections):
+    boxes = np.array(
+        [detection.bounding_box for detection in detections], dtype=float
+    )
+    return boxes.reshape(-1, 4)
+
+
+def _to_label_arrays(preds, gts, is_symmetric):
+    # Maps labels to integer codes so that comparisons are vectorized
+    codes = {}
+    pred_labels = np.array(
+        [codes.setdefault(pred.label, len(codes)) for pred in preds],
+        dtype=int,
+    )
+
+    if is_symmetric:
+        gt_labels = pred_labels
+    else:
+        gt_labels = np.array(
+            [codes.setdefault(gt.label, len(codes)) for gt in gts], dtype=int
+        )
+
+    return pred_labels, gt_labels
+
+
 def _compute_polyline_ious(
     preds, gts, error_level, iscrowd=None, classwise=False, gt_crowds=None
 ):
@@ -566,6 +620,204 @@ def _compute_mask_ious(
     )
 
 
+def _compute_dense_mask_ious(preds, gts, iscrowd=None, classwise=False):
+    is_symmetric = preds is gts
+
+    # All masks are rendered at a common resolution
+    if is_symmetric:
+        frame_size = _get_mask_frame_size(preds)
+    else:
+        frame_size = _get_mask_frame_size(itertools.chain(preds, gts))
+
+    if frame_size is None:
+        # No instance masks, so the objects are their bounding boxes
+        return _compute_bbox_ious(
+            preds, gts, iscrowd=iscrowd, classwise=classwise
+        )
+
+    pred_masks, pred_boxes = _render_masks(preds, frame_size)
+    pred_areas = np.array([np.count_nonzero(m) for m in pred_masks])
+
+    if is_symmetric:
+        gt_masks, gt_boxes, gt_areas = pred_masks, pred_boxes, pred_areas
+    else:
+        gt_masks, gt_boxes = _render_masks(gts, frame_size)
+        gt_areas = np.array([np.count_nonzero(m) for m in gt_masks])
+
+    inter = _compute_mask_intersections(
+        pred_masks,
+        pred_boxes,
+        gt_masks,
+        gt_boxes,
+        frame_size,
+        is_symmetric=is_symmetric,
+    )
+
+    if classwise:
+        pred_labels, gt_labels = _to_label_arrays(preds, gts, is_symmetric)
+        inter[pred_labels[:, np.newaxis] != gt_labels[np.newaxis, :]] = 0
+
+    union = pred_areas[:, np.newaxis] + gt_areas[np.newaxis, :] - inter
+
+    if iscrowd is not None:
+        gt_crowds = np.array([iscrowd(gt) for gt in gts], dtype=bool)
+        union[:, gt_crowds] = pred_areas[:, np.newaxis]
+
+    ious = np.zeros(inter.shape, dtype=float)
+    np.divide(inter, union, out=ious, where=union != 0)
+    np.minimum(ious, 1, out=ious)
+
+    if is_symmetric:
+        # Only the lower triangle is used so that the matrix is exactly
+        # symmetric even when crowd semantics make IoU order-dependent
+        ious = np.tril(ious, k=-1)
+        ious += ious.T
+        np.fill_diagonal(ious, 1)
+
+    return ious
+
+
+def _compute_mask_intersections(
+    pred_masks, pred_boxes, gt_masks, gt_boxes, frame_size, is_symmetric=False
+):
+    # Computes the pixel intersections of all pairs of masks as the matrix
+    # product of their flattened renderings in the common frame. The frame is
+    # processed in strips of rows so that memory usage is bounded
+    width, height = frame_size
+    num_preds, num_gts = len(pred_masks), len(gt_masks)
+    inter = np.zeros((num_preds, num_gts), dtype=int)
+
+    max_num = max(num_preds, num_gts, 1)
+    num_rows = max(_MAX_MASK_CHUNK_SIZE // (max_num * width), 1)
+
+    for y0 in range(0, height, num_rows):
+        y1 = min(y0 + num_rows, height)
+
+        pred_inds = _get_strip_inds(pred_boxes, y0, y1)
+        if is_symmetric:
+            gt_inds = pred_inds
+        else:
+            gt_inds = _get_strip_inds(gt_boxes, y0, y1)
+
+        if not pred_inds.size or not gt_inds.size:
+            continue
+
+        # Only the columns that contain a mask are rendered
+        x0 = min(pred_boxes[pred_inds, 0].min(), gt_boxes[gt_inds, 0].min())
+        x1 = max(pred_boxes[pred_inds, 2].max(), gt_boxes[gt_inds, 2].max())
+
+        pred_strip = _render_mask_strip(
+            pred_masks, pred_boxes, pred_inds, x0, y0, x1, y1
+        )
+        if is_symmetric:
+            gt_strip = pred_strip
+        else:
+            gt_strip = _render_mask_strip(
+                gt_masks, gt_boxes, gt_inds, x0, y0, x1, y1
+            )
+
+        # Strips have at most 2^24 pixels, so float32 counts are exact
+        counts = np.rint(pred_strip @ gt_strip.T).astype(int)
+        inter[np.ix_(pred_inds, gt_inds)] += counts
+
+    return inter
+
+
+def _get_strip_inds(boxes, y0, y1):
+    return np.flatnonzero((boxes[:, 1] < y1) & (boxes[:, 3] > y0))
+
+
+def _render_mask_strip(masks, boxes, inds, x0, y0, x1, y1):
+    # Renders the ``[x0, x1) x [y0, y1)`` window of the frame for each of the
+    # given masks, returning a ``len(inds) x num_pixels`` array
+    strip = np.zeros((len(inds), y1 - y0, x1 - x0), dtype=np.float32)
+    for k, idx in enumerate(inds):
+        bx0, by0, bx1, by1 = boxes[idx]
+        r0, r1 = max(by0, y0), min(by1, y1)
+        strip[k, (r0 - y0) : (r1 - y0), (bx0 - x0) : (bx1 - x0)] = masks[idx][
+            (r0 - by0) : (r1 - by0)
+        ]
+
+    return strip.reshape(len(inds), -1)
+
+
+def _get_mask_frame_size(detections):
+    # Infers the resolution of the image from the shapes of the instance
+    # masks relative to their bounding boxes
+    width = None
+    height = None
+    for detection in detections:
+        if detection.mask is None:
+            continue
+
+        _, _, w, h = detection.bounding_box
+        mask_height, mask_width = detection.mask.shape[:2]
+
+        if w > 0:
+            width = max(width or 0, mask_width / w)
+
+        if h > 0:
+            height = max(height or 0, mask_height / h)
+
+    if width is None or height is None:
+        return None
+
+    width = min(max(int(round(width)), 1), _MAX_MASK_FRAME_DIM)
+    height = min(max(int(round(height)), 1), _MAX_MASK_FRAME_DIM)
+
+    return width, height
+
+
+def _render_masks(detections, frame_size):
+    # Renders the instance masks at the given frame size, returning a list of
+    # boolean masks and a ``num_detections x 4`` array of their
+    # ``[x0, y0, x1, y1]`` pixel coordinates in the frame
+    width, height = frame_size
+
+    masks = []
+    boxes = np.zeros((len(detections), 4), dtype=int)
+    for idx, detection in enumerate(detections):
+        x, y, w, h = detection.bounding_box
+        x0 = int(round(x * width))
+        y0 = int(round(y * height))
+        x1 = max(int(round((x + w) * width)), x0)
+        y1 = max(int(round((y + h) * height)), y0)
+
+        mask = detection.mask
+        if mask is None:
+            mask = np.ones((y1 - y0, x1 - x0), dtype=bool)
+        else:
+            mask = np.asarray(mask)
+            if mask.ndim > 2:
+                mask = mask[:, :, 0]
+
+            mask = _resize_mask(mask.astype(bool), x1 - x0, y1 - y0)
+
+        # Crop to frame
+        cx0, cy0 = max(x0, 0), max(y0, 0)
+        cx1, cy1 = max(min(x1, width), cx0), max(min(y1, height), cy0)
+        mask = mask[(cy0 - y0) : (cy1 - y0), (cx0 - x0) : (cx1 - x0)]
+
+        masks.append(mask)
+        boxes[idx] = (cx0, cy0, cx1, cy1)
+
+    return masks, boxes
+
+
+def _resize_mask(mask, width, height):
+    # Nearest neighbor resizing
+    mask_height, mask_width = mask.shape[:2]
+    if (mask_width, mask_height) == (width, height):
+        return mask
+
+    if mask_width == 0 or mask_height == 0:
+        return np.zeros((height, width), dtype=bool)
+
+    rows = (np.arange(height) * mask_height) // max(height, 1)
+    cols = (np.arange(width) * mask_width) // max(width, 1)
+    return mask[rows[:, np.newaxis], cols[np.newaxis, :]]
+
+
 def _compute_segment_ious(preds, gts):
     is_symmetric = preds is gts
 
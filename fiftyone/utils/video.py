@@ -5,6 +5,8 @@ Video utilities.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import functools
 import itertools
 import logging
 import os
@@ -92,6 +94,7 @@ def reencode_videos(
     output_dir=None,
     rel_dir=None,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -140,6 +143,9 @@ def reencode_videos(
         delete_originals (False): whether to delete the original videos after
             re-encoding. This parameter has no effect if the videos are being
             updated in-place
+        num_workers (None): the number of videos to process concurrently, each
+            in its own ``ffmpeg`` process. By default, videos are processed
+            serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be re-encoded
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -157,6 +163,7 @@ def reencode_videos(
         output_dir=output_dir,
         rel_dir=rel_dir,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -178,6 +185,7 @@ def transform_videos(
     output_dir=None,
     rel_dir=None,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -238,6 +246,9 @@ def transform_videos(
             ``output_dir`` that match the shape of the input paths
         delete_originals (False): whether to delete the original videos after
             re-encoding
+        num_workers (None): the number of videos to process concurrently, each
+            in its own ``ffmpeg`` process. By default, videos are processed
+            serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be transformed
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -261,6 +272,7 @@ def transform_videos(
         output_dir=output_dir,
         rel_dir=rel_dir,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -284,6 +296,7 @@ def sample_videos(
     output_dir=None,
     rel_dir=None,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
     **kwargs,
@@ -383,6 +396,9 @@ def sample_videos(
             folder structure
         delete_originals (False): whether to delete the original videos after
             sampling
+        num_workers (None): the number of videos to sample concurrently, each
+            in its own ``ffmpeg`` process. By default, videos are sampled
+            serially
         skip_failures (False): whether to gracefully continue without raising
             an error if a video cannot be sampled
         verbose (False): whether to log the ``ffmpeg`` commands that are
@@ -409,6 +425,7 @@ def sample_videos(
         rel_dir=rel_dir,
         save_filepaths=save_filepaths,
         delete_originals=delete_originals,
+        num_workers=num_workers,
         skip_failures=skip_failures,
         verbose=verbose,
         **kwargs,
@@ -678,10 +695,14 @@ def _transform_videos(
     output_dir=None,
     rel_dir=None,
     delete_originals=False,
+    num_workers=None,
     skip_failures=False,
     verbose=False,
+    finalize_fcn=None,
     **kwargs,
 ):
+    # `finalize_fcn` is an optional function that is called with each sample
+    # in the main thread after its video has been transformed
     if output_field is None:
         output_field = media_field
 
@@ -694,83 +715,161 @@ def _transform_videos(
                 fo.config.default_sequence_idx + fo.config.default_image_ext
             )
 
+    if num_workers is None or num_workers < 1:
+        num_workers = 1
+
     view = sample_collection.select_fields(media_field)
 
     if frames is None:
         frames = itertools.repeat(None)
 
-    with fou.ProgressBar(total=len(view)) as pb:
-        for sample, _frames in pb(zip(view, frames)):
-            inpath = sample[media_field]
+    transform = functools.partial(
+        _transform_video,
+        fps=fps,
+        min_fps=min_fps,
+        max_fps=max_fps,
+        size=size,
+        min_size=min_size,
+        max_size=max_size,
+        original_frame_numbers=original_frame_numbers,
+        reencode=reencode,
+        force_reencode=force_reencode,
+        delete_original=delete_originals,
+        skip_failures=skip_failures,
+        verbose=verbose,
+        **kwargs,
+    )
 
-            _outpath = _get_outpath(
-                inpath, output_dir=output_dir, rel_dir=rel_dir
+    def _finalize(sample, _frames, inpath, outpath):
+        if save_filepaths and sample_frames:
+            _save_frame_paths(
+                sample, _frames, outpath, output_field, skip_failures
             )
 
-            if sample_frames:
-                outpath = os.path.join(
-                    os.path.splitext(_outpath)[0], frames_patt
+        if (diff_field or outpath != inpath) and not sample_frames:
+            sample[output_field] = outpath
+            sample.save()
+
+        if finalize_fcn is not None:
+            finalize_fcn(sample)
+
+    with fou.ProgressBar(total=len(view)) as pb:
+        tasks = _iter_transform_tasks(
+            view,
+            frames,
+            media_field,
+            sample_frames,
+            frames_patt,
+            reencode,
+            force_reencode,
+            output_dir,
+            rel_dir,
+            pb,
+        )
+
+        if num_workers <= 1:
+            for sample, _frames, inpath, outpath in tasks:
+                transform(inpath, outpath, frames=_frames)
+                _finalize(sample, _frames, inpath, outpath)
+                pb.update()
+
+            return
+
+        # Each task runs ``ffmpeg`` in a subprocess, so threads suffice to
+        # parallelize the work. Results are handled in the main thread as
+        # each video completes so that database writes remain serialized
+        max_pending = 2 * num_workers
+        pending = {}
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for task in tasks:
+                sample, _frames, inpath, outpath = task
+                future = executor.submit(
+                    transform, inpath, outpath, frames=_frames
                 )
+                pending[future] = task
+
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _handle_done(done, pending, _finalize, pb)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _handle_done(done, pending, _finalize, pb)
 
-                # If sampling was not forced and the first frame exists, assume
-                # that all frames exist
-                fn = _frames[0] if _frames else 1
-                if not force_reencode and os.path.isfile(outpath % fn):
-                    continue
-            elif reencode:
-                root, ext = os.path.splitext(_outpath)
-                if ext.lower() != ".mp4":
-                    outpath = root + ".mp4"
-                else:
-                    outpath = _outpath
+
+def _iter_transform_tasks(
+    view,
+    frames,
+    media_field,
+    sample_frames,
+    frames_patt,
+    reencode,
+    force_reencode,
+    output_dir,
+    rel_dir,
+    pb,
+):
+    for sample, _frames in zip(view, frames):
+        inpath = sample[media_field]
+
+        _outpath = _get_outpath(inpath, output_dir=output_dir, rel_dir=rel_dir)
+
+        if sample_frames:
+            outpath = os.path.join(os.path.splitext(_outpath)[0], frames_patt)
+
+            # If sampling was not forced and the requested frames exist,
+            # assume that the video has already been sampled
+            if not force_reencode and _frames_exist(outpath, _frames):
+                pb.update()
+                continue
+        elif reencode:
+            root, ext = os.path.splitext(_outpath)
+            if ext.lower() != ".mp4":
+                outpath = root + ".mp4"
             else:
                 outpath = _outpath
+        else:
+            outpath = _outpath
 
-            _transform_video(
-                inpath,
-                outpath,
-                frames=_frames,
-                fps=fps,
-                min_fps=min_fps,
-                max_fps=max_fps,
-                size=size,
-                min_size=min_size,
-                max_size=max_size,
-                original_frame_numbers=original_frame_numbers,
-                reencode=reencode,
-                force_reencode=force_reencode,
-                delete_original=delete_originals,
-                skip_failures=skip_failures,
-                verbose=verbose,
-                **kwargs,
-            )
+        yield sample, _frames, inpath, outpath
+
+
+def _frames_exist(outpath, frames):
+    if not frames:
+        # Frame numbers are unknown, so only the first frame can be checked
+        return os.path.isfile(outpath % 1)
 
-            if save_filepaths and sample_frames:
-                if _frames is None:
-                    try:
-                        if sample.metadata is None:
-                            sample.compute_metadata()
+    return all(os.path.isfile(outpath % fn) for fn in frames)
 
-                        _frames = range(
-                            1, sample.metadata.total_frame_count + 1
-                        )
-                    except Exception as e:
-                        if not skip_failures:
-                            raise
 
-                        _frames = []
-                        logger.warning(e)
+def _handle_done(done, pending, finalize, pb):
+    for future in done:
+        sample, _frames, inpath, outpath = pending.pop(future)
+        future.result()
+        finalize(sample, _frames, inpath, outpath)
+        pb.update()
+
+
+def _save_frame_paths(sample, frames, outpath, output_field, skip_failures):
+    if frames is None:
+        try:
+            if sample.metadata is None:
+                sample.compute_metadata()
+
+            frames = range(1, sample.metadata.total_frame_count + 1)
+        except Exception as e:
+            if not skip_failures:
+                raise
 
-                for fn in _frames:
-                    frame_path = outpath % fn
-                    if os.path.isfile(frame_path):
-                        sample.frames[fn][output_field] = frame_path
+            frames = []
+            logger.warning(e)
 
-                sample.save()
+    for fn in frames:
+        frame_path = outpath % fn
+        if os.path.isfile(frame_path):
+            sample.frames[fn][output_field] = frame_path
 
-            if (diff_field or outpath != inpath) and not sample_frames:
-                sample[output_field] = outpath
-                sample.save()
+    sample.save()
 
 
 def _transform_video(
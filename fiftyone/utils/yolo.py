@@ -598,6 +598,8 @@ class YOLOv4DatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
 
             If None, the default value of this parameter will be chosen based
             on the value of the ``data_path`` parameter
@@ -695,7 +697,7 @@ class YOLOv4DatasetExporter(
             self.export_media,
             export_path=export_path,
             rel_dir=self.rel_dir,
-            supported_modes=(True, False, "move", "symlink"),
+            supported_modes=(True, False, "move", "symlink", "hardlink"),
             default_ext=self.image_format,
             ignore_exts=True,
         )
@@ -797,6 +799,8 @@ class YOLOv5DatasetExporter(
             -   ``"move"``: move all media files into the output directory
             -   ``"symlink"``: create symlinks to the media files in the output
                 directory
+            -   ``"hardlink"``: create hard links to the media files in the
+                output directory
 
             If None, the default value of this parameter will be chosen based
             on the value of the ``data_path`` parameter
@@ -892,7 +896,7 @@ class YOLOv5DatasetExporter(
             self.export_media,
             export_path=self.data_path,
             rel_dir=self.rel_dir,
-            supported_modes=(True, False, "move", "symlink"),
+            supported_modes=(True, False, "move", "symlink", "hardlink"),
             default_ext=self.image_format,
             ignore_exts=True,
         )
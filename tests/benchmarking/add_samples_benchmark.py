@@ -9,6 +9,8 @@ Results are written to `add_samples_benchmark.log`.
 """
 import logging
 import os
+import random
+import time
 
 import eta.core.logging as etal
 
@@ -31,6 +33,58 @@ etal.custom_setup(
 )
 
 
+def _make_sample_dicts(num_samples, num_objects):
+    dicts = []
+    for idx in range(num_samples):
+        detections = []
+        for _ in range(num_objects):
+            x, y = random.random() * 0.9, random.random() * 0.9
+            w, h = random.random() * 0.1, random.random() * 0.1
+            detections.append(
+                {
+                    "label": str(random.randint(1, 80)),
+                    "bounding_box": [x, y, w, h],
+                    "confidence": random.random(),
+                }
+            )
+
+        dicts.append(
+            {
+                "filepath": "/path/to/image%d.jpg" % idx,
+                "ground_truth": {
+                    "_cls": "Detections",
+                    "detections": detections,
+                },
+            }
+        )
+
+    return dicts
+
+
+def _make_samples(dicts):
+    return [
+        fo.Sample(
+            filepath=d["filepath"],
+            ground_truth=fo.Detections(
+                detections=[
+                    fo.Detection(**kwargs)
+                    for kwargs in d["ground_truth"]["detections"]
+                ]
+            ),
+        )
+        for d in dicts
+    ]
+
+
+def _time_add_samples(samples):
+    dataset = fo.Dataset()
+    start_time = time.time()
+    dataset.add_samples(samples)
+    elapsed = time.time() - start_time
+    dataset.delete()
+    return elapsed
+
+
 #
 # Add samples benchmark
 #
@@ -38,9 +92,38 @@ etal.custom_setup(
 dataset = foz.load_zoo_dataset("cifar10", split="train")
 
 samples = [s.copy() for s in dataset]
+dicts = [s.to_mongo_dict() for s in samples]
 
 logger.info("\nStarting test")
-for batch_size in [1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, None]:
-    logger.info("\nBatch size: %s" % batch_size)
-    dataset2 = fo.Dataset()
-    dataset2.add_samples(samples, _batch_size=batch_size)
+logger.info("Samples: %.2fs" % _time_add_samples(samples))
+logger.info("Dicts: %.2fs" % _time_add_samples(dicts))
+
+
+#
+# Add detections benchmark
+#
+
+random.seed(51)
+
+logger.info("\nStarting detections test")
+for num_samples, num_objects in [(1000, 10), (10000, 10), (1000, 100)]:
+    dicts = _make_sample_dicts(num_samples, num_objects)
+
+    # Constructing the samples is part of the cost of ingesting them
+    start_time = time.time()
+    samples = _make_samples(dicts)
+    samples_time = time.time() - start_time + _time_add_samples(samples)
+
+    dicts_time = _time_add_samples(dicts)
+
+    logger.info(
+        "Samples: %d, objects: %d, samples: %.2fs, dicts: %.2fs, "
+        "speedup: %.1fx"
+        % (
+            num_samples,
+            num_objects,
+            samples_time,
+            dicts_time,
+            samples_time / max(dicts_time, 1e-9),
+        )
+    )
@@ -0,0 +1,154 @@
+"""
+Benchmarking for :func:`fiftyone.utils.iou.compute_ious`.
+
+Compares the vectorized bounding box IoU implementation against a reference
+implementation that loops over all pairs of objects in Python.
+
+Results are written to `iou_benchmark.log`.
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import logging
+import os
+import random
+import time
+
+import numpy as np
+
+import eta.core.logging as etal
+import eta.core.numutils as etan
+
+import fiftyone as fo
+import fiftyone.utils.iou as foui
+
+
+logger = logging.getLogger(__name__)
+
+
+# Logs everything written by a `logger` in this benchmark
+etal.custom_setup(
+    etal.LoggingConfig(
+        dict(
+            filename=os.path.splitext(os.path.abspath(__file__))[0] + ".log",
+            file_format="%(message)s",
+        )
+    ),
+    verbose=False,
+)
+
+
+def _make_detections(num_objects, num_classes=10):
+    detections = []
+    for _ in range(num_objects):
+        x, y = random.random() * 0.9, random.random() * 0.9
+        w, h = random.random() * 0.1, random.random() * 0.1
+        detections.append(
+            fo.Detection(
+                label=str(random.randint(1, num_classes)),
+                bounding_box=[x, y, w, h],
+                iscrowd=random.random() < 0.05,
+            )
+        )
+
+    return detections
+
+
+def _loop_compute_bbox_ious(preds, gts, iscrowd=None, classwise=False):
+    # Reference implementation that computes each pair of IoUs in Python
+    is_symmetric = preds is gts
+
+    if iscrowd is not None:
+        gt_crowds = [iscrowd(gt) for gt in gts]
+    else:
+        gt_crowds = [False] * len(gts)
+
+    ious = np.zeros((len(preds), len(gts)))
+
+    for j, (gt, gt_crowd) in enumerate(zip(gts, gt_crowds)):
+        gx, gy, gw, gh = gt.bounding_box
+        gt_area = gh * gw
+
+        for i, pred in enumerate(preds):
+            if is_symmetric and i < j:
+                iou = ious[j, i]
+            elif is_symmetric and i == j:
+                iou = 1
+            elif classwise and pred.label != gt.label:
+                continue
+            else:
+                px, py, pw, ph = pred.bounding_box
+                pred_area = ph * pw
+
+                w = min(px + pw, gx + gw) - max(px, gx)
+                if w <= 0:
+                    continue
+
+                h = min(py + ph, gy + gh) - max(py, gy)
+                if h <= 0:
+                    continue
+
+                inter = h * w
+
+                if gt_crowd:
+                    union = pred_area
+                else:
+                    union = pred_area + gt_area - inter
+
+                iou = min(etan.safe_divide(inter, union), 1)
+
+            ious[i, j] = iou
+
+    return ious
+
+
+def _time(fcn, *args, num_trials=5, **kwargs):
+    times = []
+    for _ in range(num_trials):
+        start_time = time.time()
+        result = fcn(*args, **kwargs)
+        times.append(time.time() - start_time)
+
+    return result, np.median(times)
+
+
+#
+# Bounding box IoU benchmark
+#
+
+random.seed(51)
+iscrowd = lambda l: bool(l.get_attribute_value("iscrowd", False))
+
+logger.info("\nStarting test")
+for num_objects in [10, 30, 100, 300, 1000]:
+    preds = _make_detections(num_objects)
+    gts = _make_detections(num_objects)
+
+    for name, kwargs in [
+        ("default", {}),
+        ("classwise", dict(classwise=True)),
+        ("iscrowd", dict(iscrowd=iscrowd)),
+    ]:
+        for symmetric in (False, True):
+            _gts = preds if symmetric else gts
+
+            loop_ious, loop_time = _time(
+                _loop_compute_bbox_ious, preds, _gts, **kwargs
+            )
+            ious, vec_time = _time(foui.compute_ious, preds, _gts, **kwargs)
+
+            assert np.allclose(ious, loop_ious)
+
+            logger.info(
+                "Objects: %d, mode: %s, symmetric: %s, loop: %.4fs, "
+                "vectorized: %.4fs, speedup: %.1fx"
+                % (
+                    num_objects,
+                    name,
+                    symmetric,
+                    loop_time,
+                    vec_time,
+                    loop_time / max(vec_time, 1e-9),
+                )
+            )
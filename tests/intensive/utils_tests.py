@@ -150,7 +150,9 @@ def test_transform_videos(tmpdir):
     fouv.reencode_videos(dataset)
     assert sample.filepath.endswith(".mp4")
 
-    fouv.transform_videos(dataset, reencode=True, force_reencode=True)
+    fouv.transform_videos(
+        dataset, reencode=True, force_reencode=True, num_workers=2
+    )
     assert sample.filepath.endswith(".mp4")
 
     fouv.transform_videos(dataset, max_size=(256, 256))
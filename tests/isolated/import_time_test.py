@@ -1,28 +1,115 @@
 """
-Test that fiftyone can be imported in a reasonable amount of time.
+Benchmarks the time required to ``import fiftyone``.
+
+The per-module import costs are reported via ``python -X importtime``. Set the
+``FIFTYONE_IMPORT_BENCHMARK_PATH`` environment variable to also write the
+results as JSON so that they can be tracked over time.
 
 | Copyright 2017-2022, Voxel51, Inc.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import json
+import os
+import subprocess
+import sys
 import warnings
-import time
 
 
-# TODO: decrease these once the DB service is started on-demand?
-IMPORT_WARN_THRESHOLD = 3
+IMPORT_WARN_THRESHOLD = 1
+NUM_MODULES_TO_REPORT = 20
+
+# Modules that must not be imported by ``import fiftyone``
+LAZY_MODULES = [
+    "fiftyone.core.dataset",
+    "fiftyone.core.plots",
+    "fiftyone.core.session",
+    "fiftyone.migrations",
+    "fiftyone.utils.eval",
+]
 
 
 def test_import_time(capsys):
-    t1 = time.perf_counter()
-    import fiftyone
+    results = _benchmark_import()
 
-    time_elapsed = time.perf_counter() - t1
+    time_elapsed = results["total"]
     message = "`import fiftyone` took %f seconds" % time_elapsed
-    if time_elapsed > IMPORT_WARN_THRESHOLD:
-        warnings.warn(message)
-        # disable stdout capture temporarily
-        with capsys.disabled():
+
+    with capsys.disabled():
+        print("\n%s" % message)
+        print("\nSlowest modules (cumulative seconds):")
+        for name, cumulative in results["modules"][:NUM_MODULES_TO_REPORT]:
+            print("  %8.4f  %s" % (cumulative, name))
+
+        if time_elapsed > IMPORT_WARN_THRESHOLD:
+            warnings.warn(message)
             # message must follow this format:
             # https://docs.github.com/en/actions/reference/workflow-commands-for-github-actions#setting-a-warning-message
             print("\n::warning::%s\n" % message)
+
+    benchmark_path = os.environ.get("FIFTYONE_IMPORT_BENCHMARK_PATH", None)
+    if benchmark_path:
+        with open(benchmark_path, "w") as f:
+            json.dump(results, f, indent=4)
+
+
+def test_import_is_lazy():
+    code = "\n".join(
+        [
+            "import sys",
+            "import fiftyone as fo",
+            "import fiftyone.core.odm.database as food",
+            "modules = %r" % LAZY_MODULES,
+            "print(sorted(m for m in modules if m in sys.modules))",
+            "print(food._client is None)",
+            "fo.Dataset",
+            "print('fiftyone.core.dataset' in sys.modules)",
+            "print(fo.types.__name__)",
+        ]
+    )
+    stdout = subprocess.check_output(
+        [sys.executable, "-c", code], env=_get_env()
+    )
+    lines = stdout.decode().strip().splitlines()
+    imported, not_connected, loaded, submodule = lines
+
+    assert imported == "[]"
+    assert not_connected == "True"
+    assert loaded == "True"
+    assert submodule == "fiftyone.types"
+
+
+def _benchmark_import():
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fiftyone"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=_get_env(),
+        check=True,
+    )
+
+    # Lines have the format:
+    # import time: self [us] | cumulative [us] | imported package
+    modules = {}
+    for line in proc.stderr.decode().splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        try:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            cumulative = int(cumulative) / 1e6
+        except ValueError:
+            continue
+
+        name = name.strip()
+        modules[name] = max(cumulative, modules.get(name, 0))
+
+    total = modules.get("fiftyone", 0)
+    modules = sorted(modules.items(), key=lambda kv: kv[1], reverse=True)
+
+    return {"total": total, "modules": modules}
+
+
+def _get_env():
+    # Import event logging is network-bound, so it is excluded
+    return {**os.environ, "FIFTYONE_DO_NOT_TRACK": "true"}
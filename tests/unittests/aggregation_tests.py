@@ -14,6 +14,7 @@ import unittest
 
 import fiftyone as fo
 from fiftyone import ViewField as F
+import fiftyone.core.sketches as fosk
 
 from decorators import drop_datasets
 
@@ -266,6 +267,65 @@ class DatasetTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             d.quantiles("numeric_field", 2)
 
+    @drop_datasets
+    def test_approx(self):
+        d = fo.Dataset()
+        d.add_sample_field("numeric_field", fo.FloatField)
+        d.add_sample_field("label_field", fo.StringField)
+        self.assertIsNone(d.quantiles("numeric_field", 0.5, approx=True))
+        self.assertEqual(d.distinct("label_field", approx=True), 0)
+        self.assertDictEqual(d.count_values("label_field", approx=True), {})
+
+        rng = np.random.default_rng(51)
+        values = rng.lognormal(size=2000)
+        d.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    numeric_field=float(v),
+                    list_field=[-float(v), 0.0, float(v)],
+                    label_field=str(i % 300),
+                )
+                for i, v in enumerate(values)
+            ]
+        )
+
+        q = [0, 0.1, 0.5, 0.9, 1]
+        for field in ("numeric_field", "list_field"):
+            results1 = d.quantiles(field, q, approx=True)
+            results2 = d.quantiles(field, q)
+            for r1, r2 in zip(results1, results2):
+                self.assertLessEqual(abs(r1 - r2), 0.01 * abs(r2) + 1e-9)
+
+        self.assertAlmostEqual(
+            d.distinct("label_field", approx=True), 300, delta=10
+        )
+        self.assertAlmostEqual(
+            d.distinct("list_field", approx=True), 4001, delta=80
+        )
+
+        counts = d.count_values("label_field", approx=True)
+        self.assertDictEqual(counts, d.count_values("label_field"))
+
+        counts1, edges1, other1 = d.histogram_values(
+            "numeric_field", bins=5, approx=True
+        )
+        counts2, edges2, other2 = d.histogram_values("numeric_field", bins=5)
+        self.assertListEqual(edges1, edges2)
+        self.assertEqual(sum(counts1) + other1, 2000)
+        for c1, c2 in zip(counts1, counts2):
+            self.assertAlmostEqual(c1, c2, delta=0.01 * len(values))
+
+        counts, edges, other = d.histogram_values(
+            "numeric_field", bins=4, auto=True, approx=True
+        )
+        self.assertEqual(len(edges), 5)
+        self.assertEqual(other, 0)
+        self.assertEqual(sum(counts), 2000)
+
+        with self.assertRaises(ValueError):
+            d.histogram_values("created_at", approx=True)
+
     @drop_datasets
     def test_std(self):
         d = fo.Dataset()
@@ -397,6 +457,95 @@ class DatasetTests(unittest.TestCase):
             ["found", "found", "found", "found", "found", "found", "missing"],
         )
 
+    @drop_datasets
+    def test_values_format(self):
+        d = fo.Dataset()
+        d.add_samples(
+            [
+                fo.Sample(
+                    filepath="image1.jpeg",
+                    confidence=0.5,
+                    vector=np.array([1.0, 2.0]),
+                    predictions=fo.Detections(
+                        detections=[
+                            fo.Detection(label="cat", confidence=0.1),
+                            fo.Detection(label="dog", confidence=0.2),
+                        ]
+                    ),
+                ),
+                fo.Sample(
+                    filepath="image2.jpeg",
+                    confidence=None,
+                    vector=np.array([3.0, 4.0]),
+                    predictions=fo.Detections(
+                        detections=[fo.Detection(label="rabbit")]
+                    ),
+                ),
+                fo.Sample(filepath="image3.jpeg", confidence=1.5),
+            ]
+        )
+
+        values = d.values("confidence", format="numpy")
+        self.assertEqual(values.dtype, float)
+        self.assertTrue(
+            np.array_equal(values, [0.5, np.nan, 1.5], equal_nan=True)
+        )
+
+        values = d.values("filepath", format="numpy")
+        self.assertEqual(values.shape, (3,))
+        self.assertTrue(values[0].endswith("image1.jpeg"))
+
+        values, offsets = d.values(
+            "predictions.detections.confidence", format="numpy"
+        )
+        self.assertTrue(
+            np.array_equal(values, [0.1, 0.2, np.nan], equal_nan=True)
+        )
+        self.assertListEqual(offsets.tolist(), [0, 2, 3, 3])
+
+        labels, offsets = d.values(
+            "predictions.detections.label", format="numpy"
+        )
+        self.assertListEqual(labels.tolist(), ["cat", "dog", "rabbit"])
+        self.assertListEqual(offsets.tolist(), [0, 2, 3, 3])
+
+        values = d.values("vector", format="numpy")
+        self.assertTrue(
+            np.array_equal(
+                values,
+                [[1.0, 2.0], [3.0, 4.0], [np.nan, np.nan]],
+                equal_nan=True,
+            )
+        )
+
+        values = d.exists("vector").values("vector", format="numpy")
+        self.assertTrue(np.array_equal(values, [[1.0, 2.0], [3.0, 4.0]]))
+
+        values, offsets = d.limit(0).values(
+            "predictions.detections.confidence", format="numpy"
+        )
+        self.assertEqual(len(values), 0)
+        self.assertListEqual(offsets.tolist(), [0])
+
+        with self.assertRaises(ValueError):
+            d.values("confidence", format="foo")
+
+        try:
+            import pyarrow
+        except ImportError:
+            return
+
+        values = d.values("predictions.detections.confidence", format="arrow")
+        self.assertListEqual(values.to_pylist(), [[0.1, 0.2], [None], None])
+
+        values = d.values("vector", format="arrow")
+        self.assertListEqual(
+            values.to_pylist(), [[1.0, 2.0], [3.0, 4.0], None]
+        )
+
+        values = d.exists("vector").values("vector", format="arrow")
+        self.assertEqual(values.type, pyarrow.list_(pyarrow.float64(), 2))
+
     @drop_datasets
     def test_values_unwind(self):
         sample1 = fo.Sample(filepath="video1.mp4")
@@ -926,6 +1075,7 @@ class DatasetTests(unittest.TestCase):
             fo.Count("predictions.detections"),
             fo.CountValues("predictions.detections.label"),
             fo.Distinct("predictions.detections.label"),
+            fo.Distinct("predictions.detections.label", approx=True),
             fo.HistogramValues(
                 "predictions.detections.confidence",
                 bins=50,
@@ -943,6 +1093,58 @@ class DatasetTests(unittest.TestCase):
         self.assertListEqual(aggregations, also_aggregations)
 
 
+class SketchTests(unittest.TestCase):
+    def test_quantile_sketch(self):
+        rng = np.random.default_rng(51)
+        values = rng.normal(size=10000)
+
+        sketch = fosk.QuantileSketch(relative_accuracy=0.01)
+        self.assertListEqual(sketch.quantiles([0.5]), [None])
+
+        sketch.add(values[:5000])
+        other = fosk.QuantileSketch(relative_accuracy=0.01)
+        other.add(values[5000:])
+        sketch.merge(other)
+
+        self.assertEqual(sketch.count, 10000)
+        self.assertEqual(sketch.min, values.min())
+        self.assertEqual(sketch.max, values.max())
+
+        q = [0, 0.01, 0.25, 0.5, 0.75, 0.99, 1]
+        sorted_values = np.sort(values)
+        for qi, r in zip(q, sketch.quantiles(q)):
+            idx = max(math.ceil(qi * len(values)) - 1, 0)
+            expected = sorted_values[idx]
+            self.assertLessEqual(abs(r - expected), 0.01 * abs(expected))
+
+        counts, other = sketch.histogram([-10, 0, 10])
+        self.assertEqual(other, 0)
+        self.assertAlmostEqual(counts[0], np.sum(values < 0), delta=10)
+
+        with self.assertRaises(ValueError):
+            sketch.merge(fosk.QuantileSketch(relative_accuracy=0.05))
+
+    def test_cardinality_sketch(self):
+        rng = np.random.default_rng(51)
+        hashes = rng.integers(
+            np.iinfo(np.int64).min, np.iinfo(np.int64).max, size=100000
+        )
+
+        sketch = fosk.CardinalitySketch()
+        self.assertEqual(sketch.estimate(), 0)
+
+        sketch.add_hashes(hashes[:60000])
+        other = fosk.CardinalitySketch()
+        other.add_hashes(hashes[40000:])
+        sketch.merge(other)
+
+        self.assertAlmostEqual(sketch.estimate(), 100000, delta=3000)
+
+        small = fosk.CardinalitySketch()
+        small.add_hashes(np.concatenate([hashes[:100], hashes[:100]]))
+        self.assertEqual(small.estimate(), 100)
+
+
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
     unittest.main(verbosity=2)
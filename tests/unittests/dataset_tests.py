@@ -8,17 +8,21 @@ FiftyOne dataset-related unit tests.
 from copy import copy, deepcopy
 from datetime import date, datetime
 import gc
+import operator
 import os
 
 from bson import ObjectId
+from mongoengine.errors import ValidationError
 import numpy as np
 import pytz
 import unittest
 
+import eta.core.image as etai
 import eta.core.utils as etau
 
 import fiftyone as fo
 from fiftyone import ViewField as F
+import fiftyone.core.collections as foc
 import fiftyone.core.fields as fof
 import fiftyone.core.odm as foo
 
@@ -303,6 +307,85 @@ class DatasetTests(unittest.TestCase):
 
         self.assertTupleEqual(dataset.bounds("int"), (4, 53))
 
+    @drop_datasets
+    def test_async_save_context(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i) for i in range(50)]
+        )
+        sample = dataset.first()
+
+        view = dataset.select_fields()
+        with foc.AsyncSaveContext(view, batch_size=7) as context:
+            for idx, sample_view in enumerate(view):
+                sample_view["int"] = idx + 1
+                context.save(sample_view)
+
+        self.assertTupleEqual(dataset.bounds("int"), (1, 50))
+        self.assertEqual(sample["int"], 1)
+        self.assertGreaterEqual(context.write_time, 0)
+
+        other_dataset = fo.Dataset()
+        other_dataset.add_sample(fo.Sample(filepath="image.jpg"))
+
+        with self.assertRaises(ValueError):
+            with foc.AsyncSaveContext(dataset) as context:
+                context.save(other_dataset.first())
+
+    @drop_datasets
+    def test_map_samples(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i, int=i) for i in range(50)]
+        )
+
+        outputs = dataset.map_samples(_square_int, save=True)
+        self.assertEqual(len(outputs), 50)
+        self.assertTupleEqual(dataset.bounds("int"), (0, 49**2))
+
+        view = dataset.match(F("int") >= 100)
+        num_samples = len(view)
+        ids = set(view.values("id"))
+
+        outputs = view.map_samples(_square_int, save=True, num_workers=2)
+        self.assertEqual(len(outputs), num_samples)
+        self.assertSetEqual(set(outputs.keys()), ids)
+        self.assertEqual(dataset.count_values("int")[0], 1)
+        self.assertTupleEqual(dataset.bounds("int"), (0, 49**4))
+
+        sample = dataset.first()
+        self.assertEqual(sample.int, 0)
+
+        outputs = dataset.map_samples(
+            _get_int, num_workers=3, shard_by="filepath", batch_size=5
+        )
+        self.assertDictEqual(
+            outputs, dict(zip(dataset.values("id"), dataset.values("int")))
+        )
+
+        outputs = dataset.limit(0).map_samples(_get_int, num_workers=2)
+        self.assertDictEqual(outputs, {})
+
+        # Outputs can be reduced as they are generated
+        total = sum(dataset.values("int"))
+        for num_workers in (None, 3):
+            output = dataset.map_samples(
+                _get_int,
+                num_workers=num_workers,
+                batch_size=7,
+                reduce_fcn=operator.add,
+            )
+            self.assertEqual(output, total)
+
+        output = dataset.limit(0).map_samples(
+            _get_int, num_workers=2, reduce_fcn=operator.add
+        )
+        self.assertIsNone(output)
+
+        # Workers that die raise rather than hang
+        with self.assertRaises(RuntimeError):
+            dataset.map_samples(_exit_worker, num_workers=2)
+
     @drop_datasets
     def test_date_fields(self):
         dataset = fo.Dataset()
@@ -1200,6 +1283,131 @@ class DatasetTests(unittest.TestCase):
                 ],
             )
 
+    @drop_datasets
+    def test_add_sample_dicts(self):
+        sample = fo.Sample(
+            filepath="image0.jpg",
+            tags=["train"],
+            ground_truth=fo.Detections(
+                detections=[
+                    fo.Detection(label="cat", bounding_box=[0, 0, 1, 1]),
+                ]
+            ),
+            mask=fo.Segmentation(mask=np.ones((2, 3), dtype=np.uint8)),
+            vector=np.arange(3),
+        )
+
+        dicts = [
+            {
+                "filepath": "image1.jpg",
+                "ground_truth": {
+                    "_cls": "Detections",
+                    "detections": [
+                        {"label": "cat", "bounding_box": [0, 0, 1, 1]},
+                        {"label": "dog", "iscrowd": True},
+                    ],
+                },
+                "int": 1,
+            },
+            {
+                "filepath": "image2.jpg",
+                "ground_truth": fo.Detections(),
+                "int": None,
+                "vector": np.arange(3),
+            },
+            sample.to_dict(),
+            sample.to_mongo_dict(),
+        ]
+
+        dataset = fo.Dataset()
+        sample_ids = dataset.add_samples(dicts)
+
+        self.assertEqual(len(dataset), 4)
+        self.assertListEqual(dataset.values("id"), sample_ids)
+        self.assertEqual(dataset.media_type, "image")
+        self.assertIsInstance(dataset.get_field("int"), fo.IntField)
+        self.assertListEqual(dataset.values("int"), [1, None, None, None])
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.label"),
+            [["cat", "dog"], [], ["cat"], ["cat"]],
+        )
+        self.assertListEqual(
+            dataset.values("tags"), [[], [], ["train"], ["train"]]
+        )
+        self.assertEqual(
+            len(set(dataset.distinct("ground_truth.detections.id"))), 3
+        )
+
+        sample1 = dataset.first()
+        self.assertTrue(sample1.filepath.endswith("image1.jpg"))
+        detection = sample1.ground_truth.detections[1]
+        self.assertIsInstance(detection, fo.Detection)
+        self.assertListEqual(detection.tags, [])
+        self.assertTrue(detection.iscrowd)
+
+        sample3 = dataset.skip(2).first()
+        self.assertTrue(
+            np.array_equal(sample3.mask.mask, np.ones((2, 3), dtype=np.uint8))
+        )
+        self.assertTrue(np.array_equal(sample3.vector, np.arange(3)))
+
+        with self.assertRaises(ValueError):
+            dataset.add_samples(
+                [{"filepath": "image.jpg", "other": 1}], expand_schema=False
+            )
+
+        with self.assertRaises(ValueError):
+            dataset.add_samples([{"int": 1}])
+
+        with self.assertRaises(ValueError):
+            dataset.add_samples([{"filepath": "video.mp4"}])
+
+        with self.assertRaises(ValidationError):
+            dataset.add_samples([{"filepath": "image.jpg", "int": "foo"}])
+
+        # Every value in a batch is validated, not just the first of its type
+        with self.assertRaises(ValidationError):
+            dataset._add_dicts_batch(
+                [
+                    {
+                        "filepath": "image%d.jpg" % i,
+                        "ground_truth": {
+                            "_cls": "Detections",
+                            "detections": [{"label": label}],
+                        },
+                    }
+                    for i, label in enumerate(["cat", 1])
+                ],
+                True,
+                True,
+            )
+
+        # Embedded documents must have the field's type
+        with self.assertRaises(ValidationError):
+            dataset.add_samples(
+                [
+                    {
+                        "filepath": "image.jpg",
+                        "ground_truth": {"_cls": "Classification"},
+                    }
+                ]
+            )
+
+        self.assertEqual(len(dataset), 4)
+
+        # Untyped metadata is inferred from the media type
+        dataset.add_samples(
+            [
+                {
+                    "filepath": "image3.jpg",
+                    "metadata": {"width": 640, "height": 480},
+                }
+            ]
+        )
+        metadata = dataset.last().metadata
+        self.assertIsInstance(metadata, fo.ImageMetadata)
+        self.assertEqual(metadata.width, 640)
+
     @drop_datasets
     def test_add_collection(self):
         sample1 = fo.Sample(filepath="image.jpg", foo="bar")
@@ -2085,6 +2293,59 @@ class DatasetTests(unittest.TestCase):
                 dataset3.default_skeleton, dataset.default_skeleton
             )
 
+    @drop_datasets
+    def test_compute_metadata(self):
+        with etau.TempDir() as tmp_dir:
+            samples = []
+            for idx in range(5):
+                filepath = os.path.join(tmp_dir, "image%d.png" % idx)
+                img = np.zeros((idx + 1, 2, 3), dtype=np.uint8)
+                etai.write(img, filepath)
+                samples.append(fo.Sample(filepath=filepath))
+
+            samples.append(fo.Sample(filepath="non-existent.png"))
+
+            dataset = fo.Dataset()
+            dataset.add_samples(samples)
+            sample = dataset.first()
+
+            dataset.compute_metadata(num_workers=1)
+
+            self.assertEqual(dataset.count("metadata"), 5)
+            self.assertListEqual(
+                dataset.values("metadata.height"), [1, 2, 3, 4, 5, None]
+            )
+            self.assertEqual(sample.metadata.width, 2)
+
+            dataset.set_field("metadata", None).save()
+            self.assertEqual(dataset.count("metadata"), 0)
+
+            dataset.compute_metadata(num_workers=2)
+
+            self.assertEqual(dataset.count("metadata"), 5)
+            self.assertListEqual(
+                dataset.values("metadata.height"), [1, 2, 3, 4, 5, None]
+            )
+
+            with self.assertRaises(ValueError):
+                dataset.compute_metadata(overwrite=True, skip_failures=False)
+
+            # Files whose sizes are unchanged can be skipped
+            dataset.set_field("metadata.width", 100).save()
+            filepath = dataset.values("filepath")[-2]
+            etai.write(np.zeros((10, 10, 3), dtype=np.uint8), filepath)
+
+            dataset.compute_metadata(overwrite=True, skip_unchanged=True)
+            self.assertListEqual(
+                dataset.values("metadata.width"),
+                [100, 100, 100, 100, 10, None],
+            )
+
+            dataset.compute_metadata(overwrite=True, num_workers=2)
+            self.assertListEqual(
+                dataset.values("metadata.width"), [2, 2, 2, 2, 10, None]
+            )
+
 
 class DatasetSerializationTests(unittest.TestCase):
     @drop_datasets
@@ -2887,6 +3148,19 @@ class _LabelMetadata(foo.DynamicEmbeddedDocument):
     model_name = fof.StringField()
 
 
+def _square_int(sample):
+    sample["int"] = sample.int**2
+    return sample.int
+
+
+def _get_int(sample):
+    return sample.int
+
+
+def _exit_worker(sample):
+    os._exit(1)
+
+
 if __name__ == "__main__":
     fo.config.show_progress_bars = False
     unittest.main(verbosity=2)
@@ -1413,6 +1413,131 @@ class DetectionsTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             detection["eval2"]
 
+    @drop_datasets
+    def test_evaluate_detections_num_workers(self):
+        dataset = self._make_detections_dataset()
+        view = dataset.exists("ground_truth")
+
+        results = view.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            compute_mAP=True,
+        )
+        results2 = view.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval2",
+            compute_mAP=True,
+            num_workers=2,
+        )
+
+        self.assertListEqual(list(results.ytrue), list(results2.ytrue))
+        self.assertListEqual(list(results.ypred), list(results2.ypred))
+        self.assertListEqual(list(results.ytrue_ids), list(results2.ytrue_ids))
+        self.assertAlmostEqual(results.mAP(), results2.mAP())
+
+        for field in ("tp", "fp", "fn"):
+            self.assertListEqual(
+                view.values("eval_%s" % field),
+                view.values("eval2_%s" % field),
+            )
+
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval"),
+            dataset.values("predictions.detections.eval2"),
+        )
+        self.assertListEqual(
+            dataset.values("ground_truth.detections.eval_id"),
+            dataset.values("ground_truth.detections.eval2_id"),
+        )
+
+        # In-memory samples reflect the workers' results
+        sample = view.last()
+        self.assertEqual(sample["eval2_fp"], 1)
+        self.assertEqual(sample.predictions.detections[0]["eval2"], "fp")
+
+    @drop_datasets
+    def test_evaluate_detections_incremental(self):
+        dataset = self._make_detections_dataset()
+
+        with self.assertRaises(ValueError):
+            dataset.evaluate_detections(
+                "predictions", gt_field="ground_truth", incremental=True
+            )
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            compute_mAP=True,
+            incremental=True,
+        )
+
+        self.assertEqual(len(results.sample_ids), len(results.ytrue))
+        self.assertEqual(len(results.fingerprints), len(dataset))
+        self.assertEqual(len(results.sweep_matches), len(dataset))
+
+        # Unchanged samples are not re-evaluated
+        sample1 = dataset.first()
+        sample1["eval_tp"] = 100
+        sample1.save()
+
+        sample = dataset.last()
+        sample.predictions.detections[0].label = "dog"
+        sample.save()
+
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            compute_mAP=True,
+            incremental=True,
+        )
+        results2 = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval2",
+            compute_mAP=True,
+        )
+
+        sample1.reload()
+        self.assertEqual(sample1["eval_tp"], 100)
+        self.assertIsNone(results2.sample_ids)
+        self.assertIsNone(results2.fingerprints)
+
+        self.assertListEqual(list(results.ytrue), list(results2.ytrue))
+        self.assertListEqual(list(results.ypred), list(results2.ypred))
+        self.assertListEqual(list(results.ytrue_ids), list(results2.ytrue_ids))
+        self.assertListEqual(list(results.ypred_ids), list(results2.ypred_ids))
+        self.assertListEqual(list(results.classes), list(results2.classes))
+        self.assertAlmostEqual(results.mAP(), results2.mAP())
+        self.assertTrue(np.allclose(results.precision, results2.precision))
+
+        self.assertListEqual(
+            dataset.values("predictions.detections.eval"),
+            dataset.values("predictions.detections.eval2"),
+        )
+
+        # Results and fingerprints survive a reload
+        dataset.reload()
+        results = dataset.load_evaluation_results("eval")
+        self.assertEqual(len(results.fingerprints), len(dataset))
+        self.assertEqual(len(results.sweep_matches), len(dataset))
+
+        # Changing the config triggers a full evaluation
+        results = dataset.evaluate_detections(
+            "predictions",
+            gt_field="ground_truth",
+            eval_key="eval",
+            iou=0.75,
+            incremental=True,
+        )
+
+        sample1.reload()
+        self.assertNotEqual(sample1["eval_tp"], 100)
+        self.assertIsNotNone(results.fingerprints)
+
 
 class VideoDetectionsTests(unittest.TestCase):
     def _make_video_detections_dataset(self):
@@ -1649,6 +1774,37 @@ class VideoDetectionsTests(unittest.TestCase):
             [[], [0], [1, 0], [0, 1]],
         )
 
+    def test_evaluate_video_detections_num_workers(self):
+        dataset = self._make_video_detections_dataset()
+
+        dataset.evaluate_detections(
+            "frames.predictions",
+            gt_field="frames.ground_truth",
+            eval_key="eval",
+        )
+        dataset.evaluate_detections(
+            "frames.predictions",
+            gt_field="frames.ground_truth",
+            eval_key="eval2",
+            num_workers=2,
+        )
+
+        for field in ("tp", "fp", "fn"):
+            self.assertListEqual(
+                dataset.values("eval_%s" % field),
+                dataset.values("eval2_%s" % field),
+            )
+            self.assertListEqual(
+                dataset.values("frames.eval_%s" % field),
+                dataset.values("frames.eval2_%s" % field),
+            )
+
+        self.assertListEqual(
+            dataset.values("frames.predictions.detections.eval"),
+            dataset.values("frames.predictions.detections.eval2"),
+        )
+
+    @drop_datasets
     def test_evaluate_video_detections_open_images(self):
         dataset = self._make_video_detections_dataset()
 
@@ -1910,6 +2066,57 @@ class SegmentationTests(unittest.TestCase):
         self.assertNotIn("eval_precision", dataset.get_field_schema())
         self.assertNotIn("eval_recall", dataset.get_field_schema())
 
+    @drop_datasets
+    def test_evaluate_segmentations_num_workers(self):
+        dataset = self._make_segmentation_dataset()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # suppress missing masks warning
+
+            results1 = dataset.evaluate_segmentations(
+                "predictions", gt_field="ground_truth", eval_key="eval1"
+            )
+            results2 = dataset.evaluate_segmentations(
+                "predictions",
+                gt_field="ground_truth",
+                eval_key="eval2",
+                num_workers=2,
+            )
+
+        self.assertListEqual(list(results1.classes), ["0", "1", "2"])
+        self.assertListEqual(list(results2.classes), ["0", "1", "2"])
+
+        expected = np.array([[2, 1, 1], [1, 1, 0], [1, 0, 1]], dtype=int)
+        self.assertTrue((results1.confusion_matrix() == expected).all())
+        self.assertTrue((results2.confusion_matrix() == expected).all())
+
+        self.assertListEqual(
+            dataset.values("eval1_accuracy"),
+            dataset.values("eval2_accuracy"),
+        )
+        self.assertListEqual(
+            dataset.values("eval1_recall"), dataset.values("eval2_recall")
+        )
+
+    @drop_datasets
+    def test_evaluate_segmentations_subset(self):
+        dataset = self._make_segmentation_dataset()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # suppress missing masks warning
+
+            # Pixels whose values aren't in `mask_targets` are ignored
+            results = dataset.evaluate_segmentations(
+                "predictions",
+                gt_field="ground_truth",
+                mask_targets={2: "dog", 0: "background"},
+            )
+
+        actual = results.confusion_matrix()
+        expected = np.array([[2, 1], [1, 1]], dtype=int)
+        self.assertEqual(actual.shape, expected.shape)
+        self.assertTrue((actual == expected).all())
+
 
 class VideoSegmentationTests(unittest.TestCase):
     def _make_video_segmentation_dataset(self):
@@ -5,6 +5,7 @@ FiftyOne import/export-related unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import glob
 import os
 import random
 import string
@@ -15,6 +16,7 @@ import numpy as np
 import pytest
 
 import eta.core.image as etai
+import eta.core.serial as etas
 import eta.core.utils as etau
 import eta.core.video as etav
 
@@ -393,6 +395,95 @@ class UnlabeledImageDatasetTests(ImageDatasetTests):
         # _images/<filename>
         self.assertEqual(len(relpath.split(os.path.sep)), 2)
 
+    @skipwindows
+    @drop_datasets
+    def test_export_media_modes(self):
+        dataset = self._make_dataset()
+        filepaths = dataset.values("filepath")
+
+        def _get_outpaths(export_dir):
+            return [
+                os.path.join(export_dir, os.path.basename(f))
+                for f in filepaths
+            ]
+
+        # Hard links
+
+        export_dir = self._new_dir()
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.ImageDirectory,
+            export_media="hardlink",
+        )
+
+        for inpath, outpath in zip(filepaths, _get_outpaths(export_dir)):
+            self.assertTrue(os.path.samefile(inpath, outpath))
+            self.assertFalse(os.path.islink(outpath))
+
+        # Copies are skipped on re-export unless the source changed
+
+        export_dir = self._new_dir()
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.ImageDirectory,
+            export_media=True,
+        )
+
+        outpaths = _get_outpaths(export_dir)
+        for inpath, outpath in zip(filepaths, outpaths):
+            self.assertFalse(os.path.samefile(inpath, outpath))
+            self.assertEqual(
+                int(os.path.getmtime(inpath)), int(os.path.getmtime(outpath))
+            )
+
+        ctimes = [os.stat(p).st_ctime_ns for p in outpaths]
+
+        with open(filepaths[0], "ab") as f:
+            f.write(b"\0")
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.ImageDirectory,
+            export_media=True,
+        )
+
+        self.assertEqual(
+            os.path.getsize(outpaths[0]), os.path.getsize(filepaths[0])
+        )
+        self.assertListEqual(
+            [os.stat(p).st_ctime_ns for p in outpaths[1:]], ctimes[1:]
+        )
+
+        # Symlinks replace existing copies
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.ImageDirectory,
+            export_media="symlink",
+        )
+
+        for inpath, outpath in zip(filepaths, outpaths):
+            self.assertTrue(os.path.islink(outpath))
+            self.assertTrue(os.path.samefile(inpath, outpath))
+
+        # Copies never write through existing symlinks
+
+        size = os.path.getsize(filepaths[0])
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.ImageDirectory,
+            export_media=True,
+        )
+
+        for inpath, outpath in zip(filepaths, outpaths):
+            self.assertFalse(os.path.islink(outpath))
+            self.assertFalse(os.path.samefile(inpath, outpath))
+
+        self.assertEqual(os.path.getsize(filepaths[0]), size)
+
 
 class ImageClassificationDatasetTests(ImageDatasetTests):
     def _make_dataset(self):
@@ -2472,6 +2563,24 @@ class MultitaskImageDatasetTests(ImageDatasetTests):
         info2 = dataset2.get_evaluation_info("test")
         self.assertEqual(info.key, info2.key)
 
+        # Background parsing
+
+        dataset2 = fo.Dataset.from_dir(
+            dataset_dir=export_dir,
+            dataset_type=fo.types.FiftyOneDataset,
+            parse_in_background=True,
+            max_samples=1,
+        )
+
+        self.assertEqual(len(dataset2), 1)
+        self.assertEqual(
+            os.path.basename(dataset.first().filepath),
+            os.path.basename(dataset2.first().filepath),
+        )
+        self.assertEqual(
+            dataset.first().predictions, dataset2.first().predictions
+        )
+
         # Per sample/frame directories
 
         export_dir = self._new_dir()
@@ -2576,6 +2685,96 @@ class MultitaskImageDatasetTests(ImageDatasetTests):
         # data/_images/<filename>
         self.assertEqual(len(relpath.split(os.path.sep)), 3)
 
+    @skipwindows
+    @drop_datasets
+    def test_fiftyone_bson_dataset(self):
+        dataset = self._make_dataset()
+        dataset.set_values(
+            "embedding", [np.random.rand(8) for _ in range(len(dataset))]
+        )
+
+        export_dir = self._new_dir()
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+            shard_size=1,
+            num_workers=2,
+        )
+
+        # One document per shard
+        samples_dir = os.path.join(export_dir, "samples")
+        self.assertEqual(
+            len(glob.glob(os.path.join(samples_dir, "*.bson"))),
+            len(dataset),
+        )
+
+        dataset2 = fo.Dataset.from_dir(
+            dataset_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+            num_workers=2,
+        )
+
+        self.assertEqual(len(dataset), len(dataset2))
+        self.assertListEqual(
+            [os.path.basename(f) for f in dataset.values("filepath")],
+            [os.path.basename(f) for f in dataset2.values("filepath")],
+        )
+        self.assertListEqual(
+            dataset.values("weather.label"), dataset2.values("weather.label")
+        )
+        self.assertEqual(
+            dataset.count("predictions.detections"),
+            dataset2.count("predictions.detections"),
+        )
+        for e1, e2 in zip(
+            dataset.values("embedding"), dataset2.values("embedding")
+        ):
+            self.assertTrue(np.array_equal(e1, e2))
+
+        # Shards are sized by the actual size of their documents
+
+        export_dir = self._new_dir()
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+            export_media=False,
+            shard_size=1000,
+        )
+
+        index = etas.read_json(
+            os.path.join(export_dir, "samples", "index.json")
+        )
+        shards = index["shards"]
+        self.assertGreater(len(shards), 1)
+        for shard in shards[:-1]:
+            self.assertGreaterEqual(shard["num_bytes"], 1000)
+
+        # Labels-only (with rel dir)
+
+        export_dir = self._new_dir()
+        rel_dir = self.root_dir
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+            export_media=False,
+            rel_dir=rel_dir,
+        )
+
+        dataset2 = fo.Dataset.from_dir(
+            dataset_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+            rel_dir=rel_dir,
+            max_samples=2,
+        )
+
+        self.assertEqual(len(dataset2), 2)
+        self.assertListEqual(
+            dataset[:2].values("filepath"), dataset2.values("filepath")
+        )
+
     @skipwindows
     @drop_datasets
     def test_legacy_fiftyone_dataset(self):
@@ -3449,6 +3648,33 @@ class MultitaskVideoDatasetTests(VideoDatasetTests):
 
         return dataset
 
+    @drop_datasets
+    def test_fiftyone_bson_dataset(self):
+        dataset = self._make_dataset()
+
+        export_dir = self._new_dir()
+
+        dataset.export(
+            export_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+        )
+
+        dataset2 = fo.Dataset.from_dir(
+            dataset_dir=export_dir,
+            dataset_type=fo.types.FiftyOneBSONDataset,
+        )
+
+        self.assertEqual(len(dataset), len(dataset2))
+        self.assertEqual(dataset.count("frames"), dataset2.count("frames"))
+        self.assertListEqual(
+            dataset.values("frames.weather.label"),
+            dataset2.values("frames.weather.label"),
+        )
+        self.assertEqual(
+            dataset.count("frames.predictions.detections"),
+            dataset2.count("frames.predictions.detections"),
+        )
+
     @drop_datasets
     def test_fiftyone_video_labels_dataset(self):
         dataset = self._make_dataset()
@@ -0,0 +1,326 @@
+"""
+FiftyOne pipeline optimizer unit tests.
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import unittest
+
+import fiftyone as fo
+from fiftyone import ViewField as F
+import fiftyone.core.odm as foo
+
+from decorators import drop_datasets
+
+
+class OptimizePipelineTests(unittest.TestCase):
+    def test_fuse_matches(self):
+        pipeline = [
+            {"$match": {"a": 1}},
+            {"$match": {"b": 2}},
+            {"$match": {"a": {"$gt": 0}}},
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {
+                    "$match": {
+                        "$and": [{"a": 1, "b": 2}, {"a": {"$gt": 0}}],
+                    }
+                }
+            ],
+        )
+
+    def test_hoist_match(self):
+        set_stage = {
+            "$set": {
+                "gt.detections": {
+                    "$filter": {
+                        "input": "$gt.detections",
+                        "cond": {"$gt": ["$$this.confidence", 0.5]},
+                    }
+                }
+            }
+        }
+        gt_match = {"$match": {"$expr": {"$gt": [{"$size": "$gt"}, 0]}}}
+        pipeline = [
+            set_stage,
+            gt_match,
+            {
+                "$match": {
+                    "$expr": {"$gt": ["$n", 1]},
+                    "gt.detections.label": "cat",
+                }
+            },
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {"$match": {"$expr": {"$gt": ["$n", 1]}}},
+                set_stage,
+                {
+                    "$match": {
+                        "$expr": {"$gt": [{"$size": "$gt"}, 0]},
+                        "gt.detections.label": "cat",
+                    }
+                },
+            ],
+        )
+
+        # Matches never move across stages that change the number of docs
+        pipeline = [{"$limit": 5}, {"$match": {"n": 1}}]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+        # Matches that may reference the entire document never move
+        pipeline = [
+            {"$set": {"a": 1}},
+            {"$match": {"$expr": {"$eq": [{"$size": "$$ROOT"}, 1]}}},
+        ]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+        # Queries like $text are left intact
+        pipeline = [{"$match": {"$text": {"$search": "cat"}, "n": 1}}]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+    def test_hoist_match_project(self):
+        pipeline = [
+            {"$project": {"a": True, "b.c": True}},
+            {"$match": {"b.c.d": 1}},
+            {"$match": {"b.e": 1}},
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {"$match": {"b.c.d": 1}},
+                {"$project": {"a": True, "b.c": True}},
+                {"$match": {"b.e": 1}},
+            ],
+        )
+
+        pipeline = [
+            {"$project": {"frames": False}},
+            {"$match": {"filepath": "a.mp4"}},
+            {"$match": {"frames.label": "cat"}},
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {"$match": {"filepath": "a.mp4"}},
+                {"$project": {"frames": False}},
+                {"$match": {"frames.label": "cat"}},
+            ],
+        )
+
+    def test_hoist_sort(self):
+        pipeline = [
+            {"$set": {"gt": {"$filter": {"input": "$gt", "cond": True}}}},
+            {"$sort": {"n": -1}},
+            {"$set": {"_sort_field": {"$multiply": ["$n", 2]}}},
+            {"$sort": {"_sort_field": 1}},
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {"$sort": {"n": -1}},
+                pipeline[0],
+                pipeline[2],
+                pipeline[3],
+            ],
+        )
+
+    def test_hoist_limit(self):
+        pipeline = [
+            {"$sort": {"n": 1}},
+            {"$set": {"gt": {"$filter": {"input": "$gt", "cond": True}}}},
+            {"$unset": "other"},
+            {"$skip": 2},
+            {"$limit": 5},
+        ]
+
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [
+                {"$sort": {"n": 1}},
+                {"$skip": 2},
+                {"$limit": 5},
+                pipeline[1],
+                pipeline[2],
+            ],
+        )
+
+        # Limits never move across stages that change the number of docs
+        pipeline = [{"$match": {"n": 1}}, {"$limit": 5}]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+    def test_hoist_project(self):
+        set_gt = {"$set": {"gt.label": {"$toUpper": "$gt.label"}}}
+        set_other = {"$set": {"other": {"$toUpper": "$gt.label"}}}
+        project = {"$project": {"gt": True, "filepath": True}}
+
+        # `other` is computed and then projected away
+        pipeline = [set_gt, set_other, project]
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline), [project, set_gt]
+        )
+
+        # The projection can't move ahead of a stage that reads `n`
+        set_n = {"$set": {"gt.n": "$n"}}
+        pipeline = [set_n, project]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+        pipeline = [{"$unset": ["other", "gt.label"]}, project]
+        self.assertListEqual(
+            foo.optimize_pipeline(pipeline),
+            [project, {"$unset": ["gt.label"]}],
+        )
+
+        # Projections with computed fields never move
+        pipeline = [set_gt, {"$project": {"gt": {"$literal": 1}}}]
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+    def test_barriers(self):
+        pipeline = [
+            {"$set": {"a": 1}},
+            {"$group": {"_id": "$a"}},
+            {"$match": {"b": 1}},
+            {"$unwind": "$c"},
+            {"$limit": 1},
+            {"$facet": {"x": [{"$count": "count"}]}},
+            {"$sort": {"x": 1}},
+        ]
+
+        self.assertListEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+
+class OptimizedResultsTests(unittest.TestCase):
+    """Verifies that views return the same results with and without
+    pipeline optimization.
+    """
+
+    @drop_datasets
+    def setUp(self):
+        self.dataset = fo.Dataset()
+        self.dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    n=i,
+                    tags=["even"] if i % 2 == 0 else [],
+                    gt=fo.Detections(
+                        detections=[
+                            fo.Detection(label=str(j % 3), confidence=0.1 * j)
+                            for j in range(i % 7)
+                        ]
+                    ),
+                    pred=fo.Classification(label=str(i % 4)),
+                )
+                for i in range(30)
+            ]
+        )
+
+    def _assert_same_results(self, view, ordered=True):
+        coll = self.dataset._sample_collection
+        pipeline = view._pipeline()
+
+        self.assertNotEqual(foo.optimize_pipeline(pipeline), pipeline)
+
+        expected = list(foo.aggregate(coll, pipeline, optimize=False))
+        actual = list(foo.aggregate(coll, pipeline))
+
+        if not ordered:
+            expected = sorted(expected, key=lambda d: d["_id"])
+            actual = sorted(actual, key=lambda d: d["_id"])
+
+        self.assertTrue(len(expected) > 0)
+        self.assertListEqual(actual, expected)
+
+    def test_match_after_filter_labels(self):
+        view = (
+            self.dataset.filter_labels("gt", F("confidence") > 0.25)
+            .match(F("n") > 5)
+            .match_tags("even")
+        )
+        self._assert_same_results(view, ordered=False)
+
+    def test_sort_after_filter_labels(self):
+        view = (
+            self.dataset.match(F("n") > 2)
+            .filter_labels("gt", F("label") == "1")
+            .match(F("pred.label") != "0")
+            .sort_by("n", reverse=True)
+            .limit(7)
+        )
+        self._assert_same_results(view)
+
+    def test_limit_after_expensive_stages(self):
+        view = (
+            self.dataset.sort_by(F("n") * -1)
+            .filter_labels("gt", F("confidence") > 0.1, only_matches=False)
+            .set_field("pred.label", F("label").upper())
+            .skip(3)
+            .limit(10)
+        )
+        self._assert_same_results(view)
+
+    def test_select_fields(self):
+        view = (
+            self.dataset.filter_labels("gt", F("confidence") > 0.2)
+            .set_field("pred.label", F("label").upper())
+            .select_fields("gt")
+            .match(F("gt.detections").length() > 1)
+        )
+        self._assert_same_results(view, ordered=False)
+
+        view = (
+            self.dataset.exclude_fields("pred")
+            .match(F("n") < 20)
+            .sort_by("filepath")
+            .limit(5)
+        )
+        self._assert_same_results(view)
+
+    @drop_datasets
+    def test_video(self):
+        dataset = fo.Dataset()
+        for i in range(6):
+            sample = fo.Sample(filepath="video%d.mp4" % i, n=i)
+            for fn in range(1, i + 2):
+                sample.frames[fn] = fo.Frame(
+                    gt=fo.Classification(label=str(fn % 2))
+                )
+
+            dataset.add_sample(sample)
+
+        view = (
+            dataset.match_frames(F("gt.label") == "1")
+            .match(F("n") >= 2)
+            .sort_by("n", reverse=True)
+            .limit(3)
+        )
+
+        coll = dataset._sample_collection
+        pipeline = view._pipeline()
+        optimized = foo.optimize_pipeline(pipeline)
+
+        # The sample-level match is moved ahead of the frames lookup
+        self.assertEqual(list(optimized[0].keys()), ["$match"])
+
+        expected = list(foo.aggregate(coll, pipeline, optimize=False))
+        actual = list(foo.aggregate(coll, pipeline))
+        self.assertListEqual(actual, expected)
+
+        self.assertListEqual(view.values("n"), [5, 4, 3])
+        self.assertListEqual(
+            view.values("frames.frame_number"), [[1, 3, 5], [1, 3, 5], [1, 3]]
+        )
+
+
+if __name__ == "__main__":
+    fo.config.show_progress_bars = False
+    unittest.main(verbosity=2)
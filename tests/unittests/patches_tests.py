@@ -265,6 +265,114 @@ class PatchesTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             sample["ground_truth"]
 
+    @drop_datasets
+    def test_to_patches_cache(self):
+        dataset = fo.Dataset()
+
+        sample1 = fo.Sample(
+            filepath="image1.png",
+            ground_truth=fo.Detections(
+                detections=[
+                    fo.Detection(label="cat"),
+                    fo.Detection(label="dog"),
+                ]
+            ),
+        )
+
+        sample2 = fo.Sample(
+            filepath="image2.png",
+            ground_truth=fo.Detections(
+                detections=[fo.Detection(label="rabbit")]
+            ),
+        )
+
+        sample3 = fo.Sample(
+            filepath="image3.png",
+            ground_truth=fo.Detections(
+                detections=[fo.Detection(label="squirrel")]
+            ),
+        )
+
+        dataset.add_samples([sample1, sample2, sample3])
+
+        view1 = dataset.to_patches("ground_truth")
+        view2 = dataset.to_patches("ground_truth")
+
+        # Equivalent conversions reuse the same generated dataset
+        self.assertEqual(len(view2), 4)
+        self.assertEqual(
+            view1._patches_dataset.name, view2._patches_dataset.name
+        )
+
+        # Different conversions use different datasets
+        view3 = dataset.limit(1).to_patches("ground_truth")
+        self.assertEqual(len(view3), 2)
+        self.assertNotEqual(
+            view1._patches_dataset.name, view3._patches_dataset.name
+        )
+
+        patch_id = (
+            view1.match(F("ground_truth.label") == "squirrel").first().id
+        )
+
+        sample1.ground_truth.detections.append(fo.Detection(label="fox"))
+        sample1.save()
+        dataset.delete_samples(sample2)
+
+        # Modified samples are regenerated in a new dataset, so existing
+        # views are unchanged
+        view4 = dataset.to_patches("ground_truth")
+
+        self.assertNotEqual(
+            view1._patches_dataset.name, view4._patches_dataset.name
+        )
+        self.assertEqual(len(view4), 4)
+        self.assertEqual(len(view1), 4)
+        self.assertListEqual(
+            view1.values("ground_truth.label"),
+            ["cat", "dog", "rabbit", "squirrel"],
+        )
+        self.assertListEqual(
+            view4.values("ground_truth.label"),
+            ["cat", "dog", "fox", "squirrel"],
+        )
+
+        # Patches follow the order of the source collection
+        view5 = dataset.sort_by("filepath", reverse=True).to_patches(
+            "ground_truth"
+        )
+        sample3 = dataset.last()
+        sample3.ground_truth.detections[0].label = "mouse"
+        sample3.save()
+
+        view6 = dataset.sort_by("filepath", reverse=True).to_patches(
+            "ground_truth"
+        )
+        self.assertNotEqual(
+            view5._patches_dataset.name, view6._patches_dataset.name
+        )
+        self.assertListEqual(
+            view6.values("ground_truth.label"),
+            ["mouse", "cat", "dog", "fox"],
+        )
+        self.assertListEqual(
+            view5.values("ground_truth.label"),
+            ["squirrel", "cat", "dog", "fox"],
+        )
+        self.assertEqual(
+            view4.match(F("ground_truth.label") == "squirrel").first().id,
+            patch_id,
+        )
+
+        # New fields cause the dataset to be regenerated
+        dataset.add_sample_field("new_field", fo.StringField)
+
+        view7 = dataset.to_patches("ground_truth", other_fields=True)
+        self.assertIn("new_field", view7.get_field_schema())
+
+        view8 = dataset.to_patches("ground_truth")
+        self.assertEqual(len(view8), 4)
+
     @drop_datasets
     def test_to_evaluation_patches(self):
         dataset = fo.Dataset()
@@ -0,0 +1,119 @@
+"""
+FiftyOne plot-related unit tests.
+
+| Copyright 2017-2022, Voxel51, Inc.
+| `voxel51.com <https://voxel51.com/>`_
+|
+"""
+import unittest
+
+import numpy as np
+
+import fiftyone as fo
+import fiftyone.core.plots.manager as fopm
+import fiftyone.core.plots.utils as fopu
+
+from decorators import drop_datasets
+
+
+class GridIndexTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(51)
+        self.points = rng.normal(size=(20000, 2))
+        self.index = fopu.GridIndex(self.points, seed=51)
+
+    def test_query_box(self):
+        x, y = self.points[:, 0], self.points[:, 1]
+
+        inds = self.index.query_box((0, 1), (0.5, -0.5))
+        expected = np.flatnonzero((x >= 0) & (x <= 1) & (abs(y) <= 0.5))
+        self.assertListEqual(inds.tolist(), expected.tolist())
+
+        inds = self.index.query_box((10, 11), (10, 11))
+        self.assertEqual(len(inds), 0)
+
+        inds = self.index.query_box((-100, 100), (-100, 100))
+        self.assertEqual(len(inds), len(self.points))
+
+    def test_query_polygon(self):
+        x, y = self.points[:, 0], self.points[:, 1]
+
+        inds = self.index.query_polygon([0, 2, 0], [0, 0, 2])
+        expected = np.flatnonzero((x > 0) & (y > 0) & (x + y < 2))
+        self.assertListEqual(inds.tolist(), expected.tolist())
+
+        inds = self.index.query_polygon([0, 1], [0, 1])
+        self.assertEqual(len(inds), 0)
+
+    def test_sample(self):
+        inds = self.index.sample(1000)
+        self.assertLessEqual(len(inds), 1000)
+        self.assertGreater(len(inds), 0)
+        self.assertListEqual(inds.tolist(), sorted(set(inds.tolist())))
+
+        # Sampling is deterministic
+        self.assertListEqual(inds.tolist(), self.index.sample(1000).tolist())
+
+        # Boxes with few points are not subsampled
+        box = ((0, 0.1), (0, 0.1))
+        expected = self.index.query_box(*box)
+        inds = self.index.sample(1000, *box)
+        self.assertListEqual(inds.tolist(), expected.tolist())
+
+        # Outliers are always represented
+        outlier = np.argmax(np.abs(self.points).sum(axis=1))
+        self.assertIn(outlier, self.index.sample(100))
+
+    def test_empty(self):
+        index = fopu.GridIndex(np.zeros((0, 2)))
+        self.assertEqual(len(index.query_box((0, 1), (0, 1))), 0)
+        self.assertEqual(len(index.sample(10)), 0)
+
+
+class PlotManagerTests(unittest.TestCase):
+    @drop_datasets
+    def test_select_large(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i) for i in range(5)]
+        )
+        ids = dataset.values("id")
+
+        manager = fopm.PlotManager(None)
+        manager.MAX_INLINE_IDS = 2
+
+        view = manager._select(dataset.view(), ids[:2])
+        self.assertListEqual(view.values("id"), ids[:2])
+        self.assertListEqual(dataset.list_selection_sets(), [])
+
+        view1 = manager._select(dataset.view(), ids[:3])
+        self.assertListEqual(view1.values("id"), ids[:3])
+        self.assertEqual(len(dataset.list_selection_sets()), 1)
+
+        # The same selection reuses its set
+        manager._select(dataset.view(), list(reversed(ids[:3])))
+        self.assertEqual(len(dataset.list_selection_sets()), 1)
+
+        # New selections never modify existing views
+        view2 = manager._select(dataset.view(), ids[2:])
+        self.assertListEqual(view2.values("id"), ids[2:])
+        self.assertListEqual(view1.values("id"), ids[:3])
+        self.assertEqual(len(dataset.list_selection_sets()), 2)
+
+        # Sets that the view no longer references are deleted
+        manager._delete_selection_sets(view=view2)
+        self.assertEqual(len(dataset.list_selection_sets()), 1)
+        self.assertListEqual(view2.values("id"), ids[2:])
+
+        # All sets are deleted when the manager is done with them
+        manager._delete_selection_sets()
+        self.assertListEqual(dataset.list_selection_sets(), [])
+
+        # Sets created by others are never deleted
+        dataset.create_selection_set(ids[:3], name="other")
+        manager._delete_selection_sets()
+        self.assertListEqual(dataset.list_selection_sets(), ["other"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
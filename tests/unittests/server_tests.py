@@ -5,16 +5,41 @@ FiftyOne server-related unit tests.
 | `voxel51.com <https://voxel51.com/>`_
 |
 """
+import asyncio
+import os
 import unittest
+from unittest import mock
 
+import numpy as np
+
+import eta.core.image as etai
+import eta.core.utils as etau
+
+import fiftyone as fo
+import fiftyone.core.aggregations as foa
 import fiftyone.core.dataset as fod
+from fiftyone.core.expressions import ViewField as F
 import fiftyone.core.fields as fof
 import fiftyone.core.labels as fol
+import fiftyone.core.sample as fos
+import fiftyone.server.cache as fosc
+import fiftyone.server.metadata as fosm
+import fiftyone.server.samples as fosa
+import fiftyone.server.thumbnails as fost
 import fiftyone.server.view as fosv
 
 from decorators import drop_datasets
 
 
+# The async database client is bound to the event loop on which it is first
+# used, so all tests share a loop
+_loop = asyncio.new_event_loop()
+
+
+def _run(coro):
+    return _loop.run_until_complete(coro)
+
+
 class ServerViewTests(unittest.TestCase):
     @drop_datasets
     def test_extended_view_image_label_filters_samples(self):
@@ -877,3 +902,367 @@ class ServerViewTests(unittest.TestCase):
         ]
 
         self.assertEqual(expected, returned)
+
+
+class ServerPaginationTests(unittest.TestCase):
+    async def _paginate(self, view, first=4):
+        ids = []
+        cursors = []
+        after = None
+        while True:
+            connection = await fosa.paginate_samples(
+                view._dataset.name, view._serialize(), None, first, after
+            )
+            ids.extend(str(edge.node.id) for edge in connection.edges)
+            cursors.extend(edge.cursor for edge in connection.edges)
+            if not connection.page_info.has_next_page:
+                break
+
+            after = connection.edges[-1].cursor
+
+        return ids, cursors
+
+    @drop_datasets
+    def test_paginate_samples(self):
+        _run(self._test_paginate_samples())
+
+    async def _test_paginate_samples(self):
+        dataset = fod.Dataset()
+        dataset.add_samples(
+            [
+                fos.Sample(filepath="image%d.png" % i, x=x, y=y)
+                for i, (x, y) in enumerate(
+                    [(1, "a"), (None, "b"), (3, None), (1, "c"), (2, "a")] * 3
+                )
+            ]
+        )
+
+        views = [
+            dataset.view(),
+            dataset.sort_by("x"),
+            dataset.sort_by("x", reverse=True),
+            dataset.sort_by("y", reverse=True),
+            dataset.match(F("x") > 1).sort_by([("x", -1)]),
+            dataset.shuffle(seed=51),
+        ]
+
+        for view in views:
+            ids, _ = await self._paginate(view)
+            self.assertEqual(len(ids), len(set(ids)))
+
+            # Ties may be broken differently than MongoDB's natural order
+            self.assertSetEqual(set(ids), set(view.values("id")))
+            sorted_view = dataset.select(ids, ordered=True)
+            self.assertListEqual(sorted_view.values("x"), view.values("x"))
+            self.assertListEqual(sorted_view.values("y"), view.values("y"))
+
+        # Unsorted views are paginated by ID
+        ids, cursors = await self._paginate(dataset.view())
+        self.assertListEqual(ids, dataset.values("id"))
+        self.assertEqual(fosa._parse_cursor(cursors[-1])[0], 14)
+        self.assertEqual(fosa._parse_cursor(cursors[-1])[2], ids[-1])
+
+        # Sorting creates an index that supports keyset pagination
+        self.assertIn("x_1__id_1", dataset.list_indexes())
+        for view in views[1:3]:
+            ids, cursors = await self._paginate(view)
+            self.assertListEqual(
+                dataset.select(ids, ordered=True).values("x"),
+                view.values("x"),
+            )
+            self.assertEqual(fosa._parse_cursor(cursors[-1])[0], 14)
+            self.assertIsNotNone(fosa._parse_cursor(cursors[-1])[2])
+
+        # Deep pages are fetched via range queries rather than skips
+        for view in views[:3]:
+            _, cursors = await self._paginate(view)
+            with mock.patch.object(
+                fosa.foo, "aggregate", wraps=fosa.foo.aggregate
+            ) as aggregate:
+                connection = await fosa.paginate_samples(
+                    dataset.name, view._serialize(), None, 3, cursors[9]
+                )
+
+            self.assertListEqual(
+                [str(edge.node.id) for edge in connection.edges],
+                view.values("id")[10:13],
+            )
+            pipeline = aggregate.call_args[0][1]
+            self.assertFalse(any("$skip" in stage for stage in pipeline))
+
+        # Shuffled views fall back to offset cursors
+        _, cursors = await self._paginate(dataset.shuffle())
+        self.assertListEqual(cursors, [str(i) for i in range(15)])
+
+        # Offsets are still supported
+        connection = await fosa.paginate_samples(
+            dataset.name, dataset.sort_by("x")._serialize(), None, 3, "5"
+        )
+        self.assertListEqual(
+            [str(edge.node.id) for edge in connection.edges],
+            dataset.sort_by("x").values("id")[6:9],
+        )
+
+    @drop_datasets
+    def test_keyset_fields(self):
+        dataset = fod.Dataset()
+        dataset.add_sample(
+            fos.Sample(
+                filepath="image.png",
+                x=1,
+                gt=fol.Classification(label="cat"),
+            )
+        )
+
+        get_keyset = fosa._get_keyset
+
+        self.assertEqual(get_keyset(dataset.view()), ("_id", 1))
+        self.assertEqual(
+            get_keyset(dataset.sort_by("id", reverse=True)), ("_id", -1)
+        )
+        self.assertEqual(get_keyset(dataset.sort_by("x")), ("x", 1))
+        self.assertEqual(
+            get_keyset(dataset.sort_by("x", reverse=True)), ("x", -1)
+        )
+        self.assertEqual(
+            get_keyset(dataset.sort_by("gt.label")), ("gt.label", 1)
+        )
+
+        self.assertIsNone(get_keyset(dataset.sort_by(F("x") * 2)))
+        self.assertIsNone(get_keyset(dataset.sort_by("x").limit(1)))
+        self.assertIsNone(get_keyset(dataset.set_field("x", 2).sort_by("x")))
+        self.assertIsNone(
+            get_keyset(
+                dataset.sort_by("gt.label").filter_labels(
+                    "gt", F("label") == "cat"
+                )
+            )
+        )
+        self.assertIsNone(get_keyset(dataset.sort_by("tags")))
+
+        group = fo.Group()
+        group_dataset = fod.Dataset()
+        group_dataset.add_group_field("group", default="left")
+        group_dataset.add_samples(
+            [
+                fos.Sample(filepath="l.png", x=1, group=group.element("left")),
+                fos.Sample(
+                    filepath="r.png", x=2, group=group.element("right")
+                ),
+            ]
+        )
+
+        self.assertEqual(get_keyset(group_dataset.sort_by("x")), ("x", 1))
+        self.assertIsNone(
+            get_keyset(group_dataset.sort_by("x").select_group_slices())
+        )
+
+
+class ServerCacheTests(unittest.TestCase):
+    @drop_datasets
+    def test_aggregation_cache(self):
+        _run(self._test_aggregation_cache())
+
+    async def _test_aggregation_cache(self):
+        dataset = fod.Dataset()
+        dataset.add_samples(
+            [fos.Sample(filepath="image%d.png" % i, x=i) for i in range(5)]
+        )
+
+        cache = fosc.AggregationCache(max_size=2)
+        aggs = [foa.Count(), foa.Bounds("x")]
+
+        results = await cache.aggregate(dataset, aggs)
+        self.assertListEqual(results, [5, (0, 4)])
+
+        # Callers may modify the results they receive
+        results.append(None)
+
+        # Equivalent views and aggregations hit the cache
+        results = await cache.aggregate(
+            dataset.view(), [foa.Count(), foa.Bounds("x")]
+        )
+        self.assertListEqual(results, [5, (0, 4)])
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 5)
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 5)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 2)
+
+        view = dataset.match(F("x") > 2)
+        self.assertEqual(await cache.aggregate(view, foa.Count()), 2)
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["size"], 2)
+
+        # Samples that are added or deleted elsewhere are noticed
+        dataset.add_sample(fos.Sample(filepath="image5.png", x=5))
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 6)
+        self.assertEqual(await cache.aggregate(view, foa.Count()), 3)
+
+        # Invalidation discards results that are stale due to edits
+        dataset.set_values("x", [0] * 6)
+        self.assertEqual(await cache.aggregate(view, foa.Count()), 3)
+
+        cache.invalidate(dataset.name)
+        self.assertEqual(cache.get_stats()["size"], 0)
+        self.assertEqual(await cache.aggregate(view, foa.Count()), 0)
+
+        # Expired results are recomputed
+        cache.ttl = 0
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 6)
+        self.assertEqual(cache.get_stats()["hits"], 3)
+
+        # Caching can be disabled
+        cache = fosc.AggregationCache(max_size=0)
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 6)
+        self.assertEqual(await cache.aggregate(dataset, foa.Count()), 6)
+        self.assertEqual(cache.get_stats()["hits"], 0)
+
+
+class ServerThumbnailTests(unittest.TestCase):
+    def test_thumbnail_cache(self):
+        with etau.TempDir() as tmp_dir:
+            _run(self._test_thumbnail_cache(tmp_dir))
+
+    async def _test_thumbnail_cache(self, tmp_dir):
+        cache_dir = os.path.join(tmp_dir, "cache")
+        large_path = os.path.join(tmp_dir, "large.png")
+        small_path = os.path.join(tmp_dir, "small.png")
+
+        etai.write(np.zeros((300, 400, 3), dtype=np.uint8), large_path)
+        etai.write(np.zeros((30, 40, 3), dtype=np.uint8), small_path)
+
+        cache = fost.ThumbnailCache(cache_dir)
+
+        key, path = await cache.get(large_path, 100)
+        self.assertTrue(path.startswith(cache_dir))
+        self.assertEqual(etai.read(path).shape, (75, 100, 3))
+
+        # Repeated requests reuse the existing thumbnail
+        key2, path2 = await cache.get(large_path, 100)
+        self.assertEqual(key, key2)
+        self.assertEqual(path, path2)
+
+        # Different parameters produce different thumbnails
+        key3, path3 = await cache.get(large_path, 100, fmt="webp")
+        self.assertNotEqual(key, key3)
+        self.assertTrue(path3.endswith(".webp"))
+
+        # Images that are already small enough are served as-is
+        _, small_thumbnail_path = await cache.get(small_path, 100)
+        self.assertIsNone(small_thumbnail_path)
+
+        # Modifying the source image invalidates its thumbnails
+        etai.write(np.zeros((400, 300, 3), dtype=np.uint8), large_path)
+        os.utime(large_path, ns=(0, 0))
+        key4, path4 = await cache.get(large_path, 100)
+        self.assertNotEqual(key, key4)
+        self.assertEqual(etai.read(path4).shape, (100, 75, 3))
+
+        # The least recently used thumbnails are evicted
+        cache.max_size = os.path.getsize(path4)
+        _, path5 = await cache.get(large_path, 50)
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(path3))
+        self.assertFalse(os.path.exists(path4))
+        self.assertEqual(cache.get_size(), os.path.getsize(path5))
+
+
+class ServerMetadataTests(unittest.TestCase):
+    @drop_datasets
+    def test_metadata_cache(self):
+        with etau.TempDir() as tmp_dir:
+            _run(self._test_metadata_cache(tmp_dir))
+
+    async def _test_metadata_cache(self, tmp_dir):
+        image_path1 = os.path.join(tmp_dir, "image1.png")
+        image_path2 = os.path.join(tmp_dir, "image2.png")
+        etai.write(np.zeros((30, 60, 3), dtype=np.uint8), image_path1)
+        etai.write(np.zeros((60, 30, 3), dtype=np.uint8), image_path2)
+
+        cache = fosm.MetadataCache(max_size=1)
+
+        metadata, media_metadata = await cache.get(image_path1, False)
+        self.assertDictEqual(metadata, {"aspect_ratio": 2.0})
+        self.assertIsInstance(media_metadata, fo.ImageMetadata)
+        self.assertEqual(media_metadata.width, 60)
+        self.assertEqual(media_metadata.height, 30)
+
+        metadata, _ = await cache.get(image_path1, False)
+        self.assertDictEqual(metadata, {"aspect_ratio": 2.0})
+        self.assertDictEqual(
+            cache.get_stats(),
+            {"hits": 1, "misses": 1, "size": 1, "max_size": 1},
+        )
+
+        metadata, _ = await cache.get(image_path2, False)
+        self.assertDictEqual(metadata, {"aspect_ratio": 0.5})
+        self.assertEqual(cache.get_stats()["size"], 1)
+
+        # Modified files are read again
+        etai.write(np.zeros((30, 90, 3), dtype=np.uint8), image_path2)
+        os.utime(image_path2, (0, 0))
+        metadata, _ = await cache.get(image_path2, False)
+        self.assertDictEqual(metadata, {"aspect_ratio": 3.0})
+        self.assertEqual(cache.get_stats()["misses"], 3)
+
+        # Pre-existing metadata takes precedence
+        dataset = fod.Dataset()
+        dataset.add_samples(
+            [
+                fos.Sample(filepath=image_path1),
+                fos.Sample(
+                    filepath=image_path2,
+                    metadata=fo.ImageMetadata(width=10, height=20),
+                ),
+            ]
+        )
+        samples = dataset._aggregate(
+            pipeline=[{"$sort": {"filepath": 1}}], attach_frames=False
+        )
+        results = [
+            await fosm.get_metadata(dataset, sample, "image")
+            for sample in samples
+        ]
+        self.assertEqual(results[0]["aspect_ratio"], 2.0)
+        self.assertEqual(results[1]["aspect_ratio"], 0.5)
+        self.assertListEqual(
+            results[0]["urls"], [{"field": "filepath", "url": image_path1}]
+        )
+
+        # Metadata read from disk is written back in a batch
+        dataset = fod.Dataset()
+        dataset.add_samples(
+            [
+                fos.Sample(filepath=image_path1),
+                fos.Sample(filepath=image_path2),
+            ]
+        )
+        samples = dataset._aggregate(attach_frames=False)
+
+        fosm.get_cache().clear()
+        write_back = fo.config.metadata_write_back
+        fo.config.metadata_write_back = True
+        try:
+            writes = []
+            for sample in samples:
+                await fosm.get_metadata(
+                    dataset, sample, "image", writes=writes
+                )
+
+            self.assertEqual(len(writes), 2)
+            self.assertListEqual(dataset.values("metadata"), [None, None])
+
+            await fosm.write_metadata(dataset, writes)
+        finally:
+            fo.config.metadata_write_back = write_back
+
+        metadata = dataset.sort_by("filepath").values("metadata")
+        self.assertEqual((metadata[0].width, metadata[0].height), (60, 30))
+        self.assertEqual((metadata[1].width, metadata[1].height), (90, 30))
+        self.assertEqual(metadata[0].mime_type, "image/png")
@@ -13,8 +13,12 @@ import numpy as np
 
 import fiftyone as fo
 import fiftyone.constants as foc
+import fiftyone.core.fields as fof
 import fiftyone.core.media as fom
+import fiftyone.core.odm as foo
 import fiftyone.core.uid as fou
+import fiftyone.core.utils as fout
+import fiftyone.utils.iou as foui
 from fiftyone.migrations.runner import MigrationRunner
 
 from decorators import drop_datasets
@@ -153,6 +157,120 @@ class SerializationTests(unittest.TestCase):
 
         self.assertDictEqual(s1.to_dict(), s2.to_dict())
 
+    def test_numpy_codecs(self):
+        arrays = [
+            np.random.randn(5).astype(np.float32),
+            np.arange(12, dtype=">i4").reshape(3, 4),
+            np.zeros((2, 0), dtype=np.uint8),
+            np.array(3.5),
+            np.ones((2, 3), dtype=bool),
+        ]
+
+        for array in arrays:
+            for codec in ("zlib", "raw"):
+                for ascii in (False, True):
+                    b = fout.serialize_numpy_array(
+                        array, ascii=ascii, codec=codec
+                    )
+                    a = fout.deserialize_numpy_array(b, ascii=ascii)
+                    self.assertEqual(a.shape, array.shape)
+                    self.assertTrue(np.array_equal(a, array))
+
+        # Raw arrays are stored little-endian and decoded without copying
+        b = fout.serialize_numpy_array(arrays[1], codec="raw")
+        a = fout.deserialize_numpy_array(b)
+        self.assertEqual(a.dtype, np.dtype("<i4"))
+        self.assertFalse(a.flags.owndata)
+        self.assertFalse(a.flags.writeable)
+
+        a = fout.deserialize_numpy_array(bytearray(b))
+        a[0, 0] = 1
+
+        with self.assertRaises(ValueError):
+            fout.serialize_numpy_array(arrays[0], codec="foo")
+
+        with self.assertRaises(ValueError):
+            fout.serialize_numpy_array(np.array([{}]), codec="raw")
+
+    def test_deserialize_numpy_arrays(self):
+        vectors = np.random.randn(4, 3).astype(np.float32)
+
+        raw = [fout.serialize_numpy_array(v, codec="raw") for v in vectors]
+        mixed = raw[:2] + [fout.serialize_numpy_array(v) for v in vectors[2:]]
+
+        for blobs in (raw, mixed):
+            a = fout.deserialize_numpy_arrays(blobs)
+            self.assertEqual(a.shape, (4, 3))
+            self.assertEqual(a.dtype, np.float32)
+            self.assertTrue(np.array_equal(a, vectors))
+
+        self.assertEqual(fout.deserialize_numpy_arrays([]).shape, (0,))
+
+    @drop_datasets
+    def test_field_codec(self):
+        dataset = fo.Dataset()
+        dataset.add_sample_field("vector", fof.VectorField, codec="raw")
+        dataset.add_sample_field("array", fof.ArrayField, codec="raw")
+
+        sample = fo.Sample(
+            filepath="image.png",
+            vector=np.arange(5, dtype=np.float32),
+            array=np.ones((2, 3)),
+            other=np.arange(3),
+        )
+        dataset.add_sample(sample)
+
+        d = dataset._sample_collection.find_one({})
+        self.assertTrue(d["vector"].startswith(fout._RAW_NUMPY_MAGIC))
+        self.assertTrue(d["array"].startswith(fout._RAW_NUMPY_MAGIC))
+        self.assertFalse(d["other"].startswith(fout._RAW_NUMPY_MAGIC))
+
+        dataset.reload()
+        self.assertEqual(dataset.get_field("vector").codec, "raw")
+        self.assertIsNone(dataset.get_field("other").codec)
+
+        sample.reload()
+        self.assertTrue(np.array_equal(sample.vector, np.arange(5)))
+        self.assertTrue(np.array_equal(sample.array, np.ones((2, 3))))
+
+        with self.assertRaises(ValueError):
+            fof.VectorField(codec="foo")
+
+    @drop_datasets
+    def test_field_codec_frames(self):
+        class _RawEmbedding(foo.DynamicEmbeddedDocument):
+            vector = fof.VectorField(codec="raw")
+
+        dataset = fo.Dataset()
+        dataset.media_type = "video"
+        dataset.add_frame_field("vector", fof.VectorField, codec="raw")
+
+        sample = fo.Sample(filepath="video.mp4")
+        sample.frames[1] = fo.Frame(
+            vector=np.arange(3.0),
+            embedding=_RawEmbedding(vector=np.arange(2.0)),
+            embeddings=[_RawEmbedding(vector=np.arange(2.0))],
+        )
+        dataset.add_sample(sample)
+
+        sample.frames[2] = fo.Frame(vector=np.arange(3.0))
+        sample.save()
+
+        for d in dataset._frame_collection.find({}):
+            self.assertTrue(d["vector"].startswith(fout._RAW_NUMPY_MAGIC))
+
+        d = dataset._frame_collection.find_one({"frame_number": 1})
+        self.assertTrue(
+            d["embedding"]["vector"].startswith(fout._RAW_NUMPY_MAGIC)
+        )
+        self.assertTrue(
+            d["embeddings"][0]["vector"].startswith(fout._RAW_NUMPY_MAGIC)
+        )
+
+        frame = dataset.first().frames[1]
+        self.assertTrue(np.array_equal(frame.vector, np.arange(3.0)))
+        self.assertTrue(np.array_equal(frame.embedding.vector, np.arange(2.0)))
+
 
 class MediaTypeTests(unittest.TestCase):
     @drop_datasets
@@ -236,6 +354,139 @@ class MigrationTests(unittest.TestCase):
             MigrationRunner(future_ver, "0.1")
 
 
+class IoUTests(unittest.TestCase):
+    def _make_detections(self):
+        return [
+            fo.Detection(label="cat", bounding_box=[0.1, 0.1, 0.4, 0.4]),
+            fo.Detection(label="dog", bounding_box=[0.2, 0.2, 0.4, 0.4]),
+            fo.Detection(
+                label="cat", bounding_box=[0.0, 0.0, 0.2, 0.2], iscrowd=True
+            ),
+            fo.Detection(label="cat", bounding_box=[0.8, 0.8, 0.1, 0.1]),
+        ]
+
+    def test_compute_bbox_ious(self):
+        preds = self._make_detections()
+        gts = self._make_detections()[:3]
+
+        ious = foui.compute_ious(preds, gts)
+        self.assertEqual(ious.shape, (4, 3))
+        self.assertAlmostEqual(ious[0, 0], 1.0)
+        self.assertAlmostEqual(ious[0, 1], 0.09 / 0.23)
+        self.assertAlmostEqual(ious[0, 2], 0.01 / 0.19)
+        self.assertTrue(np.all(ious[3, :] == 0))
+
+        ious = foui.compute_ious(preds, gts, classwise=True)
+        self.assertEqual(ious[0, 1], 0)
+        self.assertAlmostEqual(ious[0, 2], 0.01 / 0.19)
+
+        ious = foui.compute_ious(preds, gts, iscrowd="iscrowd")
+        self.assertAlmostEqual(ious[0, 1], 0.09 / 0.23)
+        self.assertAlmostEqual(ious[0, 2], 0.01 / 0.16)
+        self.assertAlmostEqual(ious[2, 2], 1.0)
+
+        ious = foui.compute_ious([], gts)
+        self.assertEqual(ious.shape, (0, 3))
+
+    def test_compute_bbox_ious_symmetric(self):
+        dets = self._make_detections()
+
+        ious = foui.compute_ious(dets, dets, iscrowd="iscrowd")
+        self.assertEqual(ious.shape, (4, 4))
+        self.assertTrue(np.allclose(ious, ious.T))
+        self.assertTrue(np.all(np.diag(ious) == 1))
+
+        # Symmetric results use the lower triangle of the asymmetric results
+        ious2 = foui.compute_ious(dets, list(dets), iscrowd="iscrowd")
+        tril = np.tril_indices(4, k=-1)
+        self.assertTrue(np.allclose(ious[tril], ious2[tril]))
+
+        ious = foui.compute_ious(dets, dets, classwise=True)
+        self.assertEqual(ious[0, 1], 0)
+        self.assertEqual(ious[1, 0], 0)
+        self.assertEqual(ious[1, 1], 1)
+
+    def test_compute_dense_mask_ious(self):
+        mask1 = np.ones((5, 5), dtype=bool)
+        mask2 = np.ones((5, 5), dtype=bool)
+        mask2[0, :] = False
+
+        # Masks imply a 10 x 10 frame
+        dets = [
+            fo.Detection(
+                label="cat", bounding_box=[0.0, 0.0, 0.5, 0.5], mask=mask1
+            ),
+            fo.Detection(
+                label="cat", bounding_box=[0.2, 0.2, 0.5, 0.5], mask=mask2
+            ),
+            fo.Detection(
+                label="dog", bounding_box=[0.6, 0.6, 0.2, 0.2], iscrowd=True
+            ),
+        ]
+
+        ious = foui.compute_ious(
+            dets[:2], dets[1:], use_masks=True, dense_masks=True
+        )
+        self.assertEqual(ious.shape, (2, 2))
+        self.assertAlmostEqual(ious[0, 0], 6 / 39)
+        self.assertAlmostEqual(ious[0, 1], 0)
+        self.assertAlmostEqual(ious[1, 0], 1)
+        self.assertAlmostEqual(ious[1, 1], 1 / 23)
+
+        ious = foui.compute_ious(
+            dets[:2],
+            dets[1:],
+            use_masks=True,
+            dense_masks=True,
+            iscrowd="iscrowd",
+        )
+        self.assertAlmostEqual(ious[1, 1], 1 / 20)
+
+        ious = foui.compute_ious(
+            dets[:2],
+            dets[1:],
+            use_masks=True,
+            dense_masks=True,
+            classwise=True,
+        )
+        self.assertAlmostEqual(ious[1, 1], 0)
+
+        ious = foui.compute_ious(dets, dets, use_masks=True, dense_masks=True)
+        self.assertEqual(ious.shape, (3, 3))
+        self.assertTrue(np.allclose(ious, ious.T))
+        self.assertTrue(np.all(np.diag(ious) == 1))
+        self.assertAlmostEqual(ious[1, 0], 6 / 39)
+
+        # Intersections are accumulated across strips of rows
+        chunk_size = foui._MAX_MASK_CHUNK_SIZE
+        foui._MAX_MASK_CHUNK_SIZE = 10
+        try:
+            ious2 = foui.compute_ious(
+                dets, dets, use_masks=True, dense_masks=True
+            )
+        finally:
+            foui._MAX_MASK_CHUNK_SIZE = chunk_size
+
+        self.assertTrue(np.allclose(ious, ious2))
+
+        # Multichannel masks use their first channel
+        dets3 = [
+            fo.Detection(
+                label="cat",
+                bounding_box=[0.2, 0.2, 0.5, 0.5],
+                mask=np.stack([mask2, ~mask2], axis=2),
+            )
+        ]
+        ious = foui.compute_ious(
+            dets[:1], dets3, use_masks=True, dense_masks=True
+        )
+        self.assertAlmostEqual(ious[0, 0], 6 / 39)
+
+        # Polygonal approximations are used by default
+        ious = foui.compute_ious(dets[:1], dets[:1], use_masks=True)
+        self.assertAlmostEqual(ious[0, 0], 1)
+
+
 class UIDTests(unittest.TestCase):
     def test_log_import(self):
         fo.config.do_not_track = False
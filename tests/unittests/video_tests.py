@@ -6,12 +6,16 @@ FiftyOne video-related unit tests.
 |
 """
 from datetime import date, datetime
+import os
 
 from bson import ObjectId
 import numpy as np
 import unittest
 
+import eta.core.utils as etau
+
 import fiftyone as fo
+import fiftyone.utils.video as fouv
 from fiftyone import ViewField as F
 
 from decorators import drop_datasets
@@ -1962,6 +1966,78 @@ class VideoTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             frame["ground_truth"]
 
+    @drop_datasets
+    def test_to_frames_cache(self):
+        dataset = fo.Dataset()
+
+        sample1 = fo.Sample(filepath="video1.mp4")
+        sample1.frames[1] = fo.Frame(filepath="frame11.jpg", hello="world")
+        sample1.frames[2] = fo.Frame(filepath="frame12.jpg")
+
+        sample2 = fo.Sample(filepath="video2.mp4")
+        sample2.frames[1] = fo.Frame(filepath="frame21.jpg", hello="there")
+
+        dataset.add_samples([sample1, sample2])
+
+        view1 = dataset.to_frames()
+        frame_ids = view1.values("id")
+
+        view2 = dataset.to_frames()
+        self.assertEqual(
+            view1._frames_dataset.name, view2._frames_dataset.name
+        )
+
+        sample1.frames[3] = fo.Frame(filepath="frame13.jpg", hello="again")
+        sample1.save()
+
+        # Only the frames of modified samples are regenerated, in a new
+        # dataset that preserves the order of the frames
+        view3 = dataset.to_frames()
+        self.assertNotEqual(
+            view1._frames_dataset.name, view3._frames_dataset.name
+        )
+        self.assertEqual(len(view1), 3)
+        self.assertEqual(len(view3), 4)
+        self.assertListEqual(view3.values("id")[:2], frame_ids[:2])
+        self.assertListEqual(view3.values("id")[3:], frame_ids[2:])
+        self.assertListEqual(
+            view3.values("hello"), ["world", None, "again", "there"]
+        )
+
+    @drop_datasets
+    def test_transform_videos_num_workers(self):
+        with etau.TempDir() as tmp_dir:
+            src_dir = os.path.join(tmp_dir, "src")
+            dst_dir = os.path.join(tmp_dir, "dst")
+
+            filepaths = []
+            for idx in range(5):
+                filepath = os.path.join(src_dir, "video%d.mp4" % idx)
+                etau.write_file(str(idx), filepath)
+                filepaths.append(filepath)
+
+            dataset = fo.Dataset()
+            dataset.add_samples([fo.Sample(filepath=f) for f in filepaths])
+
+            fouv.transform_videos(
+                dataset,
+                output_field="copy",
+                output_dir=dst_dir,
+                num_workers=2,
+            )
+
+            copies = dataset.values("copy")
+            self.assertListEqual(
+                copies,
+                [
+                    os.path.join(dst_dir, os.path.basename(f))
+                    for f in filepaths
+                ],
+            )
+            for idx, copy in enumerate(copies):
+                with open(copy, "r") as f:
+                    self.assertEqual(f.read(), str(idx))
+
     @drop_datasets
     def test_to_frames_schema(self):
         sample = fo.Sample(filepath="video.mp4")
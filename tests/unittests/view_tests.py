@@ -1128,6 +1128,121 @@ class SetValuesTests(unittest.TestCase):
         )
 
 
+class ViewExplainTests(unittest.TestCase):
+    @drop_datasets
+    def test_explain(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [
+                fo.Sample(
+                    filepath="image%d.jpg" % i,
+                    n=i,
+                    ground_truth=fo.Classification(label=str(i % 3)),
+                )
+                for i in range(20)
+            ]
+        )
+
+        view = dataset.match({"n": {"$gt": 5}, "ground_truth.label": "1"})
+        view = view.sort_by(F("n") * -1).limit(3)
+
+        report = view.explain()
+
+        self.assertEqual(len(report["stages"]), 3)
+        self.assertListEqual(
+            report["stages"][0]["pipeline"],
+            [{"$match": {"n": {"$gt": 5}, "ground_truth.label": "1"}}],
+        )
+        self.assertListEqual(report["stages"][2]["pipeline"], [{"$limit": 3}])
+        self.assertTrue(report["stages"][0]["stage"].startswith("Match("))
+        self.assertTrue(report["collection_scan"])
+        self.assertIn("COLLSCAN", report["plan"])
+        self.assertSetEqual(
+            set(report["unindexed_fields"]), {"n", "ground_truth.label"}
+        )
+        self.assertEqual(report["num_docs_examined"], 20)
+
+        dataset.create_index("n")
+
+        report = view.explain()
+
+        self.assertFalse(report["collection_scan"])
+        self.assertIn("n_1", report["indexes_used"])
+
+        # Documents are fetched via the index and then filtered by label
+        self.assertListEqual(
+            report["unindexed_fields"], ["ground_truth.label"]
+        )
+
+        # An index scan that only serves the sort still filters every sample
+        view = dataset.match(F("ground_truth.label") == "1").sort_by(
+            "filepath"
+        )
+
+        report = view.explain()
+
+        self.assertFalse(report["collection_scan"])
+        self.assertIn("filepath_1", report["indexes_used"])
+        self.assertListEqual(
+            report["unindexed_fields"], ["ground_truth.label"]
+        )
+        self.assertEqual(report["num_docs_examined"], 20)
+        self.assertEqual(report["num_returned"], 7)
+
+        # Fetched documents that are all returned are not reported
+        report = dataset.match(F("filepath") == "image1.jpg").explain()
+
+        self.assertIn("filepath_1", report["indexes_used"])
+        self.assertListEqual(report["unindexed_fields"], [])
+
+    @drop_datasets
+    def test_explain_video(self):
+        dataset = fo.Dataset()
+        sample = fo.Sample(filepath="video.mp4")
+        sample.frames[1] = fo.Frame(label="cat")
+        sample.frames[2] = fo.Frame(label="dog")
+        dataset.add_sample(sample)
+
+        view = dataset.limit(1).match_frames(F("label") == "cat")
+
+        report = view.explain(verbosity="queryPlanner")
+        stages = report["stages"]
+
+        # The frame lookup is injected by FiftyOne
+        self.assertEqual(len(stages), 3)
+        self.assertIsNone(stages[0]["stage"])
+        self.assertEqual(stages[1]["stage"], "Limit(limit=1)")
+        self.assertTrue(stages[2]["stage"].startswith("MatchFrames("))
+        self.assertIsNone(report["num_docs_examined"])
+
+        pipeline = []
+        for stage in stages:
+            pipeline.extend(stage["pipeline"])
+
+        self.assertListEqual(pipeline, view._pipeline())
+
+    @drop_datasets
+    def test_profile(self):
+        dataset = fo.Dataset()
+        dataset.add_samples(
+            [fo.Sample(filepath="image%d.jpg" % i, n=i) for i in range(10)]
+        )
+
+        view = dataset.match(F("n") >= 2).skip(1).limit(3)
+
+        results = view.profile()
+
+        self.assertListEqual(
+            [(r["num_in"], r["num_out"]) for r in results],
+            [(10, 8), (8, 7), (7, 3)],
+        )
+        for r in results:
+            self.assertGreaterEqual(r["time"], 0)
+            self.assertGreaterEqual(r["cumulative_time"], r["time"])
+
+        self.assertListEqual(dataset.profile(), [])
+
+
 class ViewSaveTest(unittest.TestCase):
     @drop_datasets
     def setUp(self):
@@ -2306,6 +2421,32 @@ class ViewStageTests(unittest.TestCase):
         self.assertEqual(len(result), 2)
         self.assertEqual(result.values("filepath"), values)
 
+    def test_select_set(self):
+        name = self.dataset.create_selection_set([self.sample1.id], name="a")
+        self.assertEqual(name, "a")
+        self.assertTrue(self.dataset.has_selection_set("a"))
+        self.assertListEqual(self.dataset.list_selection_sets(), ["a"])
+        self.assertListEqual(
+            self.dataset.load_selection_set("a"), [self.sample1.id]
+        )
+
+        view = self.dataset.select_set("a")
+        self.assertEqual(len(view), 1)
+        self.assertEqual(view.first().id, self.sample1.id)
+
+        view2 = fo.DatasetView._build(self.dataset, view._serialize())
+        self.assertListEqual(view2.values("id"), [self.sample1.id])
+
+        # Sets can be overwritten
+        self.dataset.create_selection_set([self.sample2.id], name="a")
+        self.assertListEqual(view.values("id"), [self.sample2.id])
+
+        self.dataset.delete_selection_set("a")
+        self.assertFalse(self.dataset.has_selection_set("a"))
+
+        with self.assertRaises(ValueError):
+            self.dataset.select_set("a")
+
     def test_select_fields(self):
         self.dataset.add_sample_field("select_fields_field", fo.IntField)
 